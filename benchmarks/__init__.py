@@ -0,0 +1,13 @@
+import argparse
+
+def positive_int(value: str) -> int:
+    """
+    argparse type for options that must be at least 1, such as the number of timed runs
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'must be an integer but was: {value}')
+    if number < 1:
+        raise argparse.ArgumentTypeError(f'must be at least 1 but was: {number}')
+    return number
@@ -0,0 +1,111 @@
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import statistics
+from . import positive_int
+from .synthetic import SyntheticProjectSpec
+from .stand_in import StandInData
+from .suites import default_suite
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+# Results of ad-hoc runs (ignored by git), results of releases are recorded in RESULTS_DIR with --output
+LOCAL_RESULTS_DIR = os.path.join(RESULTS_DIR, 'local')
+
+parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Time lmctl operations on synthetic projects and a local stand-in environment')
+parser.add_argument('--repeat', type=positive_int, default=5, help='timed runs of each benchmark')
+parser.add_argument('--only', action='append', help='only run benchmarks with names starting with this value (may be used more than once)')
+parser.add_argument('--subprojects', type=int, default=5, help='Resource subprojects in the synthetic project')
+parser.add_argument('--scenarios', type=int, default=10, help='behaviour scenarios in the synthetic project')
+parser.add_argument('--payload-files', type=int, default=2, help='payload files in each subproject')
+parser.add_argument('--payload-size', type=int, default=1024*1024, help='size of each payload file in bytes')
+parser.add_argument('--descriptors', type=int, default=100, help='descriptors served by the stand-in environment')
+parser.add_argument('--latency', type=float, default=0.005, help='seconds the stand-in environment waits before each response')
+parser.add_argument('--output', help='file to record the results in (default: benchmarks/results/local/<version>-<timestamp>.json)')
+parser.add_argument('--compare', help='previously recorded results file to compare against')
+parser.add_argument('--threshold', type=float, default=0.1, help='relative slow down of the median reported as a regression when comparing')
+parser.add_argument('--fail-on-regression', default=False, action='store_true', help='exit with 1 when a regression is found')
+
+def _lmctl_version():
+    with open(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'lmctl', 'pkg_info.json')) as f:
+        return json.load(f)['version']
+
+def _time(benchmark, repeat):
+    benchmark.setup()
+    try:
+        # Warm up run, so one-off costs (imports, connection pools) are not counted
+        benchmark.run()
+        durations = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            benchmark.run()
+            durations.append(time.perf_counter() - start)
+    finally:
+        benchmark.teardown()
+    return {
+        'runs': repeat,
+        'min': min(durations),
+        'mean': statistics.mean(durations),
+        'median': statistics.median(durations),
+        'max': max(durations),
+        'stdev': statistics.stdev(durations) if repeat > 1 else 0.0
+    }
+
+def _compare(results, baseline, threshold):
+    regressions = []
+    print('')
+    print(f'Compared with {baseline["version"]} ({baseline["timestamp"]}):')
+    for name, stats in results.items():
+        previous = baseline['results'].get(name, None)
+        if previous is None:
+            print(f'  {name:<32} new')
+            continue
+        change = (stats['median'] - previous['median']) / previous['median']
+        flag = ''
+        if change > threshold:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        print(f'  {name:<32} {previous["median"]:>9.4f}s -> {stats["median"]:>9.4f}s ({change:+.1%}){flag}')
+    return regressions
+
+def main():
+    args = parser.parse_args()
+    spec = SyntheticProjectSpec(subprojects=args.subprojects, scenarios=args.scenarios, payload_files=args.payload_files, payload_size=args.payload_size)
+    data = StandInData(descriptors=args.descriptors, latency=args.latency)
+    suite = default_suite(spec, data)
+    if args.only:
+        suite = [b for b in suite if any(b.name.startswith(o) for o in args.only)]
+    print(f'Synthetic project: {spec.describe()}')
+    print(f'Stand-in environment: {args.descriptors} descriptors, {args.latency}s latency')
+    results = {}
+    for benchmark in suite:
+        stats = _time(benchmark, args.repeat)
+        results[benchmark.name] = stats
+        print(f'  {benchmark.name:<32} median {stats["median"]:.4f}s  min {stats["min"]:.4f}s  max {stats["max"]:.4f}s')
+    record = {
+        'version': _lmctl_version(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'parameters': {k: v for k, v in vars(args).items() if k not in ('output', 'compare', 'fail_on_regression', 'threshold', 'only')},
+        'results': results
+    }
+    output = args.output
+    if output is None:
+        os.makedirs(LOCAL_RESULTS_DIR, exist_ok=True)
+        output = os.path.join(LOCAL_RESULTS_DIR, f'{record["version"]}-{time.strftime("%Y%m%d%H%M%S")}.json')
+    elif os.path.dirname(output) != '':
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(record, f, indent=2)
+    print(f'Results recorded in {output}')
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        regressions = _compare(results, baseline, args.threshold)
+        if len(regressions) > 0 and args.fail_on_regression:
+            sys.exit(1)
+
+main()
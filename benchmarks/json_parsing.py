@@ -0,0 +1,104 @@
+"""
+Compare the peak memory and time of parsing a large list of processes, and summarising it as "lmctl analyze process" does, with the
+json module, with orjson (the optional codec used by lmctl.utils.json_codec) and as a lazy lmctl.client.models.RecordList
+(which keeps the raw bytes and decodes each process when it is read, using orjson when installed).
+
+Each variant runs in its own process, so its peak RSS is not affected by the others:
+
+    python -m benchmarks.json_parsing --rows 50000
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import resource
+import tempfile
+import subprocess
+from benchmarks import positive_int
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+VARIANTS = ['json', 'orjson', 'records']
+INTENT_TYPES = ['CreateAssembly', 'UpgradeAssembly', 'ChangeAssemblyState', 'DeleteAssembly', 'HealAssembly']
+STATUSES = ['Completed', 'Failed', 'Cancelled', 'In Progress']
+
+parser = argparse.ArgumentParser(prog='python -m benchmarks.json_parsing', description='Compare peak RSS and time of parsing large list results')
+parser.add_argument('--rows', type=int, default=50000, help='processes in the list result')
+parser.add_argument('--repeat', type=positive_int, default=3, help='runs of each variant (the lowest peak and time are reported)')
+parser.add_argument('--child', nargs=2, metavar=('VARIANT', 'FILE'), help=argparse.SUPPRESS)
+
+def generate_processes(rows: int):
+    rand = random.Random(42)
+    processes = []
+    for i in range(rows):
+        assembly = f'assembly-{rand.randint(0, rows // 10)}'
+        processes.append({
+            'id': f'{i:08d}-6a1c-4c7b-9d6e-{rand.getrandbits(48):012x}',
+            'assemblyId': f'{rand.getrandbits(64):016x}',
+            'assemblyName': assembly,
+            'assemblyType': f'assembly::type-{rand.randint(0, 20)}::1.0',
+            'intentType': rand.choice(INTENT_TYPES),
+            'status': rand.choice(STATUSES),
+            'startTime': f'2021-06-{rand.randint(1, 28):02d}T{rand.randint(0, 23):02d}:{rand.randint(0, 59):02d}:00.000Z',
+            'endTime': f'2021-06-{rand.randint(1, 28):02d}T{rand.randint(0, 23):02d}:{rand.randint(0, 59):02d}:30.000Z',
+            'intent': {'assemblyName': assembly, 'intendedState': 'Active', 'properties': {f'prop{p}': f'value-{p}' for p in range(5)}}
+        })
+    return processes
+
+def _peak_rss_bytes() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+def run_child(variant: str, path: str):
+    from lmctl.client.models import RecordList
+    from lmctl.client.process_analysis import process_stats
+    from lmctl.utils import json_codec
+    with open(path, 'rb') as f:
+        content = f.read()
+    baseline = _peak_rss_bytes()
+    start = time.perf_counter()
+    if variant == 'json':
+        # As requests' Response.json() does, without orjson
+        processes = json.loads(content.decode('utf-8'))
+    elif variant == 'records':
+        processes = RecordList.from_json(content)
+    else:
+        if not json_codec.orjson_available():
+            print(json.dumps({'skipped': 'orjson not installed'}))
+            return
+        processes = json_codec.loads(content)
+    stats = process_stats(processes)
+    parsed = time.perf_counter() - start
+    print(json.dumps({'seconds': parsed, 'peak_rss': _peak_rss_bytes() - baseline, 'groups': len(stats)}))
+
+def main():
+    args = parser.parse_args()
+    if args.child is not None:
+        run_child(*args.child)
+        return
+    fd, path = tempfile.mkstemp(suffix='.json')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(generate_processes(args.rows), f)
+        print(f'{args.rows} processes, {os.path.getsize(path) / 1e6:.1f} MB of JSON. Time and peak RSS to parse and summarise:')
+        env = os.environ.copy()
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [REPO_ROOT, env.get('PYTHONPATH')]))
+        for variant in VARIANTS:
+            runs = []
+            for _ in range(args.repeat):
+                completed = subprocess.run([sys.executable, '-m', 'benchmarks.json_parsing', '--child', variant, path], env=env, cwd=REPO_ROOT,
+                                            check=True, stdout=subprocess.PIPE, universal_newlines=True)
+                runs.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+            if 'skipped' in runs[0]:
+                print(f'  {variant:<8} skipped: {runs[0]["skipped"]}')
+                continue
+            seconds = min(r['seconds'] for r in runs)
+            peak = min(r['peak_rss'] for r in runs)
+            print(f'  {variant:<8} {seconds:>8.3f}s  peak RSS +{peak / 1e6:>7.1f} MB')
+    finally:
+        os.remove(path)
+
+if __name__ == '__main__':
+    main()
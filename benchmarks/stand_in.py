@@ -0,0 +1,98 @@
+import json
+import time
+import threading
+from urllib.parse import urlparse, unquote
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+class StandInData:
+    """
+    Catalog served by the StandInServer
+    """
+
+    def __init__(self, descriptors=100, deployment_locations=20, latency=0.005):
+        self.latency = latency
+        self.collections = {
+            'api/catalog/descriptors': [
+                {'name': f'resource::generated-{i}::1.0', 'description': f'Generated descriptor {i}', 'properties': {f'prop{p}': {'type': 'string'} for p in range(10)}}
+                for i in range(descriptors)
+            ],
+            'api/deploymentLocations': [
+                {'id': f'dl-{i}', 'name': f'generated-{i}', 'infrastructureType': 'Openstack', 'resourceManager': 'brent', 'properties': {}}
+                for i in range(deployment_locations)
+            ]
+        }
+        self.id_attrs = {
+            'api/catalog/descriptors': 'name',
+            'api/deploymentLocations': 'id'
+        }
+
+    def find(self, path: str):
+        for endpoint, items in self.collections.items():
+            if path == endpoint:
+                return items
+            if path.startswith(endpoint + '/'):
+                id_value = unquote(path[len(endpoint) + 1:])
+                id_attr = self.id_attrs[endpoint]
+                for item in items:
+                    if item[id_attr] == id_value:
+                        return item
+        return None
+
+def _build_handler(data: StandInData):
+
+    class StandInHandler(BaseHTTPRequestHandler):
+
+        def do_GET(self):
+            if data.latency > 0:
+                # Simulate the round trip to a real environment
+                time.sleep(data.latency)
+            content = data.find(urlparse(self.path).path.strip('/'))
+            if content is None:
+                self._respond(404, {'localizedMessage': f'Not found: {self.path}'})
+            else:
+                self._respond(200, content)
+
+        def _respond(self, status, content):
+            body = json.dumps(content).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StandInHandler
+
+class StandInServer:
+    """
+    Local HTTP server standing in for the read-only catalog APIs of a CP4NA orchestration environment.
+
+    Use as a context manager, the server listens on a free port of localhost until exit:
+
+        with StandInServer(StandInData()) as server:
+            client = TNCOClientBuilder().address(server.address).build()
+    """
+
+    def __init__(self, data: StandInData = None):
+        self.data = data if data is not None else StandInData()
+        self._server = None
+        self._thread = None
+
+    @property
+    def address(self):
+        host, port = self._server.server_address
+        return f'http://{host}:{port}'
+
+    def __enter__(self):
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), _build_handler(self.data))
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
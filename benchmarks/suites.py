@@ -0,0 +1,128 @@
+import os
+import sys
+import shutil
+import tempfile
+import subprocess
+from lmctl.project.source.core import Project, BuildOptions
+from lmctl.project.package.core import Pkg, PushOptions
+from lmctl.project.sessions import EnvironmentSessions
+from lmctl.client import TNCOClientBuilder, ResponseCache
+from lmctl.utils.concurrency import run_concurrently
+from tests.common.simulations.lm_simulator import LmSimulator
+from .synthetic import SyntheticProjectSpec, generate_project
+from .stand_in import StandInServer, StandInData
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class Benchmark:
+    """
+    Base for a benchmark. setup and teardown run once, run is timed on each repeat
+    """
+    name = None
+
+    def setup(self):
+        pass
+
+    def run(self):
+        raise NotImplementedError()
+
+    def teardown(self):
+        pass
+
+class ProjectBenchmark(Benchmark):
+
+    def __init__(self, spec: SyntheticProjectSpec):
+        self.spec = spec
+        self.tmp_dir = None
+        self.project_path = None
+
+    def setup(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.project_path = generate_project(os.path.join(self.tmp_dir, self.spec.name), self.spec)
+
+    def _build(self):
+        return Project(self.project_path).build(BuildOptions())
+
+    def teardown(self):
+        if self.tmp_dir is not None and os.path.exists(self.tmp_dir):
+            shutil.rmtree(self.tmp_dir)
+
+class ProjectBuildBenchmark(ProjectBenchmark):
+    name = 'project.build'
+
+    def run(self):
+        self._build()
+
+class PkgBenchmark(ProjectBenchmark):
+
+    def setup(self):
+        super().setup()
+        self.pkg = Pkg(self._build().pkg.path)
+
+class PkgInspectBenchmark(PkgBenchmark):
+    name = 'pkg.inspect'
+
+    def run(self):
+        self.pkg.inspect()
+
+class PkgPushBenchmark(PkgBenchmark):
+    name = 'pkg.push'
+
+    def run(self):
+        lm_sim = LmSimulator().start()
+        lm_sim.add_rm({'name': 'brent', 'url': 'http://brent:8443'})
+        self.pkg.push(EnvironmentSessions(lm_sim.as_mocked_session()), PushOptions())
+
+class CliStartupBenchmark(Benchmark):
+    name = 'cli.startup'
+
+    def run(self):
+        env = os.environ.copy()
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [REPO_ROOT, env.get('PYTHONPATH')]))
+        subprocess.run([sys.executable, '-c', 'from lmctl.cli.entry import cli; cli()', '--help'],
+                        env=env, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+class ClientReadBenchmark(Benchmark):
+    """
+    Reads every descriptor in the stand-in catalog one at a time, after listing them
+    """
+
+    def __init__(self, data: StandInData, max_workers: int = 1, response_cache: bool = False):
+        self.data = data
+        self.max_workers = max_workers
+        self.response_cache = response_cache
+        self.name = f'client.read.workers{max_workers}' + ('.cached' if response_cache else '')
+        self.server = None
+        self.client = None
+
+    def setup(self):
+        self.server = StandInServer(self.data).__enter__()
+        builder = TNCOClientBuilder().address(self.server.address)
+        if self.response_cache:
+            builder.response_cache(ResponseCache())
+        self.client = builder.build()
+
+    def run(self):
+        descriptors_api = self.client.descriptors
+        names = [d['name'] for d in descriptors_api.all()]
+        results = run_concurrently(descriptors_api.get, names, max_workers=self.max_workers)
+        failures = [r for r in results if r.failed]
+        if len(failures) > 0:
+            raise failures[0].error
+
+    def teardown(self):
+        if self.client is not None:
+            self.client.close()
+        if self.server is not None:
+            self.server.__exit__(None, None, None)
+
+def default_suite(spec: SyntheticProjectSpec, data: StandInData):
+    return [
+        ProjectBuildBenchmark(spec),
+        PkgInspectBenchmark(spec),
+        PkgPushBenchmark(spec),
+        CliStartupBenchmark(),
+        ClientReadBenchmark(data, max_workers=1),
+        ClientReadBenchmark(data, max_workers=8),
+        ClientReadBenchmark(data, max_workers=1, response_cache=True)
+    ]
@@ -0,0 +1,92 @@
+import os
+import json
+from lmctl.project.source.creator import CreateAssemblyProjectRequest, ResourceSubprojectRequest, ProjectCreator, CreateOptions
+
+PAYLOAD_DIR = os.path.join('Lifecycle', 'Files')
+
+class SyntheticProjectSpec:
+    """
+    Size of a generated project: an Assembly containing a number of Brent Resource subprojects,
+    with behaviour scenarios on the Assembly and binary payload files in each Resource
+    """
+
+    def __init__(self, name='synthetic', subprojects=5, scenarios=10, payload_files=2, payload_size=1024*1024):
+        self.name = name
+        self.subprojects = subprojects
+        self.scenarios = scenarios
+        self.payload_files = payload_files
+        self.payload_size = payload_size
+
+    def describe(self):
+        return f'{self.subprojects} subprojects, {self.scenarios} scenarios, {self.payload_files}x{self.payload_size} byte payloads'
+
+def _write_json(path, content):
+    with open(path, 'w') as f:
+        json.dump(content, f, indent=2)
+
+def _scenario(name, descriptor_name, configuration_name):
+    return {
+        'name': name,
+        'description': f'Generated scenario {name}',
+        'stages': [
+            {
+                'name': 'Stage One',
+                'steps': [
+                    {
+                        'stepDefinitionName': 'Utilities::SleepForTime',
+                        'properties': {
+                            'sleepTime': '1',
+                            'timeUnit': 'seconds'
+                        }
+                    }
+                ]
+            }
+        ],
+        'assemblyActors': [
+            {
+                'instanceName': configuration_name,
+                'assemblyConfigurationRef': configuration_name,
+                'initialState': 'Active',
+                'uninstallOnExit': True,
+                'provided': False
+            }
+        ],
+        'projectId': descriptor_name
+    }
+
+def _write_behaviour(project_path, spec):
+    descriptor_name = f'assembly::{spec.name}::1.0'
+    configuration_name = 'generated'
+    _write_json(os.path.join(project_path, 'Behaviour', 'Configurations', f'{configuration_name}.json'), {
+        'name': configuration_name,
+        'description': 'Generated configuration',
+        'properties': {},
+        'descriptorName': descriptor_name
+    })
+    for i in range(spec.scenarios):
+        scenario_name = f'scenario-{i}'
+        _write_json(os.path.join(project_path, 'Behaviour', 'Tests', f'{scenario_name}.json'), _scenario(scenario_name, descriptor_name, configuration_name))
+
+def _write_payloads(subproject_path, spec):
+    payload_dir = os.path.join(subproject_path, PAYLOAD_DIR)
+    os.makedirs(payload_dir, exist_ok=True)
+    for i in range(spec.payload_files):
+        with open(os.path.join(payload_dir, f'payload-{i}.bin'), 'wb') as f:
+            # Random content so compression in the build does not flatter the results
+            f.write(os.urandom(spec.payload_size))
+
+def generate_project(target_location: str, spec: SyntheticProjectSpec) -> str:
+    request = CreateAssemblyProjectRequest()
+    request.name = spec.name
+    request.target_location = target_location
+    for i in range(spec.subprojects):
+        subproject_request = ResourceSubprojectRequest()
+        subproject_request.name = f'resource-{i}'
+        subproject_request.directory = f'resource-{i}'
+        subproject_request.resource_manager = 'brent'
+        request.subproject_requests.append(subproject_request)
+    ProjectCreator(request, CreateOptions()).create()
+    _write_behaviour(target_location, spec)
+    for i in range(spec.subprojects):
+        _write_payloads(os.path.join(target_location, 'Contains', f'resource-{i}'), spec)
+    return target_location
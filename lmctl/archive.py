@@ -0,0 +1,190 @@
+import os
+import zlib
+import zipfile
+from typing import Dict, List
+from lmctl.utils.concurrency import run_concurrently
+
+STORED = 'stored'
+DEFLATE = 'deflate'
+COMPRESSION_METHODS = [STORED, DEFLATE]
+DEFAULT_COMPRESSION_LEVEL = 6
+DEFAULT_MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+# Files that are (normally) already compressed, so deflating them again costs time for no gain
+DEFAULT_STORED_EXTENSIONS = [
+    '.zip', '.gz', '.tgz', '.bz2', '.xz', '.7z', '.jar', '.war', '.csar', '.whl',
+    '.png', '.jpg', '.jpeg', '.gif', '.qcow2', '.iso', '.img', '.vmdk'
+]
+
+ZIP_STORED = zipfile.ZIP_STORED
+ZIP_DEFLATED = zipfile.ZIP_DEFLATED
+
+# Deflated members up to this size are compressed on worker threads, larger members are streamed on the calling thread
+MAX_PARALLEL_MEMBER_SIZE = 16 * 1024 * 1024
+# Members waiting to be compressed are compressed and written once their total size reaches this, bounding the memory held
+MAX_PENDING_SIZE = 64 * 1024 * 1024
+# Larger members are read and deflated this much at a time
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+class ArchiveError(Exception):
+    pass
+
+class CompressionPolicy:
+    """
+    Decides how each member of a zip archive is compressed: stored for already compressed extensions, deflate at level otherwise
+    """
+
+    def __init__(self, method: str = DEFLATE, level: int = DEFAULT_COMPRESSION_LEVEL, stored_extensions: List[str] = None, max_workers: int = DEFAULT_MAX_WORKERS):
+        if method not in COMPRESSION_METHODS:
+            raise ArchiveError('Compression method must be one of {0} but was: {1}'.format(COMPRESSION_METHODS, method))
+        if not isinstance(level, int) or level < 0 or level > 9:
+            raise ArchiveError('Compression level must be an integer between 0 and 9 but was: {0}'.format(level))
+        self.method = method
+        self.level = level
+        self.stored_extensions = [ext.lower() for ext in (stored_extensions if stored_extensions is not None else DEFAULT_STORED_EXTENSIONS)]
+        self.max_workers = max(1, max_workers)
+
+    @staticmethod
+    def from_dict(data: Dict) -> 'CompressionPolicy':
+        if data is None:
+            return CompressionPolicy()
+        if not isinstance(data, dict):
+            raise ArchiveError('compression must be a dictionary but was: {0}'.format(type(data).__name__))
+        return CompressionPolicy(
+            method=data.get('method', DEFLATE),
+            level=data.get('level', DEFAULT_COMPRESSION_LEVEL),
+            stored_extensions=data.get('storedExtensions', None)
+        )
+
+    @staticmethod
+    def infer_from_archive(path: str) -> 'CompressionPolicy':
+        """
+        Policy to use when rewriting an existing archive, so an archive built without compression stays that way
+        """
+        with zipfile.ZipFile(path, 'r') as existing:
+            if any(info.compress_type != zipfile.ZIP_STORED for info in existing.infolist()):
+                return CompressionPolicy()
+        return CompressionPolicy(method=STORED)
+
+    def to_dict(self) -> Dict:
+        return {
+            'method': self.method,
+            'level': self.level,
+            'storedExtensions': self.stored_extensions
+        }
+
+    def compress_type_for(self, name: str) -> int:
+        if self.method == STORED or self.level == 0:
+            return zipfile.ZIP_STORED
+        _, ext = os.path.splitext(name)
+        if ext.lower() in self.stored_extensions:
+            return zipfile.ZIP_STORED
+        return zipfile.ZIP_DEFLATED
+
+class ZipWriter(zipfile.ZipFile):
+    """
+    zipfile.ZipFile opened for writing, which compresses each member added with write(path, arcname=...) as decided by a CompressionPolicy.
+
+    Files to deflate are compressed with zlib at policy.level into a raw deflate stream, then written with the local header
+    zipfile.ZipInfo builds for them, so zipfile still writes the central directory (and decides on ZIP64 for it) on close.
+    They are queued and compressed on up to policy.max_workers threads, then written in the order they were added (before
+    any other member is written, once the queue reaches MAX_PENDING_SIZE, and on close). Files larger than
+    MAX_PARALLEL_MEMBER_SIZE are streamed on the calling thread, so they are never held in memory
+    """
+
+    def __init__(self, path: str, policy: CompressionPolicy = None):
+        self.policy = policy if policy is not None else CompressionPolicy()
+        self._pending = []
+        self._pending_size = 0
+        super().__init__(path, mode='w', compression=zipfile.ZIP_DEFLATED, allowZip64=True)
+
+    def write(self, filename, arcname=None, compress_type=None):
+        if compress_type is None and not os.path.isdir(filename):
+            compress_type = self.policy.compress_type_for(arcname if arcname is not None else filename)
+            if compress_type == zipfile.ZIP_DEFLATED:
+                zinfo = zipfile.ZipInfo.from_file(filename, arcname)
+                zinfo.compress_type = zipfile.ZIP_DEFLATED
+                if self.policy.max_workers > 1 and zinfo.file_size <= MAX_PARALLEL_MEMBER_SIZE:
+                    self._pending.append((filename, zinfo))
+                    self._pending_size += zinfo.file_size
+                    if self._pending_size >= MAX_PENDING_SIZE:
+                        self._write_pending()
+                    return
+                self._write_pending()
+                self._write_streamed(filename, zinfo)
+                return
+        self._write_pending()
+        super().write(filename, arcname=arcname, compress_type=compress_type)
+
+    def _new_compressor(self):
+        # Raw deflate stream (no zlib header), as zip members are written
+        return zlib.compressobj(self.policy.level, zlib.DEFLATED, -15)
+
+    def _deflate(self, pending_member):
+        filename, _ = pending_member
+        with open(filename, 'rb') as f:
+            data = f.read()
+        compressor = self._new_compressor()
+        return len(data), zlib.crc32(data), compressor.compress(data) + compressor.flush()
+
+    def _write_pending(self):
+        pending, self._pending, self._pending_size = self._pending, [], 0
+        if len(pending) == 0:
+            return
+        for task in run_concurrently(self._deflate, pending, max_workers=self.policy.max_workers):
+            if task.failed:
+                raise task.error
+            _, zinfo = task.item
+            zinfo.file_size, zinfo.CRC, deflated = task.value
+            zinfo.compress_size = len(deflated)
+            zinfo.header_offset = self.fp.tell()
+            self.fp.write(zinfo.FileHeader())
+            self.fp.write(deflated)
+            self._add_member(zinfo)
+
+    def _write_streamed(self, filename, zinfo):
+        # Sizes are only known once the file is read, so the local header is written again afterwards (as zipfile does).
+        # It must be written with the same ZIP64 choice both times to keep its length
+        zip64 = zinfo.file_size * 1.05 > zipfile.ZIP64_LIMIT
+        zinfo.CRC = 0
+        zinfo.compress_size = 0
+        zinfo.header_offset = self.fp.tell()
+        self.fp.write(zinfo.FileHeader(zip64))
+        compressor = self._new_compressor()
+        file_size = 0
+        compress_size = 0
+        crc = 0
+        with open(filename, 'rb') as f:
+            while True:
+                chunk = f.read(STREAM_CHUNK_SIZE)
+                if not chunk:
+                    break
+                file_size += len(chunk)
+                crc = zlib.crc32(chunk, crc)
+                deflated = compressor.compress(chunk)
+                compress_size += len(deflated)
+                self.fp.write(deflated)
+        deflated = compressor.flush()
+        compress_size += len(deflated)
+        self.fp.write(deflated)
+        zinfo.file_size, zinfo.compress_size, zinfo.CRC = file_size, compress_size, crc
+        if not zip64 and (file_size > zipfile.ZIP64_LIMIT or compress_size > zipfile.ZIP64_LIMIT):
+            raise zipfile.LargeZipFile('{0} grew beyond the ZIP64 limit while it was being added'.format(filename))
+        end = self.fp.tell()
+        self.fp.seek(zinfo.header_offset)
+        self.fp.write(zinfo.FileHeader(zip64))
+        self.fp.seek(end)
+        self._add_member(zinfo)
+
+    def _add_member(self, zinfo):
+        # The same bookkeeping zipfile does after writing a member, so it is included in the central directory on close
+        self.start_dir = self.fp.tell()
+        self.filelist.append(zinfo)
+        self.NameToInfo[zinfo.filename] = zinfo
+
+    def close(self):
+        try:
+            if self.fp is not None and self.mode == 'w':
+                self._write_pending()
+        finally:
+            super().close()
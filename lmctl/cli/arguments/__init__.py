@@ -1,6 +1,9 @@
-from .environment_name import environment_name_option
-from .format import OutputFormats, output_format_handler, common_output_format_handler, default_output_format_handler
+from .environment_name import environment_name_option, all_environments_option
+from .format import OutputFormats, output_format_handler, common_output_format_handler, default_output_format_handler, analysis_output_format_handler
 from .file_input import FileInputs, file_inputs_handler, default_file_inputs_handler
 from .set_param import set_param_option
 from .ignore_missing import ignore_missing_option
-from .tnco_secrets import tnco_client_secret_option, tnco_pwd_option
\ No newline at end of file
+from .journal_out import journal_out_option
+from .profile import profile_options
+from .tnco_secrets import tnco_client_secret_option, tnco_pwd_option
+from .selection import fields_option, filter_option
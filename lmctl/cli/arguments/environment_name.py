@@ -1,9 +1,19 @@
 import click
 
-def environment_name_option():
+def environment_name_option(allow_many: bool = False):
     def decorator(f):
+        help = 'Name of the environment from the configuration file to be used'
+        if allow_many:
+            help += ' (or a comma separated list of names, to run against each of them at the same time)'
         return click.option('-e', '--environment', 'environment_name', 
                         required=False,
-                        help='Name of the environment from the configuration file to be used'
+                        help=help
+                        )(f)
+    return decorator
+
+def all_environments_option():
+    def decorator(f):
+        return click.option('--all-environments', is_flag=True, default=False,
+                        help='Run against every environment in the configuration file with CP4NA orchestration configured, at the same time'
                         )(f)
     return decorator
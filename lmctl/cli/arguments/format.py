@@ -1,9 +1,10 @@
 import click
-from lmctl.cli.format import OutputFormat, Table, JsonFormat, YamlFormat, TableFormat
+from lmctl.cli.format import OutputFormat, Table, JsonFormat, YamlFormat, TableFormat, CsvFormat
 
 JSON_VALUE = 'json'
 YAML_VALUE = 'yaml'
 TABLE_VALUE = 'table'
+CSV_VALUE = 'csv'
 
 class OutputFormats:
 
@@ -49,3 +50,9 @@ def default_output_format_handler():
         .add_choice(YAML_VALUE, YamlFormat(), is_default=True)\
         .add_choice(JSON_VALUE, JsonFormat())
 
+def analysis_output_format_handler(table: Table):
+    return output_format_handler()\
+            .add_choice(TABLE_VALUE, TableFormat(table=table), is_default=True)\
+            .add_choice(CSV_VALUE, CsvFormat())\
+            .add_choice(YAML_VALUE, YamlFormat())\
+            .add_choice(JSON_VALUE, JsonFormat())
@@ -0,0 +1,9 @@
+import click
+
+def journal_out_option():
+    def decorator(f):
+        return click.option('--journal-out',
+                        default=None,
+                        help='write each event of the execution to this file as a line of JSON'
+                        )(f)
+    return decorator
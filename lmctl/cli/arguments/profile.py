@@ -0,0 +1,20 @@
+import click
+
+def profile_options():
+    def decorator(f):
+        f = click.option('--profile-memory',
+                        default=False,
+                        is_flag=True,
+                        help='include the peak memory used and the largest allocations in the profile (slows execution)'
+                        )(f)
+        f = click.option('--profile-dump',
+                        default=None,
+                        help='write cProfile statistics of the execution to this file (implies --profile)'
+                        )(f)
+        f = click.option('--profile',
+                        default=False,
+                        is_flag=True,
+                        help='print the time spent (and bytes copied/uploaded) in each phase for each subproject'
+                        )(f)
+        return f
+    return decorator
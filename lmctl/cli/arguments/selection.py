@@ -0,0 +1,29 @@
+import click
+from lmctl.cli.projection import FieldSelection, FilterExpression, ExpressionError
+
+def _compiler(compile_class):
+    def _compile_value(ctx, param, value):
+        if value is None:
+            return None
+        try:
+            return compile_class(value)
+        except ExpressionError as e:
+            raise click.BadParameter(str(e), ctx=ctx, param=param) from e
+    return _compile_value
+
+def fields_option():
+    def decorator(f):
+        return click.option('--fields', 'fields',
+                        help='Comma separated fields to include from each object, nested fields separated by dots (e.g. "name,properties.resourceManager")',
+                        callback=_compiler(FieldSelection)
+                        )(f)
+    return decorator
+
+def filter_option():
+    def decorator(f):
+        return click.option('--filter', 'filter_expression',
+                        help='Only include objects matching this filter (e.g. "state==Active and name~^edge-"). ' \
+                             'Compare fields with ==, !=, ~ (regex), !~, >, >=, <, <= and combine with and, or, not and brackets',
+                        callback=_compiler(FilterExpression)
+                        )(f)
+    return decorator
@@ -0,0 +1,204 @@
+import io
+import sys
+import time
+import shlex
+import click
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import List, Any, Callable
+from lmctl.utils.concurrency import run_concurrently, DEFAULT_MAX_WORKERS
+
+logger = logging.getLogger(__name__)
+
+PASSED = 'passed'
+FAILED = 'failed'
+SKIPPED = 'skipped'
+# Commands which cannot be run as a step
+UNSUPPORTED_COMMANDS = ['batch', 'daemon']
+
+class BatchError(Exception):
+    pass
+
+@dataclass
+class BatchStep:
+    """
+    A single lmctl command (argv, without the leading "lmctl") or a group of steps run at the same time (parallel)
+    """
+    name: str
+    argv: List[str] = None
+    parallel: List['BatchStep'] = None
+    continue_on_error: bool = False
+
+    @staticmethod
+    def from_dict(data: Any, default_name: str) -> 'BatchStep':
+        if isinstance(data, (str, list)):
+            data = {'command': data}
+        if not isinstance(data, dict):
+            raise BatchError(f'Step {default_name} should be a command or an object with a "command" or "parallel" field but was: {data}')
+        name = str(data.get('name', default_name))
+        continue_on_error = data.get('continue_on_error', False) is True
+        if 'parallel' in data:
+            if not isinstance(data['parallel'], list) or len(data['parallel']) == 0:
+                raise BatchError(f'Step {name} "parallel" field should be a non-empty list of steps')
+            parallel = [BatchStep.from_dict(s, f'{name}.{i+1}') for i, s in enumerate(data['parallel'])]
+            if any(s.parallel is not None for s in parallel):
+                raise BatchError(f'Step {name} cannot include a parallel group within a parallel group')
+            return BatchStep(name, parallel=parallel, continue_on_error=continue_on_error)
+        command = data.get('command', None)
+        argv = shlex.split(command) if isinstance(command, str) else command
+        if not isinstance(argv, list) or len(argv) == 0:
+            raise BatchError(f'Step {name} should have a "command" (string or list of arguments)')
+        argv = [str(a) for a in argv]
+        if argv[0] == 'lmctl':
+            argv = argv[1:]
+        if len(argv) == 0 or argv[0] in UNSUPPORTED_COMMANDS:
+            raise BatchError(f'Step {name} has an unsupported command: {command}')
+        return BatchStep(name, argv=argv, continue_on_error=continue_on_error)
+
+def read_steps(data: Any) -> List[BatchStep]:
+    """
+    Steps from the contents of a batch file: a list of steps or an object with a "steps" list
+    """
+    if isinstance(data, dict):
+        data = data.get('steps', None)
+    if not isinstance(data, list) or len(data) == 0:
+        raise BatchError('Batch file should contain a non-empty list of "steps"')
+    return [BatchStep.from_dict(s, str(i+1)) for i, s in enumerate(data)]
+
+def _command_string(argv: List[str]) -> str:
+    return ' '.join(shlex.quote(a) for a in argv)
+
+@dataclass
+class StepResult:
+    name: str
+    command: str
+    status: str
+    group: str = None
+    exit_code: int = None
+    duration: float = None
+    output: str = None
+    error_output: str = None
+
+    @property
+    def failed(self) -> bool:
+        return self.status == FAILED
+
+@dataclass
+class BatchResult:
+    passed: bool
+    duration: float
+    steps: List[StepResult] = field(default_factory=list)
+
+class _ThreadStream(io.TextIOBase):
+    """
+    Sends writes to the buffer of the step running on the current thread, or the original stream outside of a step
+    """
+
+    def __init__(self, original):
+        self.original = original
+        self._local = threading.local()
+
+    @property
+    def encoding(self):
+        return 'utf-8'
+
+    def writable(self):
+        return True
+
+    def _target(self):
+        return getattr(self._local, 'target', None) or self.original
+
+    def capture(self, target):
+        self._local.target = target
+
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+
+    def flush(self):
+        self._target().flush()
+
+class _UnclosableStream:
+    """
+    The builtin exit(), used by commands on failure, closes stdin. Later steps may still need it (e.g. for a password prompt)
+    """
+
+    def __init__(self, original):
+        self._original = original
+
+    def close(self):
+        pass
+
+    def __getattr__(self, name):
+        return getattr(self._original, name)
+
+class BatchRunner:
+    """
+    Runs lmctl commands in this process, in order, with the steps of a parallel group run at the same time (at most max_workers at once).
+    The output of each command is captured on its result.
+
+    Once a step fails, the remaining steps are skipped unless continue_on_error is set on the runner. Steps (or parallel groups)
+    with continue_on_error set may fail without stopping the batch or failing its result
+    """
+
+    def __init__(self, cli: click.Command, max_workers: int = DEFAULT_MAX_WORKERS, continue_on_error: bool = False):
+        self.cli = cli
+        self.max_workers = max_workers
+        self.continue_on_error = continue_on_error
+
+    def run(self, steps: List[BatchStep], on_step_complete: Callable[[StepResult], None] = None) -> BatchResult:
+        start = time.perf_counter()
+        results = []
+        passed = True
+        stopped = False
+        original_streams = sys.stdout, sys.stderr, sys.stdin
+        sys.stdout, sys.stderr, sys.stdin = _ThreadStream(sys.stdout), _ThreadStream(sys.stderr), _UnclosableStream(sys.stdin)
+        try:
+            for step in steps:
+                if stopped:
+                    step_results = self._skip(step)
+                elif step.parallel is not None:
+                    tasks = run_concurrently(lambda s: self._run_command(s, group=step.name), step.parallel, max_workers=self.max_workers, catchable_exceptions=())
+                    step_results = [task.value for task in tasks]
+                else:
+                    step_results = [self._run_command(step)]
+                for i, result in enumerate(step_results):
+                    results.append(result)
+                    if on_step_complete is not None:
+                        on_step_complete(result)
+                    member = step.parallel[i] if step.parallel is not None else step
+                    if result.failed and not (step.continue_on_error or member.continue_on_error):
+                        passed = False
+                        stopped = stopped or not self.continue_on_error
+        finally:
+            sys.stdout, sys.stderr, sys.stdin = original_streams
+        return BatchResult(passed=passed, duration=round(time.perf_counter() - start, 3), steps=results)
+
+    def _skip(self, step: BatchStep) -> List[StepResult]:
+        if step.parallel is not None:
+            return [StepResult(s.name, _command_string(s.argv), SKIPPED, group=step.name) for s in step.parallel]
+        return [StepResult(step.name, _command_string(step.argv), SKIPPED)]
+
+    def _run_command(self, step: BatchStep, group: str = None) -> StepResult:
+        out, err = io.StringIO(), io.StringIO()
+        sys.stdout.capture(out)
+        sys.stderr.capture(err)
+        start = time.perf_counter()
+        exit_code = 0
+        try:
+            self.cli.main(args=list(step.argv), prog_name='lmctl', standalone_mode=True)
+        except SystemExit as e:
+            if e.code is None or isinstance(e.code, int):
+                exit_code = e.code or 0
+            else:
+                err.write(f'{e.code}\n')
+                exit_code = 1
+        except Exception as e:
+            logger.exception(f'Batch step {step.name} failed: {step.argv}')
+            err.write(f'Error: {e}\n')
+            exit_code = 1
+        finally:
+            sys.stdout.capture(None)
+            sys.stderr.capture(None)
+        return StepResult(step.name, _command_string(step.argv), PASSED if exit_code == 0 else FAILED, group=group, exit_code=exit_code,
+                            duration=round(time.perf_counter() - start, 3), output=out.getvalue(), error_output=err.getvalue())
@@ -9,4 +9,6 @@ from .vimdriver import vimdriver as vimdriver_group
 from .actions import action_types
 from .targets import target_instances
 from .login import login as login_cmd
-from .logdir import logdir as logdir_cmd
\ No newline at end of file
+from .logdir import logdir as logdir_cmd
+from .daemon import daemon as daemon_group
+from .batch import batch as batch_cmd
\ No newline at end of file
@@ -13,6 +13,11 @@ from .render_action import Render
 from .ping_action import Ping
 from .gen_file_action import GenerateFile
 from .use_action import Use
+from .export_action import Export
+from .apply_action import Apply
+from .analyze_action import Analyze
+from .watch_action import Watch
+from .run_action import Run
 
 action_types = [
     Get, 
@@ -28,5 +33,10 @@ action_types = [
     Render, 
     Ping,
     GenerateFile, 
-    Use
+    Use,
+    Export,
+    Apply,
+    Analyze,
+    Watch,
+    Run
 ]
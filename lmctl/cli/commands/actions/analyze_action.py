@@ -0,0 +1,7 @@
+from .action import Action
+
+class Analyze(Action):
+    name = 'analyze'
+    group_attrs = {
+        'help': 'Summarise metrics of supported objects'
+    }
@@ -0,0 +1,7 @@
+from .action import Action
+
+class Apply(Action):
+    name = 'apply'
+    group_attrs = {
+        'help': 'Create or update objects of a supported type to match the files in a directory'
+    }
@@ -0,0 +1,7 @@
+from .action import Action
+
+class Export(Action):
+    name = 'export'
+    group_attrs = {
+        'help': 'Export all objects of a supported type to files in a directory'
+    }
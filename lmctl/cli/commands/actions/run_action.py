@@ -0,0 +1,7 @@
+from .action import Action
+
+class Run(Action):
+    name = 'run'
+    group_attrs = {
+        'help': 'Run supported objects'
+    }
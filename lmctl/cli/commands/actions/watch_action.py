@@ -0,0 +1,7 @@
+from .action import Action
+
+class Watch(Action):
+    name = 'watch'
+    group_attrs = {
+        'help': 'Stream changes to supported objects'
+    }
@@ -0,0 +1,41 @@
+import os
+import yaml
+import click
+from lmctl.cli.io import IOController
+from lmctl.cli.safety_net import safety_net
+from lmctl.cli.arguments import default_output_format_handler
+from lmctl.cli.batch import BatchRunner, BatchError, StepResult, read_steps
+from lmctl.cli.controller import get_global_controller
+from lmctl.config import find_config_location
+from lmctl.utils.concurrency import DEFAULT_MAX_WORKERS
+
+output_formats = default_output_format_handler()
+
+@click.command(short_help='Run many lmctl commands from a file in one process', help='''\
+                Run the lmctl commands listed in a YAML/JSON file, in order, in one process. The config is loaded once
+                and one client is shared by all commands using the same environment.
+                \n\nEach step is a command (without the leading "lmctl"), as a string or list of arguments, optionally with a "name" and "continue_on_error",
+                or a "parallel" list of steps run at the same time:
+                \n\n  steps:\n\n    - command: create deploymentlocation -f dl.yaml -e dev\n\n    - parallel:\n\n      - get assembly A -e dev\n\n      - get assembly B -e dev
+                \n\nOnce a step fails the remaining steps are skipped, unless "--continue-on-error" is set.
+                The result of each step, including its output, is printed at the end and progress is printed to stderr''')
+@click.option('-f', '--file', 'batch_file', required=True, type=click.File('r'), help='YAML/JSON file listing the steps to run')
+@click.option('--concurrency', type=click.IntRange(min=1), default=DEFAULT_MAX_WORKERS, show_default=True, help='Maximum number of steps of a parallel group run at the same time')
+@click.option('--continue-on-error', is_flag=True, help='Run the remaining steps after a step fails')
+@output_formats.option()
+@click.pass_context
+def batch(ctx: click.Context, batch_file, concurrency: int = DEFAULT_MAX_WORKERS, continue_on_error: bool = False, output_format: str = None):
+    io = IOController.get()
+    output_formatter = output_formats.resolve_choice(output_format)
+    with safety_net(BatchError, yaml.YAMLError):
+        steps = read_steps(yaml.safe_load(batch_file))
+    if os.path.exists(find_config_location(ignore_not_found=True)):
+        # Load the config before any step, so every step shares it (and the clients built from it)
+        get_global_controller(reuse_tnco_clients=True)
+    def print_progress(result: StepResult):
+        io.print_error(f'[{result.status}] {result.name}: {result.command}' + (f' ({result.duration}s)' if result.duration is not None else ''))
+    runner = BatchRunner(ctx.find_root().command, max_workers=concurrency, continue_on_error=continue_on_error)
+    result = runner.run(steps, on_step_complete=print_progress)
+    io.print(output_formatter.convert_element(result))
+    if not result.passed:
+        exit(1)
@@ -0,0 +1,65 @@
+import os
+import sys
+import click
+import subprocess
+from lmctl.cli import daemon as lmctl_daemon
+from lmctl.cli.cmd_tags import settings_tag
+from lmctl.cli.io import IOController
+
+def _socket_option():
+    return click.option('--socket', 'socket_path', default=None, help=f'Path of the Unix socket used by the daemon (default: value of {lmctl_daemon.SOCKET_ENV_VAR} or ~/.lmctl/daemon.sock)')
+
+@settings_tag
+@click.group(short_help='Manage a background lmctl process', help=f'''\
+                Manage a background lmctl process which holds the loaded config and authenticated connections to each environment.
+                \n\nWhile the daemon is running, action commands (get, create, ping etc.) are sent to it instead of starting a new process,
+                making scripts that run many commands much faster. Commands needing input (such as a password prompt) still run in-process.
+                Set {lmctl_daemon.DISABLE_ENV_VAR}=1 to stop commands being sent to the daemon''')
+def daemon():
+    if not lmctl_daemon.daemon_supported():
+        IOController.get().print_error('Error: The lmctl daemon requires Unix domain sockets, which are not supported on this platform')
+        exit(1)
+
+@daemon.command(help='Start the daemon in the background (or in the foreground with --foreground)')
+@_socket_option()
+@click.option('--foreground', is_flag=True, help='Run the daemon in this process until stopped, rather than in the background')
+def start(socket_path: str = None, foreground: bool = False):
+    io = IOController.get()
+    socket_path = socket_path or lmctl_daemon.default_socket_path()
+    if lmctl_daemon.request({'control': lmctl_daemon.STATUS_REQUEST}, socket_path=socket_path) is not None:
+        io.print_error(f'Error: An lmctl daemon is already running on {socket_path}')
+        exit(1)
+    if foreground:
+        io.print(f'lmctl daemon listening on {socket_path}')
+        lmctl_daemon.serve(socket_path)
+        return
+    subprocess.Popen([sys.executable, '-m', lmctl_daemon.__name__, socket_path], env=os.environ.copy(), start_new_session=True,
+                        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    status = lmctl_daemon.wait_until_listening(socket_path)
+    if status is None:
+        io.print_error(f'Error: lmctl daemon did not start listening on {socket_path} within {lmctl_daemon.DEFAULT_START_TIMEOUT} seconds')
+        exit(1)
+    io.print(f'lmctl daemon started (pid {status.get("pid")}) on {socket_path}')
+
+@daemon.command(help='Stop the daemon')
+@_socket_option()
+def stop(socket_path: str = None):
+    io = IOController.get()
+    socket_path = socket_path or lmctl_daemon.default_socket_path()
+    if lmctl_daemon.request({'control': lmctl_daemon.STOP_REQUEST}, socket_path=socket_path) is None:
+        io.print_error(f'Error: No lmctl daemon running on {socket_path}')
+        exit(1)
+    io.print('lmctl daemon stopped')
+
+@daemon.command(help='Show whether the daemon is running and how many commands it has run')
+@_socket_option()
+def status(socket_path: str = None):
+    io = IOController.get()
+    socket_path = socket_path or lmctl_daemon.default_socket_path()
+    reply = lmctl_daemon.request({'control': lmctl_daemon.STATUS_REQUEST}, socket_path=socket_path)
+    if reply is None:
+        io.print(f'No lmctl daemon running on {socket_path}')
+        exit(1)
+    status = reply.get('status', {})
+    io.print(f'lmctl daemon running (pid {status.get("pid")}) on {status.get("socket")}')
+    io.print(f'Uptime: {status.get("uptime")}s, commands run: {status.get("commands")}, clients: {status.get("clients")}')
@@ -4,8 +4,13 @@ import shutil
 import os
 import lmctl.cli.lifecycle as lifecycle_cli
 import lmctl.project.package.core as pkgs
-from lmctl.cli.format import determine_format_class
+import lmctl.project.package.index as pkg_index
+import lmctl.project.package.diff as pkg_diff
+from lmctl.cli.format import determine_format_class, Table, Column, TableFormat
+from lmctl.cli.arguments import common_output_format_handler, journal_out_option, profile_options
+from lmctl.utils.json_codec import dumps as json_dumps
 from lmctl.cli.cmd_tags import project_tag
+from lmctl.utils.concurrency import DEFAULT_MAX_WORKERS
 
 logger = logging.getLogger(__name__)
 
@@ -25,19 +30,45 @@ PUSH_HEADER = 'Push'
 @click.option('--armname', default='defaultrm', help='if using ansible-rm packaging the name of ARM to upload Resources to must be provided')
 @click.option('--pwd', default=None, help='password used for authenticating with CP4NA orchestration (only required if CP4NA orchestration is secure and a username has been included in the environment config)')
 @click.option('--autocorrect', default=False, is_flag=True, help='allow validation warnings and errors to be autocorrected if supported')
-def push(package, environment, config, armname, pwd, autocorrect):
+@click.option('--environments', default=None, help='comma separated list of environments to push to at the same time, instead of a single ENVIRONMENT')
+@click.option('--concurrency', type=click.IntRange(min=1), default=DEFAULT_MAX_WORKERS, show_default=True, help='maximum number of environments pushed to at the same time (when using --environments)')
+@journal_out_option()
+@profile_options()
+def push(package, environment, config, armname, pwd, autocorrect, environments, concurrency, journal_out, profile, profile_dump, profile_memory):
     """Pushes an existing Assembly/Resource package to a target CP4NA orchestration (and ARM) environment"""
     logger.debug('Pushing package at: {0}'.format(package))
+    environment_names = __parse_environments_option(environment, environments)
     pkg, pkg_content = lifecycle_cli.get_pkg_and_open(package)
     try:
-        env_sessions = lifecycle_cli.build_sessions_for_pkg(pkg_content.meta, environment, pwd, armname, config)
-        controller = lifecycle_cli.ExecutionController(PUSH_HEADER)
-        controller.start(package)
-        exec_push(controller, pkg, env_sessions, allow_autocorrect=autocorrect)
+        controller = lifecycle_cli.ExecutionController(PUSH_HEADER, journal_out=journal_out, profile=profile, profile_dump=profile_dump, profile_memory=profile_memory)
+        if environment_names is None:
+            env_sessions = lifecycle_cli.build_sessions_for_pkg(pkg_content.meta, environment, pwd, armname, config)
+            controller.start(package)
+            exec_push(controller, pkg, env_sessions, allow_autocorrect=autocorrect)
+        else:
+            env_sessions_by_name = {}
+            for environment_name in environment_names:
+                env_sessions_by_name[environment_name] = lifecycle_cli.build_sessions_for_pkg(pkg_content.meta, environment_name, pwd, armname, config)
+            controller.start('{0} to {1}'.format(package, ', '.join(environment_names)))
+            exec_push_to_environments(controller, pkg, pkg_content, env_sessions_by_name, allow_autocorrect=autocorrect, max_workers=concurrency)
     finally:
         cleanup_pkg(pkg_content)
     controller.finalise()
 
+def __parse_environments_option(environment, environments):
+    if environments is None:
+        return None
+    if environment is not None:
+        raise click.UsageError('Use either the ENVIRONMENT argument or the --environments option, not both')
+    environment_names = []
+    for environment_name in environments.split(','):
+        environment_name = environment_name.strip()
+        if len(environment_name) > 0 and environment_name not in environment_names:
+            environment_names.append(environment_name)
+    if len(environment_names) == 0:
+        raise click.BadParameter('must include at least one environment name', param_hint='--environments')
+    return environment_names
+
 
 @pkg.command(help='Inspect a package')
 @click.argument('package')
@@ -53,6 +84,130 @@ def inspect(package, config, output_format):
     finally:
         cleanup_pkg(pkg_content)
     
+class PkgSearchTable(Table):
+
+    columns = [
+        Column('package', header='Package', accessor=lambda x: '{0}-{1}'.format(x.get('package'), x.get('version'))),
+        Column('name', header='Content'),
+        Column('descriptor', header='Descriptor'),
+        Column('resource-manager', header='Resource Manager'),
+        Column('path', header='Path')
+    ]
+
+search_output_formats = common_output_format_handler(table=PkgSearchTable())
+
+
+@pkg.command(help='Build or update an index of the packages (.tgz and .csar files) in a directory and its subdirectories, for use with "pkg search". '
+                    'Only the meta file of each package is read (and the package file hashed) and packages are only read again when their modification time or size changes, '
+                    'or when they could not be read last time')
+@click.argument('directory')
+@click.option('--index', 'index_path', default=None, help='path of the index file, created if it does not exist [default: {0} in DIRECTORY]'.format(pkg_index.DEFAULT_INDEX_FILE_NAME))
+@click.option('--rebuild', default=False, is_flag=True, help='read every package again, even those unchanged since the last update')
+@click.option('--concurrency', type=click.IntRange(min=1), default=DEFAULT_MAX_WORKERS, show_default=True, help='maximum number of packages read at the same time')
+def index(directory, index_path, rebuild, concurrency):
+    if index_path is None:
+        index_path = os.path.join(directory, pkg_index.DEFAULT_INDEX_FILE_NAME)
+    logger.debug('Indexing packages in {0} to {1}'.format(directory, index_path))
+    try:
+        with pkg_index.PkgIndex(index_path) as pkg_idx:
+            result = pkg_idx.update(directory, max_workers=concurrency, rebuild=rebuild)
+    except pkg_index.PkgIndexError as e:
+        click.echo('Error: {0}'.format(str(e)), err=True)
+        exit(1)
+    for path, error in result.errors:
+        click.echo('Failed to index {0}: {1}'.format(path, error), err=True)
+    click.echo('Indexed {0}: {1} added, {2} updated, {3} removed, {4} unchanged'.format(directory, len(result.added), len(result.updated), len(result.removed), result.unchanged))
+    if result.failed:
+        exit(1)
+
+
+@pkg.command(help='Search an index built with "pkg index" for packages, listing the package and each subpackage matching all of the options. '
+                    'TERM is matched (case insensitive) against any part of the name of the package, content or descriptor')
+@click.argument('term', required=False, default=None)
+@click.option('-d', '--dir', 'directory', default='.', show_default=True, help='directory indexed with "pkg index"')
+@click.option('--index', 'index_path', default=None, help='path of the index file, instead of the default file in --dir')
+@click.option('--descriptor', default=None, help='glob pattern of the descriptor name, e.g. "resource::example*::1.0"')
+@click.option('--version', default=None, help='version of the package')
+@click.option('--type', 'content_type', default=None, help='type of content, e.g. Assembly or Resource')
+@click.option('--resource-manager', default=None, help='resource manager type of the content, e.g. brent')
+@click.option('--digest', default=None, help='sha256 digest of the package file (or the start of it)')
+@search_output_formats.option()
+def search(term, directory, index_path, descriptor, version, content_type, resource_manager, digest, output_format):
+    if index_path is None:
+        index_path = os.path.join(directory, pkg_index.DEFAULT_INDEX_FILE_NAME)
+    if not os.path.exists(index_path):
+        click.echo('Error: No index found at {0}, create it with "lmctl pkg index"'.format(index_path), err=True)
+        exit(1)
+    try:
+        with pkg_index.PkgIndex(index_path) as pkg_idx:
+            results = pkg_idx.search(term=term, descriptor=descriptor, version=version, content_type=content_type, resource_manager=resource_manager, digest=digest)
+    except pkg_index.PkgIndexError as e:
+        click.echo('Error: {0}'.format(str(e)), err=True)
+        exit(1)
+    output_formatter = search_output_formats.resolve_choice(output_format)
+    click.echo(output_formatter.convert_list(results))
+
+CONTENT_CHANGE_SYMBOLS = {pkg_diff.ADDED: '+', pkg_diff.REMOVED: '-', pkg_diff.CHANGED: '~'}
+MAX_CONTENT_VALUE_LENGTH = 60
+
+def _format_content_value(value):
+    value = json_dumps(value)
+    if len(value) > MAX_CONTENT_VALUE_LENGTH:
+        value = value[:MAX_CONTENT_VALUE_LENGTH - 3] + '...'
+    return value
+
+def _format_content_changes(member_change):
+    if member_change.content_changes is None:
+        return None
+    lines = []
+    for content_change in member_change.content_changes:
+        if content_change.change == pkg_diff.ADDED:
+            detail = _format_content_value(content_change.new)
+        elif content_change.change == pkg_diff.REMOVED:
+            detail = _format_content_value(content_change.old)
+        else:
+            detail = '{0} -> {1}'.format(_format_content_value(content_change.old), _format_content_value(content_change.new))
+        lines.append('{0} {1}: {2}'.format(CONTENT_CHANGE_SYMBOLS[content_change.change], content_change.path or '(document)', detail))
+    return '\n'.join(lines)
+
+class PkgDiffTable(Table):
+
+    columns = [
+        Column('change', header='Change'),
+        Column('path', header='Member'),
+        Column('old_size', header='Old Size'),
+        Column('new_size', header='New Size'),
+        Column('content_changes', header='Content Changes', accessor=_format_content_changes)
+    ]
+
+diff_output_formats = common_output_format_handler(table=PkgDiffTable())
+
+
+@pkg.command(help='Compare the members of two packages by their digest, without extracting them. '
+                    'Changed descriptors, behaviour (JSON) and lmpkg.yml files are also compared by their content, listing each value added, removed or changed. '
+                    'Each package is read up to twice: once to hash its members (holding at most --concurrency members in memory) and again, only when '
+                    'descriptor, behaviour or lmpkg.yml files have changed, to compare them. The old version of all changed files being compared is held '
+                    'in memory at once, so memory use grows with their total size (files over 16MB are only compared by digest)')
+@click.argument('old_package', type=click.Path(exists=True, dir_okay=False))
+@click.argument('new_package', type=click.Path(exists=True, dir_okay=False))
+@click.option('--concurrency', type=click.IntRange(min=1), default=DEFAULT_MAX_WORKERS, show_default=True, help='maximum number of members hashed at the same time')
+@diff_output_formats.option()
+def diff(old_package, new_package, concurrency, output_format):
+    logger.debug('Comparing package {0} to {1}'.format(old_package, new_package))
+    try:
+        result = pkg_diff.diff_pkgs(old_package, new_package, max_workers=concurrency)
+    except pkgs.PackageError as e:
+        click.echo('Error: {0}'.format(str(e)), err=True)
+        exit(1)
+    output_formatter = diff_output_formats.resolve_choice(output_format)
+    if isinstance(output_formatter, TableFormat):
+        if result.has_changes:
+            click.echo(output_formatter.convert_list(result.changes))
+        click.echo('{0} added, {1} removed, {2} changed, {3} unchanged'.format(result.count(pkg_diff.ADDED), result.count(pkg_diff.REMOVED),
+                                                                                result.count(pkg_diff.CHANGED), result.unchanged))
+    else:
+        click.echo(output_formatter.convert_element(result.to_dict()))
+
 def cleanup_pkg(pkg):
     if os.path.exists(pkg.tree.root_path):
         shutil.rmtree(pkg.tree.root_path)
@@ -69,3 +224,22 @@ def exec_push(controller, pkg, env_sessions, allow_autocorrect=False):
     push_options.allow_autocorrect = allow_autocorrect
     push_options.journal_consumer = controller.consumer
     return controller.execute(pkg.push, env_sessions, push_options)
+
+def exec_push_to_environments(controller, pkg, pkg_content, env_sessions_by_name, allow_autocorrect=False, max_workers=DEFAULT_MAX_WORKERS):
+    push_options = pkgs.MultiPushOptions()
+    push_options.allow_autocorrect = allow_autocorrect
+    push_options.journal_consumer = controller.consumer
+    push_options.max_workers = max_workers
+    for environment_name in env_sessions_by_name.keys():
+        push_options.environment_journal_consumers[environment_name] = controller.environment_consumer(environment_name)
+    results = controller.execute(pkg.push_to_environments, env_sessions_by_name, push_options, pkg_content)
+    controller.close_environment_consumers()
+    lifecycle_cli.printer.print_section('Environments')
+    for result in results:
+        if result.failed:
+            detail = '{0}: {1}'.format(result.environment_name, result.error)
+            controller.include_failure(detail)
+            lifecycle_cli.printer.print_text('{0}: {1} ({2:.2f}s) - {3}'.format(result.environment_name, lifecycle_cli.FAILED, result.duration, result.error))
+        else:
+            lifecycle_cli.printer.print_text('{0}: {1} ({2:.2f}s)'.format(result.environment_name, lifecycle_cli.PASSED, result.duration))
+    return results
@@ -8,6 +8,8 @@ import lmctl.project.source.creator as creator
 import lmctl.project.types as project_types
 import lmctl.files as files
 from lmctl.cli.cmd_tags import project_tag
+from lmctl.cli.arguments import journal_out_option, profile_options
+from lmctl.utils.concurrency import DEFAULT_MAX_WORKERS
 
 
 logger = logging.getLogger(__name__)
@@ -62,20 +64,23 @@ def exec_test(controller, pkg_content, env_sessions, tests):
     controller.process_test_report(test_report)
 
 
-def exec_pull(controller, project, env_sessions):
+def exec_pull(controller, project, env_sessions, max_workers=DEFAULT_MAX_WORKERS):
     pull_options = project_sources.PullOptions()
     pull_options.journal_consumer = controller.consumer
+    pull_options.max_workers = max_workers
     controller.execute(project.pull, env_sessions, pull_options)
 
 
 @project.command(help='Validate sources of a Project')
 @click.option('--project', 'project_path', default='./', help='File location of project')
 @click.option('--autocorrect', default=False, is_flag=True, help='allow validation warnings and errors to be autocorrected if supported')
-def validate(project_path, autocorrect):
+@journal_out_option()
+@profile_options()
+def validate(project_path, autocorrect, journal_out, profile, profile_dump, profile_memory):
     """Validates an Assembly/Resource project"""
     logger.debug('Validating project at: {0}'.format(project_path))
     project = lifecycle_cli.open_project(project_path)
-    controller = lifecycle_cli.ExecutionController(VALIDATE_HEADER)
+    controller = lifecycle_cli.ExecutionController(VALIDATE_HEADER, journal_out=journal_out, profile=profile, profile_dump=profile_dump, profile_memory=profile_memory)
     controller.start('{0} at {1}'.format(project.config.name, project_path))
     exec_validate(controller, project, allow_autocorrect=autocorrect)
     controller.finalise()
@@ -84,11 +89,13 @@ def validate(project_path, autocorrect):
 @project.command(help='Build distributable package for Project')
 @click.option('--project', 'project_path',  default='./', help='File location of project')
 @click.option('--autocorrect', default=False, is_flag=True, help='allow validation warnings and errors to be autocorrected if supported')
-def build(project_path, autocorrect):
+@journal_out_option()
+@profile_options()
+def build(project_path, autocorrect, journal_out, profile, profile_dump, profile_memory):
     """Builds an Assembly/Resource project"""
     logger.debug('Building project at: {0}'.format(project_path))
     project = lifecycle_cli.open_project(project_path)
-    controller = lifecycle_cli.ExecutionController(BUILD_HEADER)
+    controller = lifecycle_cli.ExecutionController(BUILD_HEADER, journal_out=journal_out, profile=profile, profile_dump=profile_dump, profile_memory=profile_memory)
     controller.start('{0} at {1}'.format(project.config.name, project_path))
     exec_build(controller, project, allow_autocorrect=autocorrect)
     controller.finalise()
@@ -101,12 +108,14 @@ def build(project_path, autocorrect):
 @click.option('--armname', default='defaultrm', help='if using ansible-rm packaging the name of ARM to upload Resources must be provided')
 @click.option('--pwd', default=None, help='password used for authenticating with CP4NA orchestration (only required if CP4NA is secure and a username has been included in the environment config)')
 @click.option('--autocorrect', default=False, is_flag=True, help='allow validation warnings and errors to be autocorrected if supported')
-def push(project_path, environment, config, armname, pwd, autocorrect):
+@journal_out_option()
+@profile_options()
+def push(project_path, environment, config, armname, pwd, autocorrect, journal_out, profile, profile_dump, profile_memory):
     """Push an Assembly/Resource project"""
     logger.debug('Pushing project at: {0}'.format(project_path))
     project = lifecycle_cli.open_project(project_path)
     env_sessions = lifecycle_cli.build_sessions_for_project(project.config, environment, pwd, armname, config)
-    controller = lifecycle_cli.ExecutionController(PUSH_HEADER)
+    controller = lifecycle_cli.ExecutionController(PUSH_HEADER, journal_out=journal_out, profile=profile, profile_dump=profile_dump, profile_memory=profile_memory)
     controller.start('{0} at {1}'.format(project.config.name, project_path))
     build_result = exec_build(controller, project, allow_autocorrect=autocorrect)
     exec_push(controller, build_result.pkg, env_sessions)
@@ -127,12 +136,14 @@ def __parse_tests_option(tests):
 @click.option('--tests', default=None, help='specify comma separated list of individual tests to execute')
 @click.option('--pwd', default=None, help='password used for authenticating with CP4NA orchestration (only required if CP4NA orchestration is secure and a username has been included in the environment config)')
 @click.option('--autocorrect', default=False, is_flag=True, help='allow validation warnings and errors to be autocorrected if supported')
-def test(project_path, environment, config, armname, tests, pwd, autocorrect):
+@journal_out_option()
+@profile_options()
+def test(project_path, environment, config, armname, tests, pwd, autocorrect, journal_out, profile, profile_dump, profile_memory):
     """Builds, pushes and runs the tests of an Assembly/Resource project on a target CP4NA orchestration (and ARM) environment"""
     logger.debug('Testing project at: {0}'.format(project_path))
     project = lifecycle_cli.open_project(project_path)
     env_sessions = lifecycle_cli.build_sessions_for_project(project.config, environment, pwd, armname, config)
-    controller = lifecycle_cli.ExecutionController(TEST_HEADER)
+    controller = lifecycle_cli.ExecutionController(TEST_HEADER, journal_out=journal_out, profile=profile, profile_dump=profile_dump, profile_memory=profile_memory)
     controller.start('{0} at {1}'.format(project.config.name, project_path))
     build_result = exec_build(controller, project, allow_autocorrect=autocorrect)
     pkg_content = exec_push(controller, build_result.pkg, env_sessions)
@@ -145,14 +156,17 @@ def test(project_path, environment, config, armname, tests, pwd, autocorrect):
 @click.argument('environment', required=False, default=None)
 @click.option('--config', default=None, help='configuration file')
 @click.option('--pwd', default=None, help='password used for authenticating with CP4NA orchestration (only required if CP4NA orchestration is secure and a username has been included in the environment config, without a password)')
-def pull(project_path, environment, config, pwd):
+@click.option('--concurrency', type=click.IntRange(min=1), default=DEFAULT_MAX_WORKERS, show_default=True, help='maximum number of requests made at the same time to fetch the sources of all subprojects')
+@journal_out_option()
+@profile_options()
+def pull(project_path, environment, config, pwd, concurrency, journal_out, profile, profile_dump, profile_memory):
     """Pulls the content of a Assembly/Resource from a target CP4NA orchestration environment, overidding local content"""
     logger.debug('Pulling project at: {0}'.format(project_path))
     project = lifecycle_cli.open_project(project_path)
     env_sessions = lifecycle_cli.build_sessions_for_project(project.config, environment, pwd, None, config)
-    controller = lifecycle_cli.ExecutionController(PULL_HEADER)
+    controller = lifecycle_cli.ExecutionController(PULL_HEADER, journal_out=journal_out, profile=profile, profile_dump=profile_dump, profile_memory=profile_memory)
     controller.start('{0} at {1}'.format(project.config.name, project_path))
-    exec_pull(controller, project, env_sessions)
+    exec_pull(controller, project, env_sessions, max_workers=concurrency)
     controller.finalise()
 
 @project.command(help='List element(s) of a Project. Element options: tests')
@@ -202,7 +216,9 @@ def create(location, name, version, project_type, rm, contains, servicetype, vnf
     create_options.journal_consumer = lifecycle_cli.ConsoleProjectJournalConsumer(lifecycle_cli.printer)
     try:
         creator.ProjectCreator(project_request, create_options).create()
+        lifecycle_cli.printer.flush()
     except creator.CreateError as e:
+        lifecycle_cli.printer.flush()
         lifecycle_cli.printer.print_text('Error: {0}'.format(str(e)))
         logger.exception(str(e))
         exit(1)
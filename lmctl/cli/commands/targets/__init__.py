@@ -19,6 +19,7 @@ from .resources import Resource
 from .intents import Intents
 from .processes import Processes
 from .config import Configuration
+from .workflows import Workflows
 
 target_instances = [
     DeploymentLocations(), 
@@ -39,5 +40,6 @@ target_instances = [
     Resource(), 
     Intents(),
     Processes(),
-    Configuration()
+    Configuration(),
+    Workflows()
 ]
\ No newline at end of file
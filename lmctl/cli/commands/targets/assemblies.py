@@ -1,8 +1,10 @@
 import click
 from typing import Dict
-from lmctl.client import TNCOClient, TNCOClientHttpError, TNCOClientError
-from lmctl.cli.arguments import common_output_format_handler, default_file_inputs_handler, set_param_option
-from lmctl.cli.format import Table, Column
+from lmctl.client import TNCOClient, TNCOClientHttpError, TNCOClientError, AssemblyWatcher
+from lmctl.client.assembly_watch import DEFAULT_MIN_INTERVAL, DEFAULT_MAX_INTERVAL
+from lmctl.cli.arguments import common_output_format_handler, default_file_inputs_handler, set_param_option, output_format_handler
+from lmctl.cli.format import Table, Column, TableFormat, YamlFormat, NdjsonFormat
+from lmctl.cli.projection import Pushdown
 from .tnco_target import TNCOTarget, LmGet, LmCreate, LmUpdate, LmDelete, LmGen, LmCmd
 
 class AssemblyTable(Table):
@@ -14,7 +16,29 @@ class AssemblyTable(Table):
         Column('state', header='State')
     ]
 
+class AssemblyChangeTable(Table):
+
+    columns = [
+        Column('time', header='Time'),
+        Column('change', header='Change'),
+        Column('id', header='ID'),
+        Column('name', header='Name'),
+        Column('descriptor_name', header='Descriptor Name', accessor=lambda x: _show_change(x.previous_descriptor_name, x.descriptor_name)),
+        Column('state', header='State', accessor=lambda x: _show_change(x.previous_state, x.state))
+    ]
+
+def _show_change(previous: str, current: str) -> str:
+    if previous is None or previous == current:
+        return current
+    if current is None:
+        return previous
+    return f'{previous} -> {current}'
+
 output_formats = common_output_format_handler(table=AssemblyTable())
+watch_output_formats = output_format_handler()\
+                        .add_choice('table', TableFormat(table=AssemblyChangeTable()), is_default=True)\
+                        .add_choice('ndjson', NdjsonFormat())\
+                        .add_choice('yaml', YamlFormat())
 file_inputs = default_file_inputs_handler()
 
 class Assemblies(TNCOTarget):
@@ -33,11 +57,12 @@ class Assemblies(TNCOTarget):
             }
         }
 
-    @LmGet(output_formats=output_formats, help=f'''\
+    @LmGet(output_formats=output_formats, filter_pushdown=[Pushdown('name', 'name_contains', contains=True, skip_when=['name', 'id', 'topn'])], help=f'''\
                                             Get an {display_name} by ID or name. Alternatively, get a list of most recent or by partial name match\
                                             \n\nUse NAME argument to get by name\
                                             \n\nOmit NAME argument and use --topN option to get recent\
-                                            \n\nOmit NAME argument and use --name-contains option to get by partial name match''')
+                                            \n\nOmit NAME argument and use --name-contains option to get by partial name match\
+                                            \n\nA --filter comparing the name (e.g. "name~^edge-") is used as --name-contains when no other option is given''')
     @click.argument('name', required=False)
     @click.option('--id', help='Get by ID')
     @click.option('--name-contains', help='Partial name search string')
@@ -67,6 +92,42 @@ class Assemblies(TNCOTarget):
         else:
             raise click.BadArgumentUsage('Must set either "NAME" argument or "--id" option or "--name-contains" option or "--topN" option', ctx=ctx)
 
+    @LmCmd(short_help=f'Stream changes to {display_name}s',
+            help=f'''\
+                Poll the most recently changed {display_name}s (--topN) or those with a name containing a search string (--name-contains) 
+                and print only those added, removed or changed (state or descriptorName) since the last poll\
+                \n\nThe poll interval starts at --interval, grows while nothing changes (up to --max-interval) and resets when something does.
+                Transient errors from a poll (such as a lost connection or a 5xx response) are reported and polling continues, backing off as if nothing changed.
+                Use ndjson output to print one JSON object per change. Stop with Ctrl+C''')
+    @click.option('--name-contains', help='Partial name search string')
+    @click.option('--topN', is_flag=True, help=f'Watch {display_name} instances that have recently changed')
+    @click.option('--interval', type=click.FloatRange(min=0.1), default=DEFAULT_MIN_INTERVAL, show_default=True, help='Seconds between polls while changes are being found')
+    @click.option('--max-interval', type=click.FloatRange(min=0.1), default=DEFAULT_MAX_INTERVAL, show_default=True, help='Maximum seconds between polls while nothing changes')
+    @click.option('--skip-existing', is_flag=True, help=f'Do not print the {display_name}s found by the first poll')
+    @watch_output_formats.option()
+    def watch(self, tnco_client: TNCOClient, ctx: click.Context, name_contains: str = None, topn: bool = False, interval: float = DEFAULT_MIN_INTERVAL,
+                max_interval: float = DEFAULT_MAX_INTERVAL, skip_existing: bool = False, output_format: str = None):
+        if name_contains is not None and topn is True:
+            raise click.BadArgumentUsage('Do not use "--name-contains" option when using the "--topN" option', ctx=ctx)
+        if name_contains is None and topn is False:
+            raise click.BadArgumentUsage('Must set either "--name-contains" option or "--topN" option', ctx=ctx)
+        if max_interval < interval:
+            raise click.BadArgumentUsage('"--max-interval" must not be less than "--interval"', ctx=ctx)
+        ctl = self._get_controller()
+        output_formatter = watch_output_formats.resolve_choice(output_format)
+        watcher = AssemblyWatcher(tnco_client.assemblies, name_contains=name_contains, min_interval=interval, max_interval=max_interval)
+        try:
+            def report_error(error, retry_interval):
+                ctl.io.print_error(f'TNCO error occurred polling {self.plural} (retrying in {retry_interval:g}s): {error}')
+            for changes in watcher.watch(include_existing=(skip_existing is False), on_error=report_error):
+                if isinstance(output_formatter, YamlFormat):
+                    # One document per change, so the stream can be read as it arrives
+                    ctl.io.print('\n'.join('---\n' + output_formatter.convert_element(change).rstrip('\n') for change in changes))
+                else:
+                    ctl.io.print(output_formatter.convert_list(changes))
+        except KeyboardInterrupt:
+            pass
+
     @LmCreate(short_help=f'Request an intent to create an {display_name}', 
                     help=f'''\
                         Request an intent to create an {display_name}. The request can include the following parameters (either with --set or in a file with -f):
@@ -1,7 +1,9 @@
 import click
-from typing import Dict
+from typing import Dict, List
 from lmctl.client import TNCOClient, TNCOClientHttpError
-from lmctl.cli.arguments import common_output_format_handler
+from lmctl.client import execution_metrics
+from lmctl.utils.concurrency import DEFAULT_MAX_WORKERS
+from lmctl.cli.arguments import common_output_format_handler, analysis_output_format_handler
 from lmctl.cli.format import Table, Column
 from .tnco_target import TNCOTarget, LmGet, LmCreate, LmUpdate, LmDelete, LmCmd
 #, accessor=lambda x: x.get('scenarioSummary').get('name') if 'scenarioSummary' in x else None),
@@ -15,7 +17,34 @@ class ScenarioExecutionTable(Table):
         Column('status', header='Status')
     ]
 
+class MetricSummaryTable(Table):
+
+    columns = [
+        Column('name', header='Metric'),
+        Column('executions', header='Executions'),
+        Column('count', header='Count'),
+        Column('mean', header='Mean'),
+        Column('min', header='Min'),
+        Column('p50', header='P50'),
+        Column('p90', header='P90'),
+        Column('p99', header='P99'),
+        Column('max', header='Max'),
+        Column('rate', header='Rate (/s)')
+    ]
+
+class MetricBucketTable(Table):
+
+    columns = [
+        Column('name', header='Metric'),
+        Column('offset', header='Offset (s)'),
+        Column('count', header='Count'),
+        Column('mean', header='Mean'),
+        Column('rate', header='Rate (/s)')
+    ]
+
 output_formats = common_output_format_handler(table=ScenarioExecutionTable())
+summary_output_formats = analysis_output_format_handler(MetricSummaryTable())
+bucket_output_formats = analysis_output_format_handler(MetricBucketTable())
 
 class ScenarioExecutions(TNCOTarget):
     name = 'scenarioexecution'
@@ -86,4 +115,51 @@ class ScenarioExecutions(TNCOTarget):
                     ctl.io.print(f'No {self.display_name} found with ID {scenario_exec_id} (ignoring)')
                     return
             raise
-        return scenario_exec_id
\ No newline at end of file
+        return scenario_exec_id
+
+    @LmCmd(short_help=f'Summarise the metrics of {display_name}s', 
+            help=f'''\
+                    Summarise the metrics of many {display_name}s, fetched concurrently\
+                    \n\nUse ID arguments to analyze particular executions, or the "--scenario" or "--project" option to analyze all of a Behaviour Scenario or Project\
+                    \n\nThe count, mean, min, percentiles (nearest-rank), max and rate of the samples of each metric are shown, 
+                    or with "--bucket" the count, mean and rate in each time bucket. NumPy is used for the calculations when installed (pip install lmctl[analysis])\
+                    \n\nEach metric must have a "name" and a list of "samples", each with a numeric "value" and an ISO 8601 "timestamp". 
+                    Executions whose metrics cannot be fetched are reported after the summary of the others''')
+    @click.argument('IDS', nargs=-1)
+    @click.option('--project', help=f'ID of a project to analyze all {display_name}s from')
+    @click.option('--scenario', help=f'ID of a scenario to analyze all {display_name}s of')
+    @click.option('--bucket', 'bucket_seconds', type=click.FloatRange(min=0.001), help='Summarise the samples in time buckets of this number of seconds')
+    @click.option('--concurrency', type=click.IntRange(min=1), default=DEFAULT_MAX_WORKERS, show_default=True, help='Maximum number of metric requests made at the same time')
+    @summary_output_formats.option()
+    def analyze(self, tnco_client: TNCOClient, ctx: click.Context, ids: List[str] = None, project: str = None, scenario: str = None, bucket_seconds: float = None, 
+                    concurrency: int = DEFAULT_MAX_WORKERS, output_format: str = None):
+        api = tnco_client.behaviour_scenario_execs
+        ids = list(ids or [])
+        if len([x for x in [len(ids) > 0, project is not None, scenario is not None] if x]) != 1:
+            raise click.BadArgumentUsage('Must set one of "IDS" arguments, "--project" option or "--scenario" option', ctx=ctx)
+        if project is not None:
+            ids = [e.get('id') for e in api.all_in_project(project)]
+        elif scenario is not None:
+            ids = [e.get('id') for e in api.all_of_scenario(scenario)]
+        # Executions whose metrics could not be fetched are reported after the summary of the others
+        metrics_by_execution = {}
+        failed = []
+        for task in api.get_metrics_of_executions(ids, max_workers=concurrency):
+            if task.failed:
+                failed.append(task)
+            else:
+                metrics_by_execution[task.item] = task.value
+        samples = execution_metrics.collect_samples(metrics_by_execution)
+        if bucket_seconds is not None:
+            output_formatter = bucket_output_formats.resolve_choice(output_format)
+            result = execution_metrics.bucket(samples, bucket_seconds)
+        else:
+            output_formatter = summary_output_formats.resolve_choice(output_format)
+            result = execution_metrics.summarise(samples)
+        ctl = self._get_controller()
+        ctl.io.print(output_formatter.convert_list(result))
+        for task in failed:
+            ctl.io.print_error(f'TNCO error occurred getting metrics of {self.display_name} "{task.item}": {task.error}')
+        if len(failed) > 0:
+            ctl.io.print_error(f'Summarised {len(metrics_by_execution)} of {len(metrics_by_execution) + len(failed)} {self.display_name}(s), {len(failed)} failed')
+            exit(1)
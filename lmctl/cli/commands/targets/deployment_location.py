@@ -1,9 +1,13 @@
+import os
 import click
-from typing import Dict
+import yaml
+from typing import Dict, List
 from lmctl.client import TNCOClient, TNCOClientHttpError
-from lmctl.cli.arguments import common_output_format_handler
-from lmctl.cli.format import Table, Column
-from .tnco_target import TNCOTarget, LmGet, LmCreate, LmUpdate, LmDelete, LmGen
+from lmctl.files import safe_file_name
+from lmctl.utils.concurrency import DEFAULT_MAX_WORKERS
+from lmctl.cli.arguments import common_output_format_handler, default_output_format_handler
+from lmctl.cli.format import Table, Column, TableFormat
+from .tnco_target import TNCOTarget, LmGet, LmCreate, LmUpdate, LmDelete, LmGen, LmCmd
 
 class DeploymentLocationTable(Table):
     
@@ -14,7 +18,22 @@ class DeploymentLocationTable(Table):
         Column('description', header='Description')
     ]
 
+class DeploymentLocationPlanTable(Table):
+
+    columns = [
+        Column('name', header='Name'),
+        Column('action', header='Action')
+    ]
+
+class DeploymentLocationChangeTable(Table):
+
+    columns = DeploymentLocationPlanTable.columns + [
+        Column('result', header='Result', accessor=lambda x: f'Failed: {x.error}' if x.failed else 'OK')
+    ]
+
 output_formats = common_output_format_handler(table=DeploymentLocationTable())
+export_output_formats = default_output_format_handler()
+LOCATION_FILE_EXTENSIONS = ['.yaml', '.yml', '.json']
     
 class DeploymentLocations(TNCOTarget):
     name = 'deploymentlocation'
@@ -105,4 +124,76 @@ class DeploymentLocations(TNCOTarget):
                     ctl.io.print(f'No {self.display_name} found with name {deployment_location_id} (ignoring)')
                     return
             raise
-        return deployment_location_id
\ No newline at end of file
+        return deployment_location_id
+
+    @LmCmd(short_help=f'Export all {display_name}s to files', 
+            help=f'''\
+                    Export all {display_name}s to files in a directory, one per location named after it (numbered when names give the same file name)\
+                    \n\nThe files may be used with "apply" to copy the locations to another environment''')
+    @click.option('-d', '--directory', required=True, type=click.Path(file_okay=False), help='Directory to write the files to (created if it does not exist)')
+    @export_output_formats.option()
+    def export(self, tnco_client: TNCOClient, ctx: click.Context, directory: str, output_format: str):
+        api = tnco_client.deployment_locations
+        output_formatter = export_output_formats.resolve_choice(output_format)
+        locations = api.export_all()
+        os.makedirs(directory, exist_ok=True)
+        # Different names may have the same safe file name (or differ only by case), so number the repeats to keep every location
+        used_file_names = set()
+        for location in locations:
+            base_name = safe_file_name(location.get('name'))
+            file_name = f'{base_name}.{output_format}'
+            repeat = 1
+            while file_name.lower() in used_file_names:
+                repeat += 1
+                file_name = f'{base_name}-{repeat}.{output_format}'
+            used_file_names.add(file_name.lower())
+            file_path = os.path.join(directory, file_name)
+            with open(file_path, 'w') as f:
+                f.write(output_formatter.convert_element(location))
+        return f'Exported {len(locations)} {self.display_name}(s) to {directory}'
+
+    @LmCmd(short_help=f'Create or update {display_name}s from files', 
+            help=f'''\
+                    Create or update {display_name}s to match the files (YAML or JSON, one location per file) in a directory\
+                    \n\nAll locations are fetched once and only those that are new or differ from the files are created or updated, 
+                    several at a time. Locations that exist only on the server are left untouched''')
+    @click.option('-d', '--directory', required=True, type=click.Path(exists=True, file_okay=False), help='Directory of files to apply')
+    @click.option('--concurrency', type=click.IntRange(min=1), default=DEFAULT_MAX_WORKERS, show_default=True, help='Maximum number of locations created or updated at the same time')
+    @click.option('--dry-run', is_flag=True, help='Only report the changes that would be made')
+    def apply(self, tnco_client: TNCOClient, ctx: click.Context, directory: str, concurrency: int = DEFAULT_MAX_WORKERS, dry_run: bool = False):
+        api = tnco_client.deployment_locations
+        ctl = self._get_controller()
+        locations = self._read_location_files(directory)
+        changes = api.apply_all(locations, max_workers=concurrency, dry_run=dry_run)
+        table = DeploymentLocationPlanTable() if dry_run else DeploymentLocationChangeTable()
+        ctl.io.print(TableFormat(table=table).convert_list(changes))
+        counts = {}
+        for change in changes:
+            counts[change.action] = counts.get(change.action, 0) + 1
+        failures = len([c for c in changes if c.failed])
+        summary = ', '.join(f'{count} {action}' for action, count in counts.items())
+        if dry_run:
+            ctl.io.print(f'Dry run, no changes made: {summary}')
+        else:
+            ctl.io.print(f'Applied {len(changes)} {self.display_name}(s): {summary}, {failures} failed')
+        if failures > 0:
+            exit(1)
+
+    def _read_location_files(self, directory: str) -> List[Dict]:
+        locations = []
+        names = {}
+        for file_name in sorted(os.listdir(directory)):
+            if os.path.splitext(file_name)[1].lower() not in LOCATION_FILE_EXTENSIONS:
+                continue
+            with open(os.path.join(directory, file_name), 'r') as f:
+                try:
+                    location = yaml.safe_load(f)
+                except yaml.YAMLError as e:
+                    raise click.BadParameter(f'Could not parse {file_name}: {e}', param_hint='--directory')
+            if not isinstance(location, dict) or location.get('name', None) is None:
+                raise click.BadParameter(f'{file_name} does not contain a {self.display_name} with a "name" attribute', param_hint='--directory')
+            if location['name'] in names:
+                raise click.BadParameter(f'{file_name} and {names[location["name"]]} both contain a {self.display_name} named {location["name"]}', param_hint='--directory')
+            names[location['name']] = file_name
+            locations.append(location)
+        return locations
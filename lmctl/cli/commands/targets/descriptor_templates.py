@@ -1,8 +1,14 @@
+import os
+import re
+import json
 import click
-from typing import Dict
-from lmctl.client import TNCOClient, TNCOClientHttpError
+from typing import Callable, Dict, Iterator
+from lmctl.client import TNCOClient, TNCOClientHttpError, LocalTemplateRenderer
+from lmctl.client.api import BatchRenderItem
+from lmctl.utils.concurrency import DEFAULT_MAX_WORKERS
 from lmctl.cli.arguments import common_output_format_handler, default_file_inputs_handler, default_output_format_handler, set_param_option
 from lmctl.cli.format import Table, Column
+from lmctl.cli.io import IOController
 from .tnco_target import TNCOTarget, LmGet, LmCreate, LmUpdate, LmDelete, LmCmd, LmGen
 
 class DescriptorTemplatesTable(Table):
@@ -31,14 +37,15 @@ class DescriptorTemplates(TNCOTarget):
             'template': 'name: assembly::{{ injected_prop }}::1.0',
         }
 
-    @LmCmd(short_help=f'Render a {display_name} and view the output', 
+    @LmCmd(lazy_tnco_client=True, short_help=f'Render a {display_name} and view the output', 
                 help=f'''\
                         Render a {display_name} and view the output
                         \n\nNote: the file passed to "-f, --file" only identifies the template, that should exist on the server, to be rendered. It does not represent the literal template to be rendered 
+                        (unless "--local" is used)
                       ''')
     @click.argument('name', required=False)
     @render_output_formats.option()
-    @file_inputs.option(var_name='template_file_content', help='Path to file with the name of the template to be rendered')
+    @file_inputs.option(var_name='template_file_content', help='Path to file with the name of the template to be rendered (or the full template, when using "--local")')
     @file_inputs.option(var_name='request_file_content', options=['-r', '--request-file'], help='Path to file with properties to be used on the render request')
     @set_param_option()
     @set_param_option(options=['--prop'], var_name='prop_values', help='Directly set a property passed to the render request')
@@ -47,16 +54,47 @@ class DescriptorTemplates(TNCOTarget):
                             instead passing the output back unchecked. This is useful for debugging normal render requests 
                             of a template which produce output that cannot be parsed as YAML
                             NOTE: when this option is enabled, the value of "-o" is ignored as the output must be in plain text''')
-    def render(self, tnco_client: TNCOClient, ctx: click.Context, output_format: str, name: str = None, raw: bool = False, set_values: Dict = None, prop_values: Dict = None, template_file_content: Dict = None, request_file_content: Dict = None):
-        api = tnco_client.descriptor_templates
-        if template_file_content is not None:
+    @click.option('--batch', 'batch_file', type=click.Path(exists=True, dir_okay=False), help='''\
+                            Path to a file of render requests, one JSON object per line, each with a "template" name (defaults to NAME), 
+                            an optional "id" and the render request (e.g. "properties"). The requests are rendered concurrently and 
+                            identical requests are only rendered once (the last 1024 results are kept for repeats later in the file). Results are written as JSON lines, unless "--output-dir" is set''')
+    @click.option('--output-dir', type=click.Path(file_okay=False), help='Write the result of each request in "--batch" to a file named after its id in this directory (numbered when ids give the same file name)')
+    @click.option('--concurrency', type=click.IntRange(min=1), default=DEFAULT_MAX_WORKERS, show_default=True, help='Maximum number of render requests made at the same time (when using "--batch")')
+    @click.option('--local', is_flag=True, help='''\
+                            Render the template from "-f, --file" in this process, without the template engine on the server. 
+                            Useful for previewing changes to a template or rendering large batches quickly''')
+    @click.option('--verify-sample', type=click.IntRange(min=0), default=0, help='''\
+                            When using "--local", also render this number of requests on the server and fail if the output differs 
+                            (the template on the server should match the local file)''')
+    def render(self, get_tnco_client: Callable[[], TNCOClient], ctx: click.Context, output_format: str, name: str = None, raw: bool = False, set_values: Dict = None, prop_values: Dict = None, template_file_content: Dict = None, request_file_content: Dict = None,
+                    batch_file: str = None, output_dir: str = None, concurrency: int = DEFAULT_MAX_WORKERS, local: bool = False, verify_sample: int = 0):
+        if verify_sample > 0 and not local:
+            raise click.BadArgumentUsage(message='Only use "--verify-sample" option with "--local" option', ctx=ctx)
+        local_template = None
+        if local:
+            if template_file_content is None:
+                raise click.BadArgumentUsage(message='Must set "-f, --file" option with the template to render when using "--local" option', ctx=ctx)
             if name is not None:
-                raise click.BadArgumentUsage(message='Do not use "NAME" argument when using "-f, --file" option', ctx=ctx)
-            name = template_file_content.get('name', None)
+                raise click.BadArgumentUsage(message='Do not use "NAME" argument when using "--local" option', ctx=ctx)
+            local_template = template_file_content
+            name = local_template.get('name', None)
             if name is None:
                 raise click.BadArgumentUsage(message='Object from file does not contain a "name" attribute', ctx=ctx)
-        elif name is None:
-            raise click.BadArgumentUsage(message='Must set "NAME" argument when no "-f, --file" option specified', ctx=ctx)
+        if batch_file is not None:
+            if (template_file_content is not None and not local) or request_file_content is not None or set_values or prop_values:
+                raise click.BadArgumentUsage(message='Do not use "-f, --file" (unless "--local"), "-r, --request-file", "--set" or "--prop" options when using "--batch" option', ctx=ctx)
+            return self._render_batch(get_tnco_client, batch_file, name, raw, output_format, output_dir, concurrency, local_template=local_template, verify_sample=verify_sample)
+        elif output_dir is not None:
+            raise click.BadArgumentUsage(message='Only use "--output-dir" option with "--batch" option', ctx=ctx)
+        if local_template is None:
+            if template_file_content is not None:
+                if name is not None:
+                    raise click.BadArgumentUsage(message='Do not use "NAME" argument when using "-f, --file" option', ctx=ctx)
+                name = template_file_content.get('name', None)
+                if name is None:
+                    raise click.BadArgumentUsage(message='Object from file does not contain a "name" attribute', ctx=ctx)
+            elif name is None:
+                raise click.BadArgumentUsage(message='Must set "NAME" argument when no "-f, --file" option specified', ctx=ctx)
         if request_file_content is not None and len(request_file_content) > 0:
             if set_values is not None and len(set_values) > 0:
                 raise click.BadArgumentUsage(message='Do not use "--set" option when using "-r, --request-file" option', ctx=ctx)
@@ -71,14 +109,97 @@ class DescriptorTemplates(TNCOTarget):
                 render_request['properties'] = {}
             if prop_values is not None:
                 render_request['properties'].update(prop_values)
-        ctl = self._get_controller()
-        if raw: 
-            result = api.render_raw(template_name=name, render_request=render_request)
-            ctl.io.print(result)
+        io = IOController.get()
+        if local_template is not None:
+            renderer = LocalTemplateRenderer()
+            result = renderer.render_raw(local_template, render_request) if raw else renderer.render(local_template, render_request)
+        elif raw:
+            result = get_tnco_client().descriptor_templates.render_raw(template_name=name, render_request=render_request)
+        else:
+            result = get_tnco_client().descriptor_templates.render(template_name=name, render_request=render_request)
+        if raw:
+            io.print(result)
         else:
-            result = api.render(template_name=name, render_request=render_request)   
             output_formatter = output_formats.resolve_choice(output_format)
-            ctl.io.print(output_formatter.convert_element(result))
+            io.print(output_formatter.convert_element(result))
+        if verify_sample > 0 and not self._matches_server_render(get_tnco_client().descriptor_templates, BatchRenderItem(name, render_request), raw, result):
+            exit(1)
+
+    def _matches_server_render(self, api, item: BatchRenderItem, raw: bool, local_result) -> bool:
+        if raw:
+            server_result = api.render_raw(template_name=item.template_name, render_request=item.render_request)
+        else:
+            server_result = api.render(template_name=item.template_name, render_request=item.render_request)
+        if server_result != local_result:
+            IOController.get().print_error(f'Local render of {item.request_id or item.template_name} differs from the server render')
+            return False
+        return True
+
+    def _read_batch_items(self, batch_file: str, default_template_name: str = None) -> Iterator[BatchRenderItem]:
+        with open(batch_file, 'r') as f:
+            for line_number, line in enumerate(f, start=1):
+                if len(line.strip()) == 0:
+                    continue
+                try:
+                    yield BatchRenderItem.from_dict(json.loads(line), default_template_name=default_template_name, default_request_id=str(line_number))
+                except ValueError as e:
+                    raise click.BadParameter(f'Line {line_number} of {batch_file} is not a valid render request: {e}', param_hint='--batch')
+
+    def _render_batch(self, get_tnco_client: Callable[[], TNCOClient], batch_file: str, default_template_name: str, raw: bool, output_format: str, output_dir: str, concurrency: int,
+                            local_template: Dict = None, verify_sample: int = 0):
+        io = IOController.get()
+        output_formatter = render_output_formats.resolve_choice(output_format)
+        extension = 'txt' if raw else output_format
+        if output_dir is not None:
+            os.makedirs(output_dir, exist_ok=True)
+        # Ids may repeat or have the same safe file name (or differ only by case), so number the repeats to keep every result
+        used_file_names = set()
+        rendered = 0
+        failures = 0
+        duplicates = 0
+        mismatches = 0
+        items = self._read_batch_items(batch_file, default_template_name=default_template_name)
+        if local_template is not None:
+            batch_results = LocalTemplateRenderer().render_batch({local_template.get('name'): local_template}, items, raw=raw)
+        else:
+            batch_results = get_tnco_client().descriptor_templates.render_batch(items, raw=raw, max_workers=concurrency)
+        for batch_result in batch_results:
+            item = batch_result.item
+            if verify_sample > 0 and not batch_result.failed and not batch_result.duplicate:
+                verify_sample -= 1
+                if not self._matches_server_render(get_tnco_client().descriptor_templates, item, raw, batch_result.result):
+                    mismatches += 1
+            if batch_result.duplicate:
+                duplicates += 1
+            if batch_result.failed:
+                failures += 1
+            else:
+                rendered += 1
+            if output_dir is None:
+                line = {'id': item.request_id, 'template': item.template_name}
+                if batch_result.failed:
+                    line['error'] = str(batch_result.error)
+                else:
+                    line['result'] = batch_result.result
+                io.print(json.dumps(line, default=str))
+            elif batch_result.failed:
+                io.print_error(f'Failed to render {item.request_id} ({item.template_name}): {batch_result.error}')
+            else:
+                output = batch_result.result if raw else output_formatter.convert_element(batch_result.result)
+                base_name = re.sub(r'[^A-Za-z0-9_.\-]', '_', item.request_id)
+                file_name = f'{base_name}.{extension}'
+                repeat = 1
+                while file_name.lower() in used_file_names:
+                    repeat += 1
+                    file_name = f'{base_name}-{repeat}.{extension}'
+                used_file_names.add(file_name.lower())
+                file_path = os.path.join(output_dir, file_name)
+                with open(file_path, 'w') as f:
+                    f.write(output)
+        if output_dir is not None:
+            io.print(f'Rendered {rendered} request(s) to {output_dir} ({duplicates} duplicate(s), {failures} failure(s))')
+        if failures > 0 or mismatches > 0:
+            exit(1)
 
     @LmGet(output_formats=output_formats, help=f'''\
                                             Get a summary of all {display_name}s or get the details of one by name\
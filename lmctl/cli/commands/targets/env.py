@@ -1,12 +1,13 @@
 import click
 from .target import Target
-from lmctl.client import TNCOClientError
+from lmctl.client import TNCOClientError, TestResult
 from lmctl.cli.io import IOController
 from lmctl.cli.format import Table, Column, TableFormat
-from lmctl.cli.arguments import common_output_format_handler, tnco_client_secret_option, tnco_pwd_option
+from lmctl.cli.arguments import common_output_format_handler, tnco_client_secret_option, tnco_pwd_option, all_environments_option
 from lmctl.cli.safety_net import safety_net
 from lmctl.environment import EnvironmentGroup
 from lmctl.config import ConfigError, get_config_with_path, write_config
+from lmctl.utils.concurrency import DEFAULT_MAX_WORKERS, run_concurrently
 
 def build_arms_string(env_group: EnvironmentGroup):
     arms = env_group.arms
@@ -19,13 +20,52 @@ def build_arms_string(env_group: EnvironmentGroup):
             arms_str += '{0} - {1}'.format(arm_name, arm_env.address)
     return arms_str
 
+def format_duration(duration: float):
+    if duration is None:
+        return None
+    return round(duration * 1000, 2)
+
 class PingTable(Table):
     columns = [
         Column('name', header='Test Name'),
         Column('result', header='Result', accessor=lambda x: 'OK' if x.passed else 'Failed'),
+        Column('duration', header='Time (ms)', accessor=lambda x: format_duration(x.duration)),
+        Column('error', header='Error')
+    ]
+
+class PingBenchmarkTable(Table):
+    columns = [
+        Column('name', header='API Group'),
+        Column('count', header='Requests'),
+        Column('failures', header='Failures'),
+        Column('p50', header='p50 (ms)'),
+        Column('p95', header='p95 (ms)'),
+        Column('p99', header='p99 (ms)'),
+        Column('max', header='Max (ms)'),
+        Column('throughput', header='Req/s')
+    ]
+
+class EnvironmentsPingTable(Table):
+    columns = [
+        Column('environment', header='Environment'),
+        Column('name', header='Test Name'),
+        Column('result', header='Result'),
+        Column('duration', header='Time (ms)'),
         Column('error', header='Error')
     ]
 
+def test_result_row(test: TestResult) -> dict:
+    return {
+        'name': test.name, 
+        'result': 'OK' if test.passed else 'Failed', 
+        'duration': format_duration(test.duration), 
+        'error': str(test.error) if test.error is not None else None
+    }
+
+ping_output_formats = common_output_format_handler(table=PingTable())
+benchmark_output_formats = common_output_format_handler(table=PingBenchmarkTable())
+environments_ping_output_formats = common_output_format_handler(table=EnvironmentsPingTable())
+
 class EnvironmentTable(Table):
     
     columns = [
@@ -75,32 +115,104 @@ class Environments(Target):
     def ping(self):
         @click.command(help=f'''\
                     Test connection with {self.display_name} from active config file
-                    \n\nConnection is tested by making requests to a few pre-selected APIs on the configured CP4NA orchestration''')
+                    \n\nConnection is tested by making requests to a few pre-selected APIs on the configured CP4NA orchestration\
+                    \n\nUse a comma separated list of names for NAME, or the --all-environments option, to test several environments at the same time''')
         @click.argument('name', required=False)
+        @all_environments_option()
         @tnco_client_secret_option()
         @tnco_pwd_option()
         @click.option('--include-template-engine', '--include-kami', 'include_template_engine', is_flag=True, help='Include tests for connection to Kami, an optional demo component')
+        @click.option('--repeat', type=click.IntRange(min=1), default=None, help='Benchmark the environment by repeating each test this number of times, reporting latency percentiles and throughput of each API group (and authentication, if secure)')
+        @click.option('--concurrency', type=click.IntRange(min=1), default=DEFAULT_MAX_WORKERS, show_default=True, help='Maximum number of requests made at the same time')
+        @ping_output_formats.option()
         @click.pass_context
-        def _ping(ctx: click.Context, name: str = None, pwd: str = None, client_secret: str = None, include_template_engine: bool = False):
+        def _ping(ctx: click.Context, name: str = None, all_environments: bool = False, pwd: str = None, client_secret: str = None, include_template_engine: bool = False, 
+                    repeat: int = None, concurrency: int = DEFAULT_MAX_WORKERS, output_format: str = None):
             ctl = self._get_controller()
+            if all_environments and name is not None:
+                raise click.BadArgumentUsage('Do not use "NAME" argument when using the "--all-environments" option', ctx=ctx)
+            names = ctl.resolve_environment_names(name, all_environments=all_environments)
+            if all_environments or len(names) > 1:
+                if repeat is not None:
+                    raise click.BadArgumentUsage('Do not use "--repeat" option when pinging more than one environment', ctx=ctx)
+                self._ping_environments(ctl, names, pwd, client_secret, include_template_engine, concurrency, output_format)
+                return
             env = ctl.get_environment_group(name)
             happy_exit = True
+            if repeat is not None:
+                if not env.has_tnco:
+                    ctl.io.print_error('No CP4NA orchestration configured, nothing to benchmark')
+                    exit(1)
+                self._benchmark(ctl, name, pwd, client_secret, include_template_engine, repeat, concurrency, output_format)
+                return
+            output_formatter = ping_output_formats.resolve_choice(output_format)
+            table_selected = isinstance(output_formatter, TableFormat)
             if env.has_tnco:
                 tnco_client = ctl.get_tnco_client(environment_group_name=name, input_pwd=pwd, input_client_secret=client_secret)
-                ctl.io.print(f'Pinging CP4NA orchestration: {env.tnco.address}')
-                tnco_ping_result = tnco_client.ping(include_template_engine=include_template_engine)
-                ctl.io.print(TableFormat(table=PingTable()).convert_list(tnco_ping_result.tests))
+                if table_selected:
+                    ctl.io.print(f'Pinging CP4NA orchestration: {env.tnco.address}')
+                tnco_ping_result = tnco_client.ping(include_template_engine=include_template_engine, max_workers=concurrency)
+                if table_selected:
+                    ctl.io.print(output_formatter.convert_list(tnco_ping_result.tests))
+                else:
+                    ctl.io.print(output_formatter.convert_list([test_result_row(test) for test in tnco_ping_result.tests]))
                 if tnco_ping_result.passed:
-                    ctl.io.print(f'CP4NA orchestration tests passed! ✅')
+                    if table_selected:
+                        ctl.io.print(f'CP4NA orchestration tests passed! ✅')
                 else:
                     ctl.io.print_error(f'CP4NA orchestration tests failed! ❌')
                     happy_exit = False
-            else:
+            elif table_selected:
                 ctl.io.print('No CP4NA orchestration configured (skipping)')
+            else:
+                ctl.io.print(output_formatter.convert_list([]))
             if not happy_exit:
                 exit(1)
         return _ping
 
+    def _ping_environments(self, ctl, names: list, pwd: str, client_secret: str, include_template_engine: bool, concurrency: int, output_format: str):
+        output_formatter = environments_ping_output_formats.resolve_choice(output_format)
+        table_selected = isinstance(output_formatter, TableFormat)
+        tnco_names = []
+        for name in names:
+            if ctl.get_environment_group(name).has_tnco:
+                tnco_names.append(name)
+            elif table_selected:
+                ctl.io.print(f'No CP4NA orchestration configured on {name} (skipping)')
+        tnco_clients = ctl.get_tnco_clients(tnco_names, input_pwd=pwd, input_client_secret=client_secret)
+        def ping_environment(name: str):
+            return tnco_clients[name].ping(include_template_engine=include_template_engine, max_workers=concurrency)
+        rows = []
+        failed_names = []
+        # Each environment is pinged at the same time, an error reaching one is reported as a failed test rather than stopping the others
+        for task in run_concurrently(ping_environment, tnco_names, catchable_exceptions=(TNCOClientError,)):
+            tests = [TestResult(name='Connection', error=task.error, duration=task.duration)] if task.failed else task.value.tests
+            for test in tests:
+                rows.append({'environment': task.item, **test_result_row(test)})
+            if task.failed or not task.value.passed:
+                failed_names.append(task.item)
+        ctl.io.print(output_formatter.convert_list(rows))
+        if len(failed_names) > 0:
+            ctl.io.print_error(f'CP4NA orchestration tests failed on: {", ".join(failed_names)} ❌')
+            exit(1)
+        elif table_selected:
+            ctl.io.print(f'CP4NA orchestration tests passed on {len(tnco_names)} environment(s)! ✅')
+
+    def _benchmark(self, ctl, name: str, pwd: str, client_secret: str, include_template_engine: bool, repeat: int, concurrency: int, output_format: str):
+        output_formatter = benchmark_output_formats.resolve_choice(output_format)
+        tnco_client = ctl.get_tnco_client(environment_group_name=name, input_pwd=pwd, input_client_secret=client_secret)
+        with ctl.tnco_client_safety_net():
+            # Authenticate before timing so the first round of requests is not skewed by it
+            tnco_client.get_access_token()
+            benchmark_result = tnco_client.benchmark(repeat=repeat, concurrency=concurrency, include_template_engine=include_template_engine)
+        if isinstance(output_formatter, TableFormat):
+            ctl.io.print(f'Benchmarked CP4NA orchestration with {repeat} round(s) at concurrency {concurrency} in {benchmark_result.elapsed}s')
+            ctl.io.print(output_formatter.convert_list(benchmark_result.stats))
+        else:
+            ctl.io.print(output_formatter.convert_element(benchmark_result))
+        if not benchmark_result.passed:
+            exit(1)
+
     def use(self):
         @click.command(help=f'Change the active environment (default environment used by commands)')
         @click.argument('environment_name')
@@ -1,9 +1,14 @@
+import re
 import click
+from datetime import datetime, timedelta
 from typing import Dict, List
 from lmctl.client import TNCOClient, TNCOClientHttpError
-from lmctl.cli.arguments import common_output_format_handler
+from lmctl.client import process_analysis
+from lmctl.utils.concurrency import DEFAULT_MAX_WORKERS
+from lmctl.cli.arguments import common_output_format_handler, analysis_output_format_handler
 from lmctl.cli.format import Table, Column
-from .tnco_target import TNCOTarget, LmGet
+from lmctl.cli.projection import Pushdown
+from .tnco_target import TNCOTarget, LmGet, LmCmd
 
 class ProcessTable(Table):
 
@@ -14,14 +19,52 @@ class ProcessTable(Table):
         Column('assembly', header='Assembly', accessor=lambda x: x.get('assemblyName') + ' (' + x.get('assemblyId') + ')'),
     ]
 
+class ProcessStatsTable(Table):
+
+    columns = [
+        Column('intent_type', header='Intent'),
+        Column('assembly_type', header='Assembly Type'),
+        Column('count', header='Count'),
+        Column('failed', header='Failed'),
+        Column('failure_rate', header='Failure Rate'),
+        Column('mean', header='Mean (s)'),
+        Column('p50', header='P50 (s)'),
+        Column('p90', header='P90 (s)'),
+        Column('p99', header='P99 (s)'),
+        Column('max', header='Max (s)')
+    ]
+
 output_formats = common_output_format_handler(table=ProcessTable())
+# Parts of a "--filter" sent to TNCO as query parameters, unless retrieving a single process by ID
+process_filter_pushdown = [
+    Pushdown('status', 'status', multiple=True, skip_when=['id']),
+    Pushdown('intentType', 'intent_type', multiple=True, skip_when=['id']),
+    Pushdown('assemblyId', 'assembly_id', skip_when=['id']),
+    Pushdown('assemblyName', 'assembly_name', skip_when=['id']),
+    Pushdown('assemblyType', 'assembly_type', skip_when=['id'])
+]
+stats_output_formats = analysis_output_format_handler(ProcessStatsTable())
+
+TIME_FORMATS = ['%Y-%m-%d', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S']
+DURATION_UNITS = {'s': 'seconds', 'm': 'minutes', 'h': 'hours', 'd': 'days', 'w': 'weeks'}
+
+class DurationParamType(click.ParamType):
+    name = 'duration'
+
+    def convert(self, value, param, ctx):
+        if isinstance(value, timedelta):
+            return value
+        match = re.fullmatch(r'(\d+(?:\.\d+)?)([smhdw])', str(value).strip())
+        if match is None or float(match.group(1)) <= 0:
+            self.fail(f'{value} is not a duration such as 30m, 6h or 1d', param, ctx)
+        return timedelta(**{DURATION_UNITS[match.group(2)]: float(match.group(1))})
 
 class Processes(TNCOTarget):
     name = 'process'
     plural = 'processes'
     display_name = 'Assembly Process'
 
-    @LmGet(output_formats=output_formats, short_help=f'''Get the status of an {display_name}''',
+    @LmGet(output_formats=output_formats, filter_pushdown=process_filter_pushdown, short_help=f'''Get the status of an {display_name}''',
         help=f'''\
             Get the status of an {display_name}.
             \n\nA single Process can be retrieved by the "ID" argument or retrieve multiple Processes with a combination of filter options: 
@@ -84,6 +127,37 @@ class Processes(TNCOTarget):
                 query_params['limit'] = limit
             return api.query(**query_params)
             
+    @LmCmd(short_help=f'Summarise the durations and failures of {display_name}es',
+            help=f'''\
+                Summarise the durations and failure rates of {display_name}es, by intent type and assembly type, started in a time range\
+                \n\nThe range is split into windows which are queried concurrently, to avoid one large slow query. 
+                Times are in UTC. NumPy is used for the calculations when installed (pip install lmctl[analysis])''')
+    @click.option('--from', 'from_time', required=True, type=click.DateTime(formats=TIME_FORMATS), help='Start of the time range (UTC)')
+    @click.option('--to', 'to_time', type=click.DateTime(formats=TIME_FORMATS), help='End of the time range (UTC)  [default: now]')
+    @click.option('--window', type=DurationParamType(), default='1d', show_default=True, help='Length of the time windows queried, e.g. 30m, 6h, 1d')
+    @click.option('--assembly-type', help='Only include processes of Assemblies of this Type')
+    @click.option('--intent-type', multiple=True, help='Only include processes of this Intent Type (may provide option multiple times)')
+    @click.option('--concurrency', type=click.IntRange(min=1), default=DEFAULT_MAX_WORKERS, show_default=True, help='Maximum number of windows queried at the same time')
+    @stats_output_formats.option()
+    def analyze(self, tnco_client: TNCOClient, ctx: click.Context, from_time: datetime, to_time: datetime = None, window: timedelta = None, assembly_type: str = None,
+                    intent_type: List[str] = None, concurrency: int = DEFAULT_MAX_WORKERS, output_format: str = None):
+        api = tnco_client.processes
+        if to_time is None:
+            to_time = datetime.utcnow()
+        if to_time <= from_time:
+            raise click.BadArgumentUsage(message='"--to" must be later than "--from"', ctx=ctx)
+        if window is None:
+            window = timedelta(days=1)
+        query_params = {}
+        if assembly_type is not None:
+            query_params['assemblyType'] = assembly_type
+        if intent_type is not None and len(intent_type) > 0:
+            query_params['intentTypes'] = ','.join(intent_type)
+        processes = api.query_in_windows(from_time, to_time, window, max_workers=concurrency, lazy=True, **query_params)
+        output_formatter = stats_output_formats.resolve_choice(output_format)
+        ctl = self._get_controller()
+        ctl.io.print(output_formatter.convert_list(process_analysis.process_stats(processes)))
+
     def _check_var_not_set_with_id(self, ctx, var_name, var, check_empty_list=False):
         if var is not None:
             if check_empty_list and isinstance(var, (list,tuple)) and len(var) == 0:
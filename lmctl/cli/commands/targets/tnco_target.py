@@ -1,18 +1,30 @@
 
 from .target import Target
-from typing import Callable, Any
+from collections.abc import Mapping
+from typing import Callable, Any, List, Dict
+from lmctl.client import TNCOClientError
+from lmctl.cli.io import IOController
+from lmctl.cli.safety_net import tnco_client_safety_net
+from lmctl.cli.format import OutputFormat, TableFormat, Table, Column
+from lmctl.utils.concurrency import run_concurrently
+from lmctl.utils.dcutils.dc_to_dict import asdict
+from lmctl.cli.projection import FieldSelection, FilterExpression, Pushdown, push_down, select, select_output_format
 from lmctl.cli.arguments import (OutputFormats, 
                                 FileInputs, 
                                 default_output_format_handler, 
                                 environment_name_option, 
+                                all_environments_option,
                                 default_file_inputs_handler,
                                 set_param_option,
                                 ignore_missing_option, 
                                 tnco_client_secret_option, 
-                                tnco_pwd_option)
+                                tnco_pwd_option,
+                                fields_option,
+                                filter_option)
 import os
 import click
 import functools
+import dataclasses
 
 class TNCOTarget(Target):
 
@@ -65,6 +77,19 @@ class TNCOTarget(Target):
         @tnco_pwd_option()
         @click.pass_context
         def cmd(ctx: click.Context, environment_name: str, pwd: str = None, client_secret: str = None, **kwargs):
+            if getattr(handler_function, '__lazy_tnco_client__', False):
+                # Config is only loaded, and a client built, if the handler calls get_tnco_client()
+                io = IOController.get()
+                with tnco_client_safety_net(io_controller=io):
+                    tnco_clients = []
+                    def get_tnco_client():
+                        if len(tnco_clients) == 0:
+                            tnco_clients.append(self._get_controller().get_tnco_client(environment_name, input_pwd=pwd, input_client_secret=client_secret))
+                        return tnco_clients[0]
+                    result = handler_function(get_tnco_client, ctx=ctx, **kwargs)
+                    if result is not None:
+                        io.print(result)
+                return
             ctl = self._get_controller()
             with ctl.tnco_client_safety_net():
                 tnco_client = ctl.get_tnco_client(environment_name, input_pwd=pwd, input_client_secret=client_secret)
@@ -128,18 +153,35 @@ class TNCOTarget(Target):
         else:
             output_formats = default_output_format_handler()
 
+        pushdowns = getattr(handler_function, '__filter_pushdown__', [])
+
         # Build up a command (but don't decorate it as one yet)
-        @environment_name_option()
+        @environment_name_option(allow_many=True)
+        @all_environments_option()
         @output_formats.option()
+        @fields_option()
+        @filter_option()
         @tnco_client_secret_option()
         @tnco_pwd_option()
         @click.pass_context
-        def cmd(ctx: click.Context, environment_name: str, output_format: str, pwd: str = None, client_secret: str = None, **kwargs):
+        def cmd(ctx: click.Context, environment_name: str, output_format: str, all_environments: bool = False, fields: FieldSelection = None, 
+                    filter_expression: FilterExpression = None, pwd: str = None, client_secret: str = None, **kwargs):
             ctl = self._get_controller()
-            output_formatter = output_formats.resolve_choice(output_format)
+            output_formatter = select_output_format(output_formats.resolve_choice(output_format), fields)
+            if all_environments and environment_name is not None:
+                raise click.BadArgumentUsage('Do not use "-e, --environment" option when using the "--all-environments" option', ctx=ctx)
+            if filter_expression is not None:
+                # Reduce what TNCO returns where the command has an option for part of the filter, the whole filter is still applied to the result
+                push_down(filter_expression, pushdowns, kwargs)
+            def get_selected(tnco_client):
+                return select_result(handler_function(tnco_client, ctx=ctx, **kwargs), filter_expression, fields)
+            environment_names = ctl.resolve_environment_names(environment_name, all_environments=all_environments)
+            if all_environments or len(environment_names) > 1:
+                self._get_from_environments(ctl, environment_names, get_selected, output_formatter, pwd, client_secret)
+                return
             with ctl.tnco_client_safety_net():
                 tnco_client = ctl.get_tnco_client(environment_name, input_pwd=pwd, input_client_secret=client_secret)
-                result = handler_function(tnco_client, ctx=ctx, **kwargs)
+                result = get_selected(tnco_client)
                 if isinstance(result, list):
                     ctl.io.print(output_formatter.convert_list(result))
                 else:
@@ -158,6 +200,24 @@ class TNCOTarget(Target):
         cmd = click.command(**cmd_kwargs)(cmd)
         return cmd
 
+    def _get_from_environments(self, ctl, environment_names: List[str], get_function: Callable, output_formatter: OutputFormat, pwd: str, client_secret: str):
+        # Requests to every environment are made at the same time, an error from one is reported without stopping the others
+        tnco_clients = ctl.get_tnco_clients(environment_names, input_pwd=pwd, input_client_secret=client_secret)
+        def get_from_environment(environment_name: str):
+            return get_function(tnco_clients[environment_name])
+        merged_result = []
+        failed = False
+        for task in run_concurrently(get_from_environment, environment_names, catchable_exceptions=(TNCOClientError,)):
+            if task.failed:
+                ctl.io.print_error(f'TNCO error occurred on environment "{task.item}": {task.error}')
+                failed = True
+            else:
+                values = task.value if isinstance(task.value, list) else [task.value]
+                merged_result.extend(with_environment(task.item, value) for value in values)
+        ctl.io.print(with_environment_column(output_formatter).convert_list(merged_result))
+        if failed:
+            exit(1)
+
     def _create_cmd_builder(self, handler_function: Callable) -> click.Command:
         if hasattr(handler_function, '__file_inputs__'):
             file_inputs = handler_function.__file_inputs__
@@ -268,10 +328,37 @@ class TNCOTarget(Target):
         cmd = click.command(**cmd_kwargs)(cmd)
         return cmd
 
-def LmGet(output_formats: OutputFormats = None, **cmd_kwargs):
+def select_result(result: Any, filter_expression: FilterExpression = None, fields: FieldSelection = None) -> Any:
+    """
+    Apply the "--filter" and "--fields" options of a get command to its result. A single object not matching the filter becomes an empty list
+    """
+    if filter_expression is None and fields is None:
+        return result
+    if isinstance(result, list):
+        return list(select(result, filter_expression, fields))
+    selected = list(select([result], filter_expression, fields))
+    return selected[0] if len(selected) > 0 else []
+
+def with_environment(environment_name: str, value: Any) -> Dict:
+    if dataclasses.is_dataclass(type(value)):
+        value = asdict(value)
+    if not isinstance(value, Mapping):
+        value = {'value': value}
+    return {'environment': environment_name, **value}
+
+def with_environment_column(output_formatter: OutputFormat) -> OutputFormat:
+    if isinstance(output_formatter, TableFormat) and output_formatter.table is not None:
+        table = Table()
+        table.columns = [Column('environment', header='Environment')] + list(output_formatter.get_columns())
+        return TableFormat(table=table)
+    return output_formatter
+
+def LmGet(output_formats: OutputFormats = None, filter_pushdown: List[Pushdown] = None, **cmd_kwargs):
     def decorator(f):
         if output_formats is not None:
             f.__output_formats__ = output_formats
+        if filter_pushdown is not None:
+            f.__filter_pushdown__ = filter_pushdown
         if len(cmd_kwargs) > 0:
             f.__cmd_kwargs__ = cmd_kwargs
         f.__lm_cmd_type__ = 'LmGet'
@@ -322,10 +409,16 @@ def LmGen(output_formats: OutputFormats = None, **cmd_kwargs):
         return f
     return decorator
 
-def LmCmd(**cmd_kwargs):
+def LmCmd(lazy_tnco_client: bool = False, **cmd_kwargs):
+    """
+    Command given a TNCOClient for the selected environment. With lazy_tnco_client, the command is instead given a function 
+    returning the client, so commands which do not always need one can run without any config
+    """
     def decorator(f):
         if len(cmd_kwargs) > 0:
             f.__cmd_kwargs__ = cmd_kwargs
+        if lazy_tnco_client:
+            f.__lazy_tnco_client__ = True
         f.__lm_cmd_type__ = 'LmCmd'
         return f
     return decorator
\ No newline at end of file
@@ -0,0 +1,77 @@
+import yaml
+import click
+from lmctl.client import TNCOClient, WorkflowRunner, WorkflowState, WorkflowError, ProcessWaiter, NodeResult, read_workflow
+from lmctl.client.intent_workflow import DEFAULT_MIN_POLL_INTERVAL, DEFAULT_MAX_POLL_INTERVAL
+from lmctl.utils.concurrency import DEFAULT_MAX_WORKERS
+from lmctl.cli.arguments import output_format_handler
+from lmctl.cli.format import Table, Column, TableFormat, YamlFormat, JsonFormat
+from .tnco_target import TNCOTarget, LmCmd
+
+class WorkflowNodeTable(Table):
+
+    columns = [
+        Column('name', header='Node'),
+        Column('intent', header='Intent'),
+        Column('status', header='Status'),
+        Column('process_id', header='Process'),
+        Column('duration', header='Duration (s)'),
+        Column('error', header='Error')
+    ]
+
+output_formats = output_format_handler()\
+                    .add_choice('table', TableFormat(table=WorkflowNodeTable()), is_default=True)\
+                    .add_choice('yaml', YamlFormat())\
+                    .add_choice('json', JsonFormat())
+
+class Workflows(TNCOTarget):
+    name = 'workflow'
+    plural = 'workflows'
+    display_name = 'Intent Workflow'
+
+    @LmCmd(short_help=f'Run an {display_name} from a file',
+            help=f'''\
+                Run the Assembly intents of an {display_name} file, each once the nodes it depends on have completed:
+                \n\n  nodes:\n\n    shared:\n\n      intent: createAssembly\n\n      request:\n\n        assemblyName: shared\n\n        descriptorName: assembly::shared::1.0\n\n        intendedState: Active
+                \n\n    edge:\n\n      intent: createAssembly\n\n      depends_on: [shared]\n\n      request: ...
+                \n\nIntents: createAssembly, upgrade, createOrUpgrade, changeState, scaleOut, scaleIn, heal, adopt, delete (or any intent name known to TNCO).
+                Independent nodes run at the same time and each waits on the process of its intent, polling less often while its status is unchanged.
+                When a node fails, the nodes depending on it are skipped.
+                \n\nWith --state-file, progress is saved as it happens. Running again with the same file resumes: completed nodes are not requested again,
+                nodes left waiting on a process wait on the same process and failed or skipped nodes are retried.
+                A summary with the duration of each node is printed at the end and progress is printed to stderr''')
+    @click.option('-f', '--file', 'workflow_file', required=True, type=click.File('r'), help='YAML/JSON file of the workflow')
+    @click.option('--state-file', help='File to save progress to, and resume from when it exists')
+    @click.option('--concurrency', type=click.IntRange(min=1), default=DEFAULT_MAX_WORKERS, show_default=True, help='Maximum number of nodes run at the same time')
+    @click.option('--poll-interval', type=click.FloatRange(min=0.1), default=DEFAULT_MIN_POLL_INTERVAL, show_default=True, help='Seconds between polls of a process while its status is changing')
+    @click.option('--max-poll-interval', type=click.FloatRange(min=0.1), default=DEFAULT_MAX_POLL_INTERVAL, show_default=True, help='Maximum seconds between polls of a process while its status is unchanged')
+    @output_formats.option()
+    def run(self, tnco_client: TNCOClient, ctx: click.Context, workflow_file, state_file: str = None, concurrency: int = DEFAULT_MAX_WORKERS,
+                poll_interval: float = DEFAULT_MIN_POLL_INTERVAL, max_poll_interval: float = DEFAULT_MAX_POLL_INTERVAL, output_format: str = None):
+        if max_poll_interval < poll_interval:
+            raise click.BadArgumentUsage('"--max-poll-interval" must not be less than "--poll-interval"', ctx=ctx)
+        ctl = self._get_controller()
+        output_formatter = output_formats.resolve_choice(output_format)
+        try:
+            workflow = read_workflow(yaml.safe_load(workflow_file))
+            state = WorkflowState(workflow, path=state_file)
+        except (WorkflowError, yaml.YAMLError) as e:
+            ctl.io.print_error(f'Error: {e}')
+            exit(1)
+        def print_progress(result: NodeResult):
+            ctl.io.print_error(f'[{result.status}] {result.name}: {result.intent}' + (f' ({result.duration}s)' if result.duration is not None else '')
+                                    + (f' - {result.error}' if result.error is not None else ''))
+        waiter = ProcessWaiter(tnco_client.processes, min_interval=poll_interval, max_interval=max_poll_interval)
+        runner = WorkflowRunner(tnco_client, max_workers=concurrency, waiter=waiter)
+        try:
+            result = runner.run(workflow, state=state, on_node_complete=print_progress)
+        except KeyboardInterrupt:
+            if state_file is not None:
+                ctl.io.print_error(f'Stopped, run again with "--state-file {state_file}" to resume')
+            exit(1)
+        if isinstance(output_formatter, TableFormat):
+            ctl.io.print(output_formatter.convert_list(result.nodes))
+            ctl.io.print(f'{"Passed" if result.passed else "Failed"} in {result.duration}s')
+        else:
+            ctl.io.print(output_formatter.convert_element(result))
+        if not result.passed:
+            exit(1)
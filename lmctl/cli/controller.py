@@ -1,5 +1,8 @@
+import copy
 import click
 import logging
+import threading
+from typing import List, Dict
 from lmctl.cli.io import IOController
 from lmctl.config import get_global_config_with_path, Config, ConfigError
 from lmctl.environment import EnvironmentGroup
@@ -9,10 +12,19 @@ logger = logging.getLogger(__name__)
 
 class CLIController:
     
-    def __init__(self, config: Config, config_path: str):
+    def __init__(self, config: Config, config_path: str, reuse_tnco_clients: bool = False):
         self.config = config
         self.config_path = config_path
         self.io = IOController.get()
+        # Clients by environment and credentials, kept (with their sessions and access tokens) when reuse_tnco_clients is set
+        self.tnco_clients = {} if reuse_tnco_clients else None
+        self._tnco_client_lock = threading.RLock()
+
+    def close(self):
+        for tnco_client in (self.tnco_clients or {}).values():
+            tnco_client.close()
+        if self.tnco_clients is not None:
+            self.tnco_clients.clear()
 
     def safety_net(self, *catchable_exceptions):
         return safety_net(*catchable_exceptions, io_controller=self.io)
@@ -44,12 +56,46 @@ class CLIController:
                 return env_group
         return None
  
+    def resolve_environment_names(self, environment_names: str = None, all_environments: bool = False) -> List[str]:
+        """
+        Names of the environment groups selected by a comma separated list of names, or of every group with CP4NA orchestration
+        configured when all_environments is True. A single name (or None, for the active environment) is returned as it was given
+        """
+        if all_environments:
+            names = [name for name, env_group in self.config.environments.items() if env_group.has_tnco]
+            if len(names) == 0:
+                self.io.print_error('Error: No environments with CP4NA orchestration configured found in config')
+                exit(1)
+            return names
+        if environment_names is None or ',' not in environment_names:
+            return [environment_names]
+        names = list(dict.fromkeys(name.strip() for name in environment_names.split(',') if len(name.strip()) > 0))
+        for name in names:
+            if name not in self.config.environments:
+                self.io.print_error(f'Error: No environment named: {name}')
+                exit(1)
+        return names
+
+    def get_tnco_clients(self, environment_group_names: List[str], input_pwd: str = None, input_client_secret: str = None) -> Dict[str, 'TNCOClient']:
+        """
+        One client for each named environment group. Clients are built one at a time, so any prompts for credentials are not interleaved
+        """
+        return {name: self.get_tnco_client(name, input_pwd=input_pwd, input_client_secret=input_client_secret) for name in environment_group_names}
+
     def get_tnco_client(self, environment_group_name: str = None, input_pwd: str = None, input_client_secret: str = None, input_token: str = None) -> 'TNCOClient':
+        # Commands run concurrently (e.g. by lmctl batch) prompt for credentials and build the shared client one at a time
+        with self._tnco_client_lock:
+            return self._get_tnco_client(environment_group_name, input_pwd=input_pwd, input_client_secret=input_client_secret, input_token=input_token)
+
+    def _get_tnco_client(self, environment_group_name: str = None, input_pwd: str = None, input_client_secret: str = None, input_token: str = None) -> 'TNCOClient':
         env_group = self.get_environment_group(environment_group_name)
         if not env_group.has_tnco:
             self.io.print_error(f'Error: CP4NA orchestration environment not configured on group: {environment_group_name}')
             exit(1)
         tnco = env_group.tnco
+        if self.tnco_clients is not None:
+            # The config outlives this command (e.g. in the daemon), so credentials given to it are only used for this client and its cache key
+            tnco = copy.deepcopy(tnco)
         if tnco.secure:
             if tnco.is_using_token_auth:
                 if input_token is not None and len(input_token.strip()) > 0:
@@ -71,7 +117,15 @@ class CLIController:
                     elif tnco.password is None:
                         prompt_pwd = self.io.prompt(f'Please enter password for CP4NA orchestration user {tnco.username}', hide_input=True, default='')
                         tnco.password = prompt_pwd
-        return tnco.build_client()
+        if self.tnco_clients is None:
+            return tnco.build_client()
+        client_key = (env_group.name, tnco.token, tnco.client_secret, tnco.password)
+        tnco_client = self.tnco_clients.get(client_key, None)
+        if tnco_client is None:
+            tnco_client = tnco.build_client()
+            tnco_client.use_sessions = True
+            self.tnco_clients[client_key] = tnco_client
+        return tnco_client
 
     def create_arm_session(self, arm_name: str, environment_group_name: str = None):
         env_group = self.get_environment_group(environment_group_name)
@@ -84,12 +138,12 @@ class CLIController:
 
 global_controller = None
 
-def get_global_controller(override_config_path: str = None) -> CLIController:
+def get_global_controller(override_config_path: str = None, reuse_tnco_clients: bool = False) -> CLIController:
     global global_controller
     if global_controller is None:
         try:
             config, config_path = get_global_config_with_path(override_config_path=override_config_path)
-            global_controller = CLIController(config, config_path)
+            global_controller = CLIController(config, config_path, reuse_tnco_clients=reuse_tnco_clients)
         except ConfigError as e:
             IOController().print_error(f'Error: Failed to load configuration - {e}')
             logger.exception(str(e))
@@ -0,0 +1,287 @@
+"""
+Long-lived local process which runs lmctl commands on behalf of the lmctl CLI, over a Unix domain socket.
+
+The daemon keeps the parsed config and authenticated TNCOClients (with their connection pools) between commands,
+so each forwarded command skips Python startup, imports, config parsing and authentication.
+
+This module is imported before any other part of lmctl on every invocation of the CLI, so it must only import from the standard library at the top level
+"""
+import io
+import os
+import sys
+import json
+import time
+import socket
+import logging
+import threading
+import socketserver
+from pathlib import Path
+from typing import List, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+SOCKET_ENV_VAR = 'LMCTL_DAEMON_SOCKET'
+DISABLE_ENV_VAR = 'LMCTL_NO_DAEMON'
+CONFIG_ENV_VAR = 'LMCONFIG'
+# Commands which only talk to CP4NA orchestration through the CLIController, so can safely be run by the daemon.
+# Local-only and long-running commands (genfile, use, watch) and the older command groups always run in-process
+FORWARDED_COMMANDS = ['get', 'create', 'update', 'delete', 'execute', 'cancel', 'changestate', 'scale', 'heal', 'adopt',
+                        'render', 'ping', 'analyze', 'export', 'apply']
+STOP_REQUEST = 'stop'
+STATUS_REQUEST = 'status'
+DEFAULT_START_TIMEOUT = 10
+
+class DaemonInputRequired(BaseException):
+    """
+    Raised when a command run by the daemon needs input from the user (e.g. a password prompt), so the CLI runs it in-process instead.
+    Extends BaseException so it is not swallowed by the catch-all safety nets of the commands
+    """
+    pass
+
+def default_socket_path() -> str:
+    return os.environ.get(SOCKET_ENV_VAR, str(Path.home().joinpath('.lmctl').joinpath('daemon.sock')))
+
+def daemon_supported() -> bool:
+    return hasattr(socket, 'AF_UNIX')
+
+def _send(sock: socket.socket, message: Dict):
+    sock.sendall(json.dumps(message).encode('utf-8') + b'\n')
+
+def _read_messages(sock: socket.socket):
+    buffer = b''
+    while True:
+        data = sock.recv(65536)
+        if not data:
+            return
+        buffer += data
+        while b'\n' in buffer:
+            line, buffer = buffer.split(b'\n', 1)
+            yield json.loads(line)
+
+def _connect(socket_path: str) -> Optional[socket.socket]:
+    if not daemon_supported() or not os.path.exists(socket_path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+def request(message: Dict, socket_path: str = None) -> Optional[Dict]:
+    """
+    Send a control message (status or stop) to the daemon, returning its reply or None if no daemon is listening
+    """
+    sock = _connect(socket_path or default_socket_path())
+    if sock is None:
+        return None
+    with sock:
+        _send(sock, message)
+        return next(_read_messages(sock), None)
+
+def forward(argv: List[str], socket_path: str = None) -> Optional[int]:
+    """
+    Run a command on the daemon, writing its output to stdout/stderr as it arrives, and return its exit code.
+    Returns None, without running anything, when the command should be run in-process instead
+    (no daemon listening, the command is not forwarded, or the daemon asked for it to be)
+    """
+    if os.environ.get(DISABLE_ENV_VAR) or len(argv) == 0 or argv[0] not in FORWARDED_COMMANDS:
+        return None
+    sock = _connect(socket_path or default_socket_path())
+    if sock is None:
+        return None
+    stdout, stderr = sys.stdout, sys.stderr
+    with sock:
+        _send(sock, {'argv': argv, 'cwd': os.getcwd(), 'config': os.environ.get(CONFIG_ENV_VAR, None)})
+        for message in _read_messages(sock):
+            if 'out' in message:
+                stdout.write(message['out'])
+                stdout.flush()
+            elif 'err' in message:
+                stderr.write(message['err'])
+                stderr.flush()
+            elif 'fallback' in message:
+                return None
+            elif 'exit' in message:
+                return message['exit']
+    stderr.write('Error: Connection to lmctl daemon closed before the command completed\n')
+    return 1
+
+class _SocketWriter(io.RawIOBase):
+
+    def __init__(self, sock: socket.socket, stream_name: str):
+        self.sock = sock
+        self.stream_name = stream_name
+        self.written = False
+
+    def writable(self):
+        return True
+
+    def write(self, data) -> int:
+        if len(data) > 0:
+            _send(self.sock, {self.stream_name: bytes(data).decode('utf-8', errors='replace')})
+            self.written = True
+        return len(data)
+
+class _DaemonIOController:
+    """
+    Wraps the IOController of the CLI so prompts raise DaemonInputRequired rather than waiting on input that will never arrive
+    """
+
+    def __init__(self, io_controller):
+        self._io_controller = io_controller
+
+    def prompt(self, *args, **kwargs):
+        raise DaemonInputRequired()
+
+    def confirm_prompt(self, *args, **kwargs):
+        raise DaemonInputRequired()
+
+    def __getattr__(self, name):
+        return getattr(self._io_controller, name)
+
+class DaemonRequestHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        try:
+            message = json.loads(self.rfile.readline())
+        except ValueError:
+            return
+        if message.get('control', None) == STATUS_REQUEST:
+            _send(self.request, {'status': self.server.status()})
+        elif message.get('control', None) == STOP_REQUEST:
+            _send(self.request, {'stopping': True})
+            threading.Thread(target=self.server.shutdown).start()
+        elif message.get('config', None) != os.environ.get(CONFIG_ENV_VAR, None):
+            _send(self.request, {'fallback': 'Daemon was started with a different config file'})
+        else:
+            self.server.run_command(self.request, message.get('argv', []), message.get('cwd', None))
+
+class DaemonServer(socketserver.UnixStreamServer):
+    """
+    Runs one command at a time, since each command takes over the working directory and stdout/stderr of the process
+    """
+
+    def __init__(self, socket_path: str):
+        self.socket_path = socket_path
+        self.started_at = time.time()
+        self.commands_run = 0
+        self._config_mtime = None
+        self._cli = None
+        super().__init__(socket_path, DaemonRequestHandler)
+
+    def server_bind(self):
+        # The daemon holds credentials, so only the user who started it may connect. The socket is created with mode 0600,
+        # rather than changed after it is bound, so there is no moment where others could connect
+        previous_umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(previous_umask)
+
+    def status(self) -> Dict:
+        from lmctl.cli import controller
+        cached_clients = 0
+        if controller.global_controller is not None:
+            cached_clients = len(controller.global_controller.tnco_clients or {})
+        return {'pid': os.getpid(), 'socket': self.socket_path, 'uptime': round(time.time() - self.started_at, 1),
+                    'commands': self.commands_run, 'clients': cached_clients}
+
+    def prepare(self):
+        from lmctl.cli import controller
+        from lmctl.cli import io as cli_io
+        from lmctl.config import ConfigFinder, clear_global_config
+        if self._cli is None:
+            from lmctl.cli.entry import cli
+            self._cli = cli
+        # Reload the config (dropping the clients built from it) whenever the file changes
+        config_path = ConfigFinder().find(ignore_not_found=True)
+        config_mtime = os.path.getmtime(config_path) if os.path.exists(config_path) else None
+        if config_mtime != self._config_mtime:
+            if controller.global_controller is not None:
+                controller.global_controller.close()
+            controller.clear_global_controller()
+            clear_global_config()
+            self._config_mtime = config_mtime
+        if not isinstance(cli_io.global_io, _DaemonIOController):
+            cli_io.global_io = _DaemonIOController(cli_io.IOController.get())
+        if controller.global_controller is None and config_mtime is not None:
+            controller.get_global_controller(reuse_tnco_clients=True)
+
+    def run_command(self, sock: socket.socket, argv: List[str], cwd: str = None):
+        out, err = _SocketWriter(sock, 'out'), _SocketWriter(sock, 'err')
+        stdout = io.TextIOWrapper(out, encoding='utf-8', line_buffering=True, write_through=True)
+        stderr = io.TextIOWrapper(err, encoding='utf-8', line_buffering=True, write_through=True)
+        original_cwd, original_stdout, original_stderr, original_stdin = os.getcwd(), sys.stdout, sys.stderr, sys.stdin
+        exit_code = 0
+        try:
+            self.prepare()
+            if cwd is not None:
+                os.chdir(cwd)
+            sys.stdout, sys.stderr, sys.stdin = stdout, stderr, io.StringIO()
+            self._cli.main(args=argv, prog_name='lmctl', standalone_mode=True)
+        except SystemExit as e:
+            if e.code is None or isinstance(e.code, int):
+                exit_code = e.code or 0
+            else:
+                stderr.write(f'{e.code}\n')
+                exit_code = 1
+        except DaemonInputRequired:
+            exit_code = None
+        except Exception as e:
+            logger.exception(f'lmctl daemon failed to run command: {argv}')
+            stderr.write(f'Error: {e}\n')
+            exit_code = 1
+        finally:
+            sys.stdout, sys.stderr, sys.stdin = original_stdout, original_stderr, original_stdin
+            os.chdir(original_cwd)
+            self.commands_run += 1
+        try:
+            stdout.flush()
+            stderr.flush()
+            if exit_code is None:
+                if out.written or err.written:
+                    _send(sock, {'err': f'Error: Command requires input, run it without the daemon (set {DISABLE_ENV_VAR}=1)\n'})
+                    _send(sock, {'exit': 1})
+                else:
+                    _send(sock, {'fallback': 'Command requires input'})
+            else:
+                _send(sock, {'exit': exit_code})
+        except OSError:
+            logger.debug(f'lmctl daemon client disconnected before the result of {argv} was sent')
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+def serve(socket_path: str = None):
+    """
+    Listen for commands on socket_path until stopped. A socket file left behind by a daemon that is no longer running is replaced
+    """
+    socket_path = socket_path or default_socket_path()
+    if request({'control': STATUS_REQUEST}, socket_path=socket_path) is not None:
+        raise OSError(f'An lmctl daemon is already listening on {socket_path}')
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+    os.makedirs(os.path.dirname(os.path.abspath(socket_path)), exist_ok=True)
+    server = DaemonServer(socket_path)
+    try:
+        # Import the CLI and load the config up front, so the first command is as quick as the rest
+        server.prepare()
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+def wait_until_listening(socket_path: str, timeout: float = DEFAULT_START_TIMEOUT) -> Optional[Dict]:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        status = request({'control': STATUS_REQUEST}, socket_path=socket_path)
+        if status is not None:
+            return status.get('status')
+        time.sleep(0.05)
+    return None
+
+if __name__ == '__main__':
+    serve(sys.argv[1] if len(sys.argv) > 1 else None)
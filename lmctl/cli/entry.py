@@ -29,6 +29,8 @@ cli.add_command(lmctl_commands.lifecycledriver_group)
 cli.add_command(lmctl_commands.vimdriver_group) 
 cli.add_command(lmctl_commands.login_cmd) 
 cli.add_command(lmctl_commands.logdir_cmd)
+cli.add_command(lmctl_commands.daemon_group)
+cli.add_command(lmctl_commands.batch_cmd)
 
 for action in lmctl_commands.action_types:
     cli.add_command(action(targets=lmctl_commands.target_instances))
@@ -3,6 +3,8 @@ from .input_format import InputFormat
 from .json import JsonFormat
 from .yaml import YamlFormat
 from .table import TableFormat, Table, Column
+from .csv import CsvFormat
+from .ndjson import NdjsonFormat
 from .exceptions import BadFormatError
 import warnings
 
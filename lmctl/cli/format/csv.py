@@ -0,0 +1,25 @@
+from .output_format import OutputFormat, to_output_data
+from typing import List, Any
+import csv
+import io
+
+class CsvFormat(OutputFormat):
+    """
+    Writes a list of flat objects as CSV, with a header row of the attribute names (in the order they are first seen)
+    """
+
+    def convert_list(self, element_list: List[Any]) -> str:
+        rows = []
+        headers = {}
+        for e in element_list:
+            row = to_output_data(e)
+            headers.update(dict.fromkeys(row.keys()))
+            rows.append(row)
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=list(headers.keys()), lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(rows)
+        return output.getvalue().rstrip('\n')
+
+    def convert_element(self, element: Any) -> str:
+        return self.convert_list([element])
@@ -1,36 +1,28 @@
-from .output_format import OutputFormat
+from .output_format import OutputFormat, to_output_data
 from .input_format import InputFormat
 from .exceptions import BadFormatError
 from typing import List, Any, Dict
-from lmctl.utils.dcutils.dc_to_dict import asdict
-import dataclasses
+from lmctl.utils import json_codec
 import json 
 
 class JsonFormat(OutputFormat, InputFormat):
 
     def convert_list(self, element_list: List[Any]) -> str:
-        converted_element_list = []
-        for e in element_list:
-            if dataclasses.is_dataclass(type(e)):
-                converted_element_list.append(asdict(e))
-            else:
-                converted_element_list.append(e)
-        data = {'items': converted_element_list}
+        data = {'items': [to_output_data(e) for e in element_list]}
         try:
-            return json.dumps(data, indent=2)
-        except json.JSONDecodeError as e:
+            return json_codec.dumps(data, indent=True)
+        except (TypeError, ValueError) as e:
             raise BadFormatError(f'Failed to convert to JSON: {e}') from e
 
     def convert_element(self, element: Any) -> str:
-        if dataclasses.is_dataclass(type(element)):
-            element = asdict(element)
+        element = to_output_data(element)
         try:
-            return json.dumps(element, indent=2)
-        except json.JSONDecodeError as e:
+            return json_codec.dumps(element, indent=True)
+        except (TypeError, ValueError) as e:
             raise BadFormatError(f'Failed to convert to JSON: {e}') from e
 
     def read(self, content: str) -> Dict:
         try:
-            return json.loads(content)
+            return json_codec.loads(content)
         except json.JSONDecodeError as e:
             raise BadFormatError(f'Failed to read content as JSON: {e}') from e
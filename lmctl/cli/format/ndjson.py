@@ -0,0 +1,19 @@
+from .output_format import OutputFormat, to_output_data
+from .exceptions import BadFormatError
+from typing import List, Any
+from lmctl.utils import json_codec
+
+class NdjsonFormat(OutputFormat):
+    """
+    Writes each element as compact JSON on its own line, so output can be streamed and read one line at a time
+    """
+
+    def convert_list(self, element_list: List[Any]) -> str:
+        return '\n'.join(self.convert_element(e) for e in element_list)
+
+    def convert_element(self, element: Any) -> str:
+        element = to_output_data(element)
+        try:
+            return json_codec.dumps(element)
+        except (TypeError, ValueError) as e:
+            raise BadFormatError(f'Failed to convert to JSON: {e}') from e
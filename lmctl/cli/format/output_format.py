@@ -1,5 +1,18 @@
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
 from typing import List, Any
+from lmctl.utils.dcutils.dc_to_dict import asdict
+import dataclasses
+
+def to_output_data(element: Any) -> Any:
+    """
+    Dataclasses, and other mappings (such as the Records of lmctl.client.models.RecordList), as plain dicts for output
+    """
+    if dataclasses.is_dataclass(type(element)):
+        return asdict(element)
+    if isinstance(element, Mapping) and not isinstance(element, dict):
+        return dict(element)
+    return element
 
 class OutputFormat(ABC):
 
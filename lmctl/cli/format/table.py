@@ -1,4 +1,5 @@
 from .output_format import OutputFormat
+from collections.abc import Mapping
 from typing import Union, Callable, List, Any
 from tabulate import tabulate
 
@@ -28,7 +29,7 @@ class TableFormat(OutputFormat):
             self.headers = headers
             self.row_processor = row_processor
 
-    def _get_columns(self):
+    def get_columns(self):
         if self.table is None:
             return None
         columns_access = self.table.columns
@@ -47,7 +48,7 @@ class TableFormat(OutputFormat):
         return columns
 
     def convert_list(self, element_list: List[Any]):
-        columns = self._get_columns()
+        columns = self.get_columns()
         if columns is None:
             headers = self.headers
         else:
@@ -74,14 +75,14 @@ class TableFormat(OutputFormat):
         else:
             for c in columns:
                 if c.accessor is None:
-                    if isinstance(element, dict):
+                    if isinstance(element, Mapping):
                         value = element.get(c.name)
                     else:
                         value = getattr(element, c.name, None)
                 elif callable(c.accessor):
                     value = c.accessor(element)
                 else:
-                    if isinstance(element, dict):
+                    if isinstance(element, Mapping):
                         value = element.get(c.accessor)
                     else:
                         value = getattr(element, c.accessor, None)
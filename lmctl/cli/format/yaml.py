@@ -1,29 +1,20 @@
-from .output_format import OutputFormat
+from .output_format import OutputFormat, to_output_data
 from .input_format import InputFormat
 from .exceptions import BadFormatError
 from typing import List, Any, Dict
-from lmctl.utils.dcutils.dc_to_dict import asdict
-import dataclasses
 import yaml
 
 class YamlFormat(OutputFormat):
 
     def convert_list(self, element_list: List[Any]) -> str:
-        converted_element_list = []
-        for e in element_list:
-            if dataclasses.is_dataclass(type(e)):
-                converted_element_list.append(asdict(e))
-            else:
-                converted_element_list.append(e)
-        data = {'items': converted_element_list}
+        data = {'items': [to_output_data(e) for e in element_list]}
         try:
             return yaml.dump(data, sort_keys=False)
         except yaml.YAMLError as e:
             raise BadFormatError(f'Failed to convert to YAML: {e}') from e
 
     def convert_element(self, element: Any) -> str:
-        if dataclasses.is_dataclass(type(element)):
-            element = asdict(element)
+        element = to_output_data(element)
         try:
             return yaml.dump(element, sort_keys=False)
         except yaml.YAMLError as e:
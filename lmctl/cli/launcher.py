@@ -0,0 +1,10 @@
+import sys
+from .daemon import forward
+
+def init_cli():
+    # Hand the command to a running lmctl daemon, if there is one, before paying for the imports of the full CLI
+    exit_code = forward(sys.argv[1:])
+    if exit_code is not None:
+        sys.exit(exit_code)
+    from .entry import init_cli as init_in_process_cli
+    init_in_process_cli()
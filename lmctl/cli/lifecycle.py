@@ -1,12 +1,17 @@
+import os
+import cProfile
+import tracemalloc
 import lmctl.journal as journal
 import lmctl.project.journal as project_journal
 import lmctl.project.source.core as project_sources
+import lmctl.project.profiling as profiling
 import lmctl.project.package.core as pkgs
 import lmctl.cli.output as output
 import lmctl.cli.ctlmgmt as ctlmgmt
 import lmctl.drivers.lm.base as lm_drivers
 import lmctl.drivers.arm as arm_drivers
 import logging
+import threading
 from lmctl.project.sessions import EnvironmentSessions, EnvironmentSelectionError
 from lmctl.project.types import ANSIBLE_RM_TYPES
 from lmctl.client import TNCOClientError
@@ -17,6 +22,10 @@ FAILED = 'FAILED'
 PASSED = 'PASSED'
 PASSED_WITH_WARNINGS = 'PASSED (with warnings)'
 
+DEFAULT_FLUSH_INTERVAL = 0.5
+# Output of environments executed at the same time is printed in larger blocks, so it is easier to follow
+ENVIRONMENT_FLUSH_INTERVAL = 2
+
 
 def build_sessions_for_project(project_config, environment_name, lm_pwd=None, arm_name=None, config_path=None):
     lm_session = ctlmgmt.create_lm_session(environment_name, lm_pwd, config_path)
@@ -89,16 +98,37 @@ class Banner:
 
 
 class ProjectPrinter:
+    """
+    Prints project lifecycle output. Lines printed for a subproject are buffered and written together when the
+    outermost subproject ends, or at most flush_interval seconds after they were printed
+    """
 
-    def __init__(self):
+    def __init__(self, flush_interval=DEFAULT_FLUSH_INTERVAL):
+        self.flush_interval = flush_interval
         self.__sub_projects = []
+        self.__buffer = []
+        self.__flush_timer = None
+        self.__lock = threading.RLock()
 
     def inc_sub_project(self, name):
-        self.__sub_projects.append(name)
+        with self.__lock:
+            self.__sub_projects.append(name)
 
     def dec_sub_project(self):
-        if len(self.__sub_projects) > 0:
-            del self.__sub_projects[-1]
+        with self.__lock:
+            if len(self.__sub_projects) > 0:
+                del self.__sub_projects[-1]
+            if len(self.__sub_projects) == 0:
+                self.flush()
+
+    def flush(self):
+        with self.__lock:
+            if self.__flush_timer is not None:
+                self.__flush_timer.cancel()
+                self.__flush_timer = None
+            if len(self.__buffer) > 0:
+                output.printer.text('\n'.join(self.__buffer))
+                self.__buffer = []
 
     def __normalise_lines(self, lines):
         if type(lines) is str:
@@ -136,7 +166,7 @@ class ProjectPrinter:
         self.__print('--> {0}'.format(section_name))
 
     def print_break(self):
-        self.__print_root('')
+        self.__write('')
 
     def print_lines(self, lines):
         lines = self.__normalise_lines(lines)
@@ -147,17 +177,30 @@ class ProjectPrinter:
         self.__print(text)
 
     def __print(self, orig_text):
-        full_text = ''
-        if len(self.__sub_projects) > 0:
-            for sub_project in self.__sub_projects:
-                full_text += '[{0}]'.format(sub_project)
-            full_text += ' '
-        full_text += orig_text
-        output.printer.text(full_text)
+        with self.__lock:
+            full_text = ''
+            if len(self.__sub_projects) > 0:
+                for sub_project in self.__sub_projects:
+                    full_text += '[{0}]'.format(sub_project)
+                full_text += ' '
+            full_text += orig_text
+            self.__write(full_text)
 
     def __print_root(self, orig_text):
-        output.printer.text(orig_text)
-
+        with self.__lock:
+            self.flush()
+            output.printer.text(orig_text)
+
+    def __write(self, text):
+        with self.__lock:
+            if len(self.__sub_projects) == 0:
+                self.__print_root(text)
+                return
+            self.__buffer.append(text)
+            if self.__flush_timer is None:
+                self.__flush_timer = threading.Timer(self.flush_interval, self.flush)
+                self.__flush_timer.daemon = True
+                self.__flush_timer.start()
 
 
 class ConsoleProjectJournalConsumer(journal.Consumer):
@@ -230,16 +273,99 @@ class TestReporter:
         return details
 
 
+class ExecutionProfile:
+
+    def __init__(self, name, dump_path=None, trace_memory=False):
+        self.phase_profiler = profiling.PhaseProfiler(name)
+        self.dump_path = dump_path
+        self.trace_memory = trace_memory
+        self.cprofiler = None
+        self.memory_snapshot = None
+        self.memory_peak = None
+
+    def start(self):
+        if self.trace_memory:
+            tracemalloc.start()
+        if self.dump_path is not None:
+            self.cprofiler = cProfile.Profile()
+            self.cprofiler.enable()
+        profiling.activate(self.phase_profiler)
+        self.phase_profiler.start()
+
+    def stop(self):
+        self.phase_profiler.stop()
+        profiling.deactivate()
+        if self.cprofiler is not None:
+            self.cprofiler.disable()
+            self.cprofiler.dump_stats(self.dump_path)
+        if self.trace_memory and tracemalloc.is_tracing():
+            self.memory_snapshot = tracemalloc.take_snapshot().filter_traces([
+                tracemalloc.Filter(False, cProfile.__file__),
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, '<frozen importlib._bootstrap*>')
+            ])
+            _, self.memory_peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+    def report(self):
+        lines = self.phase_profiler.summary()
+        if self.dump_path is not None:
+            lines.append('cProfile statistics written to: {0}'.format(self.dump_path))
+        if self.memory_peak is not None:
+            lines.append('Peak memory: {0:.1f}MB'.format(self.memory_peak / (1024 * 1024)))
+            lines.append('Largest allocations:')
+            for stat in self.memory_snapshot.statistics('lineno')[:10]:
+                lines.append('  {0}'.format(stat))
+        return lines
+
+
 class ExecutionController:
 
-    def __init__(self, title):
+    def __init__(self, title, journal_out=None, profile=False, profile_dump=None, profile_memory=False):
         self.banner = Banner(title)
         self.result = PASSED
         self.detail = []
+        self.journal_out = journal_out
+        self.journal_file_consumer = None
+        self.environment_printers = []
+        self.environment_file_consumers = []
+        self.profile = None
+        if profile or profile_dump is not None or profile_memory:
+            self.profile = ExecutionProfile(title, dump_path=profile_dump, trace_memory=profile_memory)
         self.consumer = ConsoleProjectJournalConsumer(printer)
+        if journal_out is not None:
+            self.journal_file_consumer = project_journal.JsonLinesJournalConsumer(journal_out)
+            self.consumer = journal.ConsumerGroup([self.consumer, self.journal_file_consumer])
+
+    def environment_consumer(self, environment_name):
+        """
+        Journal consumer for one of several environments executed at the same time. Console output is prefixed with the environment name
+        and buffered, so each environment is printed in blocks rather than interleaved line by line. When journal_out is set, the events
+        are written to a separate file named after the environment
+        """
+        environment_printer = ProjectPrinter(flush_interval=ENVIRONMENT_FLUSH_INTERVAL)
+        environment_printer.inc_sub_project(environment_name)
+        self.environment_printers.append(environment_printer)
+        consumer = ConsoleProjectJournalConsumer(environment_printer)
+        if self.journal_out is not None:
+            root, ext = os.path.splitext(self.journal_out)
+            file_consumer = project_journal.JsonLinesJournalConsumer('{0}.{1}{2}'.format(root, environment_name, ext))
+            self.environment_file_consumers.append(file_consumer)
+            consumer = journal.ConsumerGroup([consumer, file_consumer])
+        return consumer
+
+    def close_environment_consumers(self):
+        for environment_printer in self.environment_printers:
+            environment_printer.dec_sub_project()
+        self.environment_printers = []
+        for file_consumer in self.environment_file_consumers:
+            file_consumer.close()
+        self.environment_file_consumers = []
 
     def start(self, start_info=None):
         printer.print_header(self.banner.text(start_info))
+        if self.profile is not None:
+            self.profile.start()
 
     def include_failure(self, detail):
         self.result = FAILED
@@ -258,6 +384,18 @@ class ExecutionController:
         printer.print_warning(warning)
 
     def execute(self, exec_func, *args):
+        try:
+            return self.__execute(exec_func, *args)
+        finally:
+            # Buffered output is the most relevant when the execution ends with an unexpected error or exit, so is never left unprinted
+            self.flush()
+
+    def flush(self):
+        for environment_printer in self.environment_printers:
+            environment_printer.flush()
+        printer.flush()
+
+    def __execute(self, exec_func, *args):
         try:
             response = exec_func(*args)
         except project_sources.BuildValidationError as e:
@@ -272,7 +410,14 @@ class ExecutionController:
         return response
 
     def finalise(self):
+        self.close_environment_consumers()
+        if self.profile is not None:
+            self.profile.stop()
+            printer.print_section('Profile')
+            printer.print_lines(self.profile.report())
         printer.print_footer(self.banner.text(self.result), self.detail)
+        if self.journal_file_consumer is not None:
+            self.journal_file_consumer.close()
         if self.result == FAILED:
             exit(1)
         exit(0)
@@ -0,0 +1,374 @@
+import re
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from lmctl.cli.format import OutputFormat, TableFormat, Table, Column
+from lmctl.cli.format.output_format import to_output_data
+
+_KEYWORDS = ('and', 'or', 'not')
+_REGEX_SPECIAL_CHARACTERS = frozenset('.^$*+?{}[]\\|()')
+_TOKEN_PATTERN = re.compile(r'''\s*(?:(?P<open>\()|(?P<close>\))|(?P<operator>==|!=|!~|~|>=|<=|>|<)|(?P<quoted>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')|(?P<word>[^\s()=!~<>"']+))''')
+
+class ExpressionError(ValueError):
+    pass
+
+def compile_path(path: str) -> Callable[[Any], Any]:
+    """
+    Accessor for a dot separated path (e.g. properties.resourceManager or items.0.name), returning None when any part of it is missing
+    """
+    keys = path.split('.')
+    if any(len(k) == 0 for k in keys):
+        raise ExpressionError(f'Invalid field "{path}"')
+    if len(keys) == 1:
+        key = keys[0]
+        return lambda element: _get(element, key)
+    def accessor(element: Any) -> Any:
+        for key in keys:
+            element = _get(element, key)
+            if element is None:
+                return None
+        return element
+    return accessor
+
+def _get(element: Any, key: str) -> Any:
+    if isinstance(element, Mapping):
+        return element.get(key, None)
+    if isinstance(element, Sequence) and not isinstance(element, str):
+        try:
+            return element[int(key)]
+        except (ValueError, IndexError):
+            return None
+    return getattr(element, key, None)
+
+class FieldSelection:
+    """
+    Compiled "--fields" value: a comma separated list of paths to keep from each object.
+    Nested paths keep their structure, so "name,properties.resourceManager" keeps {"name": ..., "properties": {"resourceManager": ...}}
+    """
+
+    def __init__(self, expression: str):
+        self.paths = [p.strip() for p in expression.split(',') if len(p.strip()) > 0]
+        if len(self.paths) == 0:
+            raise ExpressionError('No fields given')
+        self._accessors = [(path.split('.'), compile_path(path)) for path in self.paths]
+        # A path inside another would be written into (or over) the value kept for the other, so only one of them can be used
+        for keys, _ in self._accessors:
+            for other_keys, _ in self._accessors:
+                if len(keys) < len(other_keys) and other_keys[:len(keys)] == keys:
+                    raise ExpressionError(f'Fields "{".".join(keys)}" and "{".".join(other_keys)}" overlap, use only one of them')
+
+    def apply(self, element: Any) -> Dict:
+        element = element if isinstance(element, Mapping) else to_output_data(element)
+        projected = {}
+        for keys, accessor in self._accessors:
+            target = projected
+            for key in keys[:-1]:
+                target = target.setdefault(key, {})
+            target[keys[-1]] = accessor(element)
+        return projected
+
+    def table_format(self) -> TableFormat:
+        table = Table()
+        table.columns = [Column(path, header=path, accessor=accessor) for path, (_, accessor) in zip(self.paths, self._accessors)]
+        return TableFormat(table=table)
+
+    def __repr__(self) -> str:
+        return f'FieldSelection({",".join(self.paths)!r})'
+
+class Comparison:
+
+    def __init__(self, path: str, operator: str, value: Optional[str]):
+        self.path = path
+        self.operator = operator
+        self.value = value
+
+    def compile(self) -> Callable[[Any], bool]:
+        accessor = compile_path(self.path)
+        value = self.value
+        if self.operator in ('~', '!~'):
+            try:
+                pattern = re.compile(value)
+            except re.error as e:
+                raise ExpressionError(f'Invalid regular expression "{value}" for "{self.path}": {e}') from e
+            if self.operator == '~':
+                return lambda element: _matches(pattern, accessor(element))
+            return lambda element: not _matches(pattern, accessor(element))
+        if self.operator in ('==', '!='):
+            equals = _equals_function(value)
+            if self.operator == '==':
+                return lambda element: equals(accessor(element))
+            return lambda element: not equals(accessor(element))
+        if value is None:
+            raise ExpressionError(f'Cannot use "{self.operator}" with null')
+        compare = _ORDERING[self.operator]
+        number = _to_number(value)
+        def ordered(element: Any) -> bool:
+            actual = accessor(element)
+            if actual is None or isinstance(actual, (bool, Mapping, list)):
+                return False
+            if number is not None and isinstance(actual, (int, float)):
+                return compare(actual, number)
+            return compare(str(actual), value)
+        return ordered
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Comparison) and (self.path, self.operator, self.value) == (other.path, other.operator, other.value)
+
+    def __repr__(self) -> str:
+        return f'Comparison({self.path!r}, {self.operator!r}, {self.value!r})'
+
+_ORDERING = {
+    '>': lambda a, b: a > b,
+    '>=': lambda a, b: a >= b,
+    '<': lambda a, b: a < b,
+    '<=': lambda a, b: a <= b
+}
+
+def _to_number(value: str) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def _matches(pattern, actual: Any) -> bool:
+    if actual is None:
+        return False
+    return pattern.search(actual if isinstance(actual, str) else str(actual)) is not None
+
+def _equals_function(value: Optional[str]) -> Callable[[Any], bool]:
+    if value is None:
+        return lambda actual: actual is None
+    number = _to_number(value)
+    lowered = value.lower()
+    def equals(actual: Any) -> bool:
+        if isinstance(actual, str):
+            return actual == value
+        if isinstance(actual, bool):
+            return str(actual).lower() == lowered
+        if isinstance(actual, (int, float)):
+            return number is not None and actual == number
+        return actual is not None and str(actual) == value
+    return equals
+
+class _Present:
+    """
+    A path on its own, true when it has a value other than null, false, an empty string or an empty list/object
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def compile(self) -> Callable[[Any], bool]:
+        accessor = compile_path(self.path)
+        return lambda element: bool(accessor(element))
+
+class _Not:
+
+    def __init__(self, operand):
+        self.operand = operand
+
+    def compile(self) -> Callable[[Any], bool]:
+        operand = self.operand.compile()
+        return lambda element: not operand(element)
+
+class _And:
+
+    def __init__(self, operands: List):
+        self.operands = operands
+
+    def compile(self) -> Callable[[Any], bool]:
+        operands = [o.compile() for o in self.operands]
+        return lambda element: all(o(element) for o in operands)
+
+class _Or:
+
+    def __init__(self, operands: List):
+        self.operands = operands
+
+    def compile(self) -> Callable[[Any], bool]:
+        operands = [o.compile() for o in self.operands]
+        return lambda element: any(o(element) for o in operands)
+
+def _tokenize(expression: str) -> List[Tuple[str, str]]:
+    tokens = []
+    position = 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = _TOKEN_PATTERN.match(expression, position)
+        if match is None or match.end() == position:
+            raise ExpressionError(f'Unexpected character at position {position + 1}: {expression[position:]}')
+        kind = match.lastgroup
+        text = match.group(kind)
+        if kind == 'quoted':
+            text = re.sub(r'\\(.)', r'\1', text[1:-1])
+        elif kind == 'word' and text.lower() in _KEYWORDS:
+            kind, text = 'keyword', text.lower()
+        tokens.append((kind, text))
+        position = match.end()
+    return tokens
+
+class _Parser:
+    """
+    Recursive descent over: or_expr := and_expr ("or" and_expr)*, and_expr := unary ("and" unary)*,
+    unary := "not" unary | "(" or_expr ")" | path [operator value]
+    """
+
+    def __init__(self, expression: str):
+        self.tokens = _tokenize(expression)
+        self.position = 0
+
+    def parse(self):
+        if len(self.tokens) == 0:
+            raise ExpressionError('Empty filter')
+        node = self._or()
+        if self.position < len(self.tokens):
+            raise ExpressionError(f'Unexpected "{self.tokens[self.position][1]}"')
+        return node
+
+    def _peek(self) -> Tuple[Optional[str], Optional[str]]:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None, None
+
+    def _next(self, description: str) -> Tuple[str, str]:
+        if self.position >= len(self.tokens):
+            raise ExpressionError(f'Expected {description} but reached the end of the filter')
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def _or(self):
+        operands = [self._and()]
+        while self._peek() == ('keyword', 'or'):
+            self.position += 1
+            operands.append(self._and())
+        return operands[0] if len(operands) == 1 else _Or(operands)
+
+    def _and(self):
+        operands = [self._unary()]
+        while self._peek() == ('keyword', 'and'):
+            self.position += 1
+            operands.append(self._unary())
+        return operands[0] if len(operands) == 1 else _And(operands)
+
+    def _unary(self):
+        kind, text = self._next('a field, "not" or "("')
+        if (kind, text) == ('keyword', 'not'):
+            return _Not(self._unary())
+        if kind == 'open':
+            node = self._or()
+            if self._next('")"')[0] != 'close':
+                raise ExpressionError('Expected ")"')
+            return node
+        if kind != 'word':
+            raise ExpressionError(f'Expected a field but found "{text}"')
+        path = text
+        if self._peek()[0] != 'operator':
+            return _Present(path)
+        _, operator = self._next('an operator')
+        kind, value = self._next(f'a value after "{path}{operator}"')
+        if kind not in ('word', 'quoted', 'keyword'):
+            raise ExpressionError(f'Expected a value after "{path}{operator}" but found "{value}"')
+        if kind == 'word' and value == 'null':
+            value = None
+        return Comparison(path, operator, value)
+
+class FilterExpression:
+    """
+    Compiled "--filter" value. Comparisons of a field path to a value are combined with and, or, not and parentheses:
+
+        state==Active and (name~^edge- or properties.site!=lab)
+
+    Operators: == and != (values are compared as numbers or true/false when the field is one, null matches a missing field),
+    ~ and !~ (regular expression search), >, >=, < and <= (numeric when both sides are numbers, otherwise as strings, so ISO times compare in order).
+    Quote values containing spaces or brackets. A field on its own is true when it is set and not empty
+    """
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        self._root = _Parser(expression).parse()
+        self.matches = self._root.compile()
+
+    def required_comparisons(self) -> List[Comparison]:
+        """
+        Comparisons every matching object must satisfy (those joined to the rest of the filter by "and"), which are safe to send to TNCO as query parameters
+        """
+        if isinstance(self._root, Comparison):
+            return [self._root]
+        if isinstance(self._root, _And):
+            return [o for o in self._root.operands if isinstance(o, Comparison)]
+        return []
+
+    def __repr__(self) -> str:
+        return f'FilterExpression({self.expression!r})'
+
+class Pushdown:
+    """
+    Maps comparisons on a field to an option of a get command, which the command sends to TNCO as a query parameter to reduce the objects returned.
+    The filter is still applied to the objects returned, so the option only needs to return a superset of the matches.
+
+    With contains=True the option is a partial match (such as --name-contains), set from == comparisons and regular expressions that are a plain
+    string (optionally anchored with ^ or $). With multiple=True the option accepts many values.
+    The comparison is not pushed down if the option, or any of the "skip_when" options, are already set
+    """
+
+    def __init__(self, path: str, option: str, contains: bool = False, multiple: bool = False, skip_when: Iterable[str] = None):
+        self.path = path
+        self.option = option
+        self.contains = contains
+        self.multiple = multiple
+        self.skip_when = list(skip_when or [])
+
+    def value_for(self, comparison: Comparison) -> Optional[str]:
+        if comparison.path != self.path or comparison.value is None:
+            return None
+        if comparison.operator == '==':
+            return comparison.value
+        if comparison.operator == '~' and self.contains:
+            literal = comparison.value
+            if literal.startswith('^'):
+                literal = literal[1:]
+            if literal.endswith('$'):
+                literal = literal[:-1]
+            if len(literal) > 0 and not any(c in _REGEX_SPECIAL_CHARACTERS for c in literal):
+                return literal
+        return None
+
+    def apply(self, filter_expression: FilterExpression, kwargs: Dict[str, Any]) -> bool:
+        if _is_set(kwargs.get(self.option, None)) or any(_is_set(kwargs.get(o, None)) for o in self.skip_when):
+            return False
+        for comparison in filter_expression.required_comparisons():
+            value = self.value_for(comparison)
+            if value is not None:
+                kwargs[self.option] = (value,) if self.multiple else value
+                return True
+        return False
+
+def _is_set(value: Any) -> bool:
+    if value is None or value is False:
+        return False
+    if isinstance(value, (tuple, list)):
+        return len(value) > 0
+    return True
+
+def push_down(filter_expression: FilterExpression, pushdowns: Iterable[Pushdown], kwargs: Dict[str, Any]) -> List[str]:
+    """
+    Set the options of a get command that the filter can be sent to TNCO as, returning the names of those set
+    """
+    return [p.option for p in pushdowns if p.apply(filter_expression, kwargs)]
+
+def select(elements: Iterable[Any], filter_expression: FilterExpression = None, fields: FieldSelection = None) -> Iterator[Any]:
+    """
+    Filter and project elements as they are iterated, so only the matching objects (and only the selected fields of them) reach the output format
+    """
+    for element in elements:
+        if filter_expression is not None and not filter_expression.matches(element):
+            continue
+        yield fields.apply(element) if fields is not None else element
+
+def select_output_format(output_formatter: OutputFormat, fields: FieldSelection = None) -> OutputFormat:
+    """
+    With "--fields", a table shows a column for each field instead of its usual columns
+    """
+    if fields is not None and isinstance(output_formatter, TableFormat):
+        return fields.table_format()
+    return output_formatter
@@ -1,5 +1,5 @@
 from .client import TNCOClient
-from .exceptions import TNCOClientError, TNCOClientHttpError
+from .exceptions import TNCOClientError, TNCOClientHttpError, TNCOClientNotFoundError
 from .client_builder import TNCOClientBuilder
 from .auth_type import AuthType
 from .auth_tracker import AuthTracker
@@ -8,7 +8,15 @@ from .pass_auth import UserPassAuth, LegacyUserPassAuth
 from .token_auth import JwtTokenAuth
 from .error_capture import TNCOErrorCapture, tnco_error_capture
 from .client_test_result import TestResult, TestResults
+from .client_benchmark import LatencyStats, BenchmarkResults
+from .execution_metrics import MetricSummary, MetricBucket
 from .client_request import TNCOClientRequest
+from .name_cache import NameCache
+from .response_cache import ResponseCache, MemoryCacheBackend, DiskCacheBackend, DEFAULT_CATALOG_TTLS
+from .admission import AdmissionController, TokenBucket
+from .template_renderer import LocalTemplateRenderer, TemplateRenderError
+from .assembly_watch import AssemblyWatcher, AssemblyChange
+from .intent_workflow import Workflow, WorkflowNode, WorkflowRunner, WorkflowState, WorkflowResult, NodeResult, WorkflowError, ProcessWaiter, read_workflow
 from .constants import *
 
 def builder():
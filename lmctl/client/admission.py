@@ -0,0 +1,208 @@
+import time
+import logging
+import threading
+import requests
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIN_CONCURRENCY = 1
+DEFAULT_MAX_CONCURRENCY = 16
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_MAX_RETRY_WAIT = 60
+DEFAULT_RETRY_BACKOFF = 0.5
+DEFAULT_LATENCY_TOLERANCE = 2.0
+DEFAULT_DECREASE_FACTOR = 0.5
+# Latency growth smaller than this (in seconds) is treated as noise, however small the lowest latency seen
+MIN_LATENCY_GROWTH = 0.05
+
+# Responses telling the client CP4NA orchestration is overloaded
+OVERLOAD_STATUS_CODES = (429, 503)
+# Methods which are safe to resend after a 503, as the server may have started on the first attempt.
+# A 429 means the request was rejected without being processed, so may be resent whatever the method
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE')
+
+def parse_retry_after(value: str, now: Callable[[], datetime] = None) -> Optional[float]:
+    """
+    Seconds to wait from a Retry-After header, given as a number of seconds or an HTTP date. Returns None when the value is missing or invalid
+    """
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if retry_at is None:
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    current = now() if now is not None else datetime.now(timezone.utc)
+    return max((retry_at - current).total_seconds(), 0.0)
+
+class TokenBucket:
+    """
+    Allows requests at an average of rate per second, with bursts of up to burst requests
+    """
+
+    def __init__(self, rate: float, burst: int = None, clock: Callable[[], float] = time.monotonic):
+        if rate <= 0:
+            raise ValueError(f'rate must be greater than 0 but was: {rate}')
+        self.rate = rate
+        self.burst = burst if burst is not None and burst > 0 else max(int(rate), 1)
+        self.clock = clock
+        self.tokens = float(self.burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take a token, returning how long (in seconds) to wait before using it.
+        Tokens may be taken before they are available, so waiting callers are served in the order they reserved
+        """
+        with self._lock:
+            now = self.clock()
+            self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+class AdmissionController:
+    """
+    Limits the requests a TNCOClient sends to CP4NA orchestration, shared by every thread using the client.
+
+    - requests_per_second (optional) limits the rate of requests with a token bucket, allowing bursts of up to burst requests
+    - The number of requests in flight is limited and adjusted with AIMD (additive increase, multiplicative decrease): the limit grows
+      by one for each full window of successful responses, up to max_concurrency, and is multiplied by decrease_factor (no lower than min_concurrency)
+      on a 429/503 response, a timeout or connection error, or the recent latency growing beyond latency_tolerance times the lowest latency seen.
+      The limit is decreased at most once per round trip, so one burst of errors only counts once
+    - A 429/503 response is retried up to max_retries times, after the wait given by its Retry-After header (or an exponential backoff).
+      A Retry-After on a retried response holds back every request on the client, not just the one retried. Responses asking for a wait longer than max_retry_wait
+      are returned as they are, without holding back later requests
+    """
+
+    def __init__(self, requests_per_second: float = None, burst: int = None, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                    min_concurrency: int = DEFAULT_MIN_CONCURRENCY, max_retries: int = DEFAULT_MAX_RETRIES, max_retry_wait: float = DEFAULT_MAX_RETRY_WAIT,
+                    latency_tolerance: float = DEFAULT_LATENCY_TOLERANCE, decrease_factor: float = DEFAULT_DECREASE_FACTOR,
+                    clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        if min_concurrency < 1 or max_concurrency < min_concurrency:
+            raise ValueError(f'Concurrency limits must be at least 1, with max_concurrency no less than min_concurrency, but were: {min_concurrency}, {max_concurrency}')
+        self.bucket = TokenBucket(requests_per_second, burst=burst, clock=clock) if requests_per_second is not None else None
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.max_retries = max_retries
+        self.max_retry_wait = max_retry_wait
+        self.latency_tolerance = latency_tolerance
+        self.decrease_factor = decrease_factor
+        self.clock = clock
+        self.sleep = sleep
+        self.limit = float(max_concurrency)
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self.baseline_latency = None
+        self.recent_latency = None
+        self._last_decrease = None
+        self._condition = threading.Condition()
+
+    @property
+    def concurrency_limit(self) -> int:
+        return max(int(self.limit), self.min_concurrency)
+
+    def acquire(self) -> float:
+        """
+        Wait until a request may be sent, returning the time it was admitted (pass it to release once the request completes)
+        """
+        with self._condition:
+            while self.in_flight >= self.concurrency_limit:
+                self._condition.wait()
+            self.in_flight += 1
+        wait = self.bucket.reserve() if self.bucket is not None else 0.0
+        wait = max(wait, self.blocked_until - self.clock())
+        if wait > 0:
+            logger.debug(f'Holding request for {wait:.3f}s to stay within the CP4NA orchestration rate limit')
+            self.sleep(wait)
+        return self.clock()
+
+    def release(self, admitted_at: float, overloaded: bool = False, retry_after: float = None):
+        """
+        Record the outcome of a request admitted at admitted_at, letting the next waiting request through
+        """
+        now = self.clock()
+        latency = now - admitted_at
+        with self._condition:
+            self.in_flight -= 1
+            if retry_after is not None:
+                self.blocked_until = max(self.blocked_until, now + min(retry_after, self.max_retry_wait))
+            if overloaded:
+                self._decrease(now, 'overloaded')
+            else:
+                self._observe_latency(latency)
+                if self._latency_grown():
+                    self._decrease(now, f'latency grew to {self.recent_latency:.3f}s')
+                elif self.limit < self.max_concurrency:
+                    self.limit = min(self.limit + 1 / self.limit, float(self.max_concurrency))
+            self._condition.notify_all()
+
+    def _observe_latency(self, latency: float):
+        if self.baseline_latency is None:
+            self.baseline_latency = self.recent_latency = latency
+            return
+        self.recent_latency = 0.8 * self.recent_latency + 0.2 * latency
+        # Drift slowly towards higher latencies, so a server which becomes slower for good does not keep the limit down
+        self.baseline_latency = min(latency, self.baseline_latency + 0.01 * (latency - self.baseline_latency))
+
+    def _latency_grown(self) -> bool:
+        return self.recent_latency > self.baseline_latency * self.latency_tolerance and self.recent_latency - self.baseline_latency > MIN_LATENCY_GROWTH
+
+    def _decrease(self, now: float, reason: str):
+        round_trip = self.recent_latency if self.recent_latency is not None else 0.0
+        if self._last_decrease is not None and now - self._last_decrease < round_trip:
+            return
+        self._last_decrease = now
+        self.limit = max(self.limit * self.decrease_factor, float(self.min_concurrency))
+        # Start measuring latency again at the new limit
+        self.recent_latency = self.baseline_latency
+        logger.debug(f'CP4NA orchestration {reason}, reduced concurrent request limit to {self.concurrency_limit}')
+
+    def _retry_wait(self, response: requests.Response, attempt: int) -> Tuple[Optional[float], bool]:
+        retry_after = parse_retry_after(response.headers.get('Retry-After', None))
+        if retry_after is not None:
+            return retry_after, True
+        return min(DEFAULT_RETRY_BACKOFF * (2 ** attempt), self.max_retry_wait), False
+
+    def send(self, send_request: Callable[[], requests.Response], retry_status_codes: Tuple[int, ...] = OVERLOAD_STATUS_CODES) -> requests.Response:
+        """
+        Send a request (by calling send_request) once admitted, retrying responses with a status in retry_status_codes
+        """
+        attempt = 0
+        while True:
+            admitted_at = self.acquire()
+            try:
+                response = send_request()
+            except (requests.Timeout, requests.ConnectionError):
+                self.release(admitted_at, overloaded=True)
+                raise
+            except BaseException:
+                self.release(admitted_at)
+                raise
+            overloaded = response.status_code in OVERLOAD_STATUS_CODES
+            if not overloaded:
+                self.release(admitted_at)
+                return response
+            wait, from_header = self._retry_wait(response, attempt)
+            retry = response.status_code in retry_status_codes and attempt < self.max_retries and wait <= self.max_retry_wait
+            # Only hold back other requests for a wait this request will honour, a response returned as it is should not stall the next request
+            self.release(admitted_at, overloaded=True, retry_after=wait if from_header and retry else None)
+            if not retry:
+                return response
+            attempt += 1
+            logger.debug(f'CP4NA orchestration responded with {response.status_code}, retrying in {wait:.3f}s (attempt {attempt} of {self.max_retries})')
+            if not from_header:
+                # A Retry-After wait is applied by acquire, as it holds back all requests
+                self.sleep(wait)
@@ -4,9 +4,9 @@ from .behaviour_assembly_configurations import BehaviourAssemblyConfigurationsAP
 from .behaviour_projects import BehaviourProjectsAPI
 from .behaviour_scenarios import BehaviourScenariosAPI
 from .behaviour_scenario_executions import BehaviourScenarioExecutionsAPI
-from .deployment_locations import DeploymentLocationAPI
+from .deployment_locations import DeploymentLocationAPI, DeploymentLocationChange
 from .descriptors import DescriptorsAPI
-from .descriptor_templates import DescriptorTemplatesAPI
+from .descriptor_templates import DescriptorTemplatesAPI, BatchRenderItem, BatchRenderResult
 from .lifecycle_drivers import LifecycleDriversAPI
 from .processes import ProcessesAPI
 from .resource_drivers import ResourceDriversAPI
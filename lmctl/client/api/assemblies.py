@@ -1,13 +1,14 @@
 import urllib
-from typing import List, Dict, Union
-from lmctl.client.exceptions import TNCOClientError
+from typing import List, Dict, Union, Tuple, Optional
+from lmctl.client.exceptions import TNCOClientError, TNCOClientNotFoundError, TNCOClientHttpError
 from lmctl.client.models import (CreateAssemblyIntent, UpgradeAssemblyIntent, ChangeAssemblyStateIntent, 
                                     DeleteAssemblyIntent, ScaleAssemblyIntent, HealAssemblyIntent,
                                     AdoptAssemblyIntent, CreateOrUpgradeAssemblyIntent, Intent)
 
 from lmctl.client.client_request import TNCOClientRequest
 from .tnco_api_base import TNCOAPI
-from lmctl.client.utils import build_relative_endpoint, read_response_location_header
+from lmctl.client.utils import build_relative_endpoint, read_response_location_header, read_response_body_as_json
+from lmctl.utils.concurrency import run_concurrently, DEFAULT_MAX_WORKERS
 
 class AssembliesAPI(TNCOAPI):
     topology_endpoint = 'api/topology/assemblies'
@@ -21,18 +22,101 @@ class AssembliesAPI(TNCOAPI):
         return self._get_json(self.topology_endpoint)
 
     def get_by_name(self, name: str) -> Dict:
+        """
+        Get the Assembly with a name. When the ID of the name is in the client's name cache, the Assembly is requested by ID instead
+        (falling back to a search by name if it has since been deleted or renamed)
+        """
+        cache = self.base_client.assembly_name_cache
+        id_value = cache.get(name)
+        if id_value is not None:
+            assembly = self._get_cached(id_value)
+            if assembly is not None and assembly.get('name') == name:
+                return assembly
+            cache.invalidate(name)
         result = self.all_with_name(name)
         if len(result) == 0:
-            raise TNCOClientError(f'No Assembly found with name matching "{name}"')
+            raise TNCOClientNotFoundError(f'No Assembly found with name matching "{name}"')
         else:
+            self._remember_ids(result[:1])
             return result[0]
 
+    def _get_cached(self, id_value: str) -> Optional[Dict]:
+        try:
+            return self.get(id_value)
+        except TNCOClientHttpError as e:
+            if e.status_code == 404:
+                return None
+            raise
+
     def all_with_name(self, name: str) -> List:
         return self._get_json(self.topology_endpoint, query_params={'name': name})
 
     def all_with_name_containing(self, search_string: str) -> List:
         return self._get_json(self.topology_endpoint, query_params={'nameContains': search_string})
 
+    def poll(self, name_contains: str = None, etag: str = None) -> Tuple[Optional[List], Optional[str]]:
+        """
+        Get the most recently changed Assemblies, or those with a name containing name_contains, bypassing any response cache.
+
+        When etag (from a previous poll) is given it is sent as If-None-Match, so an unchanged result is not downloaded again.
+        Returns the Assemblies (or None if the server reports no change) and the ETag to send on the next poll
+        """
+        request = TNCOClientRequest.build_request_for_json(endpoint=self.topology_endpoint)
+        if name_contains is not None:
+            request.query_params['nameContains'] = name_contains
+        if etag is not None:
+            request.headers['If-None-Match'] = etag
+        response = self.base_client.make_request(request)
+        if response.status_code == 304:
+            return None, etag
+        return self._extract_assemblies(read_response_body_as_json(response)), response.headers.get('ETag', None)
+
+    def resolve_id_by_name(self, name: str) -> str:
+        return self.resolve_ids_by_name([name])[name]
+
+    def resolve_ids_by_name(self, names: List[str], prefix: str = None, ignore_missing: bool = False, max_workers: int = DEFAULT_MAX_WORKERS) -> Dict[str, str]:
+        """
+        Resolve the IDs of many Assemblies by name. Names found in the client's name cache are not requested again.
+
+        If prefix is set, a single "nameContains" query is made first to resolve any names it matches in one request.
+        The remaining names are looked up concurrently, using at most max_workers requests at a time.
+        """
+        cache = self.base_client.assembly_name_cache
+        resolved = {}
+        missing = []
+        for name in dict.fromkeys(names):
+            id_value = cache.get(name)
+            if id_value is not None:
+                resolved[name] = id_value
+            else:
+                missing.append(name)
+        if prefix is not None and len(missing) > 0:
+            self._remember_ids(self._extract_assemblies(self.all_with_name_containing(prefix)))
+            still_missing = []
+            for name in missing:
+                id_value = cache.get(name)
+                if id_value is not None:
+                    resolved[name] = id_value
+                else:
+                    still_missing.append(name)
+            missing = still_missing
+        for task in run_concurrently(self.get_by_name, missing, max_workers=max_workers, catchable_exceptions=(TNCOClientError,)):
+            if task.failed:
+                if not ignore_missing or not isinstance(task.error, TNCOClientNotFoundError):
+                    raise task.error
+            else:
+                resolved[task.item] = task.value.get('id')
+        return resolved
+
+    def _extract_assemblies(self, result) -> List:
+        if isinstance(result, dict):
+            return result.get('assemblies', [])
+        return result or []
+
+    def _remember_ids(self, assemblies: List):
+        names_to_ids = {a.get('name'): a.get('id') for a in assemblies if isinstance(a, dict)}
+        self.base_client.assembly_name_cache.put_all(names_to_ids)
+
     def intent(self, intent_name: str, intent_obj: Union[Dict, 
                                                         AdoptAssemblyIntent,
                                                         CreateAssemblyIntent, 
@@ -53,7 +137,13 @@ class AssembliesAPI(TNCOAPI):
         return self._intent_request_impl('createOrUpgradeAssembly', intent_obj)
 
     def intent_delete(self, intent_obj: Union[Dict, DeleteAssemblyIntent]) -> str:
-        return self._intent_request_impl('deleteAssembly', intent_obj)
+        process_id = self._intent_request_impl('deleteAssembly', intent_obj)
+        intent_obj_data = intent_obj.to_dict() if isinstance(intent_obj, Intent) else intent_obj
+        if intent_obj_data.get('assemblyName', None) is not None:
+            self.base_client.assembly_name_cache.invalidate(intent_obj_data.get('assemblyName'))
+        if intent_obj_data.get('assemblyId', None) is not None:
+            self.base_client.assembly_name_cache.invalidate_id(intent_obj_data.get('assemblyId'))
+        return process_id
 
     def intent_change_state(self, intent_obj: Union[Dict, ChangeAssemblyStateIntent]) -> str:
         return self._intent_request_impl('changeAssemblyState', intent_obj)
@@ -1,5 +1,7 @@
 from typing import List, Dict
 from lmctl.client.client_request import TNCOClientRequest
+from lmctl.client.exceptions import TNCOClientError
+from lmctl.utils.concurrency import run_concurrently, TaskResult, DEFAULT_MAX_WORKERS
 from .tnco_api_base import TNCOAPI
 class BehaviourScenarioExecutionsAPI(TNCOAPI):
     endpoint = 'api/behaviour/executions'
@@ -54,6 +56,13 @@ class BehaviourScenarioExecutionsAPI(TNCOAPI):
         endpoint = self._execution_metrics_endpoint(execution_id)
         return self._get_json(endpoint=endpoint)
 
+    def get_metrics_of_executions(self, execution_ids: List[str], max_workers: int = DEFAULT_MAX_WORKERS) -> List[TaskResult]:
+        """
+        Get the metrics of many executions, using at most max_workers requests at a time. Returns a TaskResult for each execution ID (the item), 
+        with the metrics of the execution as the value or the error when the request failed, so one failure does not lose the others
+        """
+        return run_concurrently(self.get_metrics, list(dict.fromkeys(execution_ids)), max_workers=max_workers, catchable_exceptions=(TNCOClientError,))
+
     def get_metric(self, execution_id: str, metric_id: str) -> Dict:
         endpoint = self._execution_metric_endpoint(execution_id, metric_id)
         return self._get_json(endpoint=endpoint)
@@ -1,6 +1,30 @@
+from dataclasses import dataclass
 from typing import List, Dict
+from lmctl.client.exceptions import TNCOClientError
+from lmctl.utils.concurrency import run_concurrently, DEFAULT_MAX_WORKERS
 from .tnco_api_base import TNCOAPI
 
+# Attributes set by the server, which are not compared or exported
+GENERATED_ATTRIBUTES = ['id']
+
+CREATE_ACTION = 'create'
+UPDATE_ACTION = 'update'
+UNCHANGED_ACTION = 'unchanged'
+
+@dataclass
+class DeploymentLocationChange:
+    """
+    Change needed (and, once applied, the outcome) to make a Deployment Location on the server match a local copy
+    """
+    name: str
+    action: str
+    location: Dict
+    error: Exception = None
+
+    @property
+    def failed(self):
+        return self.error is not None
+
 class DeploymentLocationAPI(TNCOAPI):
     endpoint = 'api/deploymentLocations'
 
@@ -20,4 +44,53 @@ class DeploymentLocationAPI(TNCOAPI):
         self._delete(id_value=id)
 
     def all_with_name(self, name: str) -> List:
-        return self._get_json(self.endpoint, query_params={'name': name})
\ No newline at end of file
+        return self._get_json(self.endpoint, query_params={'name': name})
+
+    def export_all(self) -> List[Dict]:
+        """
+        All Deployment Locations, without the attributes generated by the server, so they may be applied to another environment
+        """
+        return [{k: v for k, v in location.items() if k not in GENERATED_ATTRIBUTES} for location in self.all()]
+
+    def plan_apply(self, locations: List[Dict]) -> List[DeploymentLocationChange]:
+        """
+        Compare locations with those on the server (fetched once) to decide which must be created or updated. 
+        A location is only updated when one of its attributes differs from the server
+        """
+        existing = {location.get('name'): location for location in self.all()}
+        changes = []
+        for location in locations:
+            name = location.get('name', None)
+            if name is None:
+                raise TNCOClientError(f'Deployment Location is missing a "name" attribute: {location}')
+            current = existing.get(name, None)
+            if current is None:
+                changes.append(DeploymentLocationChange(name, CREATE_ACTION, location))
+            elif self._differs(location, current):
+                merged = {**current, **location, 'id': current.get('id', name)}
+                changes.append(DeploymentLocationChange(name, UPDATE_ACTION, merged))
+            else:
+                changes.append(DeploymentLocationChange(name, UNCHANGED_ACTION, current))
+        return changes
+
+    def apply_all(self, locations: List[Dict], max_workers: int = DEFAULT_MAX_WORKERS, dry_run: bool = False) -> List[DeploymentLocationChange]:
+        """
+        Create or update each of the locations that differ from the server, at most max_workers at a time. 
+        Failures are recorded on the returned changes rather than raised
+        """
+        changes = self.plan_apply(locations)
+        if dry_run:
+            return changes
+        pending = [change for change in changes if change.action != UNCHANGED_ACTION]
+        for task in run_concurrently(self._apply_change, pending, max_workers=max_workers, catchable_exceptions=(TNCOClientError,)):
+            task.item.error = task.error
+        return changes
+
+    def _apply_change(self, change: DeploymentLocationChange):
+        if change.action == CREATE_ACTION:
+            self.create(dict(change.location))
+        else:
+            self.update(change.location)
+
+    def _differs(self, location: Dict, current: Dict) -> bool:
+        return any(current.get(k, None) != v for k, v in location.items() if k not in GENERATED_ATTRIBUTES)
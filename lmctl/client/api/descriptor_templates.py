@@ -1,7 +1,56 @@
-from typing import Dict
+import json
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, Iterable, Iterator
 from lmctl.client.client_request import TNCOClientRequest
+from lmctl.client.exceptions import TNCOClientError
+from lmctl.utils.concurrency import run_concurrently, DEFAULT_MAX_WORKERS
 from .descriptors import DescriptorsAPI
 
+# Number of render requests, per worker, read from the input before waiting for their results
+BATCH_WINDOW_PER_WORKER = 4
+# Number of successful render results kept (least recently used dropped first) so repeats later in a batch are not sent again
+BATCH_RESULT_CACHE_SIZE = 1024
+
+@dataclass
+class BatchRenderItem:
+    """
+    One render request in a batch. request_id identifies the item in the results (and output files)
+    """
+    template_name: str
+    render_request: Dict = None
+    request_id: str = None
+
+    @staticmethod
+    def from_dict(data: Dict, default_template_name: str = None, default_request_id: str = None) -> 'BatchRenderItem':
+        """
+        Read an item from a dict with a "template" name, an optional "id" and the remaining keys (e.g. "properties") as the render request 
+        """
+        if not isinstance(data, dict):
+            raise ValueError(f'Expected a render request object but got: {type(data).__name__}')
+        render_request = dict(data)
+        template_name = render_request.pop('template', default_template_name)
+        if template_name is None:
+            raise ValueError('Render request does not contain a "template" attribute')
+        request_id = render_request.pop('id', default_request_id)
+        return BatchRenderItem(template_name, render_request, str(request_id) if request_id is not None else None)
+
+    def cache_key(self, raw: bool) -> str:
+        content = json.dumps([self.template_name, raw, self.render_request or {}], sort_keys=True, default=str)
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+@dataclass
+class BatchRenderResult:
+    item: BatchRenderItem
+    result: Any = None
+    error: Exception = None
+    duplicate: bool = False
+
+    @property
+    def failed(self):
+        return self.error is not None
+
 class DescriptorTemplatesAPI(DescriptorsAPI):
     endpoint = 'api/catalog/descriptorTemplates'
 
@@ -12,7 +61,7 @@ class DescriptorTemplatesAPI(DescriptorsAPI):
             self.override_address = None
         super().__init__(base_client)
 
-    def render(self, template_name: str, render_request: Dict) -> Dict:
+    def render(self, template_name: str, render_request: Dict, session: Any = None) -> Dict:
         if render_request is None:
             render_request = {}
         endpoint = self._render_endpoint(template_name)
@@ -21,9 +70,11 @@ class DescriptorTemplatesAPI(DescriptorsAPI):
                         .add_headers({'Accept': 'application/yaml'})
         if self.override_address is not None:
             request.override_address = self.override_address
+        if session is not None:
+            request.use_session(session)
         return self._exec_request_and_parse_yaml(request)
 
-    def render_raw(self, template_name: str, render_request: Dict) -> str:
+    def render_raw(self, template_name: str, render_request: Dict, session: Any = None) -> str:
         if render_request is None:
             render_request = {}
         endpoint = self._render_raw_endpoint(template_name)
@@ -32,6 +83,8 @@ class DescriptorTemplatesAPI(DescriptorsAPI):
                         .add_headers({'Accept': 'text/plain'})
         if self.override_address is not None:
             request.override_address = self.override_address
+        if session is not None:
+            request.use_session(session)
         return self._exec_request_and_parse_plaintext(request)
 
     def _render_endpoint(self, template_name: str) -> str:
@@ -40,3 +93,51 @@ class DescriptorTemplatesAPI(DescriptorsAPI):
     def _render_raw_endpoint(self, template_name: str) -> str:
         return f'{self.endpoint}/{template_name}/render-raw'
 
+    def render_batch(self, items: Iterable[BatchRenderItem], raw: bool = False, max_workers: int = DEFAULT_MAX_WORKERS) -> Iterator[BatchRenderResult]:
+        """
+        Render many requests, against one or more templates, concurrently on a pooled connection.
+
+        Results are yielded in the order of items, as each window of requests completes, so items may be a (lazy) stream. 
+        Identical requests (same template and render request) are only sent once, the repeats are given the same result (marked as duplicate).
+        Repeats in later windows reuse the last BATCH_RESULT_CACHE_SIZE successful results (by cache_key), so failed renders are sent again.
+        Failed renders are reported on the result rather than raised
+        """
+        render_func = self.render_raw if raw else self.render
+        window_size = max(max_workers, 1) * BATCH_WINDOW_PER_WORKER
+        results_cache = OrderedDict()
+        with self.base_client.pooled_session(pool_size=max_workers) as session:
+            window = []
+            for item in items:
+                window.append(item)
+                if len(window) >= window_size:
+                    yield from self._render_window(window, raw, render_func, session, max_workers, results_cache)
+                    window = []
+            if len(window) > 0:
+                yield from self._render_window(window, raw, render_func, session, max_workers, results_cache)
+
+    def _render_window(self, window, raw, render_func, session, max_workers: int, results_cache: OrderedDict) -> Iterator[BatchRenderResult]:
+        keys = [item.cache_key(raw) for item in window]
+        completed = {}
+        for key in keys:
+            if key in results_cache and key not in completed:
+                results_cache.move_to_end(key)
+                completed[key] = (results_cache[key], None)
+        pending = {}
+        for key, item in zip(keys, window):
+            if key not in completed and key not in pending:
+                pending[key] = item
+        tasks = run_concurrently(lambda key: render_func(template_name=pending[key].template_name, render_request=pending[key].render_request, session=session), 
+                                    pending.keys(), max_workers=max_workers, catchable_exceptions=(TNCOClientError,))
+        for task in tasks:
+            completed[task.item] = (task.value, task.error)
+            if not task.failed:
+                results_cache[task.item] = task.value
+                if len(results_cache) > BATCH_RESULT_CACHE_SIZE:
+                    results_cache.popitem(last=False)
+        del tasks
+        last_use = {key: index for index, key in enumerate(keys)}
+        for index, (key, item) in enumerate(zip(keys, window)):
+            # Results are dropped from the window once yielded for the last item that needs them (the cache keeps its own reference)
+            value, error = completed.pop(key) if last_use[key] == index else completed[key]
+            duplicate = pending.get(key, None) is not item
+            yield BatchRenderResult(item, result=value, error=error, duplicate=duplicate)
@@ -12,19 +12,19 @@ class DescriptorsAPI(TNCOAPI):
     def create(self, descriptor: Dict):
         request = TNCOClientRequest(method='POST', endpoint=self.endpoint).add_yaml_body(descriptor)
         request.override_address = getattr(self, 'override_address') if hasattr(self, 'override_address') else None
-        self._exec_request(request)
+        self._exec_mutating_request(request, self.endpoint)
 
     def update(self, descriptor: Dict):
         request = TNCOClientRequest(method='PUT', 
                                     endpoint=build_relative_endpoint_from_data(data_dict=descriptor, id_attr='name', base_endpoint=self.endpoint)
                                 ).add_yaml_body(descriptor)
         request.override_address = getattr(self, 'override_address') if hasattr(self, 'override_address') else None
-        self._exec_request(request)
+        self._exec_mutating_request(request, self.endpoint)
 
     def delete(self, name: str):
         request = TNCOClientRequest(method='DELETE', endpoint=build_relative_endpoint(id_value=name, base_endpoint=self.endpoint))
         request.override_address = getattr(self, 'override_address') if hasattr(self, 'override_address') else None
-        self._exec_request(request)
+        self._exec_mutating_request(request, self.endpoint)
 
     def get(self, name: str, effective: bool = None) -> Dict:
         query_params = {}
@@ -1,6 +1,9 @@
+from datetime import datetime, timedelta, timezone
 from typing import List, Dict
 from .tnco_api_base import TNCOAPI
 from lmctl.client.client_request import TNCOClientRequest
+from lmctl.client.exceptions import TNCOClientError
+from lmctl.utils.concurrency import run_concurrently, DEFAULT_MAX_WORKERS
 
 class ProcessesAPI(TNCOAPI):
     endpoint = 'api/processes'
@@ -11,5 +14,45 @@ class ProcessesAPI(TNCOAPI):
             query_params['shallow'] = shallow
         return self._get(id_value=id, query_params=query_params)
 
-    def query(self, **query_params) -> List:
-        return self._get_json(self.endpoint, query_params=query_params)
+    def query(self, lazy: bool = False, **query_params) -> List:
+        """
+        Query processes. With lazy, the result is a RecordList, holding the raw response and decoding each process only when it is read
+        """
+        return self._get_json(self.endpoint, query_params=query_params, lazy=lazy)
+
+    def query_in_windows(self, start: datetime, end: datetime, window: timedelta, max_workers: int = DEFAULT_MAX_WORKERS, lazy: bool = False, **query_params) -> List:
+        """
+        Query the processes between start and end by splitting the range into windows, queried concurrently (at most max_workers at a time).
+        Processes returned by more than one window (e.g. on a boundary) are only included once, when they have an id.
+        Any other query_params (such as intentTypes) are added to the query of every window.
+        With lazy, each window is kept as a RecordList and the processes returned are its Records (see query)
+        """
+        if window.total_seconds() <= 0:
+            raise ValueError(f'window must be greater than 0 but was: {window}')
+        windows = []
+        window_start = start
+        while window_start < end:
+            window_end = min(window_start + window, end)
+            windows.append((window_start, window_end))
+            window_start = window_end
+        def query_window(time_range):
+            return self.query(lazy=lazy, **query_params, startDateTime=self._format_time(time_range[0]), endDateTime=self._format_time(time_range[1]))
+        processes = []
+        seen_ids = set()
+        for task in run_concurrently(query_window, windows, max_workers=max_workers, catchable_exceptions=(TNCOClientError,)):
+            if task.failed:
+                raise task.error
+            for process in task.value or []:
+                # Only processes with an id can be recognised as repeats, the others are all kept
+                process_id = process.get('id')
+                if process_id is not None:
+                    if process_id in seen_ids:
+                        continue
+                    seen_ids.add(process_id)
+                processes.append(process)
+        return processes
+
+    def _format_time(self, value: datetime) -> str:
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.strftime('%Y-%m-%dT%H:%M:%S.') + f'{value.microsecond // 1000:03d}Z'
@@ -5,6 +5,8 @@ from lmctl.client.utils import read_response_body_as_json
 class ResourceManagersAPI(TNCOAPI):
     endpoint = 'api/resource-managers'
     id_attr = 'name'
+    # Onboarding a Resource Manager creates or updates the descriptors of the Resources it manages
+    dependent_endpoints = ['api/catalog/descriptors']
 
     def all(self) -> List:
         return self._all()
@@ -2,16 +2,18 @@ from typing import Union
 from pathlib import Path
 from lmctl.client.client_request import TNCOClientRequest
 from .tnco_api_base import TNCOAPI
-from lmctl.client.utils import build_relative_endpoint
+from lmctl.client.utils import build_relative_endpoint, read_response_location_header
 
 class ResourcePackagesAPI(TNCOAPI):
     endpoint = 'api/resource-manager/resource-packages'
+    # Pushing a package creates or updates the descriptors it contains
+    dependent_endpoints = ['api/catalog/descriptors']
 
     def create(self, resource_pkg_path: Union[str,Path]) -> str:
         with open(resource_pkg_path, 'rb') as resource_pkg:
             files = {'file': resource_pkg}
             request = TNCOClientRequest(method='POST', endpoint=self.endpoint).add_files(files)
-            return self._exec_request_and_get_location_header(request)
+            return self._exec_mutating_request(request, self.endpoint, response_handler=read_response_location_header)
 
     def update(self, resource_name: str, resource_pkg_path: Union[str,Path]):
         with open(resource_pkg_path, 'rb') as resource_pkg:
@@ -19,7 +21,7 @@ class ResourcePackagesAPI(TNCOAPI):
             request = TNCOClientRequest(method='PUT', 
                                         endpoint=build_relative_endpoint(base_endpoint=self.endpoint, id_value=resource_name)
                                     ).add_files(files)
-            self._exec_request(request)
+            self._exec_mutating_request(request, self.endpoint)
 
     def delete(self, resource_name: str):
         self._delete(id_value=resource_name)
@@ -1,9 +1,10 @@
 from typing import Dict, Callable, List
 from lmctl.client.client_request import TNCOClientRequest
 from lmctl.client.exceptions import TNCOClientError
+from lmctl.client.response_cache import ResponseCache
 from lmctl.client.utils import (build_relative_endpoint, convert_dict_to_json, build_relative_endpoint_from_data, 
                         read_response_location_header, read_response_body_as_json, read_response_body_as_yaml, 
-                        read_response_body_as_plaintext)
+                        read_response_body_as_plaintext, read_response_body_as_records)
 import yaml
 import json
 import requests
@@ -14,21 +15,46 @@ def default_create_response_handler_placeholder(response):
 
 class TNCOAPI:
     id_attr = 'id'
+    # Endpoints of other APIs whose objects the server also creates, updates or deletes when this API changes an object (so their cached responses are invalidated too)
+    dependent_endpoints = []
 
     def __init__(self, base_client: 'TNCOClient'):
         self.base_client = base_client
 
-    def _get_json(self, endpoint: str, query_params: Dict[str,str] = None):
+    def _get_json(self, endpoint: str, query_params: Dict[str,str] = None, lazy: bool = False):
         request = TNCOClientRequest.build_request_for_json(endpoint=endpoint)
         if query_params is not None:
             request.query_params.update(query_params)
+        if lazy:
+            return self._exec_request(request, response_handler=read_response_body_as_records)
         return self._exec_request_and_parse_json(request)
 
+    def _response_cache(self) -> ResponseCache:
+        response_cache = getattr(self.base_client, 'response_cache', None)
+        return response_cache if isinstance(response_cache, ResponseCache) else None
+
+    def _invalidate_cache(self, endpoint: str = None):
+        response_cache = self._response_cache()
+        if response_cache is not None:
+            response_cache.invalidate(endpoint if endpoint is not None else self.endpoint)
+
     def _exec_request(self, request: TNCOClientRequest, response_handler: Callable = None):
-        response = self.base_client.make_request(request)
+        response_cache = self._response_cache()
+        if response_cache is not None and response_cache.is_cacheable(request):
+            response = response_cache.fetch(self.base_client, request)
+        else:
+            response = self.base_client.make_request(request)
         if response_handler is not None:
             return response_handler(response=response)
 
+    def _exec_mutating_request(self, request: TNCOClientRequest, invalidated_endpoint: str, response_handler: Callable = None):
+        try:
+            return self._exec_request(request, response_handler=response_handler)
+        finally:
+            self._invalidate_cache(invalidated_endpoint)
+            for dependent_endpoint in self.dependent_endpoints:
+                self._invalidate_cache(dependent_endpoint)
+
     def _exec_request_and_parse_json(self, request: TNCOClientRequest) -> Dict:
         return self._exec_request(request, response_handler=read_response_body_as_json)
 
@@ -62,11 +88,11 @@ class TNCOAPI:
             endpoint = self.endpoint
         request = TNCOClientRequest(method='POST', endpoint=endpoint).add_json_body(obj)
         if response_handler == default_create_response_handler_placeholder:
-            id_value = self._exec_request(request, response_handler=read_response_location_header)
+            id_value = self._exec_mutating_request(request, endpoint, response_handler=read_response_location_header)
             obj[self.id_attr] = id_value
             return obj
         else:
-            return self._exec_request(request, response_handler=response_handler)
+            return self._exec_mutating_request(request, endpoint, response_handler=response_handler)
 
     def _update(self, obj: Dict, id_attr: str  = None, endpoint: str = None, response_handler: Callable = None):
         if id_attr is None:
@@ -77,7 +103,7 @@ class TNCOAPI:
                         method='PUT',
                         endpoint=build_relative_endpoint_from_data(data_dict=obj, id_attr=id_attr, base_endpoint=endpoint)
                     ).add_json_body(obj)
-        return self._exec_request(request, response_handler=response_handler)
+        return self._exec_mutating_request(request, endpoint, response_handler=response_handler)
 
     def _delete(self, id_value: str, endpoint: str = None):
         if endpoint is None:
@@ -86,4 +112,4 @@ class TNCOAPI:
             method='DELETE',
             endpoint=build_relative_endpoint(base_endpoint=endpoint, id_value=id_value)
         )
-        self._exec_request(request)
\ No newline at end of file
+        self._exec_mutating_request(request, endpoint)
\ No newline at end of file
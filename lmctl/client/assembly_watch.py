@@ -0,0 +1,120 @@
+import time
+from datetime import datetime, timezone
+from dataclasses import dataclass
+from typing import Dict, List, Iterator, Callable, Tuple
+from .exceptions import TNCOClientError, TNCOClientHttpError
+
+ADDED = 'added'
+REMOVED = 'removed'
+CHANGED = 'changed'
+
+DEFAULT_MIN_INTERVAL = 2
+DEFAULT_MAX_INTERVAL = 30
+DEFAULT_BACKOFF = 1.5
+# Client errors that may succeed if the poll is repeated, any other 4xx response ends the watch
+TRANSIENT_CLIENT_ERROR_STATUS_CODES = [408, 429]
+
+@dataclass
+class AssemblyChange:
+    """
+    An Assembly that was added to, removed from or changed (state or descriptorName) in the watched result between two polls
+    """
+    change: str
+    id: str
+    name: str
+    descriptor_name: str = None
+    state: str = None
+    previous_descriptor_name: str = None
+    previous_state: str = None
+    time: str = None
+
+def snapshot(assemblies: List[Dict]) -> Dict[str, Tuple[str, str, str]]:
+    """
+    Index Assemblies by ID, keeping only the name, descriptorName and state of each so large results stay small in memory
+    """
+    return {a.get('id'): (a.get('name', None), a.get('descriptorName', None), a.get('state', None)) for a in assemblies if isinstance(a, dict)}
+
+def diff_snapshots(previous: Dict[str, Tuple], current: Dict[str, Tuple], time: str = None) -> List[AssemblyChange]:
+    changes = []
+    for id_value, (name, descriptor_name, state) in current.items():
+        before = previous.get(id_value, None)
+        if before is None:
+            changes.append(AssemblyChange(ADDED, id_value, name, descriptor_name=descriptor_name, state=state, time=time))
+        elif before[1:] != (descriptor_name, state):
+            changes.append(AssemblyChange(CHANGED, id_value, name, descriptor_name=descriptor_name, state=state,
+                                            previous_descriptor_name=before[1], previous_state=before[2], time=time))
+    for id_value, (name, descriptor_name, state) in previous.items():
+        if id_value not in current:
+            changes.append(AssemblyChange(REMOVED, id_value, name, previous_descriptor_name=descriptor_name, previous_state=state, time=time))
+    return changes
+
+class AssemblyWatcher:
+    """
+    Polls the most recently changed Assemblies (or those with a name containing name_contains) and reports only what changed between polls.
+
+    The interval starts at min_interval, grows by backoff after each poll with no changes (up to max_interval)
+    and drops back to min_interval as soon as something changes. A poll failing with a transient error (e.g. a lost connection
+    or a 5xx response) is reported and the interval grows as if nothing changed. Polls send the ETag of the last result,
+    so a server supporting conditional requests does not resend an unchanged result.
+    Note: with the most recently changed Assemblies, "removed" also covers an Assembly no longer being one of the most recent
+    """
+
+    def __init__(self, assemblies_api: 'AssembliesAPI', name_contains: str = None, min_interval: float = DEFAULT_MIN_INTERVAL,
+                    max_interval: float = DEFAULT_MAX_INTERVAL, backoff: float = DEFAULT_BACKOFF):
+        if min_interval <= 0 or max_interval < min_interval:
+            raise ValueError(f'Intervals must be greater than 0, with max_interval no less than min_interval, but were: {min_interval}, {max_interval}')
+        self.assemblies_api = assemblies_api
+        self.name_contains = name_contains
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.interval = min_interval
+        self.etag = None
+        self.current = {}
+
+    def poll(self) -> List[AssemblyChange]:
+        assemblies, self.etag = self.assemblies_api.poll(name_contains=self.name_contains, etag=self.etag)
+        changes = []
+        if assemblies is not None:
+            latest = snapshot(assemblies)
+            changes = diff_snapshots(self.current, latest, time=datetime.now(timezone.utc).isoformat(timespec='seconds'))
+            self.current = latest
+        if len(changes) > 0:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+        return changes
+
+    def is_transient_error(self, error: TNCOClientError) -> bool:
+        if isinstance(error, TNCOClientHttpError):
+            return not (400 <= error.status_code < 500) or error.status_code in TRANSIENT_CLIENT_ERROR_STATUS_CODES
+        return True
+
+    def watch(self, include_existing: bool = True, max_polls: int = None, sleep: Callable[[float], None] = time.sleep,
+                on_error: Callable[[TNCOClientError, float], None] = None) -> Iterator[List[AssemblyChange]]:
+        """
+        Poll until stopped (or max_polls is reached), yielding the changes found by each poll that found any.
+        The Assemblies found by the first successful poll are reported as added, unless include_existing is False.
+        Transient errors are passed to on_error, with the seconds until the next poll, and polling continues. Other errors are raised
+        """
+        polls = 0
+        has_baseline = False
+        while max_polls is None or polls < max_polls:
+            if polls > 0:
+                sleep(self.interval)
+            polls += 1
+            try:
+                changes = self.poll()
+            except TNCOClientError as e:
+                if not self.is_transient_error(e):
+                    raise
+                self.interval = min(self.interval * self.backoff, self.max_interval)
+                if on_error is not None:
+                    on_error(e, self.interval)
+                continue
+            if not has_baseline:
+                has_baseline = True
+                if not include_existing:
+                    continue
+            if len(changes) > 0:
+                yield changes
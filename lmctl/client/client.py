@@ -1,15 +1,24 @@
 from .api import *
-from typing import Dict
+from contextlib import contextmanager
+from typing import Dict, List
 from urllib.parse import urlparse, urlencode
 from .exceptions import TNCOClientError, TNCOClientHttpError
 from .auth_type import AuthType
 from .auth_tracker import AuthTracker
 from .error_capture import tnco_error_capture
 from .client_test_result import TestResult, TestResults
+from .client_benchmark import LatencyStats, BenchmarkResults
 from .client_request import TNCOClientRequest
+from .name_cache import NameCache
+from .response_cache import ResponseCache
+from .admission import AdmissionController, OVERLOAD_STATUS_CODES, IDEMPOTENT_METHODS
 from lmctl.utils.trace_ctx import trace_ctx
+from lmctl.utils import json_codec
+from lmctl.utils.concurrency import run_concurrently, DEFAULT_MAX_WORKERS
 import requests
 import logging
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -25,13 +34,17 @@ class TNCOClient:
     PUT = 'put'
     DELETE = 'delete'
 
-    def __init__(self, address: str, auth_type: AuthType = None, kami_address: str = None, use_sessions: bool = False):
+    def __init__(self, address: str, auth_type: AuthType = None, kami_address: str = None, use_sessions: bool = False, assembly_name_cache: NameCache = None, response_cache: ResponseCache = None, admission_controller: AdmissionController = None):
         self.address = self._parse_address(address)
         self.auth_type = auth_type
         self.kami_address = kami_address
         self.auth_tracker = AuthTracker() if self.auth_type is not None else None
+        self._auth_lock = threading.RLock()
         self._session = None
         self.use_sessions = use_sessions
+        self.assembly_name_cache = assembly_name_cache if assembly_name_cache is not None else NameCache()
+        self.response_cache = response_cache
+        self.admission_controller = admission_controller
 
     def _parse_address(self, address: str) -> str:
         if address is not None:
@@ -51,12 +64,30 @@ class TNCOClient:
         else:
             return requests
 
+    @contextmanager
+    def pooled_session(self, pool_size: int = DEFAULT_MAX_WORKERS):
+        """
+        Open a requests.Session keeping up to pool_size connections open to each host, closed on exit. Requests given this session
+        (see TNCOClientRequest.use_session) reuse its connections when made concurrently (e.g. from run_concurrently). 
+        The client itself is not changed, so other requests made at the same time are unaffected
+        """
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        try:
+            yield session
+        finally:
+            session.close()
+
     def get_access_token(self) -> str:
         if self.auth_tracker is not None:
-            if self.auth_tracker.has_access_expired:
-                auth_response = self.auth_type.handle(self)
-                self.auth_tracker.accept_auth_response(auth_response)
-            return self.auth_tracker.current_access_token
+            # Requests may be made from several threads, only one of them should authenticate
+            with self._auth_lock:
+                if self.auth_tracker.has_access_expired:
+                    auth_response = self.auth_type.handle(self)
+                    self.auth_tracker.accept_auth_response(auth_response)
+                return self.auth_tracker.current_access_token
         else:
             return None
 
@@ -99,8 +130,13 @@ class TNCOClient:
             request_kwargs['auth'] = request.additional_auth_handler        
         self._supplement_headers(headers=request_kwargs['headers'], inject_current_auth=request.inject_current_auth) 
 
+        session = request.session if request.session is not None else self._curr_session()
+        send_request = lambda: session.request(method=request.method, url=url, verify=False, **request_kwargs)
         try:
-            response = self._curr_session().request(method=request.method, url=url, verify=False, **request_kwargs)
+            if self.admission_controller is not None:
+                response = self.admission_controller.send(send_request, retry_status_codes=self._retry_status_codes(request))
+            else:
+                response = send_request()
         except requests.RequestException as e:
             raise TNCOClientError(str(e)) from e
         logger.debug(f'CP4NA orchestration request has returned: Method={request.method}, URL={url}, Response={response}')
@@ -110,33 +146,61 @@ class TNCOClient:
             raise TNCOClientHttpError(f'{request.method} request to {url} failed', e) from e
         return response
 
+    def _retry_status_codes(self, request: TNCOClientRequest):
+        if request.files is not None and len(request.files) > 0:
+            # Files may be partially read by the first attempt
+            return ()
+        if request.method.upper() in IDEMPOTENT_METHODS:
+            return OVERLOAD_STATUS_CODES
+        return (429,)
+
     def make_request_for_json(self, request: TNCOClientRequest) -> Dict:
         response = self.make_request(request)
         try:
-            return response.json()
+            return json_codec.read_response(response)
         except ValueError as e:
             raise TNCOClientError(f'Failed to parse response to JSON: {str(e)}') from e
 
-    def ping(self, include_template_engine: bool = False) -> Dict:
-        with tnco_error_capture() as A:
-            self.descriptors.all()
-        with tnco_error_capture() as B:
-            self.deployment_locations.all()
-        with tnco_error_capture() as C:
-            self.behaviour_projects.all()
-        with tnco_error_capture() as D:
-            self.shared_inf_keys.all()
-        tests = []
-        tests.append(TestResult(name='Descriptors', error=A.error))
-        tests.append(TestResult(name='Topology', error=B.error))
-        tests.append(TestResult(name='Behaviour', error=C.error))
-        tests.append(TestResult(name='Resource Manager', error=D.error))
+    def _ping_checks(self, include_template_engine: bool = False) -> List:
+        checks = [
+            ('Descriptors', lambda: self.descriptors.all()),
+            ('Topology', lambda: self.deployment_locations.all()),
+            ('Behaviour', lambda: self.behaviour_projects.all()),
+            ('Resource Manager', lambda: self.shared_inf_keys.all())
+        ]
         if include_template_engine:
-            with tnco_error_capture() as templates:
-                self.descriptor_templates.all()
-            tests.append(TestResult(name='Template Engine', error=templates.error))
+            checks.append(('Template Engine', lambda: self.descriptor_templates.all()))
+        return checks
+
+    def _run_checks(self, checks: List, max_workers: int):
+        return run_concurrently(lambda check: check[1](), checks, max_workers=max_workers, catchable_exceptions=(TNCOClientError,))
+
+    def ping(self, include_template_engine: bool = False, max_workers: int = DEFAULT_MAX_WORKERS) -> TestResults:
+        checks = self._ping_checks(include_template_engine=include_template_engine)
+        tests = []
+        for result in self._run_checks(checks, max_workers):
+            tests.append(TestResult(name=result.item[0], error=result.error, duration=result.duration))
         return TestResults(tests=tests)
 
+    def benchmark(self, repeat: int = 10, concurrency: int = DEFAULT_MAX_WORKERS, include_template_engine: bool = False, include_auth: bool = True) -> BenchmarkResults:
+        """
+        Repeat the ping checks (and authentication, if the client is secure) to measure latency and throughput of each API group
+        """
+        checks = self._ping_checks(include_template_engine=include_template_engine)
+        if include_auth and self.auth_type is not None:
+            checks.append(('Authentication', lambda: self.auth_type.handle(self)))
+        # Interleave the groups so they are measured under the same load
+        tasks = [check for _ in range(repeat) for check in checks]
+        start = time.perf_counter()
+        results = self._run_checks(tasks, concurrency)
+        elapsed = time.perf_counter() - start
+        stats = []
+        for name, _ in checks:
+            durations = [r.duration for r in results if r.item[0] == name and not r.failed]
+            failures = len([r for r in results if r.item[0] == name and r.failed])
+            stats.append(LatencyStats.from_durations(name, durations, failures, elapsed))
+        return BenchmarkResults(repeat=repeat, concurrency=concurrency, elapsed=round(elapsed, 3), stats=stats)
+
     @property
     def auth(self) -> AuthenticationAPI:
         return AuthenticationAPI(self)
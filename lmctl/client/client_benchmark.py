@@ -0,0 +1,58 @@
+import math
+from dataclasses import dataclass, field
+from typing import List
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list
+    """
+    if len(sorted_values) == 0:
+        return None
+    rank = max(int(math.ceil((pct / 100) * len(sorted_values))), 1)
+    return sorted_values[rank - 1]
+
+@dataclass
+class LatencyStats:
+    """
+    Latency (in milliseconds) and throughput (requests per second) of one group of requests in a benchmark
+    """
+    name: str
+    count: int = 0
+    failures: int = 0
+    min: float = None
+    mean: float = None
+    p50: float = None
+    p95: float = None
+    p99: float = None
+    max: float = None
+    throughput: float = None
+
+    @staticmethod
+    def from_durations(name: str, durations: List[float], failures: int, elapsed: float) -> 'LatencyStats':
+        millis = sorted(d * 1000 for d in durations)
+        stats = LatencyStats(name=name, count=len(millis) + failures, failures=failures)
+        if len(millis) > 0:
+            stats.min = round(millis[0], 2)
+            stats.mean = round(sum(millis) / len(millis), 2)
+            stats.p50 = round(percentile(millis, 50), 2)
+            stats.p95 = round(percentile(millis, 95), 2)
+            stats.p99 = round(percentile(millis, 99), 2)
+            stats.max = round(millis[-1], 2)
+        if elapsed > 0:
+            stats.throughput = round(len(millis) / elapsed, 2)
+        return stats
+
+    @property
+    def passed(self):
+        return self.failures == 0
+
+@dataclass
+class BenchmarkResults:
+    repeat: int
+    concurrency: int
+    elapsed: float
+    stats: List[LatencyStats] = field(default_factory=list)
+
+    @property
+    def passed(self):
+        return all(s.passed for s in self.stats)
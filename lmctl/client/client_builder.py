@@ -3,6 +3,9 @@ from .pass_auth import UserPassAuth, LegacyUserPassAuth
 from .token_auth import JwtTokenAuth
 from .client import TNCOClient
 from .auth_type import AuthType
+from .name_cache import NameCache
+from .response_cache import ResponseCache
+from .admission import AdmissionController
 
 class TNCOClientBuilder:
 
@@ -10,6 +13,9 @@ class TNCOClientBuilder:
         self._address = None
         self._kami_address = None
         self._auth = None
+        self._assembly_name_cache = None
+        self._response_cache = None
+        self._admission_controller = None
     
     @property
     def address(self):
@@ -51,5 +57,30 @@ class TNCOClientBuilder:
         self._auth = LegacyUserPassAuth(username=username, password=password, legacy_auth_address=legacy_auth_address)
         return self
     
+    @property
+    def assembly_name_cache(self):
+        return self._assembly_name_cache
+
+    def assembly_name_cache(self, assembly_name_cache: NameCache) -> 'TNCOClientBuilder':
+        self._assembly_name_cache = assembly_name_cache
+        return self
+
+    @property
+    def response_cache(self):
+        return self._response_cache
+
+    def response_cache(self, response_cache: ResponseCache) -> 'TNCOClientBuilder':
+        self._response_cache = response_cache
+        return self
+
+    @property
+    def admission_controller(self):
+        return self._admission_controller
+
+    def admission_controller(self, admission_controller: AdmissionController) -> 'TNCOClientBuilder':
+        self._admission_controller = admission_controller
+        return self
+
     def build(self):
-        return TNCOClient(self._address, auth_type=self._auth, kami_address=self._kami_address)
+        return TNCOClient(self._address, auth_type=self._auth, kami_address=self._kami_address, assembly_name_cache=self._assembly_name_cache,
+                            response_cache=self._response_cache, admission_controller=self._admission_controller)
@@ -18,6 +18,8 @@ class TNCOClientRequest:
     override_address: str = None
     inject_current_auth: bool = True
     additional_auth_handler: AuthBase = None
+    # requests.Session to send this request on, instead of the client's own
+    session: Any = None
 
     def add_headers(self, headers: Dict[str, Any]) -> 'TNCOClientRequest':
         self.headers.update(headers)
@@ -61,6 +63,10 @@ class TNCOClientRequest:
         self.additional_auth_handler = additional_auth_handler
         return self
 
+    def use_session(self, session: Any) -> 'TNCOClientRequest':
+        self.session = session
+        return self
+
     @staticmethod
     def build_request_for_json(endpoint: str, method: str = 'GET', query_params: Dict[str, Any] = None):
         if query_params is None:
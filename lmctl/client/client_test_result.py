@@ -2,9 +2,10 @@ from typing import List
 
 class TestResult:
 
-    def __init__(self, name: str, error: Exception = None):
+    def __init__(self, name: str, error: Exception = None, duration: float = None):
         self.name = name
         self.error = error
+        self.duration = duration
     
     @property
     def passed(self):
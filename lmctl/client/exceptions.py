@@ -4,6 +4,9 @@ import yaml
 class TNCOClientError(Exception):
     pass
 
+class TNCOClientNotFoundError(TNCOClientError):
+    pass
+
 class TNCOClientHttpError(TNCOClientError):
     
     def __init__(self, msg, cause, *args, **kwargs):
@@ -0,0 +1,194 @@
+import re
+import math
+from datetime import datetime, timedelta, timezone
+from dataclasses import dataclass
+from typing import Dict, List, Any
+from .client_benchmark import percentile
+from .exceptions import TNCOClientError
+
+try:
+    import numpy
+except ImportError:
+    # Optional (pip install lmctl[analysis]), the summaries fall back to pure Python without it
+    numpy = None
+
+# The metrics of an execution are a list of objects, each with a "name" and a list of "samples". 
+# Each sample is an object with a numeric "value" and the ISO 8601 "timestamp" it was recorded at
+SAMPLES_KEY = 'samples'
+SAMPLE_VALUE_KEY = 'value'
+SAMPLE_TIME_KEY = 'timestamp'
+
+# Date and time, with any number of fractional digits and an optional "Z" or +HH:MM offset (datetime.fromisoformat accepts
+# only 3 or 6 fractional digits before Python 3.11, and does not exist on 3.6)
+_TIMESTAMP_PATTERN = re.compile(r'^(\d{4}-\d{2}-\d{2})[T ](\d{2}:\d{2}:\d{2})(?:[.,](\d+))?(?:(Z|z)|([+-])(\d{2}):?(\d{2}))?$')
+
+class MetricFormatError(TNCOClientError):
+    pass
+
+def numpy_available() -> bool:
+    return numpy is not None
+
+@dataclass
+class MetricSummary:
+    """
+    Summary of the samples of one metric across all executions. Rate is the number of samples per second between the first and last sample
+    """
+    name: str
+    executions: int
+    count: int
+    mean: float = None
+    min: float = None
+    p50: float = None
+    p90: float = None
+    p99: float = None
+    max: float = None
+    rate: float = None
+
+@dataclass
+class MetricBucket:
+    """
+    Samples of one metric in a time bucket, starting offset seconds after the first sample of the metric
+    """
+    name: str
+    offset: float
+    count: int
+    mean: float = None
+    rate: float = None
+
+class MetricSamples:
+    """
+    Values (and times, in epoch seconds) of one metric, collected from many executions
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.values = []
+        self.times = []
+        self.executions = set()
+
+    def add(self, execution_id: str, value: float, time: float):
+        self.values.append(value)
+        self.times.append(time)
+        self.executions.add(execution_id)
+
+def parse_timestamp(raw_time: str) -> float:
+    """
+    Epoch seconds of an ISO 8601 timestamp. Timestamps without an offset are treated as UTC.
+    Raises ValueError if raw_time is not a timestamp in this format
+    """
+    match = _TIMESTAMP_PATTERN.match(raw_time.strip()) if isinstance(raw_time, str) else None
+    if match is None:
+        raise ValueError(f'Expected an ISO 8601 timestamp but got: {raw_time!r}')
+    date_part, time_part, fraction, _, offset_sign, offset_hours, offset_minutes = match.groups()
+    try:
+        parsed = datetime.strptime(f'{date_part}T{time_part}', '%Y-%m-%dT%H:%M:%S')
+    except ValueError:
+        raise ValueError(f'Expected an ISO 8601 timestamp but got: {raw_time!r}') from None
+    offset = timedelta(0)
+    if offset_sign is not None:
+        offset = timedelta(hours=int(offset_hours), minutes=int(offset_minutes))
+        if offset_sign == '-':
+            offset = -offset
+    seconds = parsed.replace(tzinfo=timezone.utc).timestamp() - offset.total_seconds()
+    if fraction is not None:
+        seconds += int(fraction) / 10 ** len(fraction)
+    return seconds
+
+def _parse_sample(sample: Any):
+    if not isinstance(sample, dict):
+        raise ValueError(f'Expected a sample object but got: {sample!r}')
+    value = sample.get(SAMPLE_VALUE_KEY, None)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f'Expected a numeric "{SAMPLE_VALUE_KEY}" but got: {value!r}')
+    return float(value), parse_timestamp(sample.get(SAMPLE_TIME_KEY, None))
+
+def collect_samples(metrics_by_execution: Dict[str, List[Dict]]) -> Dict[str, MetricSamples]:
+    """
+    Group the samples of the metrics of many executions (as returned by BehaviourScenarioExecutionsAPI.get_metrics) by metric name.
+    Raises MetricFormatError, naming the execution and metric, if any metric or sample does not have the expected format
+    """
+    samples_by_name = {}
+    for execution_id, metrics in metrics_by_execution.items():
+        if not isinstance(metrics, list):
+            raise MetricFormatError(f'Metrics of execution {execution_id} are not a list: {type(metrics).__name__}')
+        for metric in metrics:
+            if not isinstance(metric, dict) or not isinstance(metric.get('name', None), str) or not isinstance(metric.get(SAMPLES_KEY, None), list):
+                raise MetricFormatError(f'Metric of execution {execution_id} does not have a "name" and a list of "{SAMPLES_KEY}": {metric!r}')
+            name = metric['name']
+            if name not in samples_by_name:
+                samples_by_name[name] = MetricSamples(name)
+            for index, sample in enumerate(metric[SAMPLES_KEY]):
+                try:
+                    value, time = _parse_sample(sample)
+                except ValueError as e:
+                    raise MetricFormatError(f'Sample {index} of metric {name} of execution {execution_id} is invalid: {e}') from e
+                samples_by_name[name].add(execution_id, value, time)
+    return samples_by_name
+
+def _round(value) -> float:
+    return None if value is None else round(float(value), 3)
+
+def _summarise_with_numpy(samples: MetricSamples) -> MetricSummary:
+    values = numpy.sort(numpy.asarray(samples.values, dtype=float))
+    times = numpy.asarray(samples.times, dtype=float)
+    # Nearest-rank percentiles, to match the pure Python summary
+    ranks = numpy.maximum(numpy.ceil(numpy.array([50, 90, 99]) / 100 * len(values)).astype(int), 1) - 1
+    p50, p90, p99 = values[ranks]
+    span = times.max() - times.min() if len(times) > 1 else 0
+    return MetricSummary(samples.name, len(samples.executions), len(values), mean=_round(values.mean()), min=_round(values[0]),
+                            p50=_round(p50), p90=_round(p90), p99=_round(p99), max=_round(values[-1]), rate=_round(len(times) / span) if span > 0 else None)
+
+def _summarise_with_python(samples: MetricSamples) -> MetricSummary:
+    values = sorted(samples.values)
+    times = samples.times
+    span = max(times) - min(times) if len(times) > 1 else 0
+    return MetricSummary(samples.name, len(samples.executions), len(values), mean=_round(sum(values) / len(values)), min=_round(values[0]),
+                            p50=_round(percentile(values, 50)), p90=_round(percentile(values, 90)), p99=_round(percentile(values, 99)), max=_round(values[-1]),
+                            rate=_round(len(times) / span) if span > 0 else None)
+
+def summarise(samples_by_name: Dict[str, MetricSamples], use_numpy: bool = None) -> List[MetricSummary]:
+    """
+    Count, mean, min, nearest-rank p50/p90/p99, max and rate of each metric. NumPy is used, when installed, unless use_numpy is False
+    """
+    if use_numpy is None:
+        use_numpy = numpy_available()
+    summarise_func = _summarise_with_numpy if use_numpy else _summarise_with_python
+    return [summarise_func(samples) for samples in samples_by_name.values() if len(samples.values) > 0]
+
+def _bucket_with_numpy(samples: MetricSamples, bucket_seconds: float) -> List[MetricBucket]:
+    if len(samples.values) == 0:
+        return []
+    values = numpy.asarray(samples.values, dtype=float)
+    times = numpy.asarray(samples.times, dtype=float)
+    indices = numpy.floor((times - times.min()) / bucket_seconds).astype(int)
+    counts = numpy.bincount(indices)
+    sums = numpy.bincount(indices, weights=values)
+    return [MetricBucket(samples.name, _round(i * bucket_seconds), int(count), mean=_round(sums[i] / count), rate=_round(count / bucket_seconds))
+                for i, count in enumerate(counts) if count > 0]
+
+def _bucket_with_python(samples: MetricSamples, bucket_seconds: float) -> List[MetricBucket]:
+    if len(samples.values) == 0:
+        return []
+    start = min(samples.times)
+    buckets = {}
+    for time, value in zip(samples.times, samples.values):
+        index = int(math.floor((time - start) / bucket_seconds))
+        count, total = buckets.get(index, (0, 0.0))
+        buckets[index] = (count + 1, total + value)
+    return [MetricBucket(samples.name, _round(i * bucket_seconds), count, mean=_round(total / count), rate=_round(count / bucket_seconds))
+                for i, (count, total) in sorted(buckets.items())]
+
+def bucket(samples_by_name: Dict[str, MetricSamples], bucket_seconds: float, use_numpy: bool = None) -> List[MetricBucket]:
+    """
+    Count, mean and rate (samples per second) of each metric in consecutive time buckets of bucket_seconds.
+    Empty buckets are left out
+    """
+    if bucket_seconds <= 0:
+        raise ValueError(f'bucket_seconds must be greater than 0 but was: {bucket_seconds}')
+    if use_numpy is None:
+        use_numpy = numpy_available()
+    bucket_func = _bucket_with_numpy if use_numpy else _bucket_with_python
+    result = []
+    for samples in samples_by_name.values():
+        result.extend(bucket_func(samples, bucket_seconds))
+    return result
@@ -0,0 +1,336 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field, asdict
+from typing import Any, Callable, Dict, List, Optional
+from lmctl.client.exceptions import TNCOClientError
+from lmctl.utils.concurrency import DEFAULT_MAX_WORKERS
+from lmctl.utils.trace_ctx import trace_ctx
+
+logger = logging.getLogger(__name__)
+
+PENDING = 'pending'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+SKIPPED = 'skipped'
+
+DEFAULT_MIN_POLL_INTERVAL = 2
+DEFAULT_MAX_POLL_INTERVAL = 30
+DEFAULT_POLL_BACKOFF = 1.5
+
+# Short names accepted for the intent of a node. Any other value is used as the intent name as given (it is not validated,
+# so intents added to TNCO can still be used)
+INTENT_ALIASES = {
+    'create': 'createAssembly',
+    'upgrade': 'upgradeAssembly',
+    'createOrUpgrade': 'createOrUpgradeAssembly',
+    'changeState': 'changeAssemblyState',
+    'scaleOut': 'scaleOutAssembly',
+    'scaleIn': 'scaleInAssembly',
+    'heal': 'healAssembly',
+    'adopt': 'adoptAssembly',
+    'delete': 'deleteAssembly'
+}
+PROCESS_COMPLETED_STATUSES = ['COMPLETED']
+PROCESS_FAILED_STATUSES = ['FAILED', 'CANCELLED']
+
+class WorkflowError(Exception):
+    pass
+
+@dataclass
+class WorkflowNode:
+    """
+    One Assembly intent of a workflow, requested once all the nodes it depends on have completed
+    """
+    name: str
+    intent: str
+    request: Dict
+    depends_on: List[str] = field(default_factory=list)
+    timeout: float = None
+
+    @staticmethod
+    def from_dict(name: str, data: Any) -> 'WorkflowNode':
+        if not isinstance(data, dict):
+            raise WorkflowError(f'Node "{name}" should be an object with "intent" and "request" fields but was: {data}')
+        intent = data.get('intent', None)
+        if not isinstance(intent, str) or len(intent) == 0:
+            raise WorkflowError(f'Node "{name}" should have an "intent" (e.g. createAssembly or changeState)')
+        intent = INTENT_ALIASES.get(intent, intent)
+        request = data.get('request', None)
+        if not isinstance(request, dict):
+            raise WorkflowError(f'Node "{name}" should have a "request" object with the body of the intent')
+        depends_on = data.get('depends_on', [])
+        if isinstance(depends_on, str):
+            depends_on = [depends_on]
+        if not isinstance(depends_on, list):
+            raise WorkflowError(f'Node "{name}" "depends_on" should be a node name or a list of node names')
+        timeout = data.get('timeout', None)
+        if timeout is not None and (not isinstance(timeout, (int, float)) or timeout <= 0):
+            raise WorkflowError(f'Node "{name}" "timeout" should be a number of seconds greater than 0')
+        return WorkflowNode(name, intent, request, depends_on=[str(d) for d in depends_on], timeout=timeout)
+
+    @property
+    def definition_hash(self) -> str:
+        """
+        Changes when the intent or request of the node changes, so a resumed workflow runs a changed node again
+        """
+        content = json.dumps({'intent': self.intent, 'request': self.request}, sort_keys=True)
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()[:16]
+
+class Workflow:
+    """
+    A directed acyclic graph of Assembly intents. Nodes are kept in a topological order (with the order given in the file kept where possible)
+    """
+
+    def __init__(self, nodes: List[WorkflowNode], name: str = None):
+        self.name = name
+        self.nodes = self._sort(nodes)
+        self.nodes_by_name = {n.name: n for n in self.nodes}
+
+    def _sort(self, nodes: List[WorkflowNode]) -> List[WorkflowNode]:
+        if len(nodes) == 0:
+            raise WorkflowError('Workflow should contain at least one node')
+        by_name = {}
+        for node in nodes:
+            if node.name in by_name:
+                raise WorkflowError(f'Workflow has more than one node named "{node.name}"')
+            by_name[node.name] = node
+        for node in nodes:
+            for dependency in node.depends_on:
+                if dependency not in by_name:
+                    raise WorkflowError(f'Node "{node.name}" depends on "{dependency}", which is not a node of the workflow')
+        ordered = []
+        placed = set()
+        remaining = list(nodes)
+        while len(remaining) > 0:
+            ready = [n for n in remaining if all(d in placed for d in n.depends_on)]
+            if len(ready) == 0:
+                raise WorkflowError(f'Workflow has a dependency cycle between nodes: {[n.name for n in remaining]}')
+            for node in ready:
+                ordered.append(node)
+                placed.add(node.name)
+            remaining = [n for n in remaining if n.name not in placed]
+        return ordered
+
+def read_workflow(data: Any) -> Workflow:
+    """
+    Workflow from the contents of a workflow file: an object with "nodes", either an object of nodes keyed by name or a list of nodes with a "name" field
+    """
+    if not isinstance(data, dict):
+        raise WorkflowError('Workflow file should contain an object with "nodes"')
+    raw_nodes = data.get('nodes', None)
+    if isinstance(raw_nodes, dict):
+        nodes = [WorkflowNode.from_dict(str(name), node) for name, node in raw_nodes.items()]
+    elif isinstance(raw_nodes, list):
+        nodes = []
+        for i, node in enumerate(raw_nodes):
+            if not isinstance(node, dict) or node.get('name', None) is None:
+                raise WorkflowError(f'Node {i+1} should be an object with a "name" field')
+            nodes.append(WorkflowNode.from_dict(str(node['name']), node))
+    else:
+        raise WorkflowError('Workflow file should contain "nodes", as an object keyed by node name or a list')
+    return Workflow(nodes, name=data.get('name', None))
+
+class ProcessWaiter:
+    """
+    Polls a process until it reaches a final status. The interval starts at min_interval, grows by backoff after each poll
+    where the status has not changed (up to max_interval) and drops back to min_interval when it changes.
+    Waiting stops early, returning None, once the stop event is set
+    """
+
+    def __init__(self, processes_api: 'ProcessesAPI', min_interval: float = DEFAULT_MIN_POLL_INTERVAL, max_interval: float = DEFAULT_MAX_POLL_INTERVAL,
+                    backoff: float = DEFAULT_POLL_BACKOFF, clock: Callable[[], float] = time.monotonic):
+        if min_interval <= 0 or max_interval < min_interval:
+            raise ValueError(f'Intervals must be greater than 0, with max_interval no less than min_interval, but were: {min_interval}, {max_interval}')
+        self.processes_api = processes_api
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.clock = clock
+
+    def wait(self, process_id: str, timeout: float = None, stop: threading.Event = None) -> Optional[Dict]:
+        """
+        Final state of the process. Raises WorkflowError if it has not finished within timeout seconds
+        """
+        stop = stop or threading.Event()
+        deadline = None if timeout is None else self.clock() + timeout
+        interval = self.min_interval
+        last_status = None
+        while True:
+            process = self.processes_api.get(process_id, shallow=True)
+            status = str(process.get('status', '')).upper()
+            if status in PROCESS_COMPLETED_STATUSES or status in PROCESS_FAILED_STATUSES:
+                return process
+            if last_status is not None and status == last_status:
+                interval = min(interval * self.backoff, self.max_interval)
+            else:
+                interval = self.min_interval
+            last_status = status
+            sleep_for = interval
+            if deadline is not None:
+                remaining = deadline - self.clock()
+                if remaining <= 0:
+                    raise WorkflowError(f'Process {process_id} did not finish within {timeout} seconds (last status: {process.get("status", None)})')
+                sleep_for = min(sleep_for, remaining)
+            if stop.wait(sleep_for):
+                return None
+
+@dataclass
+class NodeResult:
+    name: str
+    intent: str
+    status: str = PENDING
+    process_id: str = None
+    started_at: float = None
+    ended_at: float = None
+    duration: float = None
+    error: str = None
+    definition: str = None
+
+@dataclass
+class WorkflowResult:
+    passed: bool
+    duration: float
+    nodes: List[NodeResult] = field(default_factory=list)
+
+class WorkflowState:
+    """
+    Results of the nodes of a workflow, saved to a JSON file (when path is set) after every change so an interrupted or failed run can be resumed.
+
+    When resumed, nodes which completed (with the same intent and request) are not requested again and nodes that were waiting on a process
+    wait on the same process, rather than requesting the intent again. Failed and skipped nodes are run again
+    """
+
+    def __init__(self, workflow: Workflow, path: str = None):
+        self.workflow = workflow
+        self.path = path
+        self._lock = threading.Lock()
+        self.results = {n.name: NodeResult(n.name, n.intent, definition=n.definition_hash) for n in workflow.nodes}
+        self._load()
+
+    def _load(self):
+        if self.path is None or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                saved = json.load(f).get('nodes', {})
+        except (OSError, ValueError, AttributeError) as e:
+            raise WorkflowError(f'Failed to read workflow state file {self.path}: {e}') from e
+        for name, result in self.results.items():
+            previous = saved.get(name, None)
+            if not isinstance(previous, dict) or previous.get('definition', None) != result.definition:
+                continue
+            if previous.get('status', None) == COMPLETED:
+                self.results[name] = NodeResult(**{k: previous.get(k, None) for k in ('name', 'intent', 'status', 'process_id', 'started_at', 'ended_at', 'duration', 'definition')})
+            elif previous.get('status', None) == RUNNING and previous.get('process_id', None) is not None:
+                result.status = RUNNING
+                result.process_id = previous['process_id']
+                result.started_at = previous.get('started_at', None)
+
+    def update(self, name: str, **changes):
+        with self._lock:
+            result = self.results[name]
+            for key, value in changes.items():
+                setattr(result, key, value)
+            self._save()
+
+    def _save(self):
+        if self.path is None:
+            return
+        content = {'workflow': self.workflow.name, 'nodes': {name: asdict(result) for name, result in self.results.items()}}
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        # Replace the file in one step, so it is never left half written
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(content, f, indent=2)
+        os.replace(temp_path, self.path)
+
+class WorkflowRunner:
+    """
+    Runs the nodes of a workflow, each as soon as the nodes it depends on have completed (at most max_workers at once), waiting on the process of each intent.
+    When a node fails, the nodes depending on it (directly or not) are skipped while independent branches carry on
+    """
+
+    def __init__(self, tnco_client: 'TNCOClient', max_workers: int = DEFAULT_MAX_WORKERS, waiter: ProcessWaiter = None, clock: Callable[[], float] = time.time):
+        self.tnco_client = tnco_client
+        self.max_workers = max(1, max_workers or 1)
+        self.waiter = waiter or ProcessWaiter(tnco_client.processes)
+        self.clock = clock
+        self._stop = threading.Event()
+
+    def run(self, workflow: Workflow, state: WorkflowState = None, on_node_complete: Callable[[NodeResult], None] = None) -> WorkflowResult:
+        state = state or WorkflowState(workflow)
+        start = time.perf_counter()
+        ctx_data = dict(trace_ctx.data)
+        running = {}
+        def notify(name: str):
+            if on_node_complete is not None:
+                on_node_complete(state.results[name])
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            try:
+                while True:
+                    for node in workflow.nodes:
+                        result = state.results[node.name]
+                        if node.name in running or result.status in (COMPLETED, FAILED, SKIPPED):
+                            continue
+                        if any(d in running for d in node.depends_on):
+                            # Only act on the result of a dependency once it has been collected (and reported)
+                            continue
+                        blocked_by = [d for d in node.depends_on if state.results[d].status in (FAILED, SKIPPED)]
+                        if len(blocked_by) > 0:
+                            state.update(node.name, status=SKIPPED, error=f'Skipped as "{blocked_by[0]}" did not complete', process_id=None, started_at=None, ended_at=None, duration=None)
+                            notify(node.name)
+                        elif all(state.results[d].status == COMPLETED for d in node.depends_on):
+                            running[node.name] = executor.submit(self._run_node_in_ctx, node, state, ctx_data)
+                    if len(running) == 0:
+                        break
+                    done, _ = wait(list(running.values()), return_when=FIRST_COMPLETED)
+                    for name in [n for n, f in running.items() if f in done]:
+                        running.pop(name).result()
+                        notify(name)
+            except BaseException:
+                # e.g. KeyboardInterrupt, stop waiting on processes. Nodes left running keep their process ID in the state, to be resumed
+                self._stop.set()
+                raise
+        results = [state.results[n.name] for n in workflow.nodes]
+        return WorkflowResult(passed=all(r.status == COMPLETED for r in results), duration=round(time.perf_counter() - start, 3), nodes=results)
+
+    def _run_node_in_ctx(self, node: WorkflowNode, state: WorkflowState, ctx_data: Dict):
+        # Worker threads do not share the caller's thread-local tracing context, so carry it over
+        with trace_ctx.scope(ctx_values=ctx_data):
+            self._run_node(node, state)
+
+    def _run_node(self, node: WorkflowNode, state: WorkflowState):
+        result = state.results[node.name]
+        try:
+            if result.status == RUNNING and result.process_id is not None:
+                logger.debug(f'Resuming workflow node {node.name}, waiting on process {result.process_id}')
+            else:
+                state.update(node.name, status=RUNNING, started_at=self.clock(), ended_at=None, duration=None, error=None, process_id=None)
+                process_id = self.tnco_client.assemblies.intent(node.intent, node.request)
+                state.update(node.name, process_id=process_id)
+            process = self.waiter.wait(result.process_id, timeout=node.timeout, stop=self._stop)
+            if process is None:
+                return
+            status = str(process.get('status', '')).upper()
+            if status in PROCESS_COMPLETED_STATUSES:
+                self._finish(node, state, COMPLETED)
+            else:
+                reason = process.get('statusReason', None)
+                self._finish(node, state, FAILED, error=f'Process {process.get("status")}' + (f': {reason}' if reason else ''))
+        except (TNCOClientError, WorkflowError) as e:
+            logger.debug(f'Workflow node {node.name} failed: {e}')
+            self._finish(node, state, FAILED, error=str(e))
+
+    def _finish(self, node: WorkflowNode, state: WorkflowState, status: str, error: str = None):
+        ended_at = self.clock()
+        started_at = state.results[node.name].started_at
+        duration = None if started_at is None else round(ended_at - started_at, 3)
+        state.update(node.name, status=status, ended_at=ended_at, duration=duration, error=error)
@@ -0,0 +1,134 @@
+import re
+from array import array
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterator, List, Union
+from lmctl.utils import json_codec
+
+# Each match runs up to the next bracket outside of a string, so the scan only returns to Python once for each bracket
+_NEXT_BRACKET = re.compile(rb'[^"\[\]{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"\[\]{}]*)*([\[\]{}])', re.DOTALL)
+_LIST_START = re.compile(rb'\s*\[\s*')
+_SEPARATOR = re.compile(rb'\s*,\s*')
+_WHITESPACE = re.compile(rb'\s*')
+_OPEN_BRACKETS = (ord('['), ord('{'))
+
+class Record(Mapping):
+    """
+    Read-only view of one object in a RecordList, used like the dict it was parsed from.
+
+    The object is decoded from the raw bytes of the response when a value is first read. Only the most recently read record of a
+    RecordList is kept decoded, so reading several values of one record decodes it once, but keep the result of to_dict() if the
+    values of many records are needed at the same time
+    """
+    __slots__ = ('_records', '_index')
+
+    def __init__(self, records: 'RecordList', index: int):
+        self._records = records
+        self._index = index
+
+    def __getitem__(self, key: str) -> Any:
+        return self._records._decode(self._index)[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._records._decode(self._index).keys()))
+
+    def __len__(self) -> int:
+        return len(self._records._decode(self._index))
+
+    def to_dict(self) -> Dict:
+        """
+        A new dict of the values of this record, decoded again from the raw bytes
+        """
+        return self._records._decode(self._index, keep=False)
+
+    def __repr__(self) -> str:
+        return f'Record({self.to_dict()!r})'
+
+class RecordList(Sequence):
+    """
+    Read-only list of the objects in a JSON list result (e.g. processes), holding the raw bytes of the response rather than a dict for each object.
+
+    from_json only scans the bytes for the position of each object (one regular expression match per bracket, no values are decoded). Each
+    item is a Record, decoded when its values are read, so a large result costs about the size of the response body in memory
+    """
+    __slots__ = ('_content', '_starts', '_ends', '_decoded')
+
+    def __init__(self, content: bytes = b'[]', starts: List[int] = None, ends: List[int] = None):
+        self._content = content
+        self._starts = array('q', starts or [])
+        self._ends = array('q', ends or [])
+        # Index and dict of the most recently decoded record
+        self._decoded = (None, None)
+
+    @staticmethod
+    def from_json(content: Union[bytes, str]) -> 'RecordList':
+        """
+        Find the objects in a JSON list, raising ValueError when the content is not a list of objects.
+        Invalid JSON inside an object is only found when that object is read
+        """
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        content = bytes(content)
+        start_match = _LIST_START.match(content)
+        if start_match is None:
+            raise ValueError('Expected a JSON list')
+        starts = []
+        ends = []
+        position = start_match.end()
+        depth = 1
+        item_start = None
+        while True:
+            match = _NEXT_BRACKET.match(content, position)
+            if match is None:
+                raise ValueError('Unterminated JSON list')
+            bracket = match.group(1)[0]
+            bracket_position = match.start(1)
+            if depth == 1:
+                if bracket in _OPEN_BRACKETS:
+                    if bracket != ord('{'):
+                        raise ValueError(f'Expected a list of JSON objects but found a list at position {bracket_position}')
+                    if not _is_gap(content, ends[-1] if len(ends) > 0 else start_match.end(), bracket_position, separated=len(ends) > 0):
+                        raise ValueError(f'Expected a list of JSON objects but found other values before position {bracket_position}')
+                    item_start = bracket_position
+                else:
+                    if not _is_gap(content, ends[-1] if len(ends) > 0 else start_match.end(), bracket_position, separated=False):
+                        raise ValueError(f'Expected a list of JSON objects but found other values before position {bracket_position}')
+                    if _WHITESPACE.match(content, bracket_position + 1).end() != len(content):
+                        raise ValueError(f'Unexpected content after the JSON list at position {bracket_position + 1}')
+                    return RecordList(content, starts, ends)
+            depth += 1 if bracket in _OPEN_BRACKETS else -1
+            if depth == 1:
+                starts.append(item_start)
+                ends.append(bracket_position + 1)
+            position = bracket_position + 1
+
+    def _decode(self, index: int, keep: bool = True) -> Dict:
+        decoded_index, decoded = self._decoded
+        if decoded_index == index and keep:
+            return decoded
+        decoded = json_codec.loads(self._content[self._starts[index]:self._ends[index]])
+        if keep:
+            self._decoded = (index, decoded)
+        return decoded
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [Record(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError('RecordList index out of range')
+        return Record(self, index)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def to_dicts(self) -> List[Dict]:
+        return [record.to_dict() for record in self]
+
+def _is_gap(content: bytes, start: int, end: int, separated: bool) -> bool:
+    """
+    Check the content between two items of the list is only whitespace (separated by a comma when separated is True)
+    """
+    pattern = _SEPARATOR if separated else _WHITESPACE
+    match = pattern.match(content, start)
+    return match is not None and match.end() == end
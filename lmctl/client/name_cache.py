@@ -0,0 +1,95 @@
+import os
+import json
+import time
+import logging
+import threading
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_NAME_CACHE_TTL = 30
+
+class NameCache:
+    """
+    Thread-safe cache of object names to IDs, where each entry expires after a short TTL.
+
+    When a path is provided the entries are also persisted to a JSON file, so separate processes
+    (e.g. a sequence of lmctl invocations) can share resolved names until they expire.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_NAME_CACHE_TTL, path: str = None):
+        self.ttl = ttl
+        self.path = path
+        self._entries = {}
+        self._lock = threading.Lock()
+        if self.path is not None:
+            self._load()
+
+    def get(self, name: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(name, None)
+            if entry is None:
+                return None
+            id_value, expires_at = entry
+            if time.time() >= expires_at:
+                del self._entries[name]
+                return None
+            return id_value
+
+    def put(self, name: str, id_value: str):
+        self.put_all({name: id_value})
+
+    def put_all(self, names_to_ids: Dict[str, str]):
+        if len(names_to_ids) == 0 or self.ttl <= 0:
+            return
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            for name, id_value in names_to_ids.items():
+                if name is not None and id_value is not None:
+                    self._entries[name] = (id_value, expires_at)
+            self._save()
+
+    def invalidate(self, name: str = None):
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(name, None)
+            self._save()
+
+    def invalidate_id(self, id_value: str):
+        """
+        Remove every name cached for an ID, for when only the ID of a deleted object is known
+        """
+        with self._lock:
+            names = [name for name, entry in self._entries.items() if entry[0] == id_value]
+            for name in names:
+                del self._entries[name]
+            if len(names) > 0:
+                self._save()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                raw_entries = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.debug(f'Ignoring unreadable name cache file at {self.path}: {e}')
+            return
+        now = time.time()
+        for name, entry in raw_entries.items():
+            if isinstance(entry, list) and len(entry) == 2 and entry[1] > now:
+                self._entries[name] = (entry[0], entry[1])
+
+    def _save(self):
+        if self.path is None:
+            return
+        try:
+            directory = os.path.dirname(self.path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            with open(self.path, 'w') as f:
+                json.dump({name: list(entry) for name, entry in self._entries.items()}, f)
+        except OSError as e:
+            logger.debug(f'Failed to write name cache file at {self.path}: {e}')
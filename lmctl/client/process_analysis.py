@@ -0,0 +1,110 @@
+from dataclasses import dataclass
+from typing import Dict, List
+from .client_benchmark import percentile
+from .execution_metrics import numpy, numpy_available, parse_timestamp
+from .exceptions import TNCOClientError
+
+FAILED_STATUSES = ['FAILED']
+SUMMARY_FIELDS = ['id', 'intentType', 'assemblyType', 'status', 'startTime', 'endTime']
+
+class ProcessFormatError(TNCOClientError):
+    pass
+
+@dataclass
+class ProcessStats:
+    """
+    Number, failure rate and duration distribution (in seconds) of the processes of one intent type on one assembly type.
+    Durations only include processes that have ended
+    """
+    intent_type: str
+    assembly_type: str
+    count: int
+    failed: int
+    failure_rate: float
+    ended: int = 0
+    mean: float = None
+    p50: float = None
+    p90: float = None
+    p99: float = None
+    max: float = None
+
+def _round(value) -> float:
+    return None if value is None else round(float(value), 3)
+
+def _duration(process: Dict) -> float:
+    start = process.get('startTime', None)
+    end = process.get('endTime', None)
+    if start is None or end is None:
+        return None
+    try:
+        return max(parse_timestamp(end) - parse_timestamp(start), 0.0)
+    except ValueError as e:
+        raise ProcessFormatError(f'Process {process.get("id", None)} has an invalid "startTime" or "endTime": {e}') from e
+
+def _is_failed(process: Dict) -> bool:
+    return str(process.get('status', '')).upper() in FAILED_STATUSES
+
+def _group_processes(processes: List[Dict]):
+    groups = {}
+    group_indices = []
+    for process in processes:
+        key = (process.get('intentType', None), process.get('assemblyType', None))
+        group_indices.append(groups.setdefault(key, len(groups)))
+    return list(groups.keys()), group_indices
+
+def _stats_with_numpy(processes: List[Dict]) -> List[ProcessStats]:
+    keys, group_indices = _group_processes(processes)
+    groups = numpy.asarray(group_indices, dtype=int)
+    durations = numpy.asarray([_duration(p) for p in processes], dtype=float)
+    failed = numpy.asarray([_is_failed(p) for p in processes], dtype=float)
+    counts = numpy.bincount(groups, minlength=len(keys))
+    failures = numpy.bincount(groups, weights=failed, minlength=len(keys))
+    ended = ~numpy.isnan(durations)
+    ended_groups, ended_durations = groups[ended], durations[ended]
+    ended_counts = numpy.bincount(ended_groups, minlength=len(keys))
+    sums = numpy.bincount(ended_groups, weights=ended_durations, minlength=len(keys))
+    # Sort durations within each group, so the nearest-rank percentiles of every group can be read by index at once
+    order = numpy.lexsort((ended_durations, ended_groups))
+    sorted_durations = ended_durations[order]
+    starts = numpy.concatenate(([0], numpy.cumsum(ended_counts)[:-1]))
+    def nearest_rank(pct):
+        ranks = numpy.maximum(numpy.ceil(pct / 100 * ended_counts).astype(int), 1) - 1
+        return sorted_durations[numpy.minimum(starts + ranks, max(len(sorted_durations) - 1, 0))] if len(sorted_durations) > 0 else None
+    p50, p90, p99, p100 = (nearest_rank(pct) for pct in (50, 90, 99, 100))
+    stats = []
+    for i, (intent_type, assembly_type) in enumerate(keys):
+        stat = ProcessStats(intent_type, assembly_type, int(counts[i]), int(failures[i]), _round(failures[i] / counts[i]), ended=int(ended_counts[i]))
+        if ended_counts[i] > 0:
+            stat.mean, stat.p50, stat.p90, stat.p99, stat.max = (_round(v) for v in (sums[i] / ended_counts[i], p50[i], p90[i], p99[i], p100[i]))
+        stats.append(stat)
+    return stats
+
+def _stats_with_python(processes: List[Dict]) -> List[ProcessStats]:
+    keys, group_indices = _group_processes(processes)
+    grouped = [[] for _ in keys]
+    for process, group in zip(processes, group_indices):
+        grouped[group].append(process)
+    stats = []
+    for (intent_type, assembly_type), group in zip(keys, grouped):
+        failures = len([p for p in group if _is_failed(p)])
+        durations = sorted(d for d in (_duration(p) for p in group) if d is not None)
+        stat = ProcessStats(intent_type, assembly_type, len(group), failures, _round(failures / len(group)), ended=len(durations))
+        if len(durations) > 0:
+            stat.mean = _round(sum(durations) / len(durations))
+            stat.p50, stat.p90, stat.p99 = (_round(percentile(durations, pct)) for pct in (50, 90, 99))
+            stat.max = _round(durations[-1])
+        stats.append(stat)
+    return stats
+
+def process_stats(processes: List[Dict], use_numpy: bool = None) -> List[ProcessStats]:
+    """
+    Group processes by intent type and assembly type, calculating the failure rate and duration distribution of each group.
+    NumPy is used, when installed, unless use_numpy is False. Raises ProcessFormatError if a start or end time is not an ISO 8601 timestamp
+    """
+    if len(processes) == 0:
+        return []
+    if use_numpy is None:
+        use_numpy = numpy_available()
+    # Read the fields used in one pass, as a lazy Record (lmctl.client.models.RecordList) is decoded again when read after another record
+    processes = [{field: process.get(field, None) for field in SUMMARY_FIELDS} for process in processes]
+    return _stats_with_numpy(processes) if use_numpy else _stats_with_python(processes)
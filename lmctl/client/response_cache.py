@@ -0,0 +1,252 @@
+import os
+import json
+import time
+import base64
+import hashlib
+import logging
+import tempfile
+import threading
+import dataclasses
+import requests
+from collections import OrderedDict
+from typing import Dict, Callable, Optional
+from .client_request import TNCOClientRequest
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 500
+DEFAULT_CATALOG_TTL = 60
+
+# Catalog style APIs whose objects are read far more often than they change
+DEFAULT_CATALOG_TTLS = {
+    'api/catalog/descriptors': DEFAULT_CATALOG_TTL,
+    'api/catalog/descriptorTemplates': DEFAULT_CATALOG_TTL,
+    'api/deploymentLocations': DEFAULT_CATALOG_TTL,
+    'api/resource-managers': DEFAULT_CATALOG_TTL,
+    'api/resource-manager/lifecycle-drivers': DEFAULT_CATALOG_TTL,
+    'api/resource-manager/vim-drivers': DEFAULT_CATALOG_TTL,
+    'api/resource-manager/resource-drivers': DEFAULT_CATALOG_TTL
+}
+
+# Responses from these endpoints include secrets (e.g. private keys), so are never cached, even when included in the TTLs
+SECRET_ENDPOINTS = [
+    'api/resource-manager/infrastructure-keys'
+]
+
+class CacheEntry:
+
+    def __init__(self, endpoint: str, status_code: int, headers: Dict[str, str], content: bytes, expires_at: float):
+        self.endpoint = endpoint
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.expires_at = expires_at
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.headers.get('ETag', self.headers.get('etag', None))
+
+    @staticmethod
+    def from_response(endpoint: str, response: requests.Response, expires_at: float) -> 'CacheEntry':
+        return CacheEntry(endpoint, response.status_code, dict(response.headers), response.content, expires_at)
+
+    def to_response(self) -> requests.Response:
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.headers.update(self.headers)
+        response._content = self.content
+        return response
+
+    def to_dict(self) -> Dict:
+        return {
+            'endpoint': self.endpoint,
+            'statusCode': self.status_code,
+            'headers': self.headers,
+            'content': base64.b64encode(self.content).decode('ascii'),
+            'expiresAt': self.expires_at
+        }
+
+    @staticmethod
+    def from_dict(data: Dict) -> 'CacheEntry':
+        return CacheEntry(data['endpoint'], data['statusCode'], data['headers'], base64.b64decode(data['content']), data['expiresAt'])
+
+class MemoryCacheBackend:
+    """
+    Keeps cached responses in memory, evicting the least recently used once max_entries is reached
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key, None)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: CacheEntry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def remove_matching(self, predicate: Callable[[CacheEntry], bool]):
+        with self._lock:
+            for key in [k for k, v in self._entries.items() if predicate(v)]:
+                del self._entries[key]
+
+class DiskCacheBackend:
+    """
+    Keeps cached responses as files in a directory, so they survive between processes.
+    File modification times track use, so the least recently used are evicted once max_entries is reached.
+    The directory is only accessible to the current user (0700) and each file is only readable by them (0600)
+    """
+
+    def __init__(self, directory: str, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.directory = directory
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory, mode=0o700)
+        os.chmod(self.directory, 0o700)
+
+    def _path_for(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode('utf-8')).hexdigest() + '.json')
+
+    def _read(self, path: str) -> Optional[CacheEntry]:
+        try:
+            with open(path, 'r') as f:
+                return CacheEntry.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError) as e:
+            logger.debug(f'Ignoring unreadable response cache file at {path}: {e}')
+            return None
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        path = self._path_for(key)
+        with self._lock:
+            if not os.path.exists(path):
+                return None
+            entry = self._read(path)
+            if entry is not None:
+                os.utime(path)
+            return entry
+
+    def put(self, key: str, entry: CacheEntry):
+        path = self._path_for(key)
+        with self._lock:
+            # mkstemp creates the file as 0600, then it replaces any existing entry in one step
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(entry.to_dict(), f)
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            self._evict()
+
+    def remove_matching(self, predicate: Callable[[CacheEntry], bool]):
+        with self._lock:
+            for path in self._cache_files():
+                entry = self._read(path)
+                if entry is None or predicate(entry):
+                    os.remove(path)
+
+    def _cache_files(self):
+        return [os.path.join(self.directory, f) for f in os.listdir(self.directory) if f.endswith('.json')]
+
+    def _evict(self):
+        cache_files = self._cache_files()
+        if len(cache_files) <= self.max_entries:
+            return
+        cache_files.sort(key=os.path.getmtime)
+        for path in cache_files[:len(cache_files) - self.max_entries]:
+            os.remove(path)
+
+class ResponseCache:
+    """
+    Opt-in cache for GET requests made through the TNCOAPI classes.
+
+    Each endpoint is cached for the TTL of the longest matching prefix in ttls (or default_ttl when there is no match).
+    Expired entries with an ETag are revalidated using If-None-Match, so an unchanged object is not downloaded again.
+    Entries under an endpoint are invalidated whenever the APIs create, update or delete an object on it, along with the entries
+    of any endpoints that change as a result (TNCOAPI.dependent_endpoints, e.g. descriptors created by pushing a resource package).
+    """
+
+    def __init__(self, ttls: Dict[str, float] = None, default_ttl: float = 0, backend = None):
+        self.ttls = ttls if ttls is not None else DEFAULT_CATALOG_TTLS
+        self.default_ttl = default_ttl
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+
+    def ttl_for(self, endpoint: str) -> float:
+        if endpoint is None:
+            return self.default_ttl
+        match = None
+        for prefix in self.ttls.keys():
+            if self._endpoint_in(endpoint, prefix) and (match is None or len(prefix) > len(match)):
+                match = prefix
+        return self.ttls[match] if match is not None else self.default_ttl
+
+    def is_cacheable(self, request: TNCOClientRequest) -> bool:
+        if request.method.upper() != 'GET' or request.body is not None or len(request.files) > 0:
+            return False
+        if request.endpoint is not None and any(self._endpoint_in(request.endpoint, secret_endpoint) for secret_endpoint in SECRET_ENDPOINTS):
+            return False
+        return self.ttl_for(request.endpoint) > 0
+
+    def fetch(self, base_client: 'TNCOClient', request: TNCOClientRequest) -> requests.Response:
+        key = self._key(base_client, request)
+        entry = self.backend.get(key)
+        now = time.time()
+        if entry is not None:
+            if now < entry.expires_at:
+                logger.debug(f'Using cached response for {request.endpoint}')
+                return entry.to_response()
+            if entry.etag is not None:
+                request = dataclasses.replace(request, headers={**request.headers, 'If-None-Match': entry.etag})
+        response = base_client.make_request(request)
+        expires_at = now + self.ttl_for(request.endpoint)
+        if response.status_code == 304 and entry is not None:
+            logger.debug(f'Cached response for {request.endpoint} is still valid')
+            entry.expires_at = expires_at
+            self.backend.put(key, entry)
+            return entry.to_response()
+        self.backend.put(key, CacheEntry.from_response(request.endpoint, response, expires_at))
+        return response
+
+    def invalidate(self, endpoint: str = None):
+        if endpoint is None:
+            self.backend.remove_matching(lambda entry: True)
+        else:
+            self.backend.remove_matching(lambda entry: self._endpoint_in(entry.endpoint, endpoint))
+
+    def _endpoint_in(self, endpoint: str, base_endpoint: str) -> bool:
+        return endpoint == base_endpoint or endpoint.startswith(base_endpoint + '/')
+
+    def _key(self, base_client: 'TNCOClient', request: TNCOClientRequest) -> str:
+        address = request.override_address if request.override_address else base_client.address
+        query = '&'.join(f'{k}={v}' for k, v in sorted(request.query_params.items()))
+        accept = request.headers.get('Accept', '')
+        return f'{self._identity(base_client)}@{address}/{request.endpoint}?{query}#{accept}'
+
+    def _identity(self, base_client: 'TNCOClient') -> str:
+        """
+        Identity the client authenticates as, so a cache shared by several users or credentials never returns one identity's responses to another
+        """
+        auth_type = getattr(base_client, 'auth_type', None)
+        if auth_type is None:
+            return ''
+        username = getattr(auth_type, 'username', None)
+        client_id = getattr(auth_type, 'client_id', None)
+        if username is not None or client_id is not None:
+            return f'{username or ""}:{client_id or ""}'
+        token = getattr(auth_type, 'token', None)
+        if token is not None:
+            # Never include the token itself in the key
+            return 'token:' + hashlib.sha256(token.encode('utf-8')).hexdigest()
+        return type(auth_type).__name__
@@ -0,0 +1,98 @@
+import hashlib
+import threading
+import yaml
+import jinja2
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator
+from .exceptions import TNCOClientError
+from .api.descriptor_templates import BatchRenderItem, BatchRenderResult
+
+DEFAULT_MAX_COMPILED_TEMPLATES = 128
+
+# Parsing the output dominates the cost of a local render, so use the libyaml parser when PyYAML was built with it
+_YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+class TemplateRenderError(TNCOClientError):
+    pass
+
+class LocalTemplateRenderer:
+    """
+    Renders descriptor templates in process, without the template engine (Kami), for previewing changes to a template
+    or rendering many requests at once.
+
+    The "template" body of a descriptor template is evaluated as Jinja2, with each of its declared "properties" available by name.
+    Compiled templates are kept in a least recently used cache, keyed by a hash of the template body, so rendering the
+    same template again skips compilation
+    """
+
+    def __init__(self, max_compiled_templates: int = DEFAULT_MAX_COMPILED_TEMPLATES):
+        self.max_compiled_templates = max_compiled_templates
+        self._environment = jinja2.Environment(keep_trailing_newline=True)
+        self._compiled = OrderedDict()
+        self._lock = threading.Lock()
+
+    def compile(self, template_body: str) -> jinja2.Template:
+        key = hashlib.sha256(template_body.encode('utf-8')).hexdigest()
+        with self._lock:
+            compiled = self._compiled.get(key, None)
+            if compiled is not None:
+                self._compiled.move_to_end(key)
+                return compiled
+        try:
+            compiled = self._environment.from_string(template_body)
+        except jinja2.TemplateSyntaxError as e:
+            raise TemplateRenderError(f'Template is not valid Jinja2 (line {e.lineno}): {e.message}') from e
+        with self._lock:
+            self._compiled[key] = compiled
+            while len(self._compiled) > self.max_compiled_templates:
+                self._compiled.popitem(last=False)
+        return compiled
+
+    def resolve_properties(self, template: Dict, render_request: Dict = None) -> Dict:
+        """
+        Values for each property declared on the template, taken from the render request or the default of the property
+        """
+        declared = template.get('properties', None) or {}
+        requested = (render_request or {}).get('properties', None) or {}
+        values = {}
+        for name, definition in declared.items():
+            definition = definition or {}
+            if name in requested:
+                values[name] = requested[name]
+            elif 'default' in definition:
+                values[name] = definition['default']
+            elif definition.get('required', False) is True:
+                raise TemplateRenderError(f'No value provided for required property: {name}')
+        return values
+
+    def render_raw(self, template: Dict, render_request: Dict = None) -> str:
+        template_body = template.get('template', None)
+        if template_body is None:
+            raise TemplateRenderError(f'Descriptor Template {template.get("name")} has no "template" to render')
+        compiled = self.compile(template_body)
+        try:
+            return compiled.render(**self.resolve_properties(template, render_request))
+        except jinja2.TemplateError as e:
+            raise TemplateRenderError(f'Failed to render Descriptor Template {template.get("name")}: {e}') from e
+
+    def render(self, template: Dict, render_request: Dict = None) -> Dict:
+        output = self.render_raw(template, render_request)
+        try:
+            return yaml.load(output, Loader=_YamlLoader)
+        except yaml.YAMLError as e:
+            raise TemplateRenderError(f'Rendered Descriptor Template {template.get("name")} is not valid YAML: {e}') from e
+
+    def render_batch(self, templates_by_name: Dict[str, Dict], items: Iterable[BatchRenderItem], raw: bool = False) -> Iterator[BatchRenderResult]:
+        """
+        Render each item against the template with the same name, yielding results in order with the same
+        shape as DescriptorTemplatesAPI.render_batch. Failed renders are reported on the result rather than raised
+        """
+        render_func = self.render_raw if raw else self.render
+        for item in items:
+            template = templates_by_name.get(item.template_name, None)
+            try:
+                if template is None:
+                    raise TemplateRenderError(f'No local Descriptor Template named: {item.template_name}')
+                yield BatchRenderResult(item, result=render_func(template, item.render_request))
+            except TemplateRenderError as e:
+                yield BatchRenderResult(item, error=e)
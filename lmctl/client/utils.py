@@ -3,6 +3,8 @@ import json
 import requests
 from typing import Dict
 from lmctl.client.exceptions import TNCOClientError
+from lmctl.client.models.records import RecordList
+from lmctl.utils import json_codec
 
 def convert_dict_to_yaml(data_dict: Dict):
     return yaml.safe_dump(data_dict)
@@ -24,10 +26,16 @@ def read_response_body_as_yaml(response: requests.Response) -> Dict:
 
 def read_response_body_as_json(response: requests.Response) -> Dict:
     try:
-        return response.json()
+        return json_codec.read_response(response)
     except ValueError as e:
         raise TNCOClientError(f'Failed to parse response as JSON: {str(e)}') from e
 
+def read_response_body_as_records(response: requests.Response) -> RecordList:
+    try:
+        return RecordList.from_json(response.content)
+    except ValueError as e:
+        raise TNCOClientError(f'Failed to parse response as a JSON list: {str(e)}') from e
+
 def read_response_location_header(response: requests.Response) -> str:
     location_header = response.headers.get('Location', response.headers.get('location', None))
     if location_header is None:
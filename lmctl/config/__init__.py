@@ -45,6 +45,12 @@ def get_global_config_with_path(override_config_path: str = None) -> Config:
         global_config, global_config_path = get_config_with_path(override_config_path=override_config_path)
     return global_config, global_config_path
 
+def clear_global_config():
+    global global_config
+    global global_config_path
+    global_config = None
+    global_config_path = None
+
 def write_config(config: Config, override_config_path: str = None) -> str:
     return ConfigIO().write_discovered_file(config, override_path=override_config_path, backup_existing=True)
 
@@ -1,6 +1,8 @@
+import os
 import logging
 import requests
 import json
+import lmctl.project.profiling as profiling
 from .base import LmDriver, NotFoundException
 
 logger = logging.getLogger(__name__)
@@ -44,6 +46,7 @@ class EtsiPackageMgmtDriver(LmDriver):
         with open(resource_pkg_path, 'rb') as resource_pkg:
             response = requests.put(url, headers=headers, data=resource_pkg, verify=False)
             if response.status_code == 202:
+                profiling.record_bytes_uploaded(os.path.getsize(resource_pkg_path))
                 return True
             else:
                 self._raise_unexpected_status_exception(response)
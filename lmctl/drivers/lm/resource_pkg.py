@@ -1,4 +1,6 @@
+import os
 import requests
+import lmctl.project.profiling as profiling
 from .base import LmDriver, NotFoundException
 
 class LmResourcePkgDriver(LmDriver):
@@ -22,6 +24,7 @@ class LmResourcePkgDriver(LmDriver):
             files = {'file': resource_pkg}
             response = requests.post(url, headers=headers, files=files, verify=False)
             if response.status_code == 201:
+                profiling.record_bytes_uploaded(os.path.getsize(resource_pkg_path))
                 return True
             else:
                 self._raise_unexpected_status_exception(response)
@@ -1,3 +1,3 @@
 from .armenv import ArmEnvironment, ArmSession, ArmSessionConfig
-from .lmenv import TNCOEnvironment, LmEnvironment, LmSession, LmSessionConfig
+from .lmenv import TNCOEnvironment, TNCORateLimit, TNCOResponseCache, TNCONameCache, LmEnvironment, LmSession, LmSessionConfig
 from .group import EnvironmentGroup
\ No newline at end of file
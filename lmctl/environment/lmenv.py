@@ -1,10 +1,14 @@
 import lmctl.drivers.lm as lm_drivers
-from typing import Union, Optional
+from pathlib import Path
+from typing import Union, Optional, Dict
 from .common import build_address
 from urllib.parse import urlparse
-from lmctl.client import TNCOClient, TNCOClientBuilder, TOKEN_AUTH_MODE, LEGACY_OAUTH_MODE
+from lmctl.client import TNCOClient, TNCOClientBuilder, AdmissionController, NameCache, ResponseCache, MemoryCacheBackend, DiskCacheBackend, DEFAULT_CATALOG_TTLS, TOKEN_AUTH_MODE, LEGACY_OAUTH_MODE
+from lmctl.client.admission import DEFAULT_MAX_CONCURRENCY, DEFAULT_MIN_CONCURRENCY, DEFAULT_MAX_RETRIES, DEFAULT_MAX_RETRY_WAIT, DEFAULT_LATENCY_TOLERANCE
 from pydantic.dataclasses import dataclass
-from pydantic import constr, root_validator
+from lmctl.client.name_cache import DEFAULT_NAME_CACHE_TTL
+from lmctl.client.response_cache import DEFAULT_MAX_ENTRIES
+from pydantic import constr, conint, confloat, root_validator, validator
 from lmctl.utils.dcutils.dc_capture import recordattrs
 
 DEFAULT_KAMI_PORT = '31289'
@@ -12,6 +16,93 @@ DEFAULT_KAMI_PROTOCOL = 'http'
 DEFAULT_BRENT_NAME = 'brent'
 DEFAULT_PROTOCOL = 'https'
 DEFAULT_SECURE = False
+MEMORY_CACHE_BACKEND = 'memory'
+DISK_CACHE_BACKEND = 'disk'
+CACHE_BACKENDS = [MEMORY_CACHE_BACKEND, DISK_CACHE_BACKEND]
+
+def default_response_cache_directory():
+    return str(Path.home().joinpath('.lmctl').joinpath('cache').joinpath('responses'))
+
+@recordattrs
+@dataclass
+class TNCORateLimit:
+    """
+    Limits on the requests sent to a CP4NA orchestration environment (see lmctl.client.AdmissionController)
+    """
+    requests_per_second: Optional[confloat(gt=0)] = None
+    burst: Optional[conint(ge=1)] = None
+    max_concurrency: Optional[conint(ge=1)] = DEFAULT_MAX_CONCURRENCY
+    min_concurrency: Optional[conint(ge=1)] = DEFAULT_MIN_CONCURRENCY
+    max_retries: Optional[conint(ge=0)] = DEFAULT_MAX_RETRIES
+    max_retry_wait: Optional[confloat(ge=0)] = DEFAULT_MAX_RETRY_WAIT
+    latency_tolerance: Optional[confloat(gt=1)] = DEFAULT_LATENCY_TOLERANCE
+
+    @root_validator
+    @classmethod
+    def check_concurrency(cls, values):
+        max_concurrency = values.get('max_concurrency', None)
+        min_concurrency = values.get('min_concurrency', None)
+        if max_concurrency is not None and min_concurrency is not None and min_concurrency > max_concurrency:
+            raise ValueError(f'TNCO environment "rate_limit" configured with "min_concurrency" ({min_concurrency}) greater than "max_concurrency" ({max_concurrency})')
+        return values
+
+    def build_admission_controller(self) -> AdmissionController:
+        return AdmissionController(requests_per_second=self.requests_per_second,
+                                    burst=self.burst,
+                                    max_concurrency=self.max_concurrency if self.max_concurrency is not None else DEFAULT_MAX_CONCURRENCY,
+                                    min_concurrency=self.min_concurrency if self.min_concurrency is not None else DEFAULT_MIN_CONCURRENCY,
+                                    max_retries=self.max_retries if self.max_retries is not None else DEFAULT_MAX_RETRIES,
+                                    max_retry_wait=self.max_retry_wait if self.max_retry_wait is not None else DEFAULT_MAX_RETRY_WAIT,
+                                    latency_tolerance=self.latency_tolerance if self.latency_tolerance is not None else DEFAULT_LATENCY_TOLERANCE
+                                )
+
+@recordattrs
+@dataclass
+class TNCOResponseCache:
+    """
+    Cache for the GET requests sent to a CP4NA orchestration environment (see lmctl.client.ResponseCache)
+    """
+    backend: Optional[str] = MEMORY_CACHE_BACKEND
+    directory: Optional[str] = None
+    max_entries: Optional[conint(ge=1)] = DEFAULT_MAX_ENTRIES
+    default_ttl: Optional[confloat(ge=0)] = 0
+    ttls: Optional[Dict[str, confloat(ge=0)]] = None
+
+    @validator('backend')
+    @classmethod
+    def check_backend(cls, backend):
+        if backend is not None and backend.lower() not in CACHE_BACKENDS:
+            raise ValueError(f'TNCO environment "response_cache" configured with invalid "backend": {backend} (expected one of: {CACHE_BACKENDS})')
+        return backend.lower() if backend is not None else backend
+
+    def build_response_cache(self) -> ResponseCache:
+        max_entries = self.max_entries if self.max_entries is not None else DEFAULT_MAX_ENTRIES
+        if self.backend == DISK_CACHE_BACKEND:
+            directory = self.directory if self.directory is not None else default_response_cache_directory()
+            backend = DiskCacheBackend(directory=str(Path(directory).expanduser()), max_entries=max_entries)
+        else:
+            backend = MemoryCacheBackend(max_entries=max_entries)
+        ttls = dict(DEFAULT_CATALOG_TTLS)
+        if self.ttls is not None:
+            ttls.update({endpoint.strip('/'): ttl for endpoint, ttl in self.ttls.items()})
+        return ResponseCache(ttls=ttls, 
+                                default_ttl=self.default_ttl if self.default_ttl is not None else 0, 
+                                backend=backend
+                            )
+
+@recordattrs
+@dataclass
+class TNCONameCache:
+    """
+    Cache of the IDs of Assemblies found by name in a CP4NA orchestration environment (see lmctl.client.NameCache)
+    """
+    ttl: Optional[confloat(ge=0)] = DEFAULT_NAME_CACHE_TTL
+    path: Optional[str] = None
+
+    def build_name_cache(self) -> NameCache:
+        return NameCache(ttl=self.ttl if self.ttl is not None else DEFAULT_NAME_CACHE_TTL, 
+                            path=str(Path(self.path).expanduser()) if self.path is not None else None
+                        )
 
 @recordattrs
 @dataclass
@@ -42,6 +133,10 @@ class TNCOEnvironment:
     kami_port: Optional[Union[str,int]] = DEFAULT_KAMI_PORT 
     kami_protocol: Optional[str] = DEFAULT_KAMI_PROTOCOL
 
+    rate_limit: Optional[TNCORateLimit] = None
+    response_cache: Optional[TNCOResponseCache] = None
+    assembly_name_cache: Optional[TNCONameCache] = None
+
     @root_validator(pre=True)
     @classmethod
     def check_security(cls, values):
@@ -130,6 +225,12 @@ class TNCOEnvironment:
         builder = TNCOClientBuilder()
         builder.address(self.address)
         builder.kami_address(self.kami_address)
+        if self.rate_limit is not None:
+            builder.admission_controller(self.rate_limit.build_admission_controller())
+        if self.response_cache is not None:
+            builder.response_cache(self.response_cache.build_response_cache())
+        if self.assembly_name_cache is not None:
+            builder.assembly_name_cache(self.assembly_name_cache.build_name_cache())
         if self.secure:
             if self.auth_mode == TOKEN_AUTH_MODE:
                 builder.token_auth(token=self.token)
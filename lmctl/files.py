@@ -1,12 +1,23 @@
 import os
+import sys
+import errno
 import shutil
-import distutils.dir_util
 import string
+import threading
 import unicodedata
 import logging
+from lmctl.utils.concurrency import run_concurrently, DEFAULT_MAX_WORKERS
 
 logger = logging.getLogger(__name__)
 
+COPY_CHUNK_SIZE = 8 * 1024 * 1024
+# Trees with fewer files than this are copied on the calling thread, as a pool would cost more than it saves
+PARALLEL_COPY_THRESHOLD = 16
+# ioctl used by Linux filesystems that support copy-on-write clones (btrfs, xfs)
+FICLONE = 0x40049409
+# Errors meaning a fast copy method is not available for a file, so the next method should be tried
+_UNSUPPORTED_ERRNOS = {errno.EXDEV, errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP, errno.ENOTTY, errno.EPERM, errno.EBADF, errno.ETXTBSY}
+
 class Tree:
 
     def __init__(self, root_path=None):
@@ -37,12 +48,158 @@ def create_directories(*directories):
         os.makedirs(directory)
 
 
-def copy_file(src, dest):
-    shutil.copy2(src, dest)
-
-
-def copy_tree(src, dest):
-    distutils.dir_util.copy_tree(src, dest, 0)
+class CopyEngine:
+    """
+    Copies files and trees using the cheapest method available, falling back to the next method when one is not supported:
+
+    - a hard link, only when allow_links is True and the source is on the same filesystem. Callers must only allow links when
+      neither the source nor the copy will be modified in place afterwards
+    - a copy-on-write clone (reflink), on Linux filesystems that support it
+    - os.copy_file_range, then os.sendfile, so the data is copied in the kernel
+    - a plain read/write copy
+
+    The mode and timestamps of the source are copied in the same way as shutil.copy2. Trees are copied on a pool of threads.
+    """
+
+    def __init__(self, allow_links=False, max_workers=DEFAULT_MAX_WORKERS):
+        self.allow_links = allow_links
+        self.max_workers = max_workers
+        self._unsupported = set()
+        self._lock = threading.Lock()
+
+    def copy_file(self, src, dest):
+        if os.path.isdir(dest):
+            dest = os.path.join(dest, os.path.basename(src))
+        if os.path.exists(dest):
+            # Replace rather than write through an existing file, it may be a link to another file
+            if os.path.samefile(src, dest):
+                return dest
+            os.remove(dest)
+        elif os.path.islink(dest):
+            # A dangling link, samefile cannot be used as there is nothing to compare with
+            os.remove(dest)
+        if self.allow_links and self._try_link(src, dest):
+            return dest
+        self._copy_data(src, dest)
+        shutil.copystat(src, dest)
+        return dest
+
+    def copy_tree(self, src, dest):
+        if not os.path.isdir(src):
+            raise OSError(errno.ENOENT, 'Cannot copy tree, not a directory', src)
+        copies = []
+        os.makedirs(dest, exist_ok=True)
+        # Links to directories are followed, so track the directories above each one to stop at a link back to one of them
+        ancestors = {src: {self._dir_id(src)}}
+        for root, dirs, filenames in os.walk(src, followlinks=True):
+            target_root = os.path.join(dest, os.path.relpath(root, src))
+            root_ancestors = ancestors.pop(root)
+            for dirname in list(dirs):
+                dir_path = os.path.join(root, dirname)
+                dir_id = self._dir_id(dir_path)
+                if dir_id in root_ancestors:
+                    logger.warning('Not copying {0}, it links to a directory containing it'.format(dir_path))
+                    dirs.remove(dirname)
+                    continue
+                ancestors[dir_path] = root_ancestors | {dir_id}
+                os.makedirs(os.path.join(target_root, dirname), exist_ok=True)
+            for filename in filenames:
+                copies.append((os.path.join(root, filename), os.path.join(target_root, filename)))
+        max_workers = self.max_workers if len(copies) >= PARALLEL_COPY_THRESHOLD else 1
+        results = run_concurrently(lambda copy: self.copy_file(*copy), copies, max_workers=max_workers)
+        for result in results:
+            if result.failed:
+                raise result.error
+        return [result.value for result in results]
+
+    def _dir_id(self, path):
+        path_stat = os.stat(path)
+        return (path_stat.st_dev, path_stat.st_ino)
+
+    def _is_supported(self, method, src_dev, dest_dev):
+        with self._lock:
+            return (method, src_dev, dest_dev) not in self._unsupported
+
+    def _mark_unsupported(self, method, src_dev, dest_dev, error):
+        # Remember the filesystems a method failed on, so it is not attempted for every file
+        logger.debug('{0} not supported from device {1} to {2}: {3}'.format(method, src_dev, dest_dev, error))
+        with self._lock:
+            self._unsupported.add((method, src_dev, dest_dev))
+
+    def _try_link(self, src, dest):
+        src_dev = os.stat(src).st_dev
+        if os.stat(os.path.dirname(os.path.abspath(dest))).st_dev != src_dev or not self._is_supported('link', src_dev, src_dev):
+            return False
+        try:
+            os.link(src, dest)
+            return True
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED_ERRNOS and e.errno != errno.EMLINK:
+                raise
+            self._mark_unsupported('link', src_dev, src_dev, e)
+            return False
+
+    def _copy_data(self, src, dest):
+        with open(src, 'rb') as src_file, open(dest, 'wb') as dest_file:
+            src_stat = os.fstat(src_file.fileno())
+            dest_dev = os.fstat(dest_file.fileno()).st_dev
+            for method in [self._reflink, self._copy_file_range, self._sendfile]:
+                if not self._is_supported(method.__name__, src_stat.st_dev, dest_dev):
+                    continue
+                try:
+                    if method(src_file, dest_file, src_stat.st_size):
+                        return
+                except OSError as e:
+                    if e.errno not in _UNSUPPORTED_ERRNOS:
+                        raise
+                    self._mark_unsupported(method.__name__, src_stat.st_dev, dest_dev, e)
+                # Start again from the beginning, a failed method may have copied part of the file
+                src_file.seek(0)
+                dest_file.seek(0)
+                dest_file.truncate()
+            shutil.copyfileobj(src_file, dest_file, COPY_CHUNK_SIZE)
+
+    def _reflink(self, src_file, dest_file, size):
+        if not sys.platform.startswith('linux'):
+            return False
+        import fcntl
+        fcntl.ioctl(dest_file.fileno(), FICLONE, src_file.fileno())
+        return True
+
+    def _copy_file_range(self, src_file, dest_file, size):
+        if not hasattr(os, 'copy_file_range'):
+            return False
+        return self._kernel_copy(os.copy_file_range, src_file, dest_file, size)
+
+    def _sendfile(self, src_file, dest_file, size):
+        if not hasattr(os, 'sendfile') or not sys.platform.startswith('linux'):
+            return False
+        return self._kernel_copy(lambda src_fd, dest_fd, count: os.sendfile(dest_fd, src_fd, None, count), src_file, dest_file, size)
+
+    def _kernel_copy(self, copy_method, src_file, dest_file, size):
+        copied = 0
+        while True:
+            sent = copy_method(src_file.fileno(), dest_file.fileno(), COPY_CHUNK_SIZE)
+            if sent == 0:
+                break
+            copied += sent
+        # Some filesystems (e.g. procfs) report a size but return no data, let the plain copy handle them
+        return copied > 0 or size == 0
+
+
+_default_engine = CopyEngine()
+_linking_engine = CopyEngine(allow_links=True)
+
+def _engine(allow_links):
+    return _linking_engine if allow_links else _default_engine
+
+
+def copy_file(src, dest, allow_links=False):
+    return _engine(allow_links).copy_file(src, dest)
+
+
+def copy_tree(src, dest, allow_links=False):
+    return _engine(allow_links).copy_tree(src, dest)
 
 
 def immediate_sub_directories(parent_directory):
@@ -1,5 +1,6 @@
 import abc
 import enum
+import threading
 
 @enum.unique
 class EntryTarget(enum.Enum):
@@ -147,29 +148,34 @@ class Journal:
     def __init__(self):
         self.__current_chapter = None
         self.__consumers = []
+        # Entries may be added from several threads, so they are handed off to consumers one at a time
+        self.__lock = threading.RLock()
 
     def register_consumer(self, consumer: Consumer):
         """
         Add a new Consumer to the Journal. The consumer will receive the next entry added.
         """
-        self.__consumers.append(consumer)
+        with self.__lock:
+            self.__consumers.append(consumer)
 
     def open_chapter(self, chapter_name):
         """
         Open a new chapter in the Journal. A OpenChapterEntry will be sent out to it's consumers. No entries can be added to a Journal until a chapter is opened
         """
-        if self.__current_chapter is not None:
-            self.close_chapter()
-        self.__current_chapter = chapter_name
-        self.add_entry(OpenChapterEntry(chapter_name))
+        with self.__lock:
+            if self.__current_chapter is not None:
+                self.close_chapter()
+            self.__current_chapter = chapter_name
+            self.add_entry(OpenChapterEntry(chapter_name))
     
     def close_chapter(self):
         """
         Close the current chapter. This prevents any further entries being added to the Journal until a new chapter is opened. A CloseChapterEntry will be sent out to it's consumers.
         """
-        self.__ensure_chapter_open()
-        self.add_entry(CloseChapterEntry(self.__current_chapter))
-        self.__current_chapter = None
+        with self.__lock:
+            self.__ensure_chapter_open()
+            self.add_entry(CloseChapterEntry(self.__current_chapter))
+            self.__current_chapter = None
 
     @property
     def current_chapter(self):
@@ -186,8 +192,9 @@ class Journal:
         """
         Add a new Entry to the chapter currently open. If there is no open chapter then a ValueError will be raised
         """
-        self.__ensure_chapter_open()
-        self.__handoff_entry_to_consumers(entry)
+        with self.__lock:
+            self.__ensure_chapter_open()
+            self.__handoff_entry_to_consumers(entry)
 
     def add_text(self, msg: str, entry_target: EntryTarget=EntryTarget.CONTENT, entry_type: EntryType=EntryType.NORMAL):
         """
@@ -207,6 +214,26 @@ class Journal:
         if self.__current_chapter is None:
             raise ValueError('No chapter started')
 
+class ConsumerGroup(Consumer):
+    """
+    A consumer which hands off each entry to several other consumers, so they can be registered (or passed to options accepting a single consumer) as one
+    """
+    def __init__(self, consumers):
+        self.__consumers = list(consumers)
+        super().__init__()
+
+    @property
+    def consumers(self):
+        return self.__consumers
+
+    def is_interested(self, entry: Entry):
+        return any(consumer.is_interested(entry) == True for consumer in self.__consumers)
+
+    def consume(self, entry: Entry):
+        for consumer in self.__consumers:
+            if consumer.is_interested(entry) == True:
+                consumer.consume(entry)
+
 class JournalKeeper(Consumer):
     """
     A standard consumer implementation to keep hold of all the chapters and their entries (in memory)
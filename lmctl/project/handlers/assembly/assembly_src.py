@@ -323,6 +323,9 @@ class AssemblySourceHandler(handlers_api.SourceHandler):
         relative_staging_path = os.path.join(staging_tree.service_behaviour_tests_path, os.path.basename(test_path))
         source_stager.stage_file(test_path, relative_staging_path, behaviour_mutations.ScenarioStagingMutator(self.source_config))
 
+    def pull_descriptor_names(self):
+        return [descriptors.descriptor_named(descriptors.ASSEMBLY_DESCRIPTOR_TYPE, self.source_config.full_name, self.source_config.version)]
+
     def pull_sources(self, journal, backup_tool, env_sessions, references):
         lm_session = env_sessions.lm
         backup_tree = AssemblySourceTree()
@@ -1,5 +1,6 @@
 import os
 import zipfile
+import lmctl.archive as archive
 import shutil
 import lmctl.project.handlers.resource as resource_api
 import lmctl.project.handlers.brent as brent_api
@@ -74,6 +75,7 @@ class EtsiVnfContentHandler(resource_api.ResourceContentHandler):
         else:
             extraction_path = os.path.join(os.path.dirname(res_pkg_path), 'tmp-extract')
             os.makedirs(extraction_path)
+            compression_policy = archive.CompressionPolicy.infer_from_archive(res_pkg_path)
             with zipfile.ZipFile(res_pkg_path, "r") as res_pkg:
                 res_pkg.extractall(extraction_path)
             try:
@@ -81,7 +83,7 @@ class EtsiVnfContentHandler(resource_api.ResourceContentHandler):
                 BrentCorrectableValidation().validate_and_autocorrect(journal, validation_options, errors, warnings, tree.descriptor_file_path, \
                 tree.infrastructure_definitions_path, tree.infrastructure_manifest_file_path, tree.lifecycle_path, \
                     tree.lifecycle_manifest_file_path)
-                with zipfile.ZipFile(res_pkg_path, "w") as res_pkg:
+                with archive.ZipWriter(res_pkg_path, compression_policy) as res_pkg:
                     res_pkg_content_tree = BrentResourcePackageContentTree()
                     included_items = [
                         {'path': tree.definitions_path, 'alias': res_pkg_content_tree.definitions_path},
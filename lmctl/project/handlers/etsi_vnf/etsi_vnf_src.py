@@ -1,5 +1,5 @@
 import os
-import zipfile
+import lmctl.archive as archive
 import lmctl.project.handlers.resource as resource_api
 import lmctl.project.handlers.brent as brent_api
 import lmctl.project.handlers.interface as handlers_api
@@ -93,7 +93,7 @@ class EtsiVnfStagedSourceHandler(brent_api.BrentStagedSourceHandlerDelegate):
         relative_res_pkg_path = pkg_tree.gen_resource_package_file_path(self.source_config.full_name)
         full_res_pkg_path = source_compiler.make_file_path(relative_res_pkg_path)
         journal.event('Creating Resource package for {0}: {1}'.format(self.source_config.name, relative_res_pkg_path))
-        with zipfile.ZipFile(full_res_pkg_path, "w") as res_pkg:
+        with archive.ZipWriter(full_res_pkg_path, self.source_config.compression_policy) as res_pkg:
             included_items = [
                 {'path': self.tree.definitions_path, 'alias': res_pkg_content_tree.definitions_path, 'required': True},
                 {'path': self.tree.lifecycle_path, 'alias': res_pkg_content_tree.lifecycle_path, 'required': True}
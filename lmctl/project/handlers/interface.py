@@ -318,6 +318,12 @@ class SourceHandler(abc.ABC):
     def pull_sources(self, journal, backup_tool, env_sessions, references):
         pass
 
+    def pull_descriptor_names(self):
+        """
+        Names of the descriptors (and the behaviour projects with the same name) read by pull_sources, so they can be fetched ahead of time
+        """
+        return []
+
     @abc.abstractmethod
     def list_elements(self, journal, element_type):
         pass
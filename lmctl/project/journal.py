@@ -1,3 +1,8 @@
+import os
+import json
+import time
+import datetime
+import threading
 import lmctl.journal as journal
 
 
@@ -80,3 +85,64 @@ class Event(ProjectEvent):
 
     def to_readable(self):
         return self.message
+
+
+class JsonLinesJournalConsumer(journal.Consumer):
+    """
+    Writes each project event to a file as a line of JSON, including the time it was added, the seconds elapsed since
+    the consumer was created and the section, stage and subproject it belongs to
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.__file = open(path, 'w', buffering=1)
+        self.__lock = threading.Lock()
+        self.__start = time.perf_counter()
+        self.__subprojects = []
+        self.__section = None
+        self.__stage = None
+
+    def is_interested(self, entry):
+        return isinstance(entry, ProjectEvent)
+
+    def consume(self, entry):
+        with self.__lock:
+            if self.__file is None:
+                return
+            if isinstance(entry, SubprojectEvent):
+                self.__subprojects.append(entry.sub_project_name)
+                event_type = 'subproject'
+            elif isinstance(entry, SubprojectEndEvent):
+                event_type = 'subproject_end'
+            elif isinstance(entry, SectionEvent):
+                self.__section = entry.title
+                self.__stage = None
+                event_type = 'section'
+            elif isinstance(entry, StageEvent):
+                self.__stage = entry.title
+                event_type = 'stage'
+            else:
+                event_type = 'event'
+            record = {
+                'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                'elapsed': round(time.perf_counter() - self.__start, 6),
+                'type': event_type,
+                'level': entry.entry_type.value,
+                'section': self.__section,
+                'stage': self.__stage,
+                'subproject': '/'.join(self.__subprojects) if len(self.__subprojects) > 0 else None,
+                'message': entry.to_readable()
+            }
+            self.__file.write(json.dumps(record) + '\n')
+            if isinstance(entry, SubprojectEndEvent) and len(self.__subprojects) > 0:
+                del self.__subprojects[-1]
+
+    def close(self):
+        with self.__lock:
+            if self.__file is not None:
+                self.__file.close()
+                self.__file = None
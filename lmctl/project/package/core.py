@@ -8,6 +8,7 @@ import lmctl.utils.descriptors as descriptor_utils
 import lmctl.files as files
 import lmctl.journal as journal
 import lmctl.project.journal as project_journal
+import lmctl.project.profiling as profiling
 import lmctl.project.package.meta as pkg_metas
 import lmctl.project.processes.push as push_exec
 import lmctl.project.processes.etsi_push as etsi_push_exec
@@ -15,6 +16,7 @@ import lmctl.project.processes.pkg_validation as pkg_validation_exec
 import lmctl.project.processes.testing as test_exec
 import lmctl.project.handlers.manager as handler_manager
 import lmctl.drivers.lm.base as lm_drivers
+from lmctl.utils.concurrency import run_concurrently, DEFAULT_MAX_WORKERS
 
 
 ########################
@@ -64,6 +66,14 @@ class PushOptions(ValidateOptions):
     def __init__(self):
         super().__init__()
 
+class MultiPushOptions(PushOptions):
+
+    def __init__(self):
+        super().__init__()
+        self.max_workers = DEFAULT_MAX_WORKERS
+        # Journal consumer for each environment, keyed by name, so the events of each push are kept apart
+        self.environment_journal_consumers = {}
+
 class TestOptions(Options):
 
     def __init__(self, tests = None):
@@ -126,6 +136,17 @@ class PkgInspectionReport:
             tpl['includes'].append(include.to_dict())
         return tpl
     
+class EnvironmentPushResult:
+
+    def __init__(self, environment_name, error=None, duration=None):
+        self.environment_name = environment_name
+        self.error = error
+        self.duration = duration
+
+    @property
+    def failed(self):
+        return self.error is not None
+
 class PkgIncludeEntry:
 
     def __init__(self, meta_entry):
@@ -243,14 +264,36 @@ class Pkg:
 
         push_workspace = self.__create_push_workspace()
         files.clean_directory(push_workspace)
-        pkg_content = self.open(push_workspace)
+        with profiling.phase('Extract'):
+            pkg_content = self.open(push_workspace)
 
         if self.__is_etsi_pkg(pkg_content.meta):
-            etsi_push_exec.EtsiPushProcess(self, pkg_content.meta, journal, env_sessions, push_workspace).execute()
+            with profiling.phase('Push'):
+                etsi_push_exec.EtsiPushProcess(self, pkg_content.meta, journal, env_sessions, push_workspace).execute()
         else:
             pkg_content.push(env_sessions, options)
         return pkg_content
 
+    def push_to_environments(self, env_sessions_by_name, options, pkg_content=None):
+        """
+        Push to several environments at the same time. The package is extracted (unless already open as pkg_content) and validated once,
+        then pushed to each environment on a bounded pool of threads. Returns an EnvironmentPushResult for each environment
+        """
+        journal = self.__init_journal(options.journal_consumer)
+        journal.section('Processing Package')
+        journal.event('Processing {0}'.format(self.path))
+        if pkg_content is None:
+            push_workspace = self.__create_push_workspace()
+            files.clean_directory(push_workspace)
+            with profiling.phase('Extract'):
+                pkg_content = self.open(push_workspace)
+        if self.__is_etsi_pkg(pkg_content.meta):
+            def etsi_push(env_sessions, env_journal):
+                with profiling.phase('Push'):
+                    etsi_push_exec.EtsiPushProcess(self, pkg_content.meta, env_journal, env_sessions, pkg_content.tree.root_path).execute()
+            return _push_to_each_environment(env_sessions_by_name, options, etsi_push)
+        return pkg_content.push_to_environments(env_sessions_by_name, options)
+
     def __create_push_workspace(self):
         tempdir = tempfile.mkdtemp()
         return tempdir
@@ -302,12 +345,24 @@ class PkgContent(PkgContentBase):
         validate_result = self.__do_validate(env_sessions, options, journal)
         if validate_result.has_errors():
             raise PushValidationError(validate_result)
+        self.__do_push_validated(env_sessions, options, journal)
+
+    def push_to_environments(self, env_sessions_by_name, options):
+        journal = self.__init_journal(options.journal_consumer)
+        # Validation (and any autocorrection of the content) does not depend on the target environment, so is only done once
+        validate_result = self.__do_validate(next(iter(env_sessions_by_name.values())), options, journal)
+        if validate_result.has_errors():
+            raise PushValidationError(validate_result)
+        return _push_to_each_environment(env_sessions_by_name, options, lambda env_sessions, env_journal: self.__do_push_validated(env_sessions, options, env_journal))
+
+    def __do_push_validated(self, env_sessions, options, journal):
         try:
             push_exec.PushProcess(self, options, journal, env_sessions).execute()
         except push_exec.PushProcessError as e:
             raise PushError(str(e)) from e
         journal.section('Post process environments')
-        self.__post_process_updated_environments(env_sessions, options, journal)
+        with profiling.phase('Refresh Resource Managers'):
+            self.__post_process_updated_environments(env_sessions, options, journal)
 
     def test(self, env_sessions, options):
         journal = self.__init_journal(options.journal_consumer)
@@ -346,6 +401,13 @@ class PkgContent(PkgContentBase):
         journal.event('Refreshing CP4NA orchestration ({0}) view of RM known as {1} with url {2}'.format(lm_session.env.address, rm_name, rm_data['url']))
         onboarding_driver.update_rm(rm_data)
 
+def _push_to_each_environment(env_sessions_by_name, options, push_func):
+    def push_to(environment_name):
+        env_journal = project_journal.ProjectJournal(options.environment_journal_consumers.get(environment_name, None))
+        push_func(env_sessions_by_name[environment_name], env_journal)
+    results = run_concurrently(push_to, env_sessions_by_name.keys(), max_workers=options.max_workers)
+    return [EnvironmentPushResult(result.item, error=result.error, duration=result.duration) for result in results]
+
 class ExpandedPkgTree(files.Tree):
 
     DEPRECATED_CONTENT_DIR = 'content'
@@ -0,0 +1,308 @@
+import json
+import yaml
+import zlib
+import hashlib
+import tarfile
+import zipfile
+import logging
+import posixpath
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from lmctl.project.package.core import ExpandedPkgTree, InvalidPackageError
+from lmctl.project.package.index import DEPRECATED_PKG_META_FILE_YML
+from lmctl.utils.concurrency import DEFAULT_MAX_WORKERS
+
+logger = logging.getLogger(__name__)
+
+ADDED = 'added'
+REMOVED = 'removed'
+CHANGED = 'changed'
+
+DESCRIPTOR_KIND = 'descriptor'
+BEHAVIOUR_KIND = 'behaviour'
+META_KIND = 'meta'
+
+DESCRIPTOR_FILE_NAMES = ('assembly', 'resource', 'type')
+YAML_EXTENSIONS = ('.yml', '.yaml')
+# Descriptor, behaviour and meta members larger than this are only compared by digest
+MAX_CONTENT_DIFF_SIZE = 16 * 1024 * 1024
+# Changed members are read again to compare their content in batches of up to this size in total, or the size of the largest of them if bigger
+MIN_CONTENT_DIFF_BATCH_SIZE = 1024 * 1024
+
+def member_kind(path):
+    """
+    Determine if a package member is a descriptor, behaviour (JSON) or meta file, which are compared by their content when changed. Returns None for any other member
+    """
+    parts = path.split('/')
+    file_name = parts[-1]
+    base_name, extension = posixpath.splitext(file_name)
+    if len(parts) == 1 and file_name in (ExpandedPkgTree.PKG_META_FILE_YML, DEPRECATED_PKG_META_FILE_YML):
+        return META_KIND
+    if extension == '.json' and 'Behaviour' in parts[:-1]:
+        return BEHAVIOUR_KIND
+    if extension in YAML_EXTENSIONS:
+        if 'Descriptor' in parts[:-1] or base_name in DESCRIPTOR_FILE_NAMES or '/'.join(parts[-3:-1]) == 'Definitions/lm':
+            return DESCRIPTOR_KIND
+    return None
+
+class ContentChange:
+    """
+    Change to a single value of a descriptor, behaviour or meta file. Path is the location of the value, with keys separated by dots
+    and list items in brackets (by name, when the items of both lists are objects with a unique "name" or "id", otherwise by index)
+    """
+
+    def __init__(self, path, change, old=None, new=None):
+        self.path = path
+        self.change = change
+        self.old = old
+        self.new = new
+
+    def __eq__(self, other):
+        return isinstance(other, ContentChange) and (self.path, self.change, self.old, self.new) == (other.path, other.change, other.old, other.new)
+
+    def __repr__(self):
+        return 'ContentChange({0!r}, {1!r}, old={2!r}, new={3!r})'.format(self.path, self.change, self.old, self.new)
+
+    def to_dict(self):
+        data = {'path': self.path, 'change': self.change}
+        if self.change != ADDED:
+            data['old'] = self.old
+        if self.change != REMOVED:
+            data['new'] = self.new
+        return data
+
+def _join_path(path, key):
+    if isinstance(key, str) and not key.startswith('['):
+        return key if path == '' else '{0}.{1}'.format(path, key)
+    return '{0}{1}'.format(path, key)
+
+def _list_keys(items):
+    for key_name in ('name', 'id'):
+        if all(isinstance(item, dict) and key_name in item for item in items):
+            keys = [str(item[key_name]) for item in items]
+            if len(set(keys)) == len(keys):
+                return keys
+    return None
+
+def diff_content(old, new, path=''):
+    """
+    Compare two parsed YAML/JSON documents, returning a ContentChange for each value added, removed or changed
+    """
+    if old == new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        changes = []
+        for key in old:
+            if key not in new:
+                changes.append(ContentChange(_join_path(path, str(key)), REMOVED, old=old[key]))
+            else:
+                changes.extend(diff_content(old[key], new[key], _join_path(path, str(key))))
+        for key in new:
+            if key not in old:
+                changes.append(ContentChange(_join_path(path, str(key)), ADDED, new=new[key]))
+        return changes
+    if isinstance(old, list) and isinstance(new, list):
+        old_keys = _list_keys(old)
+        new_keys = _list_keys(new)
+        if old_keys is None or new_keys is None:
+            old_keys = [str(i) for i in range(len(old))]
+            new_keys = [str(i) for i in range(len(new))]
+        return diff_content(dict(zip(('[{0}]'.format(k) for k in old_keys), old)), dict(zip(('[{0}]'.format(k) for k in new_keys), new)), path)
+    return [ContentChange(path, CHANGED, old=old, new=new)]
+
+class MemberChange:
+
+    def __init__(self, path, change, old_size=None, new_size=None, old_digest=None, new_digest=None, kind=None, content_changes=None):
+        self.path = path
+        self.change = change
+        self.old_size = old_size
+        self.new_size = new_size
+        self.old_digest = old_digest
+        self.new_digest = new_digest
+        self.kind = kind
+        # Only for changed descriptor, behaviour and meta members which could be parsed, otherwise None
+        self.content_changes = content_changes
+
+    def to_dict(self):
+        data = {'path': self.path, 'change': self.change}
+        if self.change != ADDED:
+            data['old'] = {'size': self.old_size, 'digest': self.old_digest}
+        if self.change != REMOVED:
+            data['new'] = {'size': self.new_size, 'digest': self.new_digest}
+        if self.kind is not None:
+            data['kind'] = self.kind
+        if self.content_changes is not None:
+            data['contentChanges'] = [c.to_dict() for c in self.content_changes]
+        return data
+
+class PkgDiff:
+
+    def __init__(self, old_path, new_path, changes=None, unchanged=0):
+        self.old_path = old_path
+        self.new_path = new_path
+        self.changes = changes if changes is not None else []
+        self.unchanged = unchanged
+
+    @property
+    def has_changes(self):
+        return len(self.changes) > 0
+
+    def count(self, change):
+        return len([c for c in self.changes if c.change == change])
+
+    def to_dict(self):
+        return {
+            'old': self.old_path,
+            'new': self.new_path,
+            'added': self.count(ADDED),
+            'removed': self.count(REMOVED),
+            'changed': self.count(CHANGED),
+            'unchanged': self.unchanged,
+            'members': [c.to_dict() for c in self.changes]
+        }
+
+class _MemberDigest:
+
+    def __init__(self, path, size, digest):
+        self.path = path
+        self.size = size
+        self.digest = digest
+
+def _read_members(path, include=None):
+    """
+    Yield the path (without any leading "./") and bytes of each file in a package, or only of the files for which include(path) is True.
+    Each archive member is read once and only one member is held at a time
+    """
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path, mode='r') as pkg_csar:
+            for info in pkg_csar.infolist():
+                if not info.is_dir():
+                    member_path = _normalise_member_path(info.filename)
+                    if include is None or include(member_path):
+                        yield member_path, pkg_csar.read(info)
+        return
+    try:
+        with tarfile.open(path, mode='r|*') as pkg_tar:
+            for member in pkg_tar:
+                if member.isfile():
+                    member_path = _normalise_member_path(member.name)
+                    if include is None or include(member_path):
+                        yield member_path, pkg_tar.extractfile(member).read()
+    except (tarfile.TarError, zlib.error, EOFError, OSError) as e:
+        raise InvalidPackageError('Could not read pkg {0} as a tgz or csar: {1}'.format(path, str(e))) from e
+
+def _normalise_member_path(path):
+    while path.startswith('./'):
+        path = path[2:]
+    return path
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+class PkgDiffer:
+    """
+    Compares the members of two packages by their sha256 digest, without extracting either package.
+
+    Each package is streamed up to twice:
+    - First, members are hashed on a pool of max_workers threads while the next member is decompressed, so at most max_workers members
+      are held in memory at a time.
+    - Then, only when descriptor, behaviour or meta files have changed, those files (up to MAX_CONTENT_DIFF_SIZE each) are read again
+      from both packages, parsed and compared by their content. They are read in batches, each no larger in total than the largest of them
+      (or MIN_CONTENT_DIFF_BATCH_SIZE), so memory use is bounded by the largest file rather than all of them. A csar only reads the
+      members of the batch, a tgz is streamed again for each batch
+    """
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS):
+        self.max_workers = max(max_workers or 1, 1)
+
+    def diff(self, old_path, new_path):
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            old_members = self.__digest_members(executor, old_path)
+            new_members = self.__digest_members(executor, new_path)
+        result = self.__compare(old_path, new_path, old_members, new_members)
+        self.__diff_contents(old_path, new_path, result)
+        return result
+
+    def __digest_members(self, executor, path):
+        members = {}
+        pending = deque()
+        def collect_oldest():
+            member_path, size, future = pending.popleft()
+            members[member_path] = _MemberDigest(member_path, size, future.result())
+        for member_path, data in _read_members(path):
+            pending.append((member_path, len(data), executor.submit(_sha256, data)))
+            del data
+            if len(pending) >= self.max_workers:
+                collect_oldest()
+        while len(pending) > 0:
+            collect_oldest()
+        return members
+
+    def __compare(self, old_path, new_path, old_members, new_members):
+        result = PkgDiff(old_path, new_path)
+        for member_path in sorted(set(old_members.keys()) | set(new_members.keys())):
+            old_member = old_members.get(member_path)
+            new_member = new_members.get(member_path)
+            kind = member_kind(member_path)
+            if new_member is None:
+                result.changes.append(MemberChange(member_path, REMOVED, old_size=old_member.size, old_digest=old_member.digest, kind=kind))
+            elif old_member is None:
+                result.changes.append(MemberChange(member_path, ADDED, new_size=new_member.size, new_digest=new_member.digest, kind=kind))
+            elif old_member.digest == new_member.digest:
+                result.unchanged += 1
+            else:
+                result.changes.append(MemberChange(member_path, CHANGED, old_size=old_member.size, new_size=new_member.size,
+                                                    old_digest=old_member.digest, new_digest=new_member.digest, kind=kind))
+        return result
+
+    def __diff_contents(self, old_path, new_path, result):
+        to_diff = {}
+        for change in result.changes:
+            if change.change == CHANGED and change.kind is not None and max(change.old_size, change.new_size) <= MAX_CONTENT_DIFF_SIZE:
+                to_diff[change.path] = change
+        if len(to_diff) == 0:
+            return
+        for batch in self.__content_batches(to_diff.values()):
+            self.__diff_batch_contents(old_path, new_path, batch)
+
+    def __content_batches(self, changes):
+        changes = sorted(changes, key=lambda change: change.path)
+        budget = max(MIN_CONTENT_DIFF_BATCH_SIZE, max(change.old_size for change in changes))
+        batch = {}
+        batch_size = 0
+        for change in changes:
+            if len(batch) > 0 and batch_size + change.old_size > budget:
+                yield batch
+                batch = {}
+                batch_size = 0
+            batch[change.path] = change
+            batch_size += change.old_size
+        if len(batch) > 0:
+            yield batch
+
+    def __diff_batch_contents(self, old_path, new_path, batch):
+        old_contents = {}
+        for member_path, data in _read_members(old_path, include=batch.__contains__):
+            old_contents[member_path] = data
+            if len(old_contents) == len(batch):
+                break
+        for member_path, data in _read_members(new_path, include=old_contents.__contains__):
+            # Release each old content as soon as it has been compared
+            old_content = old_contents.pop(member_path)
+            batch[member_path].content_changes = self.__diff_member_content(member_path, old_content, data)
+            if len(old_contents) == 0:
+                break
+
+    def __diff_member_content(self, member_path, old_content, new_content):
+        try:
+            if member_path.endswith('.json'):
+                old, new = json.loads(old_content), json.loads(new_content)
+            else:
+                old, new = yaml.safe_load(old_content), yaml.safe_load(new_content)
+        except (ValueError, yaml.YAMLError) as e:
+            logger.debug('Could not parse {0} to compare content: {1}'.format(member_path, str(e)))
+            return None
+        return diff_content(old, new)
+
+def diff_pkgs(old_path, new_path, max_workers=DEFAULT_MAX_WORKERS):
+    return PkgDiffer(max_workers=max_workers).diff(old_path, new_path)
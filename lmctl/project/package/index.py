@@ -0,0 +1,350 @@
+import os
+import json
+import yaml
+import shutil
+import sqlite3
+import hashlib
+import tarfile
+import zipfile
+import zlib
+import tempfile
+import logging
+import lmctl.project.package.meta as pkg_metas
+from lmctl.project.package.core import Pkg, ExpandedPkgTree, InvalidPackageError, PackageError
+from lmctl.utils.concurrency import run_concurrently, DEFAULT_MAX_WORKERS
+
+logger = logging.getLogger(__name__)
+
+PKG_EXTENSIONS = ('.tgz', '.csar')
+DEFAULT_INDEX_FILE_NAME = '.lmpkg-index.db'
+DEPRECATED_PKG_META_FILE_YML = 'lmproject.yml'
+# Increase when the tables change, so an index built by an older version is rebuilt instead of read
+SCHEMA_VERSION = 1
+READ_CHUNK_SIZE = 1024 * 1024
+
+class PkgIndexError(PackageError):
+    pass
+
+class _DigestReader:
+    """
+    File-like wrapper calculating the sha256 digest of everything read through it, so a package is read once for both its meta file and digest
+    """
+
+    def __init__(self, f):
+        self._f = f
+        self._hash = hashlib.sha256()
+
+    def read(self, size=-1):
+        data = self._f.read(size)
+        self._hash.update(data)
+        return data
+
+    def hexdigest(self):
+        # Anything after the meta file is only read for the digest, without being decompressed
+        for chunk in iter(lambda: self._f.read(READ_CHUNK_SIZE), b''):
+            self._hash.update(chunk)
+        return self._hash.hexdigest()
+
+def _root_member_name(member_name):
+    if member_name.startswith('./'):
+        return member_name[2:]
+    return member_name
+
+def _file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def read_pkg_meta(path):
+    """
+    Read the meta file of a package and the sha256 digest of the package file, without extracting it.
+
+    Only the meta file member is decompressed. Packages in a deprecated layout (with a "lmproject.yml" instead of a meta file) are opened
+    in a temporary directory, as their meta file is written on extraction. Returns a tuple of the raw meta dictionary, parsed RootPkgMeta and digest
+    """
+    raw_meta = None
+    is_deprecated = False
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path, mode='r') as pkg_csar:
+            for member_name in pkg_csar.namelist():
+                root_name = _root_member_name(member_name)
+                if root_name == ExpandedPkgTree.PKG_META_FILE_YML:
+                    raw_meta = pkg_csar.read(member_name)
+                    break
+                is_deprecated = is_deprecated or root_name == DEPRECATED_PKG_META_FILE_YML
+        digest = _file_digest(path)
+    else:
+        with open(path, 'rb') as f:
+            reader = _DigestReader(f)
+            try:
+                with tarfile.open(fileobj=reader, mode='r|*') as pkg_tar:
+                    for member in pkg_tar:
+                        if not member.isfile():
+                            continue
+                        root_name = _root_member_name(member.name)
+                        if root_name == ExpandedPkgTree.PKG_META_FILE_YML:
+                            raw_meta = pkg_tar.extractfile(member).read()
+                            break
+                        is_deprecated = is_deprecated or root_name == DEPRECATED_PKG_META_FILE_YML
+            except (tarfile.TarError, zlib.error, EOFError, OSError) as e:
+                raise InvalidPackageError('Could not determine if pkg {0} was a tgz or csar'.format(path)) from e
+            digest = reader.hexdigest()
+    if raw_meta is None:
+        if not is_deprecated:
+            raise InvalidPackageError('Could not find meta file {0} in pkg {1}'.format(ExpandedPkgTree.PKG_META_FILE_YML, path))
+        return None, _open_pkg_meta(path), digest
+    try:
+        meta_dict = yaml.safe_load(raw_meta)
+    except yaml.YAMLError as e:
+        raise InvalidPackageError('Could not parse meta file of pkg {0}: {1}'.format(path, str(e))) from e
+    return meta_dict, _parse_meta(meta_dict), digest
+
+def _open_pkg_meta(path):
+    tempdir = tempfile.mkdtemp()
+    try:
+        return Pkg(path).open(tempdir).meta
+    finally:
+        if os.path.exists(tempdir):
+            shutil.rmtree(tempdir)
+
+def _parse_meta(meta_dict):
+    if not isinstance(meta_dict, dict) or len(meta_dict) == 0:
+        raise InvalidPackageError('Meta file must be a non-empty dictionary')
+    try:
+        return pkg_metas.PkgMetaParser.from_dict(meta_dict)
+    except (pkg_metas.PkgMetaError, pkg_metas.PkgMetaParsingException, ValueError) as e:
+        raise InvalidPackageError(str(e)) from e
+
+class PkgIndexEntry:
+    """
+    Index record of a package file, with a content entry for the package and each of its subpackages (in the order "pkg inspect" lists them)
+    """
+
+    def __init__(self, path, mtime_ns, size, digest=None, meta=None, raw_meta=None, error=None):
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.digest = digest
+        self.meta = meta
+        self.raw_meta = raw_meta
+        self.error = error
+
+    def contents(self):
+        contents = []
+        if self.meta is not None:
+            self.__add_contents(contents, self.meta, None, 0)
+        return contents
+
+    def __add_contents(self, contents, meta_entry, parent, depth):
+        contents.append({
+            'name': meta_entry.full_name,
+            'descriptor_name': meta_entry.descriptor_name,
+            'content_type': meta_entry.content_type,
+            'resource_manager': meta_entry.resource_manager,
+            'parent': parent,
+            'depth': depth
+        })
+        for subpkg in meta_entry.subpkgs:
+            self.__add_contents(contents, subpkg, meta_entry.full_name, depth + 1)
+
+class PkgIndexUpdateResult:
+
+    def __init__(self):
+        self.added = []
+        self.updated = []
+        self.removed = []
+        self.unchanged = 0
+        # Packages which could not be read, as (path, error) tuples
+        self.errors = []
+
+    @property
+    def failed(self):
+        return len(self.errors) > 0
+
+class PkgIndex:
+    """
+    SQLite index of the packages in one or more directories, to find the package including a descriptor without opening every package.
+
+    The index is updated incrementally: only package files added, or with a different modification time or size since the last update, are read.
+    Packages which could not be read are read again on every update, so they are reported until they are fixed or removed
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._connection = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def open(self):
+        if self._connection is None:
+            index_dir = os.path.dirname(os.path.abspath(self.path))
+            if not os.path.exists(index_dir):
+                os.makedirs(index_dir)
+            try:
+                self._connection = sqlite3.connect(self.path)
+                self.__init_schema()
+            except sqlite3.DatabaseError as e:
+                self.close()
+                raise PkgIndexError('Could not open package index {0}: {1}'.format(self.path, str(e))) from e
+        return self
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def __init_schema(self):
+        connection = self._connection
+        version = connection.execute('PRAGMA user_version').fetchone()[0]
+        with connection:
+            if version != SCHEMA_VERSION:
+                connection.execute('DROP TABLE IF EXISTS contents')
+                connection.execute('DROP TABLE IF EXISTS packages')
+            connection.execute('''CREATE TABLE IF NOT EXISTS packages (
+                                    path TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL, digest TEXT,
+                                    name TEXT, version TEXT, content_type TEXT, meta TEXT, error TEXT)''')
+            connection.execute('''CREATE TABLE IF NOT EXISTS contents (
+                                    package_path TEXT NOT NULL, position INTEGER NOT NULL,
+                                    name TEXT NOT NULL, descriptor_name TEXT, content_type TEXT, resource_manager TEXT, parent TEXT, depth INTEGER NOT NULL)''')
+            connection.execute('CREATE INDEX IF NOT EXISTS contents_package_path ON contents(package_path)')
+            connection.execute('CREATE INDEX IF NOT EXISTS contents_descriptor_name ON contents(descriptor_name)')
+            connection.execute('CREATE INDEX IF NOT EXISTS contents_name ON contents(name)')
+            connection.execute('CREATE INDEX IF NOT EXISTS packages_digest ON packages(digest)')
+            connection.execute('PRAGMA user_version = {0}'.format(SCHEMA_VERSION))
+
+    @property
+    def connection(self):
+        if self._connection is None:
+            raise PkgIndexError('Package index {0} is not open'.format(self.path))
+        return self._connection
+
+    def update(self, directory, max_workers=DEFAULT_MAX_WORKERS, rebuild=False):
+        """
+        Index the package files (.tgz and .csar) in a directory and its subdirectories, reading those not already indexed at their current
+        modification time and size (or which previously failed to be read) on up to max_workers threads. Packages removed from the directory are removed from the index
+        """
+        if not os.path.isdir(directory):
+            raise PkgIndexError('Directory not found: {0}'.format(directory))
+        directory = os.path.abspath(directory)
+        connection = self.connection
+        indexed = {}
+        for path, mtime_ns, size, error in connection.execute('SELECT path, mtime_ns, size, error FROM packages'):
+            if path.startswith(directory + os.sep):
+                # Never matches the stat of a file, so packages which failed are read again
+                indexed[path] = (mtime_ns, size) if error is None else None
+        result = PkgIndexUpdateResult()
+        to_read = []
+        found = set()
+        for pkg_path, stat in self.__find_packages(directory):
+            found.add(pkg_path)
+            if not rebuild and indexed.get(pkg_path) == (stat.st_mtime_ns, stat.st_size):
+                result.unchanged += 1
+            else:
+                to_read.append(PkgIndexEntry(pkg_path, stat.st_mtime_ns, stat.st_size))
+        # Reading (decompression and hashing) is done on the worker threads, the index is only written to from this thread
+        for task_result in run_concurrently(self.__read_entry, to_read, max_workers=max_workers):
+            entry = task_result.item
+            if task_result.failed:
+                entry.error = str(task_result.error)
+            if entry.error is not None:
+                result.errors.append((entry.path, entry.error))
+            (result.updated if entry.path in indexed else result.added).append(entry.path)
+        removed = [path for path in indexed if path not in found]
+        with connection:
+            for entry in to_read:
+                self.__write_entry(entry)
+            for path in removed:
+                connection.execute('DELETE FROM contents WHERE package_path = ?', (path,))
+                connection.execute('DELETE FROM packages WHERE path = ?', (path,))
+        result.removed = removed
+        return result
+
+    def __find_packages(self, directory):
+        index_path = os.path.abspath(self.path)
+        for root, dirs, file_names in os.walk(directory):
+            dirs.sort()
+            for file_name in sorted(file_names):
+                pkg_path = os.path.join(root, file_name)
+                if file_name.endswith(PKG_EXTENSIONS) and pkg_path != index_path:
+                    yield pkg_path, os.stat(pkg_path)
+
+    def __read_entry(self, entry):
+        try:
+            entry.raw_meta, entry.meta, entry.digest = read_pkg_meta(entry.path)
+        except PackageError as e:
+            logger.debug('Failed to index pkg {0}: {1}'.format(entry.path, str(e)))
+            entry.error = str(e)
+        return entry
+
+    def __write_entry(self, entry):
+        connection = self.connection
+        connection.execute('DELETE FROM contents WHERE package_path = ?', (entry.path,))
+        meta = entry.meta
+        raw_meta = entry.raw_meta if entry.raw_meta is not None else (meta.to_dict() if meta is not None else None)
+        connection.execute('INSERT OR REPLACE INTO packages (path, mtime_ns, size, digest, name, version, content_type, meta, error) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                            (entry.path, entry.mtime_ns, entry.size, entry.digest,
+                                meta.full_name if meta is not None else None, meta.version if meta is not None else None,
+                                meta.content_type if meta is not None else None,
+                                json.dumps(raw_meta, default=str) if raw_meta is not None else None, entry.error))
+        connection.executemany('INSERT INTO contents (package_path, position, name, descriptor_name, content_type, resource_manager, parent, depth) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                                [(entry.path, position, c['name'], c['descriptor_name'], c['content_type'], c['resource_manager'], c['parent'], c['depth'])
+                                    for position, c in enumerate(entry.contents())])
+
+    def search(self, term=None, descriptor=None, version=None, content_type=None, resource_manager=None, digest=None):
+        """
+        Find the package contents (the package itself and each subpackage) matching all of the given criteria:
+        - term: text included in the name of the package, content or descriptor (case insensitive)
+        - descriptor: glob pattern matching the descriptor name (e.g. "resource::example*::1.0")
+        - version: version of the package
+        - content_type and resource_manager: of the content (case insensitive)
+        - digest: prefix of the sha256 digest of the package file
+        """
+        conditions = ['p.error IS NULL']
+        parameters = []
+        if term:
+            like = '%{0}%'.format(_escape_like(term))
+            conditions.append("(c.name LIKE ? ESCAPE '\\' OR c.descriptor_name LIKE ? ESCAPE '\\' OR p.name LIKE ? ESCAPE '\\')")
+            parameters.extend([like, like, like])
+        if descriptor:
+            conditions.append('c.descriptor_name GLOB ?')
+            parameters.append(descriptor)
+        if version:
+            conditions.append('p.version = ?')
+            parameters.append(version)
+        if content_type:
+            conditions.append('c.content_type = ? COLLATE NOCASE')
+            parameters.append(content_type)
+        if resource_manager:
+            conditions.append('c.resource_manager = ? COLLATE NOCASE')
+            parameters.append(resource_manager)
+        if digest:
+            conditions.append("p.digest LIKE ? ESCAPE '\\'")
+            parameters.append('{0}%'.format(_escape_like(digest.lower())))
+        query = '''SELECT p.path, p.name, p.version, p.digest, c.name, c.descriptor_name, c.content_type, c.resource_manager, c.parent, c.depth
+                    FROM contents c JOIN packages p ON p.path = c.package_path
+                    WHERE {0} ORDER BY p.name, p.version, p.path, c.position'''.format(' AND '.join(conditions))
+        results = []
+        for row in self.connection.execute(query, parameters):
+            results.append({
+                'package': row[1],
+                'version': row[2],
+                'path': row[0],
+                'digest': row[3],
+                'name': row[4],
+                'descriptor': row[5],
+                'type': row[6],
+                'resource-manager': row[7],
+                'parent': row[8],
+                'depth': row[9]
+            })
+        return results
+
+def _escape_like(value):
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
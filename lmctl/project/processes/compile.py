@@ -1,5 +1,6 @@
 import os
 import lmctl.files as files
+import lmctl.project.profiling as profiling
 import lmctl.project.handlers.interface as handlers_api
 from lmctl.project.package.core import ExpandedPkgTree
 from .common import LIFECYCLE_WORKSPACE
@@ -21,7 +22,8 @@ class CompileProcess:
 
     def execute(self):
         content_tree = self.__create_content_tree()
-        CompileWorker(self.project, self.options, self.staging_tree, content_tree, self.journal).work()
+        with profiling.phase('Compile'):
+            CompileWorker(self.project, self.options, self.staging_tree, content_tree, self.journal).work()
         return content_tree
 
 
@@ -65,15 +67,18 @@ class CompileWorker:
             self.journal.subproject(subproject.config.name)
             child_staging_tree = self.staging_tree.gen_subproject_staging_tree(subproject.config.directory)
             child_content_tree = self.content_tree.gen_child_content_tree(subproject.config.directory)
-            CompileWorker(subproject, self.options, child_staging_tree, child_content_tree, self.journal).work()
+            with profiling.phase(subproject.config.name):
+                CompileWorker(subproject, self.options, child_staging_tree, child_content_tree, self.journal).work()
             self.journal.subproject_end(subproject.config.name)
 
 class SourceCompiler:
 
-    def __init__(self, journal, source_config, compile_path):
+    def __init__(self, journal, source_config, compile_path, allow_links=True):
         self.journal = journal
         self.source_config = source_config
         self.compile_path = compile_path
+        # Sources are compiled from the staging directory, which is not modified once staged, so files may be hard linked rather than copied
+        self.allow_links = allow_links
 
     def _join_path(self, base_path, relative_path):
         return os.path.join(base_path, relative_path)
@@ -90,12 +95,14 @@ class SourceCompiler:
             compile_path = self.compile_path
         else:
             compile_path = self._make_path(self.compile_path, relative_compile_path)
-        files.copy_tree(orig_path, compile_path)
+        files.copy_tree(orig_path, compile_path, allow_links=self.allow_links)
+        profiling.record_copy(orig_path)
 
     def make_file_path(self, relative_compile_path):
         return self._make_path(self.compile_path, relative_compile_path)
 
     def compile_file(self, orig_path, relative_compile_path):
         target_path = self._make_path(self.compile_path, relative_compile_path)
-        files.copy_file(orig_path, target_path)
+        files.copy_file(orig_path, target_path, allow_links=self.allow_links)
+        profiling.record_copy(orig_path)
 
@@ -1,8 +1,9 @@
 import os
 import tarfile
-import zipfile
+import lmctl.archive as archive
 import yaml
 import lmctl.files as files
+import lmctl.project.profiling as profiling
 import lmctl.project.package.core as pkgs
 import lmctl.project.package.meta as pkg_metas
 from .common import LIFECYCLE_WORKSPACE
@@ -38,6 +39,10 @@ class PkgProcess:
         return PkgBuildTree(os.path.join(self.project.tree.root_path, LIFECYCLE_WORKSPACE, 'build'))
 
     def execute(self):
+        with profiling.phase('Package'):
+            return self.__execute()
+
+    def __execute(self):
         self.journal.section('Finalise Package')
         build_tree = self.__create_pkg_build_tree()
         files.clean_directory(build_tree.root_path)
@@ -48,10 +53,11 @@ class PkgProcess:
         pkg_tree = pkgs.ExpandedPkgTree()
         compiled_content_path = self.content_tree.root_path
         if self.project.config.packaging == CSAR_PACKAGING:
-            with zipfile.ZipFile(pkg_path, mode='w') as pkg_zip:
+            with archive.ZipWriter(pkg_path, self.project.config.compression_policy) as pkg_zip:
                 self.__build_package(pkg_zip.write, pkg_tree, compiled_content_path, pkg_meta_file_path)
         else:
-            with tarfile.open(pkg_path, mode='w:gz') as pkg_tar:
+            # Compiled content may be hard linked, dereference so linked files are added as regular files rather than tar links
+            with tarfile.open(pkg_path, mode='w:gz', dereference=True) as pkg_tar:
                 self.__build_package(pkg_tar.add, pkg_tree, compiled_content_path, pkg_meta_file_path)
         self.__clear_compile_directory()
         try:
@@ -1,5 +1,6 @@
 import lmctl.project.handlers.interface as handlers_api
 import lmctl.project.validation as validation
+import lmctl.project.profiling as profiling
 
 class PackageValidationProcessError(Exception):
     pass
@@ -13,7 +14,8 @@ class PackageValidationProcess:
         self.env_sessions = env_sessions
 
     def execute(self):
-        return PackageValidationWorker(self.pkg_content, self.options, self.journal, self.env_sessions).work()
+        with profiling.phase('Validate Content'):
+            return PackageValidationWorker(self.pkg_content, self.options, self.journal, self.env_sessions).work()
 
 class PackageValidationWorker:
 
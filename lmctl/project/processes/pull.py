@@ -1,8 +1,11 @@
 import os
+import threading
 import lmctl.files as files
+import lmctl.project.profiling as profiling
 import lmctl.project.handlers.interface as handlers_api
 from .common import LIFECYCLE_WORKSPACE
 import lmctl.project.source.config_references as refs
+from lmctl.utils.concurrency import run_concurrently, DEFAULT_MAX_WORKERS
 
 class BackupTree(files.Tree):
     CONTAINS_DIR = 'Contains'
@@ -41,7 +44,29 @@ class PullProcess:
 
     def execute(self):
         backup_tree = self.__create_backup_tree()
-        return PullWorker(self.project, self.options, backup_tree, self.journal, self.env_sessions, self.references).work()
+        with profiling.phase('Pull'):
+            env_sessions = self.__prefetch()
+            return PullWorker(self.project, self.options, backup_tree, self.journal, env_sessions, self.references).work()
+
+    def __prefetch(self):
+        descriptor_names = []
+        self.__collect_descriptor_names(self.project, descriptor_names)
+        if len(descriptor_names) == 0:
+            return self.env_sessions
+        max_workers = self.options.max_workers
+        with profiling.phase('Prefetch'):
+            self.journal.section('Prefetch Sources')
+            self.journal.event('Fetching {0} descriptor(s) and behaviour with up to {1} concurrent request(s)'.format(len(descriptor_names), max_workers))
+            prefetch = PullPrefetch()
+            prefetch.fetch(self.env_sessions.lm, descriptor_names, max_workers=max_workers)
+        return PrefetchedEnvironmentSessions(self.env_sessions, prefetch)
+
+    def __collect_descriptor_names(self, project, descriptor_names):
+        for descriptor_name in project.source_handler.pull_descriptor_names():
+            if descriptor_name not in descriptor_names:
+                descriptor_names.append(descriptor_name)
+        for subproject in project.subprojects:
+            self.__collect_descriptor_names(subproject, descriptor_names)
 
 class PullWorker:
 
@@ -72,9 +97,92 @@ class PullWorker:
         for subproject in subprojects:
             self.journal.subproject(subproject.config.name)
             child_backup_tree = self.backup_tree.gen_subproject_backup_tree(subproject.config.directory)
-            PullWorker(subproject, self.options, child_backup_tree, self.journal, self.env_sessions, self.references).work()
+            with profiling.phase(subproject.config.name):
+                PullWorker(subproject, self.options, child_backup_tree, self.journal, self.env_sessions, self.references).work()
             self.journal.subproject_end(subproject.config.name)
 
+class PullPrefetch:
+    """
+    Remote objects read by the source handlers during a pull, fetched concurrently before any handler runs.
+
+    Each result (or the exception raised fetching it) is handed out once, to the first call the handlers make for it
+    """
+    DESCRIPTOR_METHODS = ['get_descriptor']
+    BEHAVIOUR_METHODS = ['get_project', 'get_assembly_configurations', 'get_scenarios']
+
+    def __init__(self):
+        self._results = {}
+        self._lock = threading.Lock()
+
+    def fetch(self, lm_session, descriptor_names, max_workers=DEFAULT_MAX_WORKERS):
+        calls = []
+        for descriptor_name in descriptor_names:
+            calls.extend([(lm_session.descriptor_driver, method, descriptor_name) for method in PullPrefetch.DESCRIPTOR_METHODS])
+            calls.extend([(lm_session.behaviour_driver, method, descriptor_name) for method in PullPrefetch.BEHAVIOUR_METHODS])
+        # Run the first call alone, so the session authenticates once rather than once per worker
+        results = run_concurrently(self.__call, calls[:1])
+        results.extend(run_concurrently(self.__call, calls[1:], max_workers=max_workers))
+        with self._lock:
+            for result in results:
+                _, method, descriptor_name = result.item
+                self._results[(method, descriptor_name)] = result
+
+    def __call(self, call):
+        driver, method, descriptor_name = call
+        return getattr(driver, method)(descriptor_name)
+
+    def take(self, method, descriptor_name):
+        with self._lock:
+            return self._results.pop((method, descriptor_name), None)
+
+
+class PrefetchedDriver:
+    """
+    Wraps a driver so calls for prefetched objects return the prefetched result, while any other call goes to the driver
+    """
+
+    def __init__(self, driver, prefetch, methods):
+        self._driver = driver
+        self._prefetch = prefetch
+        self._methods = methods
+
+    def __getattr__(self, name):
+        attr = getattr(self._driver, name)
+        if name not in self._methods:
+            return attr
+        def prefetched_call(*args, **kwargs):
+            result = None
+            if len(args) == 1 and len(kwargs) == 0:
+                result = self._prefetch.take(name, args[0])
+            if result is None:
+                return attr(*args, **kwargs)
+            if result.failed:
+                raise result.error
+            return result.value
+        return prefetched_call
+
+
+class PrefetchedLmSession:
+
+    def __init__(self, lm_session, prefetch):
+        self._lm_session = lm_session
+        self.descriptor_driver = PrefetchedDriver(lm_session.descriptor_driver, prefetch, PullPrefetch.DESCRIPTOR_METHODS)
+        self.behaviour_driver = PrefetchedDriver(lm_session.behaviour_driver, prefetch, PullPrefetch.BEHAVIOUR_METHODS)
+
+    def __getattr__(self, name):
+        return getattr(self._lm_session, name)
+
+
+class PrefetchedEnvironmentSessions:
+
+    def __init__(self, env_sessions, prefetch):
+        self._env_sessions = env_sessions
+        self.lm = PrefetchedLmSession(env_sessions.lm, prefetch)
+
+    def __getattr__(self, name):
+        return getattr(self._env_sessions, name)
+
+
 class SourceBackupTool:
 
     def __init__(self, journal, source_config, backup_path):
@@ -95,6 +203,7 @@ class SourceBackupTool:
     def backup_file(self, orig_path, relative_backup_path):
         target_path = self._make_path(self.backup_path, relative_backup_path)
         files.copy_file(orig_path, target_path)
+        profiling.record_copy(orig_path)
 
     def backup_tree(self, orig_path, relative_backup_path=None):
         if relative_backup_path is None:
@@ -102,5 +211,6 @@ class SourceBackupTool:
         else:
             backup_path = self._make_path(self.backup_path, relative_backup_path)
         files.copy_tree(orig_path, backup_path)
+        profiling.record_copy(orig_path)
 
         
\ No newline at end of file
@@ -1,4 +1,5 @@
 import lmctl.project.handlers.interface as handlers_api
+import lmctl.project.profiling as profiling
 
 class PushProcessError(Exception):
     pass
@@ -12,7 +13,8 @@ class PushProcess:
         self.env_sessions = env_sessions
 
     def execute(self):
-        return PushWorker(self.pkg_content, self.options, self.journal, self.env_sessions).work()
+        with profiling.phase('Push'):
+            return PushWorker(self.pkg_content, self.options, self.journal, self.env_sessions).work()
 
 class PushWorker:
 
@@ -37,6 +39,7 @@ class PushWorker:
         subcontents = self.pkg_content.subcontents
         for subcontent in subcontents:
             self.journal.subproject(subcontent.meta.name)
-            PushWorker(subcontent, self.options, self.journal, self.env_sessions).work()
+            with profiling.phase(subcontent.meta.name):
+                PushWorker(subcontent, self.options, self.journal, self.env_sessions).work()
             self.journal.subproject_end(subcontent.meta.name)
 
@@ -1,5 +1,6 @@
 import os
 import lmctl.files as files
+import lmctl.project.profiling as profiling
 import lmctl.utils.descriptors as descriptor_utils
 import lmctl.project.mutate.descriptor as descriptor_mutations
 import lmctl.project.source.config_references as refs
@@ -43,7 +44,8 @@ class StageProcess:
 
     def execute(self):
         staging_tree = self.__create_staging_tree()
-        StageWorker(self.project, self.options, staging_tree, self.journal, self.references).work()
+        with profiling.phase('Stage'):
+            StageWorker(self.project, self.options, staging_tree, self.journal, self.references).work()
         return staging_tree
 
 class StageWorker:
@@ -86,7 +88,8 @@ class StageWorker:
         for subproject in subprojects:
             self.journal.subproject(subproject.config.name)
             child_staging_tree = self.staging_tree.gen_subproject_staging_tree(subproject.config.directory)
-            StageWorker(subproject, self.options, child_staging_tree, self.journal, self.references).work()
+            with profiling.phase(subproject.config.name):
+                StageWorker(subproject, self.options, child_staging_tree, self.journal, self.references).work()
             self.journal.subproject_end(subproject.config.name)
 
 class SourceStager:
@@ -111,6 +114,7 @@ class SourceStager:
         target_path = self._make_path(self.staging_path, relative_staging_path)
         if mutator is None:
             files.copy_file(orig_path, target_path)
+            profiling.record_copy(orig_path)
         else:
             with open(orig_path, 'r') as file:
                 old_contents = file.read()
@@ -122,12 +126,14 @@ class SourceStager:
     def stage_tree(self, orig_path, relative_staging_path):
         target_path = self._make_path(self.staging_path, relative_staging_path)
         files.copy_tree(orig_path, target_path)
+        profiling.record_copy(orig_path)
         return target_path
 
     def copy_staged_file(self, orig_path, relative_staging_path):
         src_path = self._make_path(self.staging_path, orig_path)
         target_path = self._make_path(self.staging_path, relative_staging_path)
         files.copy_file(src_path, target_path)
+        profiling.record_copy(src_path)
         return target_path
 
     def stage_descriptor(self, orig_path, relative_staging_path, is_template=False):
@@ -1,5 +1,6 @@
 import lmctl.project.handlers.interface as handlers_api
 import lmctl.project.testing as project_testing
+import lmctl.project.profiling as profiling
 
 class TestProcessError(Exception):
     pass
@@ -13,7 +14,8 @@ class TestProcess:
         self.env_sessions = env_sessions
 
     def execute(self):
-        return TestWorker(self.pkg_content, self.options, self.journal, self.env_sessions).work()
+        with profiling.phase('Test'):
+            return TestWorker(self.pkg_content, self.options, self.journal, self.env_sessions).work()
 
 class TestWorker:
 
@@ -44,7 +46,8 @@ class TestWorker:
         subcontents = self.pkg_content.subcontents
         for subcontent in subcontents:
             self.journal.subproject(subcontent.meta.name)
-            test_report = TestWorker(subcontent, self.options, self.journal, self.env_sessions).work()
+            with profiling.phase(subcontent.meta.name):
+                test_report = TestWorker(subcontent, self.options, self.journal, self.env_sessions).work()
             child_reports.append(test_report)
             self.journal.subproject_end(subcontent.meta.name)
         return child_reports
@@ -2,6 +2,7 @@ import os
 import lmctl.utils.descriptors as descriptor_utils
 import lmctl.project.validation as validation
 import lmctl.project.handlers.interface as handlers_api
+import lmctl.project.profiling as profiling
 
 class ValidationProcessError(Exception):
     pass
@@ -66,7 +67,8 @@ class ValidationProcess:
         self.options = options
 
     def execute(self):
-        return ValidationWorker(self.project, self.options, self.journal).work()
+        with profiling.phase('Validate'):
+            return ValidationWorker(self.project, self.options, self.journal).work()
 
 class ValidationWorker:
 
@@ -95,7 +97,8 @@ class ValidationWorker:
     def __validate_child_projects(self, errors, warnings):
         for subproject in self.project.subprojects:
             self.journal.subproject(subproject.config.name)
-            validation_result = ValidationWorker(subproject, self.options, self.journal).work()
+            with profiling.phase(subproject.config.name):
+                validation_result = ValidationWorker(subproject, self.options, self.journal).work()
             errors.extend(validation_result.errors)
             warnings.extend(validation_result.warnings)
             self.journal.subproject_end(subproject.config.name)
@@ -0,0 +1,175 @@
+import os
+import time
+import threading
+from contextlib import contextmanager
+from collections import OrderedDict
+from typing import List
+
+class PhaseRecord:
+    """
+    Time spent, and bytes copied/uploaded, in a phase of a project lifecycle execution.
+    Subprojects and nested phases are kept as children, so the totals of a record include its children
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.elapsed = 0.0
+        self.calls = 0
+        self.bytes_copied = 0
+        self.bytes_uploaded = 0
+        self.children = OrderedDict()
+
+    def child(self, name: str) -> 'PhaseRecord':
+        if name not in self.children:
+            self.children[name] = PhaseRecord(name)
+        return self.children[name]
+
+    @property
+    def total_bytes_copied(self) -> int:
+        return self.bytes_copied + sum(c.total_bytes_copied for c in self.children.values())
+
+    @property
+    def total_bytes_uploaded(self) -> int:
+        return self.bytes_uploaded + sum(c.total_bytes_uploaded for c in self.children.values())
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'elapsed': self.elapsed,
+            'calls': self.calls,
+            'bytesCopied': self.total_bytes_copied,
+            'bytesUploaded': self.total_bytes_uploaded,
+            'children': [c.to_dict() for c in self.children.values()]
+        }
+
+def _format_bytes(num_bytes: int) -> str:
+    for unit in ['B', 'KB', 'MB']:
+        if num_bytes < 1024:
+            return '{0:.0f}{1}'.format(num_bytes, unit) if unit == 'B' else '{0:.1f}{1}'.format(num_bytes, unit)
+        num_bytes /= 1024
+    return '{0:.1f}GB'.format(num_bytes)
+
+class PhaseProfiler:
+    """
+    Records the time spent in each (possibly nested) phase of an execution.
+
+    Phases are tracked per thread, so phases started on a worker thread are recorded under the root
+    """
+
+    def __init__(self, name: str = 'Total'):
+        self.root = PhaseRecord(name)
+        self.__lock = threading.Lock()
+        self.__local = threading.local()
+        self.__start = None
+
+    def __stack(self) -> List[PhaseRecord]:
+        if not hasattr(self.__local, 'stack'):
+            self.__local.stack = [self.root]
+        return self.__local.stack
+
+    def start(self):
+        self.__start = time.perf_counter()
+
+    def stop(self):
+        if self.__start is not None:
+            self.root.elapsed += time.perf_counter() - self.__start
+            self.root.calls += 1
+            self.__start = None
+
+    @contextmanager
+    def phase(self, name: str):
+        stack = self.__stack()
+        with self.__lock:
+            record = stack[-1].child(name)
+        stack.append(record)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            with self.__lock:
+                record.elapsed += elapsed
+                record.calls += 1
+
+    def record_bytes_copied(self, num_bytes: int):
+        record = self.__stack()[-1]
+        with self.__lock:
+            record.bytes_copied += num_bytes
+
+    def record_bytes_uploaded(self, num_bytes: int):
+        record = self.__stack()[-1]
+        with self.__lock:
+            record.bytes_uploaded += num_bytes
+
+    def summary(self) -> List[str]:
+        lines = []
+        self.__summarise(self.root, 0, lines)
+        return lines
+
+    def __summarise(self, record: PhaseRecord, depth: int, lines: List[str]):
+        text = '{0}{1}: {2:.3f}s'.format('  ' * depth, record.name, record.elapsed)
+        extras = []
+        if record.calls > 1:
+            extras.append('{0} calls'.format(record.calls))
+        if record.total_bytes_copied > 0:
+            extras.append('copied {0}'.format(_format_bytes(record.total_bytes_copied)))
+        if record.total_bytes_uploaded > 0:
+            extras.append('uploaded {0}'.format(_format_bytes(record.total_bytes_uploaded)))
+        if len(extras) > 0:
+            text += ' ({0})'.format(', '.join(extras))
+        lines.append(text)
+        for child in record.children.values():
+            self.__summarise(child, depth + 1, lines)
+
+
+_active_profiler = None
+
+def activate(profiler: PhaseProfiler):
+    """
+    Make profiler the target of the module level phase/record functions, used by the lifecycle processes
+    """
+    global _active_profiler
+    _active_profiler = profiler
+
+def deactivate():
+    global _active_profiler
+    _active_profiler = None
+
+def active_profiler() -> PhaseProfiler:
+    return _active_profiler
+
+@contextmanager
+def phase(name: str):
+    profiler = _active_profiler
+    if profiler is None:
+        yield None
+    else:
+        with profiler.phase(name) as record:
+            yield record
+
+def record_bytes_copied(num_bytes: int):
+    profiler = _active_profiler
+    if profiler is not None:
+        profiler.record_bytes_copied(num_bytes)
+
+def record_bytes_uploaded(num_bytes: int):
+    profiler = _active_profiler
+    if profiler is not None:
+        profiler.record_bytes_uploaded(num_bytes)
+
+def record_copy(path: str):
+    """
+    Record the size of a file, or all files in a directory, copied from path. Sizes are only read when a profiler is active
+    """
+    profiler = _active_profiler
+    if profiler is None or not os.path.exists(path):
+        return
+    if os.path.isdir(path):
+        num_bytes = 0
+        for root, _, filenames in os.walk(path):
+            for filename in filenames:
+                num_bytes += os.path.getsize(os.path.join(root, filename))
+    else:
+        num_bytes = os.path.getsize(path)
+    profiler.record_bytes_copied(num_bytes)
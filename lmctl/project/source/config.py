@@ -3,6 +3,7 @@ import os
 import yaml
 import shutil 
 import lmctl.utils.descriptors as descriptor_utils
+from lmctl.archive import CompressionPolicy, ArchiveError
 
 # Any Projects without a Schema are deemed to be using Schema 1.0, as the idea of a Schema was only introduced in v2.1 of lmctl
 SCHEMA_1_0 = '1.0'
@@ -56,6 +57,10 @@ class ProjectConfig:
     def descriptor_name(self):
         pass
 
+    @property
+    def compression_policy(self):
+        pass
+
     def is_subproject(self):
         return False
 
@@ -150,7 +155,7 @@ class ProjectConfigBase(ProjectConfig):
 
 class RootProjectConfig(ProjectConfigBase):
 
-    def __init__(self, schema, name, version, project_type, resource_manager=None, subproject_entries=None, packaging=None):
+    def __init__(self, schema, name, version, project_type, resource_manager=None, subproject_entries=None, packaging=None, compression=None):
         super().__init__(name, project_type, resource_manager, subproject_entries)
         if not schema:
             raise ValueError('schema must be defined')
@@ -161,6 +166,11 @@ class RootProjectConfig(ProjectConfigBase):
         if not packaging:
             packaging = 'tgz'
         self._packaging = packaging
+        try:
+            self._compression_policy = CompressionPolicy.from_dict(compression)
+        except ArchiveError as e:
+            raise ProjectConfigError(str(e)) from e
+        self._compression = compression
 
     @property
     def schema(self):
@@ -174,6 +184,14 @@ class RootProjectConfig(ProjectConfigBase):
     def packaging(self):
         return self._packaging
 
+    @property
+    def compression(self):
+        return self._compression
+
+    @property
+    def compression_policy(self):
+        return self._compression_policy
+
     def to_dict(self):
         data = {}
         data['schema'] = self.schema
@@ -182,6 +200,8 @@ class RootProjectConfig(ProjectConfigBase):
         del base_data['name']
         data['version'] = self.version
         data['packaging'] = self.packaging
+        if self.compression is not None:
+            data['compression'] = self.compression
         for key, value in base_data.items():
             data[key] = value
         return data
@@ -206,6 +226,10 @@ class SubprojectConfig(ProjectConfigBase):
     def directory(self):
         return self.entry.directory
 
+    @property
+    def compression_policy(self):
+        return self.parent_project.compression_policy
+
     @property
     def full_name(self):
         return '{0}-{1}'.format(self.entry.name, self.parent_project.full_name)
@@ -242,6 +266,7 @@ class ProjectConfigParserWorker:
     def parse(self):
         self.schema = self.__read_schema()
         self.packaging = self.__read_packaging()
+        self.compression = self.__read_compression()
         self.project_name = self.__read_project_name(self.config_dict)
         self.project_type = self.__read_project_type(self.config_dict)
         self.project_version = self.__read_project_version(self.config_dict)
@@ -249,7 +274,7 @@ class ProjectConfigParserWorker:
         subprojects = self.__read_subprojects(self.config_dict)
         if types.is_resource_type(self.project_type) or types.is_etsi_vnf_type(self.project_type):
             resource_manager = self.__read_resource_manager(self.config_dict)
-        return RootProjectConfig(self.schema, self.project_name, self.project_version, self.project_type, resource_manager, subprojects, packaging=self.packaging)
+        return RootProjectConfig(self.schema, self.project_name, self.project_version, self.project_type, resource_manager, subprojects, packaging=self.packaging, compression=self.compression)
 
     def __read_schema(self):
         if 'schema' not in self.config_dict:
@@ -262,6 +287,9 @@ class ProjectConfigParserWorker:
     def __read_packaging(self):
         return self.config_dict.get('packaging', None)
 
+    def __read_compression(self):
+        return self.config_dict.get('compression', None)
+
     def __read_project_name(self, config_dict):
         return config_dict.get('name', None)
 
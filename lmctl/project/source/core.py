@@ -13,6 +13,7 @@ import lmctl.project.processes.listelement as list_exec
 import lmctl.project.handlers.interface as handlers_api
 import lmctl.project.handlers.manager as handler_manager
 import lmctl.project.package.core as pkgs
+from lmctl.utils.concurrency import DEFAULT_MAX_WORKERS
 
 ########################
 # Exceptions
@@ -68,6 +69,7 @@ class PullOptions(Options):
 
     def __init__(self):
         super().__init__()
+        self.max_workers = DEFAULT_MAX_WORKERS
 
 ########################
 # Results
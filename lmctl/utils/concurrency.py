@@ -0,0 +1,52 @@
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Any, Tuple
+from lmctl.utils.trace_ctx import trace_ctx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 8
+
+class TaskResult:
+    """
+    Outcome of a single task executed by run_concurrently
+    """
+
+    def __init__(self, item: Any, value: Any = None, error: Exception = None, duration: float = None):
+        self.item = item
+        self.value = value
+        self.error = error
+        self.duration = duration
+
+    @property
+    def failed(self):
+        return self.error is not None
+
+def _run_task(func: Callable, item: Any, ctx_data: dict, catchable_exceptions: Tuple) -> TaskResult:
+    start = time.perf_counter()
+    # Worker threads do not share the caller's thread-local tracing context, so carry it over
+    with trace_ctx.scope(ctx_values=ctx_data):
+        try:
+            value = func(item)
+        except catchable_exceptions as e:
+            logger.debug(f'Concurrent task on {item} failed: {e}')
+            return TaskResult(item, error=e, duration=time.perf_counter() - start)
+    return TaskResult(item, value=value, duration=time.perf_counter() - start)
+
+def run_concurrently(func: Callable, items: Iterable[Any], max_workers: int = DEFAULT_MAX_WORKERS, catchable_exceptions: Tuple = (Exception,)) -> List[TaskResult]:
+    """
+    Call func once for each item using a bounded pool of threads.
+
+    Results are returned in the same order as items. Exceptions matching catchable_exceptions are captured
+    on the TaskResult, any others are raised to the caller.
+    """
+    items = list(items)
+    ctx_data = dict(trace_ctx.data)
+    if max_workers is None or max_workers < 1:
+        max_workers = 1
+    if max_workers == 1 or len(items) <= 1:
+        return [_run_task(func, item, ctx_data, catchable_exceptions) for item in items]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        futures = [executor.submit(_run_task, func, item, ctx_data, catchable_exceptions) for item in items]
+        return [f.result() for f in futures]
@@ -0,0 +1,51 @@
+import json
+import requests
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    # Optional (pip install lmctl[fast]), the standard library json module is used without it
+    orjson = None
+
+def orjson_available() -> bool:
+    return orjson is not None
+
+def loads(content: Union[bytes, bytearray, str]) -> Any:
+    """
+    Parse JSON content, raising ValueError when it is invalid. orjson reads bytes directly, without decoding them to a str first
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    if isinstance(content, (bytes, bytearray)):
+        content = content.decode('utf-8')
+    return json.loads(content)
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """
+    Convert obj to JSON, indented by 2 spaces when indent is True.
+    Objects orjson cannot convert (e.g. integers over 64 bits or dicts with non-string keys) are converted by the json module instead
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode('utf-8')
+        except TypeError:
+            pass
+    return json.dumps(obj, indent=2 if indent else None)
+
+def dumps_bytes(obj: Any) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            pass
+    return json.dumps(obj).encode('utf-8')
+
+def read_response(response: requests.Response) -> Any:
+    """
+    Parse the body of a response as JSON, raising ValueError when it is invalid
+    """
+    content = response.content
+    if orjson is not None and isinstance(content, (bytes, bytearray)):
+        return orjson.loads(content)
+    return response.json()
@@ -34,8 +34,12 @@ setup(
         'dataclasses>=0.6; python_version < "3.7"',
         'pyjwt>=1.5.3,<2.0'
     ],
+    extras_require={
+        'analysis': ['numpy>=1.17'],
+        'fast': ['orjson>=3']
+    },
     entry_points='''
         [console_scripts]
-        lmctl=lmctl.cli.entry:init_cli
+        lmctl=lmctl.cli.launcher:init_cli
     '''
 )
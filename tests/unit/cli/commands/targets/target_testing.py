@@ -0,0 +1,33 @@
+from unittest.mock import patch, MagicMock
+from lmctl.config import ConfigParser
+from lmctl.cli.controller import CLIController
+from lmctl.cli.entry import cli
+import tests.unit.cli.commands.command_testing as command_testing
+
+class TargetCommandTestCase(command_testing.CommandTestCase):
+    """
+    Runs target commands (e.g. "lmctl get assembly") against mocked TNCOClients, one for each of the environments
+    """
+
+    environments = ['dev', 'prod']
+
+    def setUp(self):
+        super().setUp()
+        config = ConfigParser().from_dict({
+            'active_environment': self.environments[0],
+            'environments': {name: {'tnco': {'address': f'https://{name}.example.com'}} for name in self.environments}
+        })
+        self.controller = CLIController(config, None)
+        self.tnco_clients = {name: MagicMock(name=f'{name}_tnco_client') for name in self.environments}
+        get_controller_patcher = patch('lmctl.cli.commands.targets.target.get_global_controller', return_value=self.controller)
+        self.mock_get_controller = get_controller_patcher.start()
+        self.addCleanup(get_controller_patcher.stop)
+        get_tnco_client_patcher = patch.object(self.controller, '_get_tnco_client', side_effect=self._get_mock_tnco_client)
+        self.mock_get_tnco_client = get_tnco_client_patcher.start()
+        self.addCleanup(get_tnco_client_patcher.stop)
+
+    def _get_mock_tnco_client(self, environment_group_name: str = None, **kwargs):
+        return self.tnco_clients[environment_group_name if environment_group_name is not None else self.environments[0]]
+
+    def invoke(self, *args, **kwargs):
+        return self.runner.invoke(cli, list(args), **kwargs)
@@ -0,0 +1,73 @@
+import json
+from lmctl.client import TNCOClientError, TNCOClientHttpError
+from unittest.mock import MagicMock
+from .target_testing import TargetCommandTestCase
+
+def assembly(id_value, state='Active'):
+    return {'id': id_value, 'name': f'assembly-{id_value}', 'descriptorName': 'assembly::Test::1.0', 'state': state}
+
+class TestWatchAssemblies(TargetCommandTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.api = self.tnco_clients['dev'].assemblies
+
+    def _watch(self, poll_results, *args):
+        # Ctrl+C after the last poll
+        self.api.poll.side_effect = list(poll_results) + [KeyboardInterrupt()]
+        return self.invoke('watch', 'assembly', '--interval', '0.1', '--max-interval', '0.1', '-o', 'ndjson', *args)
+
+    def test_watch(self):
+        result = self._watch([([assembly('1')], 'v1'), (None, 'v1'), ([assembly('1', state='Failed'), assembly('2')], 'v2')], '--name-contains', 'assembly-')
+        self.assert_no_errors(result)
+        self.assertEqual([(c['change'], c['id'], c['state']) for c in map(json.loads, result.output.splitlines())], [
+            ('added', '1', 'Active'),
+            ('changed', '1', 'Failed'),
+            ('added', '2', 'Active')
+        ])
+        self.assertEqual(self.api.poll.call_args_list[1][1], {'name_contains': 'assembly-', 'etag': 'v1'})
+
+    def test_watch_continues_after_transient_error(self):
+        result = self._watch([([assembly('1')], None), TNCOClientError('Connection refused'), ([assembly('1', state='Failed')], None)], '--topN', '--skip-existing')
+        self.assert_no_errors(result)
+        lines = result.output.splitlines()
+        self.assertEqual(lines[0], 'TNCO error occurred polling assemblies (retrying in 0.1s): Connection refused')
+        self.assertEqual(json.loads(lines[1])['change'], 'changed')
+
+    def test_watch_ends_on_other_client_error(self):
+        error = TNCOClientHttpError('Mock error', cause=MagicMock(response=MagicMock(status_code=403, headers={}, body=b'')))
+        result = self._watch([([assembly('1')], None), error], '--topN')
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn('TNCO error occurred: Mock error: status=403', result.output)
+
+    def test_watch_requires_one_search_option(self):
+        result = self.invoke('watch', 'assembly')
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn('Must set either "--name-contains" option or "--topN" option', result.output)
+
+class TestGetAssembliesFromEnvironments(TargetCommandTestCase):
+
+    def test_get_merges_environments(self):
+        self.tnco_clients['dev'].assemblies.get_topN.return_value = [assembly('1'), assembly('2')]
+        self.tnco_clients['prod'].assemblies.get_topN.return_value = [assembly('3', state='Failed')]
+        result = self.invoke('get', 'assembly', '--topN', '-e', 'dev,prod', '-o', 'json')
+        self.assert_no_errors(result)
+        self.assertEqual([(a['environment'], a['id']) for a in json.loads(result.output)['items']], [('dev', '1'), ('dev', '2'), ('prod', '3')])
+
+    def test_get_merges_environments_with_environment_column(self):
+        self.tnco_clients['dev'].assemblies.get.return_value = assembly('1')
+        self.tnco_clients['prod'].assemblies.get.return_value = assembly('1', state='Failed')
+        result = self.invoke('get', 'assembly', '--id', '1', '--all-environments')
+        self.assert_no_errors(result)
+        lines = result.output.splitlines()
+        self.assertEqual([c.strip() for c in lines[0].strip('|').split('|')], ['Environment', 'ID', 'Name', 'Descriptor Name', 'State'])
+        self.assertEqual([[c.strip() for c in line.strip('|').split('|')][0::4] for line in lines[2:]], [['dev', 'Active'], ['prod', 'Failed']])
+
+    def test_get_reports_failed_environment(self):
+        self.tnco_clients['dev'].assemblies.get_topN.return_value = [assembly('1')]
+        self.tnco_clients['prod'].assemblies.get_topN.side_effect = TNCOClientError('Connection refused')
+        result = self.invoke('get', 'assembly', '--topN', '-e', 'dev,prod', '-o', 'json')
+        self.assertEqual(result.exit_code, 1)
+        error, output = result.output.split('\n', 1)
+        self.assertEqual(error, 'TNCO error occurred on environment "prod": Connection refused')
+        self.assertEqual([(a['environment'], a['id']) for a in json.loads(output)['items']], [('dev', '1')])
@@ -0,0 +1,41 @@
+import json
+from lmctl.client import TNCOClientError
+from lmctl.utils.concurrency import TaskResult
+from .target_testing import TargetCommandTestCase
+
+def latency_metrics(*values):
+    return [{'name': 'latency', 'samples': [{'timestamp': f'2021-01-01T10:00:{i:02d}Z', 'value': v} for i, v in enumerate(values)]}]
+
+class TestAnalyzeScenarioExecutions(TargetCommandTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.api = self.tnco_clients['dev'].behaviour_scenario_execs
+
+    def test_analyze(self):
+        self.api.get_metrics_of_executions.return_value = [TaskResult('A', value=latency_metrics(1, 2)), TaskResult('B', value=latency_metrics(3))]
+        result = self.invoke('analyze', 'scenarioexecution', 'A', 'B', '-o', 'json')
+        self.assert_no_errors(result)
+        self.assertEqual(json.loads(result.output)['items'][0], {
+            'name': 'latency', 'executions': 2, 'count': 3, 'mean': 2.0, 'min': 1.0, 'p50': 2.0, 'p90': 3.0, 'p99': 3.0, 'max': 3.0, 'rate': 3.0
+        })
+        self.api.get_metrics_of_executions.assert_called_once_with(['A', 'B'], max_workers=8)
+
+    def test_analyze_reports_failed_executions_after_summary(self):
+        self.api.all_of_scenario.return_value = [{'id': 'A'}, {'id': 'B'}]
+        self.api.get_metrics_of_executions.return_value = [TaskResult('A', value=latency_metrics(1, 2)), TaskResult('B', error=TNCOClientError('Mock error'))]
+        result = self.invoke('analyze', 'scenarioexecution', '--scenario', 'S', '-o', 'csv')
+        self.assertEqual(result.exit_code, 1)
+        lines = result.output.splitlines()
+        self.assertEqual(lines[0], 'name,executions,count,mean,min,p50,p90,p99,max,rate')
+        self.assertTrue(lines[1].startswith('latency,1,2,1.5,'))
+        self.assertEqual(lines[-2:], [
+            'TNCO error occurred getting metrics of Scenario Execution "B": Mock error',
+            'Summarised 1 of 2 Scenario Execution(s), 1 failed'
+        ])
+
+    def test_analyze_fails_on_unexpected_metric_format(self):
+        self.api.get_metrics_of_executions.return_value = [TaskResult('A', value=[{'name': 'latency', 'values': [1, 2]}])]
+        result = self.invoke('analyze', 'scenarioexecution', 'A')
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn('Metric of execution A does not have a "name" and a list of "samples"', result.output)
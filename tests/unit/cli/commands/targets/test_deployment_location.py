@@ -0,0 +1,31 @@
+import os
+import yaml
+import shutil
+import tempfile
+from .target_testing import TargetCommandTestCase
+
+class TestExportDeploymentLocations(TargetCommandTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+
+    def test_export(self):
+        self.tnco_clients['dev'].deployment_locations.export_all.return_value = [{'name': 'Location A', 'resourceManager': 'brent'}]
+        result = self.invoke('export', 'deploymentlocation', '-d', self.tmp_dir)
+        self.assert_no_errors(result)
+        self.assert_output(result, f'Exported 1 Deployment Location(s) to {self.tmp_dir}')
+        with open(os.path.join(self.tmp_dir, 'Location_A.yaml'), 'r') as f:
+            self.assertEqual(yaml.safe_load(f), {'name': 'Location A', 'resourceManager': 'brent'})
+
+    def test_export_names_with_same_file_name(self):
+        locations = [{'name': 'Location A'}, {'name': 'Location_A'}, {'name': 'location_a'}, {'name': 'Location_A-2'}]
+        self.tnco_clients['dev'].deployment_locations.export_all.return_value = locations
+        result = self.invoke('export', 'deploymentlocation', '-d', self.tmp_dir)
+        self.assert_no_errors(result)
+        file_names = ['Location_A.yaml', 'Location_A-2.yaml', 'location_a-3.yaml', 'Location_A-2-2.yaml']
+        self.assertEqual(sorted(os.listdir(self.tmp_dir)), sorted(file_names))
+        for file_name, location in zip(file_names, locations):
+            with open(os.path.join(self.tmp_dir, file_name), 'r') as f:
+                self.assertEqual(yaml.safe_load(f), location)
@@ -0,0 +1,129 @@
+import os
+import json
+import yaml
+import shutil
+import tempfile
+from unittest.mock import MagicMock
+from lmctl.client import TNCOClientError
+from lmctl.client.api import DescriptorTemplatesAPI
+from .target_testing import TargetCommandTestCase
+
+class TestRenderDescriptorTemplate(TargetCommandTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.base_client = MagicMock(kami_address=None)
+        self.base_client.make_request.side_effect = self._render
+        self.tnco_clients['dev'].descriptor_templates = DescriptorTemplatesAPI(self.base_client)
+
+    def _render(self, request):
+        render_request = yaml.safe_load(request.body)
+        if render_request['properties'].get('fail', False):
+            raise TNCOClientError('Mock error')
+        template_name = request.endpoint.split('/')[-2]
+        return MagicMock(text=f'name: {template_name}::{render_request["properties"]["name"]}')
+
+    def _write_batch(self, requests):
+        path = os.path.join(self.tmp_dir, 'batch.jsonl')
+        with open(path, 'w') as f:
+            for request in requests:
+                f.write(json.dumps(request) + '\n')
+        return path
+
+    def test_render_batch(self):
+        batch_file = self._write_batch([
+            {'id': 'a', 'properties': {'name': 'A'}},
+            {'id': 'b', 'template': 'other', 'properties': {'name': 'B'}},
+            {'id': 'c', 'properties': {'name': 'A'}}
+        ])
+        result = self.invoke('render', 'descriptortemplate', 'main', '--batch', batch_file, '--concurrency', '2')
+        self.assert_no_errors(result)
+        self.assertEqual([json.loads(line) for line in result.output.splitlines()], [
+            {'id': 'a', 'template': 'main', 'result': {'name': 'main::A'}},
+            {'id': 'b', 'template': 'other', 'result': {'name': 'other::B'}},
+            {'id': 'c', 'template': 'main', 'result': {'name': 'main::A'}}
+        ])
+        # The identical request is only sent once, on the pooled session
+        self.assertEqual(self.base_client.make_request.call_count, 2)
+        session = self.base_client.pooled_session.return_value.__enter__.return_value
+        for call in self.base_client.make_request.call_args_list:
+            self.assertIs(call[0][0].session, session)
+
+    def test_render_batch_with_failure(self):
+        batch_file = self._write_batch([{'id': 'a', 'properties': {'name': 'A'}}, {'id': 'b', 'properties': {'fail': True}}])
+        result = self.invoke('render', 'descriptortemplate', 'main', '--batch', batch_file)
+        self.assertEqual(result.exit_code, 1)
+        self.assertEqual([json.loads(line) for line in result.output.splitlines()], [
+            {'id': 'a', 'template': 'main', 'result': {'name': 'main::A'}},
+            {'id': 'b', 'template': 'main', 'error': 'Mock error'}
+        ])
+
+    def test_render_batch_to_output_dir(self):
+        batch_file = self._write_batch([{'id': 'a', 'properties': {'name': 'A'}}, {'id': 'b/c', 'properties': {'name': 'B'}}])
+        output_dir = os.path.join(self.tmp_dir, 'output')
+        result = self.invoke('render', 'descriptortemplate', 'main', '--batch', batch_file, '--output-dir', output_dir, '-o', 'json')
+        self.assert_no_errors(result)
+        self.assert_output(result, f'Rendered 2 request(s) to {output_dir} (0 duplicate(s), 0 failure(s))')
+        self.assertEqual(sorted(os.listdir(output_dir)), ['a.json', 'b_c.json'])
+        with open(os.path.join(output_dir, 'b_c.json'), 'r') as f:
+            self.assertEqual(json.load(f), {'name': 'main::B'})
+
+    def test_render_batch_to_output_dir_numbers_repeated_file_names(self):
+        batch_file = self._write_batch([{'id': 'a/b', 'properties': {'name': 'A'}}, {'id': 'a_b', 'properties': {'name': 'B'}}, 
+                                            {'id': 'A_B', 'properties': {'name': 'C'}}, {'id': 'a/b', 'properties': {'name': 'D'}}])
+        output_dir = os.path.join(self.tmp_dir, 'output')
+        result = self.invoke('render', 'descriptortemplate', 'main', '--batch', batch_file, '--output-dir', output_dir, '-o', 'json')
+        self.assert_no_errors(result)
+        self.assertEqual(sorted(os.listdir(output_dir)), ['A_B-3.json', 'a_b-2.json', 'a_b-4.json', 'a_b.json'])
+        for file_name, expected_name in [('a_b.json', 'main::A'), ('a_b-2.json', 'main::B'), ('A_B-3.json', 'main::C'), ('a_b-4.json', 'main::D')]:
+            with open(os.path.join(output_dir, file_name), 'r') as f:
+                self.assertEqual(json.load(f), {'name': expected_name})
+
+    def test_output_dir_without_batch_fails(self):
+        result = self.invoke('render', 'descriptortemplate', 'main', '--output-dir', self.tmp_dir)
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn('Only use "--output-dir" option with "--batch" option', result.output)
+
+    def _write_template(self, template):
+        path = os.path.join(self.tmp_dir, 'template.yaml')
+        with open(path, 'w') as f:
+            yaml.safe_dump({'name': 'main', 'properties': {'name': {'type': 'string'}}, 'template': template}, f)
+        return path
+
+    def test_render_local_does_not_load_config(self):
+        template_file = self._write_template('name: main::{{ name }}')
+        result = self.invoke('render', 'descriptortemplate', '--local', '-f', template_file, '--prop', 'name=A')
+        self.assert_no_errors(result)
+        self.assert_output(result, 'name: main::A\n')
+        self.mock_get_controller.assert_not_called()
+
+    def test_render_local_batch_does_not_load_config(self):
+        template_file = self._write_template('name: main::{{ name }}')
+        batch_file = self._write_batch([{'id': 'a', 'properties': {'name': 'A'}}, {'id': 'b', 'properties': {'name': 'B'}}])
+        result = self.invoke('render', 'descriptortemplate', '--local', '-f', template_file, '--batch', batch_file)
+        self.assert_no_errors(result)
+        self.assertEqual([json.loads(line)['result'] for line in result.output.splitlines()], [{'name': 'main::A'}, {'name': 'main::B'}])
+        self.mock_get_controller.assert_not_called()
+
+    def test_render_local_with_verify_sample(self):
+        template_file = self._write_template('name: main::{{ name }}')
+        batch_file = self._write_batch([{'id': str(i), 'properties': {'name': str(i)}} for i in range(3)])
+        result = self.invoke('render', 'descriptortemplate', '--local', '-f', template_file, '--batch', batch_file, '--verify-sample', '2')
+        self.assert_no_errors(result)
+        # Only the sample is rendered on the server
+        self.assertEqual(self.base_client.make_request.call_count, 2)
+        self.mock_get_tnco_client.assert_called_once()
+
+    def test_render_local_with_verify_sample_fails_on_difference(self):
+        template_file = self._write_template('name: changed::{{ name }}')
+        result = self.invoke('render', 'descriptortemplate', '--local', '-f', template_file, '--prop', 'name=A', '--verify-sample', '1')
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn('Local render of main differs from the server render', result.output)
+
+    def test_verify_sample_without_local_fails(self):
+        result = self.invoke('render', 'descriptortemplate', 'main', '--verify-sample', '1')
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn('Only use "--verify-sample" option with "--local" option', result.output)
+        self.mock_get_controller.assert_not_called()
@@ -0,0 +1,56 @@
+import json
+from lmctl.client import TNCOClientError, TestResult, TestResults
+from .target_testing import TargetCommandTestCase
+
+class TestPingEnvironments(TargetCommandTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.tnco_clients['dev'].ping.return_value = TestResults([TestResult(name='Descriptors', duration=0.1), TestResult(name='Topology', duration=0.2)])
+
+    def test_ping_environments(self):
+        self.tnco_clients['prod'].ping.return_value = TestResults([TestResult(name='Descriptors', duration=0.3)])
+        result = self.invoke('ping', 'env', 'dev,prod', '--concurrency', '2')
+        self.assert_no_errors(result)
+        self.assertIn('CP4NA orchestration tests passed on 2 environment(s)!', result.output)
+        for name in ('dev', 'prod'):
+            self.tnco_clients[name].ping.assert_called_once_with(include_template_engine=False, max_workers=2)
+
+    def test_ping_environments_reports_failed_environment(self):
+        self.tnco_clients['prod'].ping.side_effect = TNCOClientError('Connection refused')
+        result = self.invoke('ping', 'env', '--all-environments', '-o', 'json')
+        self.assertEqual(result.exit_code, 1)
+        output, error = result.output.rsplit('\n', 2)[:2]
+        self.assertEqual([(r['environment'], r['name'], r['result'], r['error']) for r in json.loads(output)['items']], [
+            ('dev', 'Descriptors', 'OK', None),
+            ('dev', 'Topology', 'OK', None),
+            ('prod', 'Connection', 'Failed', 'Connection refused')
+        ])
+        self.assertEqual(error, 'CP4NA orchestration tests failed on: prod ❌')
+
+    def test_ping_environments_does_not_allow_repeat(self):
+        result = self.invoke('ping', 'env', 'dev,prod', '--repeat', '2')
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn('Do not use "--repeat" option when pinging more than one environment', result.output)
+
+    def test_ping_environment_with_output_format(self):
+        result = self.invoke('ping', 'env', 'dev', '-o', 'json')
+        self.assert_no_errors(result)
+        self.assertEqual(json.loads(result.output)['items'], [
+            {'name': 'Descriptors', 'result': 'OK', 'duration': 100.0, 'error': None},
+            {'name': 'Topology', 'result': 'OK', 'duration': 200.0, 'error': None}
+        ])
+
+    def test_ping_environment_as_table(self):
+        result = self.invoke('ping', 'env', 'dev')
+        self.assert_no_errors(result)
+        self.assertIn('Pinging CP4NA orchestration: https://dev.example.com', result.output)
+        self.assertIn('| Descriptors | OK       |         100 |         |', result.output)
+        self.assertIn('CP4NA orchestration tests passed! ✅', result.output)
+
+    def test_ping_environment_with_output_format_reports_failure(self):
+        self.tnco_clients['dev'].ping.return_value = TestResults([TestResult(name='Descriptors', error='Not found', duration=0.1)])
+        result = self.invoke('ping', 'env', 'dev', '-o', 'yaml')
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn('result: Failed', result.output)
+        self.assertIn('CP4NA orchestration tests failed! ❌', result.output)
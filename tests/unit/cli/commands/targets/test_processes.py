@@ -0,0 +1,108 @@
+import json
+from datetime import datetime, timedelta
+from .target_testing import TargetCommandTestCase
+
+def process(intent_type, status, duration):
+    return {'intentType': intent_type, 'assemblyType': 'assembly::A::1.0', 'status': status, 
+                'startTime': '2021-01-01T00:00:00.000Z', 'endTime': f'2021-01-01T00:00:{duration:02d}.000Z'}
+
+def queried_process(id_value, status='Completed'):
+    return {'id': id_value, 'intentType': 'CreateAssembly', 'status': status, 'startTime': '2021-01-01T00:00:00.000Z',
+                'assemblyId': f'assembly-id-{id_value}', 'assemblyName': f'assembly-{id_value}'}
+
+class TestGetProcesses(TargetCommandTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.api = self.tnco_clients['dev'].processes
+
+    def test_get_by_id(self):
+        self.api.get.return_value = queried_process('1')
+        result = self.invoke('get', 'process', '1', '--deep', '-o', 'json')
+        self.assert_no_errors(result)
+        self.assertEqual(json.loads(result.output), queried_process('1'))
+        self.api.get.assert_called_once_with('1', shallow=False)
+
+    def test_get_by_query(self):
+        self.api.query.return_value = [queried_process('1'), queried_process('2', status='Failed')]
+        result = self.invoke('get', 'process', '--assembly-name', 'assembly-1', '--status', 'Completed', '--status', 'Failed', '--limit', '10')
+        self.assert_no_errors(result)
+        lines = result.output.splitlines()
+        self.assertEqual([c.strip() for c in lines[0].strip('|').split('|')], ['Start Time', 'Intent', 'Status', 'Assembly'])
+        self.assertEqual([line.strip('|').split('|')[3].strip() for line in lines[2:]], ['assembly-1 (assembly-id-1)', 'assembly-2 (assembly-id-2)'])
+        self.api.query.assert_called_once_with(assemblyName='assembly-1', processStatuses='Completed,Failed', limit=10)
+
+    def test_get_deep_requires_id(self):
+        result = self.invoke('get', 'process', '--deep')
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn('Do not use "--deep" option when retrieving multiple processes', result.output)
+
+    def test_get_merges_environments(self):
+        self.api.query.return_value = [queried_process('1'), queried_process('2')]
+        self.tnco_clients['prod'].processes.query.return_value = [queried_process('3', status='Failed')]
+        result = self.invoke('get', 'process', '--assembly-type', 'assembly::A::1.0', '-e', 'dev,prod', '-o', 'json')
+        self.assert_no_errors(result)
+        self.assertEqual([(p['environment'], p['id'], p['status']) for p in json.loads(result.output)['items']], [
+            ('dev', '1', 'Completed'),
+            ('dev', '2', 'Completed'),
+            ('prod', '3', 'Failed')
+        ])
+        for name in ('dev', 'prod'):
+            self.tnco_clients[name].processes.query.assert_called_once_with(assemblyType='assembly::A::1.0')
+
+class TestAnalyzeProcesses(TargetCommandTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.api = self.tnco_clients['dev'].processes
+        self.api.query_in_windows.return_value = [
+            process('CreateAssembly', 'Completed', 10),
+            process('CreateAssembly', 'Failed', 30),
+            process('DeleteAssembly', 'Completed', 5)
+        ]
+
+    def test_analyze(self):
+        result = self.invoke('analyze', 'process', '--from', '2021-01-01', '--to', '2021-01-03', '--intent-type', 'CreateAssembly', '--intent-type', 'DeleteAssembly',
+                                '--assembly-type', 'assembly::A::1.0', '--concurrency', '2')
+        self.assert_no_errors(result)
+        self.assertIn('| Intent         | Assembly Type    |   Count |   Failed |', result.output.splitlines()[0])
+        self.api.query_in_windows.assert_called_once_with(datetime(2021, 1, 1), datetime(2021, 1, 3), timedelta(days=1), max_workers=2, lazy=True,
+                                                            assemblyType='assembly::A::1.0', intentTypes='CreateAssembly,DeleteAssembly')
+
+    def test_analyze_json(self):
+        result = self.invoke('analyze', 'process', '--from', '2021-01-01', '--to', '2021-01-03', '-o', 'json')
+        self.assert_no_errors(result)
+        self.assertEqual(json.loads(result.output)['items'][0], {
+            'intent_type': 'CreateAssembly', 'assembly_type': 'assembly::A::1.0', 'count': 2, 'failed': 1, 'failure_rate': 0.5, 'ended': 2, 
+            'mean': 20.0, 'p50': 10.0, 'p90': 30.0, 'p99': 30.0, 'max': 30.0
+        })
+
+    def test_analyze_csv(self):
+        result = self.invoke('analyze', 'process', '--from', '2021-01-01', '--to', '2021-01-03', '-o', 'csv')
+        self.assert_no_errors(result)
+        self.assertEqual(result.output.splitlines()[0], 'intent_type,assembly_type,count,failed,failure_rate,ended,mean,p50,p90,p99,max')
+        self.assertEqual(result.output.splitlines()[2], 'DeleteAssembly,assembly::A::1.0,1,0,0.0,1,5.0,5.0,5.0,5.0,5.0')
+
+    def test_analyze_window_durations(self):
+        for value, expected in [('30s', timedelta(seconds=30)), ('1.5h', timedelta(minutes=90)), ('6h', timedelta(hours=6)), ('2w', timedelta(weeks=2))]:
+            with self.subTest(value=value):
+                self.api.query_in_windows.reset_mock()
+                result = self.invoke('analyze', 'process', '--from', '2021-01-01', '--to', '2021-01-03', '--window', value)
+                self.assert_no_errors(result)
+                self.assertEqual(self.api.query_in_windows.call_args[0][2], expected)
+
+    def test_analyze_invalid_window_durations(self):
+        for value in ['0m', '10', '1y', 'h', '-1h']:
+            with self.subTest(value=value):
+                result = self.invoke('analyze', 'process', '--from', '2021-01-01', '--to', '2021-01-03', '--window', value)
+                self.assertEqual(result.exit_code, 2)
+                self.assertIn(f'{value} is not a duration such as 30m, 6h or 1d', result.output)
+        self.api.query_in_windows.assert_not_called()
+
+    def test_analyze_to_not_after_from(self):
+        for to_time in ['2021-01-01', '2020-12-31T23:00:00']:
+            with self.subTest(to_time=to_time):
+                result = self.invoke('analyze', 'process', '--from', '2021-01-01', '--to', to_time)
+                self.assertEqual(result.exit_code, 2)
+                self.assertIn('"--to" must be later than "--from"', result.output)
+        self.api.query_in_windows.assert_not_called()
@@ -0,0 +1,22 @@
+import unittest
+from dataclasses import dataclass
+from lmctl.cli.format import CsvFormat
+
+@dataclass
+class Row:
+    name: str
+    count: int = None
+
+class TestCsvFormat(unittest.TestCase):
+
+    def test_convert_list(self):
+        output = CsvFormat().convert_list([{'name': 'A', 'count': 1}, {'name': 'B,C', 'mean': 2.5}])
+        self.assertEqual(output, 'name,count,mean\nA,1,\n"B,C",,2.5')
+
+    def test_convert_list_of_dataclasses(self):
+        output = CsvFormat().convert_list([Row('A', 1), Row('B')])
+        self.assertEqual(output, 'name,count\nA,1\nB,')
+
+    def test_convert_element(self):
+        output = CsvFormat().convert_element({'name': 'A'})
+        self.assertEqual(output, 'name\nA')
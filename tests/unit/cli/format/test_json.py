@@ -1,5 +1,7 @@
+import json
 import unittest
 from lmctl.cli.format import JsonFormat, BadFormatError
+from lmctl.client.models import RecordList
 
 TEST_JSON_LIST = '''\
 {
@@ -28,11 +30,21 @@ class TestJsonFormat(unittest.TestCase):
         output = JsonFormat().convert_list(test_list)
         self.assertEqual(output, TEST_JSON_LIST)
     
+    def test_convert_list_of_records(self):
+        test_list = RecordList.from_json(b'[{"someObject": {"data": "some data"}}]')
+        output = JsonFormat().convert_list(test_list)
+        self.assertEqual(json.loads(output), {'items': [{'someObject': {'data': 'some data'}}]})
+
     def test_convert_element(self):
         element = {'someObject': {'data': 'some data'}}
         output = JsonFormat().convert_element(element)
         self.assertEqual(output, TEST_JSON_ELEMENT)
 
+    def test_convert_element_not_json(self):
+        with self.assertRaises(BadFormatError) as context:
+            JsonFormat().convert_element({'value': object()})
+        self.assertTrue('Failed to convert to JSON: ' in str(context.exception))
+
     def test_read(self):
         result = JsonFormat().read(TEST_JSON_ELEMENT)
         self.assertEqual(result, {'someObject': {'data': 'some data'}})
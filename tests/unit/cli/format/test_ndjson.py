@@ -0,0 +1,25 @@
+import json
+import unittest
+from dataclasses import dataclass
+from lmctl.cli.format import NdjsonFormat, BadFormatError
+
+@dataclass
+class Row:
+    name: str
+    count: int = None
+
+class TestNdjsonFormat(unittest.TestCase):
+
+    def test_convert_list(self):
+        output = NdjsonFormat().convert_list([{'name': 'A', 'nested': {'count': 1}}, Row('B', 2)])
+        self.assertEqual([json.loads(line) for line in output.split('\n')], [{'name': 'A', 'nested': {'count': 1}}, {'name': 'B', 'count': 2}])
+
+    def test_convert_element(self):
+        output = NdjsonFormat().convert_element(Row('A'))
+        self.assertEqual(output.count('\n'), 0)
+        self.assertEqual(json.loads(output), {'name': 'A', 'count': None})
+
+    def test_convert_element_not_json(self):
+        with self.assertRaises(BadFormatError) as context:
+            NdjsonFormat().convert_element({'value': object()})
+        self.assertTrue('Failed to convert to JSON: ' in str(context.exception))
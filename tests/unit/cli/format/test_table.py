@@ -1,5 +1,6 @@
 import unittest
 from lmctl.cli.format import TableFormat, Table, Column
+from lmctl.client.models import RecordList
 
 class DummyTable(Table):
     columns = [
@@ -41,6 +42,11 @@ class TestTableFormat(unittest.TestCase):
         ]
         output = TableFormat(table=DummyTable()).convert_list(test_list)
         self.assertEqual(output, EXPECTED_LIST)
+
+    def test_convert_list_of_records(self):
+        test_list = RecordList.from_json(b'[{"name": "A", "status": "Good"}, {"name": "B", "status": "Bad"}, {"name": "C", "status": "Excellent"}, {"name": "D"}]')
+        output = TableFormat(table=DummyTable()).convert_list(test_list)
+        self.assertEqual(output, EXPECTED_LIST)
     
     def test_convert_element(self):
         element = {'name': 'A', 'status': 'Good'}
@@ -0,0 +1,118 @@
+import sys
+import time
+import click
+import unittest
+from lmctl.cli.batch import BatchRunner, BatchStep, BatchError, read_steps, PASSED, FAILED, SKIPPED
+
+@click.group()
+def fake_cli():
+    pass
+
+@fake_cli.command()
+@click.argument('name')
+@click.option('--wait', type=float, default=0)
+def get(name, wait):
+    time.sleep(wait)
+    click.echo(f'Hello {name}')
+
+@fake_cli.command()
+@click.argument('name')
+def delete(name):
+    click.echo(f'Cannot delete {name}', err=True)
+    exit(2)
+
+@fake_cli.command()
+def broken():
+    raise ValueError('Mock error')
+
+class TestReadSteps(unittest.TestCase):
+
+    def test_read_steps(self):
+        steps = read_steps({'steps': [
+            'get A',
+            ['lmctl', 'get', 'B C'],
+            {'name': 'remove', 'command': 'delete A', 'continue_on_error': True},
+            {'name': 'both', 'parallel': ['get D', {'command': 'get E'}]}
+        ]})
+        self.assertEqual(len(steps), 4)
+        self.assertEqual(steps[0], BatchStep('1', argv=['get', 'A']))
+        self.assertEqual(steps[1], BatchStep('2', argv=['get', 'B C']))
+        self.assertEqual(steps[2], BatchStep('remove', argv=['delete', 'A'], continue_on_error=True))
+        self.assertEqual(steps[3], BatchStep('both', parallel=[BatchStep('both.1', argv=['get', 'D']), BatchStep('both.2', argv=['get', 'E'])]))
+
+    def test_read_steps_from_list(self):
+        steps = read_steps(['lmctl get A'])
+        self.assertEqual(steps, [BatchStep('1', argv=['get', 'A'])])
+
+    def test_read_steps_invalid(self):
+        invalid = [
+            None,
+            {'steps': []},
+            [{'name': 'no command'}],
+            [''],
+            [{'parallel': []}],
+            [{'parallel': [{'parallel': ['get A']}]}],
+            ['lmctl batch -f other.yaml'],
+            ['daemon start'],
+            [42]
+        ]
+        for data in invalid:
+            with self.subTest(data=data):
+                with self.assertRaises(BatchError):
+                    read_steps(data)
+
+class TestBatchRunner(unittest.TestCase):
+
+    def test_run_in_order(self):
+        runner = BatchRunner(fake_cli)
+        completed = []
+        result = runner.run(read_steps(['get A', 'get B']), on_step_complete=completed.append)
+        self.assertTrue(result.passed)
+        self.assertEqual([(s.name, s.status, s.exit_code, s.output) for s in result.steps], [('1', PASSED, 0, 'Hello A\n'), ('2', PASSED, 0, 'Hello B\n')])
+        self.assertEqual(completed, result.steps)
+
+    def test_run_parallel_captures_output_of_each_step(self):
+        runner = BatchRunner(fake_cli, max_workers=3)
+        steps = read_steps([{'name': 'group', 'parallel': ['get A --wait 0.2', 'get B --wait 0.1', 'get C']}])
+        start = time.perf_counter()
+        result = runner.run(steps)
+        self.assertLess(time.perf_counter() - start, 0.3 + 0.1)
+        self.assertTrue(result.passed)
+        self.assertEqual([(s.name, s.group, s.output) for s in result.steps],
+                            [('group.1', 'group', 'Hello A\n'), ('group.2', 'group', 'Hello B\n'), ('group.3', 'group', 'Hello C\n')])
+
+    def test_run_restores_streams(self):
+        original_streams = sys.stdout, sys.stderr, sys.stdin
+        BatchRunner(fake_cli).run(read_steps(['delete A', 'broken']))
+        self.assertEqual((sys.stdout, sys.stderr, sys.stdin), original_streams)
+
+    def test_run_skips_remaining_steps_after_failure(self):
+        runner = BatchRunner(fake_cli)
+        result = runner.run(read_steps(['delete A', 'get B', {'parallel': ['get C', 'get D']}]))
+        self.assertFalse(result.passed)
+        self.assertEqual([(s.status, s.exit_code) for s in result.steps], [(FAILED, 2), (SKIPPED, None), (SKIPPED, None), (SKIPPED, None)])
+        self.assertEqual(result.steps[0].error_output, 'Cannot delete A\n')
+        self.assertEqual(result.steps[2].command, 'get C')
+
+    def test_run_with_continue_on_error(self):
+        runner = BatchRunner(fake_cli, continue_on_error=True)
+        result = runner.run(read_steps(['broken', 'get B']))
+        self.assertFalse(result.passed)
+        self.assertEqual([(s.status, s.exit_code) for s in result.steps], [(FAILED, 1), (PASSED, 0)])
+        self.assertEqual(result.steps[0].error_output, 'Error: Mock error\n')
+
+    def test_run_with_step_continue_on_error(self):
+        runner = BatchRunner(fake_cli)
+        result = runner.run(read_steps([
+            {'command': 'delete A', 'continue_on_error': True},
+            {'parallel': ['delete B', 'get C'], 'continue_on_error': True},
+            'get D'
+        ]))
+        self.assertTrue(result.passed)
+        self.assertEqual([s.status for s in result.steps], [FAILED, FAILED, PASSED, PASSED])
+
+    def test_run_parallel_failure_completes_group_then_stops(self):
+        runner = BatchRunner(fake_cli)
+        result = runner.run(read_steps([{'parallel': ['delete A', 'get B']}, 'get C']))
+        self.assertFalse(result.passed)
+        self.assertEqual([s.status for s in result.steps], [FAILED, PASSED, SKIPPED])
@@ -0,0 +1,58 @@
+import unittest
+from unittest.mock import MagicMock
+from lmctl.cli.controller import CLIController
+from lmctl.config import Config
+from lmctl.environment import EnvironmentGroup, TNCOEnvironment
+
+class TestCLIController(unittest.TestCase):
+
+    def setUp(self):
+        config = Config(environments={
+            'dev': EnvironmentGroup('dev', '', TNCOEnvironment(address='http://dev')),
+            'test': EnvironmentGroup('test', '', TNCOEnvironment(address='http://test')),
+            'armonly': EnvironmentGroup('armonly', '')
+        }, active_environment='dev')
+        self.controller = CLIController(config, 'config.yaml')
+        self.controller.io = MagicMock()
+
+    def test_resolve_environment_names_single(self):
+        self.assertEqual(self.controller.resolve_environment_names('dev'), ['dev'])
+        self.assertEqual(self.controller.resolve_environment_names(None), [None])
+
+    def test_resolve_environment_names_comma_separated(self):
+        self.assertEqual(self.controller.resolve_environment_names('test, dev,test'), ['test', 'dev'])
+
+    def test_resolve_environment_names_fails_on_unknown_name(self):
+        with self.assertRaises(SystemExit):
+            self.controller.resolve_environment_names('dev,unknown')
+        self.controller.io.print_error.assert_called_once_with('Error: No environment named: unknown')
+
+    def test_resolve_environment_names_all_environments(self):
+        self.assertEqual(self.controller.resolve_environment_names(all_environments=True), ['dev', 'test'])
+
+    def test_get_tnco_clients(self):
+        clients = self.controller.get_tnco_clients(['dev', 'test'])
+        self.assertEqual({name: client.address for name, client in clients.items()}, {'dev': 'http://dev', 'test': 'http://test'})
+
+class TestReusingCLIController(unittest.TestCase):
+
+    def setUp(self):
+        self.tnco = TNCOEnvironment(address='http://secure', secure=True, client_id='Client', username='User')
+        config = Config(environments={'secure': EnvironmentGroup('secure', '', self.tnco)}, active_environment='secure')
+        self.controller = CLIController(config, 'config.yaml', reuse_tnco_clients=True)
+        self.controller.io = MagicMock()
+
+    def tearDown(self):
+        self.controller.close()
+
+    def test_get_tnco_client_reuses_client_for_same_credentials(self):
+        client = self.controller.get_tnco_client(input_pwd='pwd', input_client_secret='secret')
+        self.assertIs(self.controller.get_tnco_client(input_pwd='pwd', input_client_secret='secret'), client)
+        self.assertIsNot(self.controller.get_tnco_client(input_pwd='other', input_client_secret='secret'), client)
+        self.assertEqual(len(self.controller.tnco_clients), 2)
+
+    def test_get_tnco_client_does_not_write_credentials_to_config(self):
+        self.controller.get_tnco_client(input_pwd='pwd', input_client_secret='secret')
+        self.assertIsNone(self.tnco.password)
+        self.assertIsNone(self.tnco.client_secret)
+        self.controller.io.prompt.assert_not_called()
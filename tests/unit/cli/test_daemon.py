@@ -0,0 +1,85 @@
+import io
+import os
+import click
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+from lmctl.cli import daemon as lmctl_daemon
+from lmctl.cli.daemon import DaemonServer, DaemonInputRequired, forward, request
+
+@click.group()
+def fake_cli():
+    pass
+
+@fake_cli.command()
+@click.argument('name')
+def get(name):
+    click.echo(f'Hello {name}')
+    click.echo('Warning', err=True)
+    exit(3)
+
+@fake_cli.command()
+def create():
+    raise DaemonInputRequired()
+
+@unittest.skipIf(not lmctl_daemon.daemon_supported(), 'Unix domain sockets not supported')
+class TestDaemon(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.tmp_dir, 'daemon.sock')
+        self.server = DaemonServer(self.socket_path)
+        self.server.prepare = lambda: None
+        self.server._cli = fake_cli
+        self.server_thread = threading.Thread(target=self.server.serve_forever, kwargs={'poll_interval': 0.05})
+        self.server_thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server_thread.join()
+        self.server.server_close()
+        shutil.rmtree(self.tmp_dir)
+
+    def _forward(self, argv):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with patch('sys.stdout', stdout), patch('sys.stderr', stderr):
+            exit_code = forward(argv, socket_path=self.socket_path)
+        return exit_code, stdout.getvalue(), stderr.getvalue()
+
+    def test_forward(self):
+        exit_code, out, err = self._forward(['get', 'World'])
+        self.assertEqual(exit_code, 3)
+        self.assertEqual(out, 'Hello World\n')
+        self.assertEqual(err, 'Warning\n')
+
+    def test_forward_falls_back_when_input_required(self):
+        exit_code, out, err = self._forward(['create'])
+        self.assertIsNone(exit_code)
+        self.assertEqual(out, '')
+
+    def test_forward_skips_commands_not_forwarded(self):
+        self.assertIsNone(forward(['watch', 'assembly'], socket_path=self.socket_path))
+        self.assertEqual(self.server.commands_run, 0)
+
+    def test_forward_skipped_when_disabled(self):
+        with patch.dict(os.environ, {lmctl_daemon.DISABLE_ENV_VAR: '1'}):
+            self.assertIsNone(forward(['get', 'World'], socket_path=self.socket_path))
+
+    def test_forward_without_daemon(self):
+        self.assertIsNone(forward(['get', 'World'], socket_path=os.path.join(self.tmp_dir, 'missing.sock')))
+
+    def test_forwarded_commands_are_actions(self):
+        from lmctl.cli.commands.actions import action_types
+        action_names = [action.name for action in action_types]
+        self.assertEqual([name for name in lmctl_daemon.FORWARDED_COMMANDS if name not in action_names], [])
+
+    def test_socket_only_accessible_to_owner(self):
+        self.assertEqual(os.stat(self.socket_path).st_mode & 0o777, 0o600)
+
+    def test_status(self):
+        self._forward(['get', 'World'])
+        status = request({'control': lmctl_daemon.STATUS_REQUEST}, socket_path=self.socket_path)['status']
+        self.assertEqual(status['pid'], os.getpid())
+        self.assertEqual(status['commands'], 1)
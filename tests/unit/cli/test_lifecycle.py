@@ -0,0 +1,68 @@
+import unittest
+from unittest.mock import patch
+from lmctl.cli.lifecycle import ProjectPrinter, ExecutionController, printer as lifecycle_printer
+
+class TestProjectPrinter(unittest.TestCase):
+
+    @patch('lmctl.cli.lifecycle.output.printer')
+    def test_root_lines_printed_immediately(self, mock_printer):
+        printer = ProjectPrinter()
+        printer.print_text('Root')
+        mock_printer.text.assert_called_once_with('Root')
+
+    @patch('lmctl.cli.lifecycle.output.printer')
+    def test_subproject_lines_flushed_at_end_of_subproject(self, mock_printer):
+        printer = ProjectPrinter(flush_interval=60)
+        printer.inc_sub_project('A')
+        printer.print_text('One')
+        printer.inc_sub_project('B')
+        printer.print_text('Two')
+        printer.dec_sub_project()
+        mock_printer.text.assert_not_called()
+        printer.dec_sub_project()
+        mock_printer.text.assert_called_once_with('[A] One\n[A][B] Two')
+
+    @patch('lmctl.cli.lifecycle.output.printer')
+    def test_root_line_flushes_buffer_first(self, mock_printer):
+        printer = ProjectPrinter(flush_interval=60)
+        printer.inc_sub_project('A')
+        printer.print_text('One')
+        printer.print_header('Footer')
+        self.assertEqual(mock_printer.text.call_args_list[0][0][0], '[A] One')
+
+    @patch('lmctl.cli.lifecycle.output.printer')
+    def test_flushed_after_interval(self, mock_printer):
+        printer = ProjectPrinter(flush_interval=0.01)
+        printer.inc_sub_project('A')
+        printer.print_text('One')
+        printer._ProjectPrinter__flush_timer.join()
+        mock_printer.text.assert_called_once_with('[A] One')
+
+class TestExecutionController(unittest.TestCase):
+
+    def _buffer_then(self, error):
+        def exec_func():
+            lifecycle_printer.inc_sub_project('A')
+            lifecycle_printer.print_text('Last line')
+            raise error
+        return exec_func
+
+    @patch('lmctl.cli.lifecycle.output.printer')
+    def test_buffered_output_flushed_on_unexpected_error(self, mock_printer):
+        controller = ExecutionController('Test')
+        try:
+            with self.assertRaises(ValueError):
+                controller.execute(self._buffer_then(ValueError('Mock error')))
+            mock_printer.text.assert_called_once_with('[A] Last line')
+        finally:
+            lifecycle_printer.dec_sub_project()
+
+    @patch('lmctl.cli.lifecycle.output.printer')
+    def test_buffered_output_flushed_on_exit(self, mock_printer):
+        controller = ExecutionController('Test')
+        try:
+            with self.assertRaises(SystemExit):
+                controller.execute(self._buffer_then(SystemExit(1)))
+            mock_printer.text.assert_called_once_with('[A] Last line')
+        finally:
+            lifecycle_printer.dec_sub_project()
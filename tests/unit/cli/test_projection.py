@@ -0,0 +1,165 @@
+import unittest
+from lmctl.cli.format import TableFormat, JsonFormat, Table, Column
+from lmctl.cli.projection import (FieldSelection, FilterExpression, Comparison, Pushdown, ExpressionError,
+                                    compile_path, push_down, select, select_output_format)
+from lmctl.cli.commands.targets.tnco_target import select_result
+
+ASSEMBLIES = [
+    {'name': 'edge-1', 'state': 'Active', 'count': 3, 'enabled': True, 'properties': {'site': 'lab', 'tags': ['a', 'b']}},
+    {'name': 'edge-2', 'state': 'Failed', 'count': 12, 'enabled': False, 'properties': {'site': 'prod'}},
+    {'name': 'core-1', 'state': 'Active', 'count': 7, 'properties': {}}
+]
+
+def names(filter_text: str):
+    expression = FilterExpression(filter_text)
+    return [a['name'] for a in ASSEMBLIES if expression.matches(a)]
+
+class TestCompilePath(unittest.TestCase):
+
+    def test_nested_and_list_paths(self):
+        self.assertEqual(compile_path('name')(ASSEMBLIES[0]), 'edge-1')
+        self.assertEqual(compile_path('properties.site')(ASSEMBLIES[0]), 'lab')
+        self.assertEqual(compile_path('properties.tags.1')(ASSEMBLIES[0]), 'b')
+
+    def test_missing_path_is_none(self):
+        self.assertIsNone(compile_path('properties.site')(ASSEMBLIES[2]))
+        self.assertIsNone(compile_path('properties.tags.5')(ASSEMBLIES[0]))
+        self.assertIsNone(compile_path('name.other')(ASSEMBLIES[0]))
+
+    def test_invalid_path(self):
+        with self.assertRaises(ExpressionError):
+            compile_path('properties..site')
+
+class TestFilterExpression(unittest.TestCase):
+
+    def test_equals(self):
+        self.assertEqual(names('state==Active'), ['edge-1', 'core-1'])
+        self.assertEqual(names('state!=Active'), ['edge-2'])
+        self.assertEqual(names('state == "Failed"'), ['edge-2'])
+
+    def test_equals_numbers_booleans_and_null(self):
+        self.assertEqual(names('count==7'), ['core-1'])
+        self.assertEqual(names('count==7.0'), ['core-1'])
+        self.assertEqual(names('enabled==true'), ['edge-1'])
+        self.assertEqual(names('enabled==null'), ['core-1'])
+        self.assertEqual(names('enabled!=null'), ['edge-1', 'edge-2'])
+
+    def test_regex(self):
+        self.assertEqual(names('name~^edge-'), ['edge-1', 'edge-2'])
+        self.assertEqual(names('name!~^edge-'), ['core-1'])
+        self.assertEqual(names("name~'-(1|3)$'"), ['edge-1', 'core-1'])
+
+    def test_ordering(self):
+        self.assertEqual(names('count>5'), ['edge-2', 'core-1'])
+        self.assertEqual(names('count<=7'), ['edge-1', 'core-1'])
+        # Not a number, so compared as strings
+        self.assertEqual(names('name<edge'), ['core-1'])
+
+    def test_and_or_not_and_brackets(self):
+        self.assertEqual(names('state==Active and name~^edge-'), ['edge-1'])
+        self.assertEqual(names('state==Failed or name~^core'), ['edge-2', 'core-1'])
+        self.assertEqual(names('not (state==Failed or name~^core)'), ['edge-1'])
+        self.assertEqual(names('state==Active AND NOT name~^core'), ['edge-1'])
+
+    def test_present(self):
+        self.assertEqual(names('properties.site'), ['edge-1', 'edge-2'])
+        self.assertEqual(names('not enabled'), ['edge-2', 'core-1'])
+
+    def test_invalid(self):
+        invalid = ['', 'state=Active', 'state==', '(state==Active', 'state==Active)', 'state==Active and', 'name~"["', 'count>null', '== Active']
+        for text in invalid:
+            with self.subTest(text=text):
+                with self.assertRaises(ExpressionError):
+                    FilterExpression(text)
+
+    def test_required_comparisons(self):
+        self.assertEqual(FilterExpression('state==Active').required_comparisons(), [Comparison('state', '==', 'Active')])
+        self.assertEqual(FilterExpression('state==Active and (name~^a or name~^b) and count>1').required_comparisons(),
+                            [Comparison('state', '==', 'Active'), Comparison('count', '>', '1')])
+        self.assertEqual(FilterExpression('state==Active or count>1').required_comparisons(), [])
+        self.assertEqual(FilterExpression('not state==Active').required_comparisons(), [])
+
+class TestFieldSelection(unittest.TestCase):
+
+    def test_apply(self):
+        fields = FieldSelection('name, properties.site,missing')
+        self.assertEqual(fields.apply(ASSEMBLIES[0]), {'name': 'edge-1', 'properties': {'site': 'lab'}, 'missing': None})
+
+    def test_no_fields(self):
+        with self.assertRaises(ExpressionError):
+            FieldSelection(' , ')
+
+    def test_overlapping_fields_are_invalid(self):
+        for expression in ['name,name.x', 'properties.x,properties', 'properties.site,properties.site.x.y']:
+            with self.subTest(expression=expression):
+                with self.assertRaises(ExpressionError) as context:
+                    FieldSelection(expression)
+                self.assertIn('overlap, use only one of them', str(context.exception))
+        # Siblings and repeats do not overlap
+        element = {'properties': {'site': 'A', 'siteId': 'B'}}
+        self.assertEqual(FieldSelection('properties.site,properties.siteId,properties.site').apply(element), {'properties': {'site': 'A', 'siteId': 'B'}})
+        self.assertEqual(element, {'properties': {'site': 'A', 'siteId': 'B'}})
+
+    def test_table_format(self):
+        fields = FieldSelection('name,properties.site')
+        output = fields.table_format().convert_list([fields.apply(a) for a in ASSEMBLIES[:2]])
+        expected_output = '| name   | properties.site   |'
+        expected_output += '\n|--------+-------------------|'
+        expected_output += '\n| edge-1 | lab               |'
+        expected_output += '\n| edge-2 | prod              |'
+        self.assertEqual(output, expected_output)
+
+    def test_select_output_format(self):
+        table = Table()
+        table.columns = [Column('name')]
+        table_format = TableFormat(table=table)
+        json_format = JsonFormat()
+        self.assertIs(select_output_format(table_format), table_format)
+        self.assertIs(select_output_format(json_format, FieldSelection('name')), json_format)
+        self.assertEqual([c.name for c in select_output_format(table_format, FieldSelection('state,count')).get_columns()], ['state', 'count'])
+
+class TestSelect(unittest.TestCase):
+
+    def test_select(self):
+        selected = list(select(ASSEMBLIES, FilterExpression('state==Active'), FieldSelection('name')))
+        self.assertEqual(selected, [{'name': 'edge-1'}, {'name': 'core-1'}])
+
+    def test_select_result(self):
+        self.assertIs(select_result(ASSEMBLIES), ASSEMBLIES)
+        self.assertEqual(select_result(ASSEMBLIES, fields=FieldSelection('name')), [{'name': 'edge-1'}, {'name': 'edge-2'}, {'name': 'core-1'}])
+        self.assertEqual(select_result(ASSEMBLIES[0], FilterExpression('state==Active'), FieldSelection('state')), {'state': 'Active'})
+        self.assertEqual(select_result(ASSEMBLIES[1], FilterExpression('state==Active')), [])
+
+class TestPushdown(unittest.TestCase):
+
+    def test_equals_pushed_down(self):
+        kwargs = {'id': None, 'status': ()}
+        pushed = push_down(FilterExpression('status==Failed and name~^edge'), [Pushdown('status', 'status', multiple=True, skip_when=['id'])], kwargs)
+        self.assertEqual(pushed, ['status'])
+        self.assertEqual(kwargs['status'], ('Failed',))
+
+    def test_not_pushed_down_when_option_set_or_skipped(self):
+        pushdown = Pushdown('status', 'status', skip_when=['id'])
+        kwargs = {'status': 'Completed'}
+        self.assertEqual(push_down(FilterExpression('status==Failed'), [pushdown], kwargs), [])
+        self.assertEqual(kwargs['status'], 'Completed')
+        kwargs = {'id': '123'}
+        self.assertEqual(push_down(FilterExpression('status==Failed'), [pushdown], kwargs), [])
+        self.assertNotIn('status', kwargs)
+
+    def test_not_pushed_down_unless_required(self):
+        pushdown = Pushdown('status', 'status')
+        for text in ['status==Failed or name==A', 'not status==Failed', 'status!=Failed', 'status~^F', 'status==null']:
+            with self.subTest(text=text):
+                kwargs = {}
+                self.assertEqual(push_down(FilterExpression(text), [pushdown], kwargs), [])
+                self.assertEqual(kwargs, {})
+
+    def test_contains_from_plain_regex(self):
+        pushdown = Pushdown('name', 'name_contains', contains=True)
+        self.assertEqual(pushdown.value_for(Comparison('name', '~', '^edge-')), 'edge-')
+        self.assertEqual(pushdown.value_for(Comparison('name', '~', 'edge$')), 'edge')
+        self.assertEqual(pushdown.value_for(Comparison('name', '==', 'edge-1')), 'edge-1')
+        self.assertIsNone(pushdown.value_for(Comparison('name', '~', '^edge-.*-1')))
+        self.assertIsNone(pushdown.value_for(Comparison('name', '~', '^$')))
+        self.assertIsNone(pushdown.value_for(Comparison('state', '~', 'edge')))
@@ -6,11 +6,13 @@ from lmctl.client.models import (CreateAssemblyIntent, UpgradeAssemblyIntent, Ch
                                     DeleteAssemblyIntent, ScaleAssemblyIntent, HealAssemblyIntent,
                                     AdoptAssemblyIntent, CreateOrUpgradeAssemblyIntent)
 from lmctl.client.client_request import TNCOClientRequest
+from lmctl.client import NameCache, TNCOClientError, TNCOClientNotFoundError, TNCOClientHttpError
 
 class TestAssembliesAPI(unittest.TestCase):
 
     def setUp(self):
         self.mock_client = MagicMock()
+        self.mock_client.assembly_name_cache = NameCache()
         self.assemblies = AssembliesAPI(self.mock_client)
 
     def test_get(self):
@@ -48,6 +50,22 @@ class TestAssembliesAPI(unittest.TestCase):
         self.assertEqual(response, mock_response)
         self.mock_client.make_request.assert_called_with(TNCOClientRequest.build_request_for_json(method='GET', endpoint='api/topology/assemblies', query_params={'nameContains': 'Test'}))
 
+    def test_poll(self):
+        self.mock_client.make_request.return_value = MagicMock(status_code=200, headers={'ETag': 'v1'})
+        self.mock_client.make_request.return_value.json.return_value = {'assemblies': [{'id': '123', 'name': 'Test'}]}
+        assemblies, etag = self.assemblies.poll(name_contains='Te')
+        self.assertEqual(assemblies, [{'id': '123', 'name': 'Test'}])
+        self.assertEqual(etag, 'v1')
+        self.mock_client.make_request.assert_called_with(TNCOClientRequest.build_request_for_json(method='GET', endpoint='api/topology/assemblies', query_params={'nameContains': 'Te'}))
+
+    def test_poll_not_modified(self):
+        self.mock_client.make_request.return_value = MagicMock(status_code=304, headers={})
+        assemblies, etag = self.assemblies.poll(etag='v1')
+        self.assertIsNone(assemblies)
+        self.assertEqual(etag, 'v1')
+        request = self.mock_client.make_request.call_args[0][0]
+        self.assertEqual(request.headers['If-None-Match'], 'v1')
+
     def test_intent(self):
         mock_response = MagicMock(headers={'Location': '/api/processes/123'})
         self.mock_client.make_request.return_value = mock_response
@@ -238,3 +256,108 @@ class TestAssembliesAPI(unittest.TestCase):
         response = self.assemblies.intent_adopt(intent)
         self.assertEqual(response, '123')
         self.mock_client.make_request.assert_called_with(TNCOClientRequest(method='POST', endpoint='api/intent/adoptAssembly', headers={'Content-Type': 'application/json'}, body=json.dumps(intent)))
+
+class TestAssembliesAPINameResolution(unittest.TestCase):
+
+    def setUp(self):
+        self.mock_client = MagicMock()
+        self.mock_client.assembly_name_cache = NameCache()
+        self.assemblies = AssembliesAPI(self.mock_client)
+
+    def _mock_topology_by_name(self, existing):
+        def make_request(request):
+            response = MagicMock()
+            if 'name' in request.query_params:
+                name = request.query_params['name']
+                response.json.return_value = [{'id': existing[name], 'name': name}] if name in existing else []
+            else:
+                search = request.query_params['nameContains']
+                response.json.return_value = {'assemblies': [{'id': v, 'name': k} for k,v in existing.items() if search in k]}
+            return response
+        self.mock_client.make_request.side_effect = make_request
+
+    def test_resolve_ids_by_name(self):
+        self._mock_topology_by_name({'A': '1', 'B': '2'})
+        result = self.assemblies.resolve_ids_by_name(['A', 'B', 'A'])
+        self.assertEqual(result, {'A': '1', 'B': '2'})
+        self.assertEqual(self.mock_client.make_request.call_count, 2)
+
+    def test_resolve_ids_by_name_uses_cache(self):
+        self._mock_topology_by_name({'A': '1'})
+        self.assemblies.resolve_id_by_name('A')
+        self.assertEqual(self.assemblies.resolve_id_by_name('A'), '1')
+        self.assertEqual(self.mock_client.make_request.call_count, 1)
+
+    def test_resolve_ids_by_name_with_prefix(self):
+        self._mock_topology_by_name({'edge-A': '1', 'edge-B': '2', 'core-C': '3'})
+        result = self.assemblies.resolve_ids_by_name(['edge-A', 'edge-B', 'core-C'], prefix='edge-')
+        self.assertEqual(result, {'edge-A': '1', 'edge-B': '2', 'core-C': '3'})
+        # One prefix query, one individual lookup
+        self.assertEqual(self.mock_client.make_request.call_count, 2)
+
+    def test_resolve_ids_by_name_raises_error_when_not_found(self):
+        self._mock_topology_by_name({'A': '1'})
+        with self.assertRaises(TNCOClientError) as context:
+            self.assemblies.resolve_ids_by_name(['A', 'B'])
+        self.assertIsInstance(context.exception, TNCOClientNotFoundError)
+        self.assertEqual(str(context.exception), 'No Assembly found with name matching "B"')
+
+    def test_resolve_ids_by_name_ignore_missing(self):
+        self._mock_topology_by_name({'A': '1'})
+        result = self.assemblies.resolve_ids_by_name(['A', 'B'], ignore_missing=True)
+        self.assertEqual(result, {'A': '1'})
+
+    def test_get_by_name_caches_id(self):
+        self._mock_topology_by_name({'A': '1'})
+        self.assemblies.get_by_name('A')
+        self.assertEqual(self.mock_client.assembly_name_cache.get('A'), '1')
+
+    def test_get_by_name_uses_cached_id(self):
+        self.mock_client.assembly_name_cache.put('A', '1')
+        self.mock_client.make_request.return_value.json.return_value = {'id': '1', 'name': 'A'}
+        self.assertEqual(self.assemblies.get_by_name('A'), {'id': '1', 'name': 'A'})
+        self.mock_client.make_request.assert_called_once_with(TNCOClientRequest.build_request_for_json(method='GET', endpoint='api/topology/assemblies/1'))
+
+    def test_get_by_name_searches_when_cached_id_renamed(self):
+        self.mock_client.assembly_name_cache.put('A', '1')
+        responses = [{'id': '1', 'name': 'Renamed'}, [{'id': '2', 'name': 'A'}]]
+        def make_request(request):
+            response = MagicMock()
+            response.json.return_value = responses.pop(0)
+            return response
+        self.mock_client.make_request.side_effect = make_request
+        self.assertEqual(self.assemblies.get_by_name('A'), {'id': '2', 'name': 'A'})
+        self.assertEqual(self.mock_client.assembly_name_cache.get('A'), '2')
+
+    def test_get_by_name_searches_when_cached_id_not_found(self):
+        self.mock_client.assembly_name_cache.put('A', '1')
+        not_found = TNCOClientHttpError('Mock error', MagicMock(response=MagicMock(status_code=404, headers={})))
+        def make_request(request):
+            if 'name' not in request.query_params:
+                raise not_found
+            response = MagicMock()
+            response.json.return_value = []
+            return response
+        self.mock_client.make_request.side_effect = make_request
+        with self.assertRaises(TNCOClientNotFoundError):
+            self.assemblies.get_by_name('A')
+        self.assertIsNone(self.mock_client.assembly_name_cache.get('A'))
+
+    def test_intent_delete_invalidates_cached_name(self):
+        self.mock_client.assembly_name_cache.put('Test', '123')
+        self.mock_client.make_request.return_value = MagicMock(headers={'Location': '/api/processes/123'})
+        self.assemblies.intent_delete({'assemblyName': 'Test'})
+        self.assertIsNone(self.mock_client.assembly_name_cache.get('Test'))
+
+    def test_intent_delete_by_id_invalidates_cached_name(self):
+        self.mock_client.assembly_name_cache.put_all({'Test': '123', 'Other': '456'})
+        self.mock_client.make_request.return_value = MagicMock(headers={'Location': '/api/processes/789'})
+        self.assemblies.intent_delete({'assemblyId': '123'})
+        self.assertIsNone(self.mock_client.assembly_name_cache.get('Test'))
+        self.assertEqual(self.mock_client.assembly_name_cache.get('Other'), '456')
+
+    def test_resolve_ids_by_name_ignore_missing_raises_other_errors(self):
+        self.mock_client.make_request.side_effect = TNCOClientError('Mock error')
+        with self.assertRaises(TNCOClientError) as context:
+            self.assemblies.resolve_ids_by_name(['A'], ignore_missing=True)
+        self.assertEqual(str(context.exception), 'Mock error')
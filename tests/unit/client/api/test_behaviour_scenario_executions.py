@@ -2,6 +2,7 @@ import unittest
 import json
 from unittest.mock import patch, MagicMock
 from lmctl.client.api import BehaviourScenarioExecutionsAPI
+from lmctl.client import TNCOClientError
 from lmctl.client.client_request import TNCOClientRequest
 
 class TestBehaviourScenarioExecutionsAPI(unittest.TestCase):
@@ -91,3 +92,24 @@ class TestBehaviourScenarioExecutionsAPI(unittest.TestCase):
         response = self.behaviour_scenario_execs.get_metric('Test', 'TestMetric')
         self.assertEqual(response, mock_response)
         self.mock_client.make_request.assert_called_with(TNCOClientRequest.build_request_for_json(method='GET', endpoint='api/behaviour/executions/Test/metrics/TestMetric'))
+
+    def test_get_metrics_of_executions(self):
+        self.mock_client.make_request.side_effect = lambda request: MagicMock(**{'json.return_value': [{'name': request.endpoint}]})
+        response = self.behaviour_scenario_execs.get_metrics_of_executions(['A', 'B', 'A'], max_workers=2)
+        self.assertEqual([(r.item, r.value) for r in response], [
+            ('A', [{'name': 'api/behaviour/executions/A/metrics'}]),
+            ('B', [{'name': 'api/behaviour/executions/B/metrics'}])
+        ])
+        self.assertEqual(self.mock_client.make_request.call_count, 2)
+
+    def test_get_metrics_of_executions_reports_each_failure(self):
+        def make_request(request):
+            if '/B/' in request.endpoint:
+                raise TNCOClientError('Mock error')
+            return MagicMock(**{'json.return_value': []})
+        self.mock_client.make_request.side_effect = make_request
+        response = self.behaviour_scenario_execs.get_metrics_of_executions(['A', 'B'])
+        self.assertFalse(response[0].failed)
+        self.assertEqual(response[0].value, [])
+        self.assertTrue(response[1].failed)
+        self.assertEqual(str(response[1].error), 'Mock error')
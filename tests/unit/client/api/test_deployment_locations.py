@@ -2,6 +2,7 @@ import unittest
 import json
 from unittest.mock import patch, MagicMock
 from lmctl.client.api import DeploymentLocationAPI
+from lmctl.client import TNCOClientError
 from lmctl.client.client_request import TNCOClientRequest
 
 class TestDeploymentLocationAPI(unittest.TestCase):
@@ -53,3 +54,58 @@ class TestDeploymentLocationAPI(unittest.TestCase):
         self.mock_client.make_request.assert_called_with(TNCOClientRequest(method='DELETE', endpoint='api/deploymentLocations/123'))
     
 
+    def _mock_server_locations(self, locations):
+        def make_request(request):
+            if request.method == 'GET':
+                return MagicMock(**{'json.return_value': locations})
+            return MagicMock(headers={'Location': '/api/deploymentLocations/new'})
+        self.mock_client.make_request.side_effect = make_request
+
+    def test_export_all(self):
+        self._mock_server_locations([{'id': 'A', 'name': 'A', 'resourceManager': 'brent'}])
+        self.assertEqual(self.deployment_locations.export_all(), [{'name': 'A', 'resourceManager': 'brent'}])
+
+    def test_plan_apply(self):
+        self._mock_server_locations([
+            {'id': 'A', 'name': 'A', 'infrastructureSpecificProperties': {'propA': 'valueA'}},
+            {'id': 'B', 'name': 'B', 'infrastructureSpecificProperties': {'propA': 'valueA'}}
+        ])
+        changes = self.deployment_locations.plan_apply([
+            {'name': 'A', 'infrastructureSpecificProperties': {'propA': 'valueA'}},
+            {'name': 'B', 'infrastructureSpecificProperties': {'propA': 'changed'}},
+            {'name': 'C'}
+        ])
+        self.assertEqual([(c.name, c.action) for c in changes], [('A', 'unchanged'), ('B', 'update'), ('C', 'create')])
+        self.assertEqual(changes[1].location, {'id': 'B', 'name': 'B', 'infrastructureSpecificProperties': {'propA': 'changed'}})
+        self.assertEqual(self.mock_client.make_request.call_count, 1)
+
+    def test_plan_apply_fails_on_location_without_name(self):
+        self._mock_server_locations([])
+        with self.assertRaises(TNCOClientError):
+            self.deployment_locations.plan_apply([{'description': 'No name'}])
+
+    def test_apply_all(self):
+        self._mock_server_locations([{'id': 'A', 'name': 'A', 'description': 'old'}, {'id': 'B', 'name': 'B'}])
+        changes = self.deployment_locations.apply_all([{'name': 'A', 'description': 'new'}, {'name': 'B'}, {'name': 'C'}], max_workers=2)
+        self.assertFalse(any(c.failed for c in changes))
+        requests = {(r[0][0].method, r[0][0].endpoint) for r in self.mock_client.make_request.call_args_list}
+        self.assertEqual(requests, {('GET', 'api/deploymentLocations'), ('PUT', 'api/deploymentLocations/A'), ('POST', 'api/deploymentLocations')})
+
+    def test_apply_all_dry_run(self):
+        self._mock_server_locations([{'id': 'A', 'name': 'A', 'description': 'old'}])
+        changes = self.deployment_locations.apply_all([{'name': 'A', 'description': 'new'}], dry_run=True)
+        self.assertEqual(changes[0].action, 'update')
+        self.assertEqual(self.mock_client.make_request.call_count, 1)
+
+    def test_apply_all_records_failures(self):
+        def make_request(request):
+            if request.method == 'GET':
+                return MagicMock(**{'json.return_value': []})
+            if 'B' in request.body:
+                raise TNCOClientError('Mock error')
+            return MagicMock(headers={'Location': '/api/deploymentLocations/new'})
+        self.mock_client.make_request.side_effect = make_request
+        changes = self.deployment_locations.apply_all([{'name': 'A'}, {'name': 'B'}])
+        self.assertFalse(changes[0].failed)
+        self.assertTrue(changes[1].failed)
+        self.assertEqual(str(changes[1].error), 'Mock error')
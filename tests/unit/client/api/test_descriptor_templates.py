@@ -1,7 +1,8 @@
 import unittest
 import yaml
 from unittest.mock import patch, MagicMock
-from lmctl.client.api import DescriptorTemplatesAPI
+from lmctl.client.api import DescriptorTemplatesAPI, BatchRenderItem
+from lmctl.client import TNCOClientError
 from lmctl.client.client_request import TNCOClientRequest
 
 class TestDescriptorTemplatesAPI(unittest.TestCase):
@@ -56,3 +57,89 @@ class TestDescriptorTemplatesAPI(unittest.TestCase):
         response = self.descriptor_templates.render_raw('assembly-template::Test::1.0', render_request)
         self.assertEqual(response, mock_response)
         self.mock_client.make_request.assert_called_with(TNCOClientRequest(method='POST', endpoint='api/catalog/descriptorTemplates/assembly-template::Test::1.0/render-raw', body=yaml.safe_dump(render_request), headers={'Accept': 'text/plain', 'Content-Type': 'application/yaml'}, override_address='http://kami.example.com'))
+
+    def test_render_batch(self):
+        self.mock_client.make_request.side_effect = lambda request: MagicMock(text=f'name: {request.endpoint}')
+        items = [
+            BatchRenderItem('templateA', {'properties': {'propA': 'valueA'}}, request_id='1'),
+            BatchRenderItem('templateB', {'properties': {'propA': 'valueA'}}, request_id='2')
+        ]
+        results = list(self.descriptor_templates.render_batch(items, max_workers=2))
+        self.assertEqual([r.item.request_id for r in results], ['1', '2'])
+        self.assertEqual(results[0].result, {'name': 'api/catalog/descriptorTemplates/templateA/render'})
+        self.assertEqual(results[1].result, {'name': 'api/catalog/descriptorTemplates/templateB/render'})
+        self.mock_client.pooled_session.assert_called_once_with(pool_size=2)
+        session = self.mock_client.pooled_session.return_value.__enter__.return_value
+        self.assertTrue(all(call[0][0].session is session for call in self.mock_client.make_request.call_args_list))
+
+    def test_render_batch_sends_identical_requests_once(self):
+        self.mock_client.make_request.return_value = MagicMock(text='name: assembly::Result::1.0')
+        items = [BatchRenderItem('templateA', {'properties': {'propA': 'valueA', 'propB': 'valueB'}}, request_id=str(i)) for i in range(3)]
+        items.append(BatchRenderItem('templateA', {'properties': {'propB': 'valueB', 'propA': 'valueA'}}, request_id='3'))
+        results = list(self.descriptor_templates.render_batch(items, max_workers=1))
+        self.assertEqual(self.mock_client.make_request.call_count, 1)
+        self.assertEqual([r.duplicate for r in results], [False, True, True, True])
+        self.assertTrue(all(r.result == {'name': 'assembly::Result::1.0'} for r in results))
+
+    @patch('lmctl.client.api.descriptor_templates.BATCH_WINDOW_PER_WORKER', 1)
+    def test_render_batch_reuses_results_of_earlier_windows(self):
+        self.mock_client.make_request.return_value = MagicMock(text='name: assembly::Result::1.0')
+        items = [BatchRenderItem('templateA', {'properties': {}}, request_id=str(i)) for i in range(5)]
+        results = list(self.descriptor_templates.render_batch(items, max_workers=2))
+        self.assertEqual(self.mock_client.make_request.call_count, 1)
+        self.assertEqual([r.duplicate for r in results], [False, True, True, True, True])
+        self.assertTrue(all(r.result == {'name': 'assembly::Result::1.0'} for r in results))
+
+    @patch('lmctl.client.api.descriptor_templates.BATCH_WINDOW_PER_WORKER', 1)
+    @patch('lmctl.client.api.descriptor_templates.BATCH_RESULT_CACHE_SIZE', 1)
+    def test_render_batch_drops_least_recently_used_results(self):
+        self.mock_client.make_request.side_effect = lambda request: MagicMock(text=f'name: {request.endpoint}')
+        items = [BatchRenderItem(template_name, {}, request_id=str(i)) for i, template_name in enumerate(['templateA', 'templateB', 'templateB', 'templateA'])]
+        results = list(self.descriptor_templates.render_batch(items, max_workers=1))
+        self.assertEqual([call[0][0].endpoint for call in self.mock_client.make_request.call_args_list], [
+            'api/catalog/descriptorTemplates/templateA/render', 
+            'api/catalog/descriptorTemplates/templateB/render', 
+            'api/catalog/descriptorTemplates/templateA/render'
+        ])
+        self.assertEqual([r.duplicate for r in results], [False, False, True, False])
+
+    @patch('lmctl.client.api.descriptor_templates.BATCH_WINDOW_PER_WORKER', 1)
+    def test_render_batch_sends_failed_requests_again_in_later_windows(self):
+        self.mock_client.make_request.side_effect = TNCOClientError('Mock error')
+        items = [BatchRenderItem('templateA', {}, request_id=str(i)) for i in range(2)]
+        results = list(self.descriptor_templates.render_batch(items, max_workers=1))
+        self.assertEqual(self.mock_client.make_request.call_count, 2)
+        self.assertTrue(all(r.failed for r in results))
+
+    def test_render_batch_reports_failures(self):
+        def make_request(request):
+            if 'templateB' in request.endpoint:
+                raise TNCOClientError('Mock error')
+            return MagicMock(text='name: assembly::Result::1.0')
+        self.mock_client.make_request.side_effect = make_request
+        items = [BatchRenderItem('templateA', request_id='1'), BatchRenderItem('templateB', request_id='2')]
+        results = list(self.descriptor_templates.render_batch(items))
+        self.assertFalse(results[0].failed)
+        self.assertTrue(results[1].failed)
+        self.assertEqual(str(results[1].error), 'Mock error')
+
+    def test_render_batch_raw(self):
+        self.mock_client.make_request.return_value = MagicMock(text='name: assembly::Result::1.0')
+        results = list(self.descriptor_templates.render_batch([BatchRenderItem('templateA', {})], raw=True))
+        self.assertEqual(results[0].result, 'name: assembly::Result::1.0')
+        self.assertEqual(self.mock_client.make_request.call_args[0][0].endpoint, 'api/catalog/descriptorTemplates/templateA/render-raw')
+
+class TestBatchRenderItem(unittest.TestCase):
+
+    def test_from_dict(self):
+        item = BatchRenderItem.from_dict({'template': 'templateA', 'id': 7, 'properties': {'propA': 'valueA'}})
+        self.assertEqual(item, BatchRenderItem('templateA', {'properties': {'propA': 'valueA'}}, request_id='7'))
+
+    def test_from_dict_uses_defaults(self):
+        item = BatchRenderItem.from_dict({'properties': {}}, default_template_name='templateA', default_request_id='3')
+        self.assertEqual(item, BatchRenderItem('templateA', {'properties': {}}, request_id='3'))
+
+    def test_from_dict_without_template_fails(self):
+        with self.assertRaises(ValueError) as context:
+            BatchRenderItem.from_dict({'properties': {}})
+        self.assertEqual(str(context.exception), 'Render request does not contain a "template" attribute')
@@ -1,7 +1,10 @@
 import unittest
+from datetime import datetime, timedelta
 from unittest.mock import patch, MagicMock
 from lmctl.client.api import ProcessesAPI
 from lmctl.client.client_request import TNCOClientRequest
+from lmctl.client import TNCOClientError
+from lmctl.client.models import Record, RecordList
 
 class TestProcessesAPI(unittest.TestCase):
 
@@ -29,3 +32,51 @@ class TestProcessesAPI(unittest.TestCase):
         response = self.processes.query(assemblyName='Abc', intentTypes='healAssembly')
         self.assertEqual(response, mock_response)
         self.mock_client.make_request.assert_called_with(TNCOClientRequest.build_request_for_json(method='GET', endpoint='api/processes', query_params={'assemblyName': 'Abc', 'intentTypes': 'healAssembly'}))
+
+    def test_query_lazy(self):
+        self.mock_client.make_request.return_value.content = b'[{"id": "123"}, {"id": "456"}]'
+        response = self.processes.query(lazy=True, assemblyName='Abc')
+        self.assertIsInstance(response, RecordList)
+        self.assertEqual(response.to_dicts(), [{'id': '123'}, {'id': '456'}])
+        self.mock_client.make_request.assert_called_with(TNCOClientRequest.build_request_for_json(method='GET', endpoint='api/processes', query_params={'assemblyName': 'Abc'}))
+
+    def test_query_lazy_fails_when_not_a_list(self):
+        self.mock_client.make_request.return_value.content = b'{"id": "123"}'
+        with self.assertRaises(TNCOClientError):
+            self.processes.query(lazy=True)
+
+    def test_query_in_windows(self):
+        def make_request(request):
+            window_start = request.query_params['startDateTime']
+            return MagicMock(**{'json.return_value': [{'id': window_start}, {'id': 'on-boundary'}]})
+        self.mock_client.make_request.side_effect = make_request
+        response = self.processes.query_in_windows(datetime(2021, 1, 1), datetime(2021, 1, 2, 12), timedelta(days=1), intentTypes='CreateAssembly')
+        self.assertEqual(response, [{'id': '2021-01-01T00:00:00.000Z'}, {'id': 'on-boundary'}, {'id': '2021-01-02T00:00:00.000Z'}])
+        queries = sorted(c[0][0].query_params.items() for c in self.mock_client.make_request.call_args_list)
+        self.assertEqual([dict(q) for q in queries], [
+            {'intentTypes': 'CreateAssembly', 'startDateTime': '2021-01-01T00:00:00.000Z', 'endDateTime': '2021-01-02T00:00:00.000Z'},
+            {'intentTypes': 'CreateAssembly', 'startDateTime': '2021-01-02T00:00:00.000Z', 'endDateTime': '2021-01-02T12:00:00.000Z'}
+        ])
+
+    def test_query_in_windows_lazy(self):
+        def make_request(request):
+            window_start = request.query_params['startDateTime']
+            return MagicMock(content=f'[{{"id": "{window_start}"}}, {{"id": "on-boundary"}}]'.encode('utf-8'))
+        self.mock_client.make_request.side_effect = make_request
+        response = self.processes.query_in_windows(datetime(2021, 1, 1), datetime(2021, 1, 2, 12), timedelta(days=1), lazy=True)
+        self.assertEqual([type(p) for p in response], [Record, Record, Record])
+        self.assertEqual([p.to_dict() for p in response], [{'id': '2021-01-01T00:00:00.000Z'}, {'id': 'on-boundary'}, {'id': '2021-01-02T00:00:00.000Z'}])
+
+    def test_query_in_windows_keeps_processes_without_id(self):
+        self.mock_client.make_request.return_value = MagicMock(**{'json.return_value': [{'id': 'A'}, {'status': 'Completed'}, {'status': 'Failed'}]})
+        response = self.processes.query_in_windows(datetime(2021, 1, 1), datetime(2021, 1, 3), timedelta(days=1), max_workers=1)
+        self.assertEqual(response, [{'id': 'A'}, {'status': 'Completed'}, {'status': 'Failed'}, {'status': 'Completed'}, {'status': 'Failed'}])
+
+    def test_query_in_windows_raises_failure(self):
+        self.mock_client.make_request.side_effect = TNCOClientError('Mock error')
+        with self.assertRaises(TNCOClientError):
+            self.processes.query_in_windows(datetime(2021, 1, 1), datetime(2021, 1, 3), timedelta(days=1))
+
+    def test_query_in_windows_fails_on_empty_window(self):
+        with self.assertRaises(ValueError):
+            self.processes.query_in_windows(datetime(2021, 1, 1), datetime(2021, 1, 3), timedelta(0))
@@ -0,0 +1,197 @@
+import unittest
+import threading
+import requests
+from datetime import datetime, timezone
+from lmctl.client import AdmissionController, TokenBucket
+from lmctl.client.admission import parse_retry_after
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+def build_response(status_code, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    return response
+
+class TestParseRetryAfter(unittest.TestCase):
+
+    def test_seconds(self):
+        self.assertEqual(parse_retry_after('5'), 5.0)
+        self.assertEqual(parse_retry_after(' 1.5 '), 1.5)
+        self.assertEqual(parse_retry_after('-1'), 0.0)
+
+    def test_http_date(self):
+        now = lambda: datetime(2021, 6, 1, 12, 0, 0, tzinfo=timezone.utc)
+        self.assertEqual(parse_retry_after('Tue, 01 Jun 2021 12:00:30 GMT', now=now), 30.0)
+        self.assertEqual(parse_retry_after('Tue, 01 Jun 2021 11:00:00 GMT', now=now), 0.0)
+
+    def test_invalid(self):
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after('soon'))
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_reserve_allows_burst_then_paces(self):
+        clock = FakeClock()
+        bucket = TokenBucket(2, burst=3, clock=clock)
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0.0, 0.0, 0.0])
+        self.assertEqual(bucket.reserve(), 0.5)
+        self.assertEqual(bucket.reserve(), 1.0)
+        clock.now += 10
+        self.assertEqual(bucket.reserve(), 0.0)
+
+    def test_default_burst(self):
+        self.assertEqual(TokenBucket(5).burst, 5)
+        self.assertEqual(TokenBucket(0.5).burst, 1)
+
+    def test_invalid_rate(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(0)
+
+class TestAdmissionController(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def _controller(self, **kwargs):
+        return AdmissionController(clock=self.clock, sleep=self.clock.sleep, **kwargs)
+
+    def _complete(self, controller, latency, overloaded=False, retry_after=None):
+        admitted_at = controller.acquire()
+        self.clock.now += latency
+        controller.release(admitted_at, overloaded=overloaded, retry_after=retry_after)
+
+    def test_invalid_concurrency(self):
+        with self.assertRaises(ValueError):
+            AdmissionController(min_concurrency=0)
+        with self.assertRaises(ValueError):
+            AdmissionController(min_concurrency=4, max_concurrency=2)
+
+    def test_acquire_waits_for_rate_limit(self):
+        controller = self._controller(requests_per_second=10, burst=1)
+        controller.acquire()
+        controller.acquire()
+        self.assertEqual(self.clock.sleeps, [0.1])
+
+    def test_overload_decreases_limit_once_per_round_trip(self):
+        controller = self._controller(max_concurrency=8)
+        self._complete(controller, 0.2)
+        self._complete(controller, 0.2, overloaded=True)
+        self.assertEqual(controller.concurrency_limit, 4)
+        self._complete(controller, 0.1, overloaded=True)
+        self.assertEqual(controller.concurrency_limit, 4)
+        self.clock.now += 1
+        self._complete(controller, 0.2, overloaded=True)
+        self.assertEqual(controller.concurrency_limit, 2)
+
+    def test_limit_not_decreased_below_min_concurrency(self):
+        controller = self._controller(max_concurrency=4, min_concurrency=3)
+        self._complete(controller, 0.1, overloaded=True)
+        self.assertEqual(controller.concurrency_limit, 3)
+
+    def test_success_increases_limit_additively(self):
+        controller = self._controller(max_concurrency=8)
+        controller.limit = 2.0
+        for _ in range(3):
+            self._complete(controller, 0.1)
+        self.assertEqual(controller.concurrency_limit, 3)
+        for _ in range(100):
+            self._complete(controller, 0.1)
+        self.assertEqual(controller.concurrency_limit, 8)
+
+    def test_latency_growth_decreases_limit(self):
+        controller = self._controller(max_concurrency=8, latency_tolerance=2.0)
+        self._complete(controller, 0.1)
+        self._complete(controller, 0.2)
+        self.assertEqual(controller.concurrency_limit, 8)
+        for _ in range(5):
+            self._complete(controller, 1.0)
+        self.assertLess(controller.concurrency_limit, 8)
+
+    def test_small_latency_growth_ignored(self):
+        controller = self._controller(max_concurrency=8)
+        self._complete(controller, 0.001)
+        for _ in range(10):
+            self._complete(controller, 0.01)
+        self.assertEqual(controller.concurrency_limit, 8)
+
+    def test_acquire_blocks_at_concurrency_limit(self):
+        controller = AdmissionController(max_concurrency=1)
+        admitted_at = controller.acquire()
+        acquired = threading.Event()
+        def acquire_second():
+            controller.acquire()
+            acquired.set()
+        thread = threading.Thread(target=acquire_second)
+        thread.start()
+        self.assertFalse(acquired.wait(0.1))
+        controller.release(admitted_at)
+        self.assertTrue(acquired.wait(1))
+        thread.join()
+        self.assertEqual(controller.in_flight, 1)
+
+    def test_send_retries_after_retry_after(self):
+        controller = self._controller()
+        responses = [build_response(429, {'Retry-After': '2'}), build_response(200)]
+        response = controller.send(lambda: responses.pop(0))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.clock.sleeps, [2.0])
+        self.assertEqual(controller.in_flight, 0)
+
+    def test_retry_after_holds_back_other_requests(self):
+        controller = self._controller()
+        self._complete(controller, 0.1, overloaded=True, retry_after=5)
+        controller.acquire()
+        self.assertEqual(self.clock.sleeps, [5.0])
+
+    def test_send_retries_with_backoff(self):
+        controller = self._controller(max_retries=2)
+        responses = [build_response(503), build_response(503), build_response(503)]
+        response = controller.send(lambda: responses.pop(0))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(self.clock.sleeps, [0.5, 1.0])
+        self.assertEqual(len(responses), 0)
+
+    def test_send_does_not_retry_other_status_codes(self):
+        controller = self._controller()
+        calls = []
+        response = controller.send(lambda: calls.append(1) or build_response(503), retry_status_codes=(429,))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(len(calls), 1)
+
+    def test_send_does_not_retry_when_retry_after_too_long(self):
+        controller = self._controller(max_retry_wait=10)
+        calls = []
+        response = controller.send(lambda: calls.append(1) or build_response(429, {'Retry-After': '30'}))
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(controller.blocked_until, 0.0)
+        controller.acquire()
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_send_does_not_hold_back_other_requests_when_out_of_retries(self):
+        controller = self._controller(max_retries=0)
+        response = controller.send(lambda: build_response(429, {'Retry-After': '5'}))
+        self.assertEqual(response.status_code, 429)
+        controller.acquire()
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_send_releases_on_connection_error(self):
+        controller = self._controller(max_concurrency=4)
+        def fail():
+            raise requests.ConnectionError('Mock error')
+        with self.assertRaises(requests.ConnectionError):
+            controller.send(fail)
+        self.assertEqual(controller.in_flight, 0)
+        self.assertEqual(controller.concurrency_limit, 2)
@@ -0,0 +1,87 @@
+import unittest
+from unittest.mock import MagicMock
+from lmctl.client import AssemblyWatcher, AssemblyChange, TNCOClientError, TNCOClientHttpError
+from lmctl.client.assembly_watch import snapshot, diff_snapshots
+
+def http_error(status_code):
+    return TNCOClientHttpError('Mock error', cause=MagicMock(response=MagicMock(status_code=status_code, headers={}, body=b'')))
+
+def assembly(id_value, state='Active', descriptor_name='assembly::Test::1.0'):
+    return {'id': id_value, 'name': f'assembly-{id_value}', 'descriptorName': descriptor_name, 'state': state, 'properties': []}
+
+class TestDiffSnapshots(unittest.TestCase):
+
+    def test_diff_snapshots(self):
+        previous = snapshot([assembly('1'), assembly('2'), assembly('3')])
+        current = snapshot([assembly('1'), assembly('2', state='Broken'), assembly('4')])
+        changes = diff_snapshots(previous, current)
+        self.assertEqual(changes, [
+            AssemblyChange('changed', '2', 'assembly-2', descriptor_name='assembly::Test::1.0', state='Broken',
+                                previous_descriptor_name='assembly::Test::1.0', previous_state='Active'),
+            AssemblyChange('added', '4', 'assembly-4', descriptor_name='assembly::Test::1.0', state='Active'),
+            AssemblyChange('removed', '3', 'assembly-3', previous_descriptor_name='assembly::Test::1.0', previous_state='Active')
+        ])
+
+    def test_diff_snapshots_ignores_other_attributes(self):
+        changed = assembly('1')
+        changed['properties'] = [{'name': 'a', 'value': 'b'}]
+        self.assertEqual(diff_snapshots(snapshot([assembly('1')]), snapshot([changed])), [])
+
+class TestAssemblyWatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.mock_api = MagicMock()
+        self.sleeps = []
+
+    def _watch(self, results, **kwargs):
+        self.mock_api.poll.side_effect = results
+        watcher = AssemblyWatcher(self.mock_api, min_interval=1, max_interval=4, backoff=2)
+        return watcher, list(watcher.watch(max_polls=len(results), sleep=self.sleeps.append, **kwargs))
+
+    def test_watch_yields_only_changes(self):
+        _, batches = self._watch([
+            ([assembly('1')], None),
+            ([assembly('1')], None),
+            ([assembly('1', state='Inactive')], None)
+        ])
+        self.assertEqual([[(c.change, c.id) for c in changes] for changes in batches], [[('added', '1')], [('changed', '1')]])
+
+    def test_watch_skips_existing(self):
+        _, batches = self._watch([([assembly('1')], None), ([assembly('1'), assembly('2')], None)], include_existing=False)
+        self.assertEqual([[(c.change, c.id) for c in changes] for changes in batches], [[('added', '2')]])
+
+    def test_watch_backs_off_while_unchanged(self):
+        unchanged = ([assembly('1')], None)
+        self._watch([unchanged, unchanged, unchanged, unchanged, ([assembly('1', state='Failed')], None), unchanged])
+        self.assertEqual(self.sleeps, [1, 2, 4, 4, 1])
+
+    def test_watch_sends_etag_of_last_result(self):
+        watcher, batches = self._watch([([assembly('1')], 'v1'), (None, 'v1')])
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(self.mock_api.poll.call_args_list[1][1], {'name_contains': None, 'etag': 'v1'})
+        self.assertEqual(list(watcher.current.keys()), ['1'])
+
+    def test_watch_continues_after_transient_errors(self):
+        errors = []
+        _, batches = self._watch([
+            TNCOClientError('Connection refused'),
+            ([assembly('1')], None),
+            http_error(503),
+            http_error(429),
+            ([assembly('1'), assembly('2')], None)
+        ], include_existing=False, on_error=lambda error, interval: errors.append((str(error), interval)))
+        # The first successful poll is the baseline
+        self.assertEqual([[(c.change, c.id) for c in changes] for changes in batches], [[('added', '2')]])
+        self.assertEqual(errors[0][0], 'Connection refused')
+        self.assertTrue(errors[1][0].startswith('Mock error: status=503'))
+        self.assertTrue(errors[2][0].startswith('Mock error: status=429'))
+        self.assertEqual([e[1] for e in errors], [2, 2, 4])
+        self.assertEqual(self.sleeps, [2, 1, 2, 4])
+
+    def test_watch_raises_other_client_errors(self):
+        with self.assertRaises(TNCOClientHttpError):
+            self._watch([([assembly('1')], None), http_error(401)])
+
+    def test_init_fails_on_invalid_intervals(self):
+        with self.assertRaises(ValueError):
+            AssemblyWatcher(self.mock_api, min_interval=5, max_interval=1)
@@ -3,7 +3,7 @@ import requests
 import json
 import jwt
 from unittest.mock import patch, MagicMock, Mock
-from lmctl.client import TNCOClient, TNCOClientError, TNCOClientHttpError, TNCOErrorCapture, TNCOClientRequest
+from lmctl.client import TNCOClient, TNCOClientError, TNCOClientHttpError, TNCOErrorCapture, TNCOClientRequest, AdmissionController
 from datetime import datetime, timedelta
 
 class TestTNCOClient(unittest.TestCase):
@@ -40,6 +40,29 @@ class TestTNCOClient(unittest.TestCase):
         mock_session.request.assert_called_with(method='GET', url='https://test.example.com/api/test', headers={}, verify=False)
         self.assertEqual(response, mock_session.request.return_value)
 
+    @patch('lmctl.client.client.requests.Session')
+    def test_pooled_session(self, requests_session_builder):
+        client = TNCOClient('https://test.example.com')
+        mock_session = self._get_requests_session(requests_session_builder)
+        with client.pooled_session(pool_size=4) as session:
+            self.assertIs(session, mock_session)
+            adapter = mock_session.mount.call_args_list[0][0][1]
+            self.assertEqual(adapter._pool_maxsize, 4)
+            client.make_request(TNCOClientRequest(method='GET', endpoint='api/test').use_session(session))
+        mock_session.request.assert_called_with(method='GET', url='https://test.example.com/api/test', headers={}, verify=False)
+        mock_session.close.assert_called_once()
+        # The client is not changed, so requests without the session are unaffected
+        self.assertFalse(client.use_sessions)
+        self.assertIsNone(client._session)
+
+    @patch('lmctl.client.client.requests')
+    def test_make_request_without_pooled_session(self, mock_requests):
+        client = TNCOClient('https://test.example.com')
+        with client.pooled_session(pool_size=4):
+            client.make_request(TNCOClientRequest(method='GET', endpoint='api/test'))
+        mock_requests.request.assert_called_once_with(method='GET', url='https://test.example.com/api/test', headers={}, verify=False)
+        mock_requests.Session.return_value.request.assert_not_called()
+
     @patch('lmctl.client.client.requests.Session')
     def test_make_request_for_json(self, requests_session_builder):
         client = TNCOClient('https://test.example.com', use_sessions=True)
@@ -57,6 +80,28 @@ class TestTNCOClient(unittest.TestCase):
             client.make_request_for_json(TNCOClientRequest(method='GET', endpoint='api/test'))
         self.assertEqual(str(context.exception), 'Failed to parse response to JSON: Mock error')
 
+    @patch('lmctl.client.client.requests.Session')
+    def test_make_request_with_admission_controller_retries_overload(self, requests_session_builder):
+        sleeps = []
+        client = TNCOClient('https://test.example.com', use_sessions=True, admission_controller=AdmissionController(sleep=sleeps.append))
+        mock_session = self._get_requests_session(requests_session_builder)
+        overloaded = MagicMock(status_code=429, headers={'Retry-After': '1'})
+        mock_session.request.side_effect = [overloaded, MagicMock(status_code=200)]
+        response = client.make_request(TNCOClientRequest(method='POST', endpoint='api/test'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mock_session.request.call_count, 2)
+        self.assertEqual(len(sleeps), 1)
+
+    @patch('lmctl.client.client.requests.Session')
+    def test_make_request_with_admission_controller_does_not_retry_unsafe_requests(self, requests_session_builder):
+        client = TNCOClient('https://test.example.com', use_sessions=True, admission_controller=AdmissionController(sleep=lambda s: None))
+        mock_session = self._get_requests_session(requests_session_builder)
+        mock_session.request.return_value.status_code = 503
+        mock_session.request.return_value.headers = {}
+        client.make_request(TNCOClientRequest(method='POST', endpoint='api/test'))
+        client.make_request(TNCOClientRequest(method='PUT', endpoint='api/test', files={'file': MagicMock()}))
+        self.assertEqual(mock_session.request.call_count, 2)
+
     @patch('lmctl.client.client.requests.Session')
     def test_make_request_with_body(self, requests_session_builder):
         client = TNCOClient('https://test.example.com', use_sessions=True)
@@ -271,4 +316,37 @@ class TestTNCOClient(unittest.TestCase):
         self.assertEqual(result.tests[3].name, 'Resource Manager')
         self.assertTrue(result.tests[3].passed)
         self.assertIsNone(result.tests[3].error)
-        
\ No newline at end of file
+        
+    @patch('lmctl.client.client.SharedInfrastructureKeysAPI')
+    @patch('lmctl.client.client.BehaviourProjectsAPI')
+    @patch('lmctl.client.client.DescriptorsAPI')
+    @patch('lmctl.client.client.DeploymentLocationAPI')
+    def test_benchmark(self, mock_dl_api, mock_descriptors_api, mock_projects_api, mock_keys_api):
+        mock_dl_api.return_value.all.return_value = []
+        mock_descriptors_api.return_value.all.return_value = []
+        mock_projects_api.return_value.all.side_effect = TNCOClientError('Mock error')
+        mock_keys_api.return_value.all.return_value = []
+        client = TNCOClient('https://test.example.com', use_sessions=True)
+        result = client.benchmark(repeat=5, concurrency=2)
+        self.assertFalse(result.passed)
+        self.assertEqual(result.repeat, 5)
+        self.assertEqual(result.concurrency, 2)
+        self.assertEqual([s.name for s in result.stats], ['Descriptors', 'Topology', 'Behaviour', 'Resource Manager'])
+        self.assertEqual(result.stats[0].count, 5)
+        self.assertEqual(result.stats[0].failures, 0)
+        self.assertIsNotNone(result.stats[0].p99)
+        self.assertEqual(result.stats[2].count, 5)
+        self.assertEqual(result.stats[2].failures, 5)
+        self.assertIsNone(result.stats[2].p50)
+        self.assertEqual(mock_descriptors_api.return_value.all.call_count, 5)
+
+    @patch('lmctl.client.client.SharedInfrastructureKeysAPI')
+    @patch('lmctl.client.client.BehaviourProjectsAPI')
+    @patch('lmctl.client.client.DescriptorsAPI')
+    @patch('lmctl.client.client.DeploymentLocationAPI')
+    def test_benchmark_includes_auth(self, mock_dl_api, mock_descriptors_api, mock_projects_api, mock_keys_api):
+        mock_auth = self._build_mocked_auth_type()
+        client = TNCOClient('https://test.example.com', auth_type=mock_auth, use_sessions=True)
+        result = client.benchmark(repeat=3, concurrency=1)
+        self.assertEqual(result.stats[-1].name, 'Authentication')
+        self.assertEqual(mock_auth.handle.call_count, 3)
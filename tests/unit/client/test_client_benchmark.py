@@ -0,0 +1,27 @@
+import unittest
+from lmctl.client import LatencyStats
+from lmctl.client.client_benchmark import percentile
+
+class TestPercentile(unittest.TestCase):
+
+    def test_percentile(self):
+        values = [float(v) for v in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 50.0)
+        self.assertEqual(percentile(values, 95), 95.0)
+        self.assertEqual(percentile(values, 99), 99.0)
+        self.assertEqual(percentile(values, 100), 100.0)
+        self.assertEqual(percentile([5.0], 99), 5.0)
+        self.assertIsNone(percentile([], 50))
+
+class TestLatencyStats(unittest.TestCase):
+
+    def test_from_durations(self):
+        stats = LatencyStats.from_durations('Test', [0.01, 0.02, 0.03, 0.04], failures=1, elapsed=2)
+        self.assertEqual(stats.count, 5)
+        self.assertEqual(stats.failures, 1)
+        self.assertFalse(stats.passed)
+        self.assertEqual(stats.min, 10.0)
+        self.assertEqual(stats.mean, 25.0)
+        self.assertEqual(stats.p50, 20.0)
+        self.assertEqual(stats.max, 40.0)
+        self.assertEqual(stats.throughput, 2.0)
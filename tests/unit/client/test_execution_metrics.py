@@ -0,0 +1,98 @@
+import unittest
+from lmctl.client import MetricSummary, MetricBucket
+from lmctl.client import execution_metrics
+
+def samples(start_second, values):
+    return [{'timestamp': f'2021-01-01T10:00:{start_second:02d}Z', 'value': v} for v in values]
+
+METRICS_BY_EXECUTION = {
+    'exec1': [
+        {'name': 'latency', 'samples': samples(0, range(1, 6))},
+        {'name': 'errors', 'samples': samples(0, [1, 2.0])}
+    ],
+    'exec2': [
+        {'name': 'latency', 'samples': [{'timestamp': '2021-01-01T10:00:05+00:00', 'value': v} for v in range(6, 11)]}
+    ]
+}
+
+START = 1609495200.0
+
+class ExecutionMetricsTestCase:
+
+    use_numpy = None
+
+    def setUp(self):
+        self.samples = execution_metrics.collect_samples(METRICS_BY_EXECUTION)
+
+    def test_collect_samples(self):
+        self.assertEqual(list(self.samples.keys()), ['latency', 'errors'])
+        self.assertEqual(self.samples['latency'].values, [float(v) for v in range(1, 11)])
+        self.assertEqual(self.samples['latency'].times, [START] * 5 + [START + 5] * 5)
+        self.assertEqual(self.samples['latency'].executions, {'exec1', 'exec2'})
+        self.assertEqual(self.samples['errors'].values, [1.0, 2.0])
+        self.assertEqual(self.samples['errors'].times, [START, START])
+
+    def test_collect_samples_fails_on_unexpected_format(self):
+        invalid = [
+            ({'exec1': {'latency': []}}, 'Metrics of execution exec1 are not a list: dict'),
+            ({'exec1': [{'name': 'latency', 'values': [1, 2]}]}, 'Metric of execution exec1 does not have a "name" and a list of "samples": {\'name\': \'latency\', \'values\': [1, 2]}'),
+            ({'exec1': [{'name': 'latency', 'samples': [1]}]}, 'Sample 0 of metric latency of execution exec1 is invalid: Expected a sample object but got: 1'),
+            ({'exec1': [{'name': 'latency', 'samples': [{'timestamp': '2021-01-01T10:00:00Z', 'value': '1'}]}]}, 
+                'Sample 0 of metric latency of execution exec1 is invalid: Expected a numeric "value" but got: \'1\''),
+            ({'exec1': [{'name': 'latency', 'samples': [{'timestamp': 1609495200000, 'value': 1}]}]}, 
+                'Sample 0 of metric latency of execution exec1 is invalid: Expected an ISO 8601 timestamp but got: 1609495200000'),
+            ({'exec1': [{'name': 'latency', 'samples': [{'value': 1}]}]}, 
+                'Sample 0 of metric latency of execution exec1 is invalid: Expected an ISO 8601 timestamp but got: None')
+        ]
+        for metrics_by_execution, expected_error in invalid:
+            with self.subTest(expected_error=expected_error):
+                with self.assertRaises(execution_metrics.MetricFormatError) as context:
+                    execution_metrics.collect_samples(metrics_by_execution)
+                self.assertEqual(str(context.exception), expected_error)
+
+    def test_parse_timestamp(self):
+        for raw_time, expected in [
+                    ('2021-01-01T10:00:00Z', START),
+                    ('2021-01-01T10:00:00', START),
+                    ('2021-01-01 10:00:00.5+00:00', START + 0.5),
+                    ('2021-01-01T10:00:00.12Z', START + 0.12),
+                    ('2021-01-01T10:00:00.123456789Z', START + 0.123456789),
+                    ('2021-01-01T11:30:00+01:30', START),
+                    ('2021-01-01T09:00:00-0100', START)]:
+            with self.subTest(raw_time=raw_time):
+                self.assertAlmostEqual(execution_metrics.parse_timestamp(raw_time), expected, places=6)
+
+    def test_collect_samples_fails_on_invalid_timestamp(self):
+        for raw_time in ['2021-01-01', '2021-13-01T10:00:00Z', '2021-01-01T10:00:00+1', 'yesterday']:
+            with self.subTest(raw_time=raw_time):
+                with self.assertRaises(execution_metrics.MetricFormatError) as context:
+                    execution_metrics.collect_samples({'exec1': [{'name': 'latency', 'samples': [{'timestamp': raw_time, 'value': 1}]}]})
+                self.assertEqual(str(context.exception), f'Sample 0 of metric latency of execution exec1 is invalid: Expected an ISO 8601 timestamp but got: {raw_time!r}')
+
+    def test_summarise(self):
+        summaries = execution_metrics.summarise(self.samples, use_numpy=self.use_numpy)
+        self.assertEqual(summaries, [
+            MetricSummary('latency', 2, 10, mean=5.5, min=1.0, p50=5.0, p90=9.0, p99=10.0, max=10.0, rate=2.0),
+            MetricSummary('errors', 1, 2, mean=1.5, min=1.0, p50=1.0, p90=2.0, p99=2.0, max=2.0, rate=None)
+        ])
+
+    def test_bucket(self):
+        buckets = execution_metrics.bucket(self.samples, 2, use_numpy=self.use_numpy)
+        self.assertEqual(buckets, [
+            MetricBucket('latency', 0.0, 5, mean=3.0, rate=2.5),
+            MetricBucket('latency', 4.0, 5, mean=8.0, rate=2.5),
+            MetricBucket('errors', 0.0, 2, mean=1.5, rate=1.0)
+        ])
+
+    def test_bucket_fails_on_zero_seconds(self):
+        with self.assertRaises(ValueError):
+            execution_metrics.bucket(self.samples, 0, use_numpy=self.use_numpy)
+
+class TestExecutionMetricsWithPython(ExecutionMetricsTestCase, unittest.TestCase):
+
+    use_numpy = False
+
+@unittest.skipIf(not execution_metrics.numpy_available(), 'NumPy is not installed')
+class TestExecutionMetricsWithNumpy(ExecutionMetricsTestCase, unittest.TestCase):
+
+    use_numpy = True
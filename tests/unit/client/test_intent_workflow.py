@@ -0,0 +1,241 @@
+import os
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock
+from lmctl.client import (TNCOClientError, Workflow, WorkflowNode, WorkflowRunner, WorkflowState, WorkflowError, ProcessWaiter, read_workflow)
+from lmctl.client.intent_workflow import COMPLETED, FAILED, SKIPPED, RUNNING, PENDING
+
+def node(name, depends_on=None, intent='createAssembly', **request):
+    return WorkflowNode(name, intent, {'assemblyName': name, **request}, depends_on=depends_on or [])
+
+class RecordingStop:
+    """
+    Stands in for the stop event of a ProcessWaiter, recording each wait instead of sleeping
+    """
+
+    def __init__(self, clock=None):
+        self.waits = []
+        self.clock = clock
+
+    def wait(self, seconds):
+        self.waits.append(seconds)
+        if self.clock is not None:
+            self.clock.now += seconds
+        return False
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+class FakeTNCO:
+    """
+    Processes complete on their second poll, with the status given for the assembly name of the intent (Completed by default)
+    """
+
+    def __init__(self, statuses=None, intent_errors=None):
+        self.statuses = statuses or {}
+        self.intent_errors = intent_errors or {}
+        self.requested = []
+        self.polls = {}
+        self._lock = threading.Lock()
+        self._names = {}
+        self.assemblies = MagicMock()
+        self.assemblies.intent.side_effect = self._intent
+        self.processes = MagicMock()
+        self.processes.get.side_effect = self._get_process
+
+    def _intent(self, intent_name, request):
+        name = request['assemblyName']
+        if name in self.intent_errors:
+            raise TNCOClientError(self.intent_errors[name])
+        with self._lock:
+            self.requested.append((intent_name, name))
+            process_id = f'process-{len(self.requested)}'
+            self._names[process_id] = name
+        return process_id
+
+    def _get_process(self, process_id, shallow=None):
+        with self._lock:
+            self.polls[process_id] = self.polls.get(process_id, 0) + 1
+            polls = self.polls[process_id]
+        status = 'In Progress' if polls < 2 else self.statuses.get(self._names.get(process_id), 'Completed')
+        return {'id': process_id, 'status': status, 'statusReason': 'Mock reason' if status == 'Failed' else None}
+
+class TestReadWorkflow(unittest.TestCase):
+
+    def test_read_nodes_by_name(self):
+        workflow = read_workflow({'name': 'rollout', 'nodes': {
+            'dependant': {'intent': 'changeState', 'depends_on': 'shared', 'request': {'assemblyName': 'A', 'intendedState': 'Active'}, 'timeout': 60},
+            'shared': {'intent': 'createAssembly', 'request': {'assemblyName': 'B'}}
+        }})
+        self.assertEqual(workflow.name, 'rollout')
+        self.assertEqual([n.name for n in workflow.nodes], ['shared', 'dependant'])
+        self.assertEqual(workflow.nodes_by_name['dependant'], WorkflowNode('dependant', 'changeAssemblyState', {'assemblyName': 'A', 'intendedState': 'Active'},
+                                                                            depends_on=['shared'], timeout=60))
+
+    def test_read_nodes_list(self):
+        workflow = read_workflow({'nodes': [
+            {'name': 'A', 'intent': 'delete', 'request': {'assemblyName': 'A'}},
+            {'name': 'B', 'intent': 'someNewIntent', 'request': {}, 'depends_on': ['A']}
+        ]})
+        self.assertEqual([(n.name, n.intent) for n in workflow.nodes], [('A', 'deleteAssembly'), ('B', 'someNewIntent')])
+
+    def test_read_invalid(self):
+        invalid = [
+            None,
+            {'nodes': {}},
+            {'nodes': 'A'},
+            {'nodes': [{'intent': 'createAssembly', 'request': {}}]},
+            {'nodes': {'A': {'request': {}}}},
+            {'nodes': {'A': {'intent': 'createAssembly'}}},
+            {'nodes': {'A': {'intent': 'createAssembly', 'request': {}, 'depends_on': 'B'}}},
+            {'nodes': {'A': {'intent': 'createAssembly', 'request': {}, 'depends_on': {'B': 1}}}},
+            {'nodes': {'A': {'intent': 'createAssembly', 'request': {}, 'timeout': 0}}},
+            {'nodes': [{'name': 'A', 'intent': 'createAssembly', 'request': {}}, {'name': 'A', 'intent': 'createAssembly', 'request': {}}]},
+            {'nodes': {'A': {'intent': 'heal', 'request': {}, 'depends_on': 'B'}, 'B': {'intent': 'heal', 'request': {}, 'depends_on': 'A'}}}
+        ]
+        for data in invalid:
+            with self.subTest(data=data):
+                with self.assertRaises(WorkflowError):
+                    read_workflow(data)
+
+    def test_definition_hash_changes_with_request(self):
+        self.assertEqual(node('A').definition_hash, node('A').definition_hash)
+        self.assertNotEqual(node('A').definition_hash, node('A', intendedState='Active').definition_hash)
+        self.assertNotEqual(node('A').definition_hash, node('A', intent='upgradeAssembly').definition_hash)
+
+class TestProcessWaiter(unittest.TestCase):
+
+    def test_backs_off_while_status_unchanged(self):
+        api = MagicMock()
+        statuses = ['Pending', 'Pending', 'Pending', 'In Progress', 'In Progress', 'Completed']
+        api.get.side_effect = [{'status': s} for s in statuses]
+        stop = RecordingStop()
+        process = ProcessWaiter(api, min_interval=1, max_interval=3, backoff=2).wait('123', stop=stop)
+        self.assertEqual(process, {'status': 'Completed'})
+        self.assertEqual(stop.waits, [1, 2, 3, 1, 2])
+        api.get.assert_called_with('123', shallow=True)
+
+    def test_returns_failed_process(self):
+        api = MagicMock()
+        api.get.return_value = {'status': 'Cancelled'}
+        self.assertEqual(ProcessWaiter(api).wait('123'), {'status': 'Cancelled'})
+
+    def test_timeout(self):
+        api = MagicMock()
+        api.get.return_value = {'status': 'In Progress'}
+        clock = FakeClock()
+        stop = RecordingStop(clock=clock)
+        with self.assertRaises(WorkflowError) as context:
+            ProcessWaiter(api, min_interval=2, max_interval=8, backoff=2, clock=clock).wait('123', timeout=5, stop=stop)
+        self.assertEqual(str(context.exception), 'Process 123 did not finish within 5 seconds (last status: In Progress)')
+        self.assertEqual(stop.waits, [2, 3])
+
+    def test_stops_when_stop_event_set(self):
+        api = MagicMock()
+        api.get.return_value = {'status': 'In Progress'}
+        stop = threading.Event()
+        stop.set()
+        self.assertIsNone(ProcessWaiter(api).wait('123', stop=stop))
+
+class TestWorkflowRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _runner(self, tnco, max_workers=4):
+        return WorkflowRunner(tnco, max_workers=max_workers, waiter=ProcessWaiter(tnco.processes, min_interval=0.01, max_interval=0.01))
+
+    def test_run_in_dependency_order(self):
+        tnco = FakeTNCO()
+        workflow = Workflow([node('shared'), node('A', ['shared']), node('B', ['shared']), node('both', ['A', 'B'], intent='changeAssemblyState')])
+        completed = []
+        result = self._runner(tnco).run(workflow, on_node_complete=lambda r: completed.append(r.name))
+        self.assertTrue(result.passed)
+        self.assertEqual(tnco.requested[0], ('createAssembly', 'shared'))
+        self.assertEqual(sorted(tnco.requested[1:3]), [('createAssembly', 'A'), ('createAssembly', 'B')])
+        self.assertEqual(tnco.requested[3], ('changeAssemblyState', 'both'))
+        self.assertEqual(completed[0], 'shared')
+        self.assertEqual(completed[-1], 'both')
+        for node_result in result.nodes:
+            self.assertEqual(node_result.status, COMPLETED)
+            self.assertIsNotNone(node_result.process_id)
+            self.assertGreaterEqual(node_result.duration, 0)
+
+    def test_failure_skips_only_descendants(self):
+        tnco = FakeTNCO(statuses={'A': 'Failed'})
+        workflow = Workflow([node('A'), node('A-child', ['A']), node('A-grandchild', ['A-child']), node('B'), node('B-child', ['B'])])
+        result = self._runner(tnco).run(workflow)
+        self.assertFalse(result.passed)
+        statuses = {r.name: (r.status, r.error) for r in result.nodes}
+        self.assertEqual(statuses, {
+            'A': (FAILED, 'Process Failed: Mock reason'),
+            'A-child': (SKIPPED, 'Skipped as "A" did not complete'),
+            'A-grandchild': (SKIPPED, 'Skipped as "A-child" did not complete'),
+            'B': (COMPLETED, None),
+            'B-child': (COMPLETED, None)
+        })
+        self.assertEqual(sorted(n for _, n in tnco.requested), ['A', 'B', 'B-child'])
+
+    def test_intent_error_fails_node(self):
+        tnco = FakeTNCO(intent_errors={'A': 'Mock error'})
+        result = self._runner(tnco).run(Workflow([node('A'), node('B', ['A'])]))
+        self.assertEqual([(r.status, r.error) for r in result.nodes], [(FAILED, 'Mock error'), (SKIPPED, 'Skipped as "A" did not complete')])
+
+    def test_state_saved_and_resumed(self):
+        path = os.path.join(self.tmp_dir, 'state', 'workflow.json')
+        tnco = FakeTNCO(statuses={'B': 'Failed'})
+        workflow = Workflow([node('A'), node('B', ['A']), node('C', ['B'])], name='test')
+        self._runner(tnco).run(workflow, state=WorkflowState(workflow, path=path))
+        with open(path, 'r') as f:
+            saved = json.load(f)
+        self.assertEqual(saved['workflow'], 'test')
+        self.assertEqual({n: r['status'] for n, r in saved['nodes'].items()}, {'A': COMPLETED, 'B': FAILED, 'C': SKIPPED})
+        # Resume once B can complete: A is not requested again
+        tnco.statuses = {}
+        tnco.requested.clear()
+        result = self._runner(tnco).run(workflow, state=WorkflowState(workflow, path=path))
+        self.assertTrue(result.passed)
+        self.assertEqual(tnco.requested, [('createAssembly', 'B'), ('createAssembly', 'C')])
+        self.assertEqual(result.nodes[0].process_id, 'process-1')
+
+    def test_resume_waits_on_running_process(self):
+        path = os.path.join(self.tmp_dir, 'workflow.json')
+        workflow = Workflow([node('A'), node('B', ['A'])])
+        with open(path, 'w') as f:
+            json.dump({'nodes': {'A': {'name': 'A', 'intent': 'createAssembly', 'status': RUNNING, 'process_id': 'existing', 'started_at': 10,
+                                        'definition': workflow.nodes[0].definition_hash}}}, f)
+        tnco = FakeTNCO()
+        result = self._runner(tnco).run(workflow, state=WorkflowState(workflow, path=path))
+        self.assertTrue(result.passed)
+        self.assertEqual(tnco.requested, [('createAssembly', 'B')])
+        self.assertEqual(result.nodes[0].process_id, 'existing')
+        self.assertGreaterEqual(tnco.polls['existing'], 2)
+
+    def test_resume_runs_changed_node_again(self):
+        path = os.path.join(self.tmp_dir, 'workflow.json')
+        tnco = FakeTNCO()
+        workflow = Workflow([node('A')])
+        self._runner(tnco).run(workflow, state=WorkflowState(workflow, path=path))
+        changed = Workflow([node('A', intendedState='Active')])
+        state = WorkflowState(changed, path=path)
+        self.assertEqual(state.results['A'].status, PENDING)
+        self._runner(tnco).run(changed, state=state)
+        self.assertEqual(tnco.requested, [('createAssembly', 'A'), ('createAssembly', 'A')])
+
+    def test_unreadable_state_file(self):
+        path = os.path.join(self.tmp_dir, 'workflow.json')
+        with open(path, 'w') as f:
+            f.write('not json')
+        with self.assertRaises(WorkflowError):
+            WorkflowState(Workflow([node('A')]), path=path)
@@ -0,0 +1,66 @@
+import unittest
+import os
+import tempfile
+import shutil
+import time
+from unittest.mock import patch
+from lmctl.client import NameCache
+
+class TestNameCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        if os.path.exists(self.tmp_dir):
+            shutil.rmtree(self.tmp_dir)
+
+    def test_put_and_get(self):
+        cache = NameCache()
+        cache.put('A', '1')
+        self.assertEqual(cache.get('A'), '1')
+        self.assertIsNone(cache.get('B'))
+
+    def test_entries_expire(self):
+        cache = NameCache(ttl=10)
+        with patch('lmctl.client.name_cache.time.time', return_value=1000):
+            cache.put('A', '1')
+        with patch('lmctl.client.name_cache.time.time', return_value=1005):
+            self.assertEqual(cache.get('A'), '1')
+        with patch('lmctl.client.name_cache.time.time', return_value=1010):
+            self.assertIsNone(cache.get('A'))
+
+    def test_invalidate(self):
+        cache = NameCache()
+        cache.put_all({'A': '1', 'B': '2'})
+        cache.invalidate('A')
+        self.assertIsNone(cache.get('A'))
+        self.assertEqual(cache.get('B'), '2')
+        cache.invalidate()
+        self.assertIsNone(cache.get('B'))
+
+    def test_invalidate_id(self):
+        cache = NameCache()
+        cache.put_all({'A': '1', 'A-alias': '1', 'B': '2'})
+        cache.invalidate_id('1')
+        self.assertIsNone(cache.get('A'))
+        self.assertIsNone(cache.get('A-alias'))
+        self.assertEqual(cache.get('B'), '2')
+
+    def test_zero_ttl_disables_cache(self):
+        cache = NameCache(ttl=0)
+        cache.put('A', '1')
+        self.assertIsNone(cache.get('A'))
+
+    def test_persists_to_disk(self):
+        path = os.path.join(self.tmp_dir, 'names.json')
+        cache = NameCache(path=path)
+        cache.put('A', '1')
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(NameCache(path=path).get('A'), '1')
+
+    def test_ignores_expired_entries_on_disk(self):
+        path = os.path.join(self.tmp_dir, 'names.json')
+        with patch('lmctl.client.name_cache.time.time', return_value=time.time() - 100):
+            NameCache(ttl=10, path=path).put('A', '1')
+        self.assertIsNone(NameCache(path=path).get('A'))
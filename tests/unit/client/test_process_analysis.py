@@ -0,0 +1,53 @@
+import unittest
+from lmctl.client import process_analysis
+from lmctl.client.process_analysis import ProcessStats
+from lmctl.client.execution_metrics import numpy_available
+
+def _process(intent_type, assembly_type, status, duration=None):
+    process = {'intentType': intent_type, 'assemblyType': assembly_type, 'status': status, 'startTime': '2021-01-01T00:00:00.000Z'}
+    if duration is not None:
+        process['endTime'] = f'2021-01-01T00:{duration // 60:02d}:{duration % 60:02d}.000Z'
+    return process
+
+PROCESSES = [_process('CreateAssembly', 'typeA', 'Completed', d) for d in range(10, 101, 10)] + [
+    _process('CreateAssembly', 'typeA', 'Failed', 5),
+    _process('DeleteAssembly', 'typeA', 'In Progress'),
+    _process('CreateAssembly', 'typeB', 'Failed', 120)
+]
+
+class ProcessAnalysisTestCase:
+
+    use_numpy = None
+
+    def test_process_stats(self):
+        stats = process_analysis.process_stats(PROCESSES, use_numpy=self.use_numpy)
+        self.assertEqual(stats, [
+            ProcessStats('CreateAssembly', 'typeA', 11, 1, 0.091, ended=11, mean=50.455, p50=50.0, p90=90.0, p99=100.0, max=100.0),
+            ProcessStats('DeleteAssembly', 'typeA', 1, 0, 0.0, ended=0),
+            ProcessStats('CreateAssembly', 'typeB', 1, 1, 1.0, ended=1, mean=120.0, p50=120.0, p90=120.0, p99=120.0, max=120.0)
+        ])
+
+    def test_process_stats_with_uneven_fractions(self):
+        processes = [{'id': '1', 'intentType': 'CreateAssembly', 'assemblyType': 'typeA', 'status': 'Completed',
+                        'startTime': '2021-03-10T12:34:56.12Z', 'endTime': '2021-03-10T12:35:06.1Z'}]
+        stats = process_analysis.process_stats(processes, use_numpy=self.use_numpy)
+        self.assertEqual(stats[0].mean, 9.98)
+
+    def test_process_stats_fails_on_invalid_time(self):
+        processes = PROCESSES + [{'id': '123', 'intentType': 'CreateAssembly', 'assemblyType': 'typeA', 'status': 'Completed',
+                                    'startTime': '2021-01-01T00:00:00Z', 'endTime': 'not a time'}]
+        with self.assertRaises(process_analysis.ProcessFormatError) as context:
+            process_analysis.process_stats(processes, use_numpy=self.use_numpy)
+        self.assertEqual(str(context.exception), 'Process 123 has an invalid "startTime" or "endTime": Expected an ISO 8601 timestamp but got: \'not a time\'')
+
+    def test_process_stats_without_processes(self):
+        self.assertEqual(process_analysis.process_stats([], use_numpy=self.use_numpy), [])
+
+class TestProcessAnalysisWithPython(ProcessAnalysisTestCase, unittest.TestCase):
+
+    use_numpy = False
+
+@unittest.skipIf(not numpy_available(), 'NumPy is not installed')
+class TestProcessAnalysisWithNumpy(ProcessAnalysisTestCase, unittest.TestCase):
+
+    use_numpy = True
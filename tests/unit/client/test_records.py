@@ -0,0 +1,87 @@
+import json
+import unittest
+from lmctl.client.models import Record, RecordList
+
+PROCESSES = [
+    {'id': '1', 'status': 'Completed', 'intentType': 'CreateAssembly', 'context': {'a': [1, 2], 'note': 'x"]}{['}},
+    {'id': '2', 'status': 'Completed', 'intentType': 'CreateAssembly', 'endTime': None},
+    {'id': '3', 'status': 'Failed', 'intentType': 'DeleteAssembly', 'tags': ['x', {'y': '\\'}]}
+]
+
+def records_of(values):
+    return RecordList.from_json(json.dumps(values).encode('utf-8'))
+
+class TestRecordList(unittest.TestCase):
+
+    def test_from_json(self):
+        records = records_of(PROCESSES)
+        self.assertEqual(len(records), 3)
+        self.assertEqual(records.to_dicts(), PROCESSES)
+
+    def test_from_json_str_and_whitespace(self):
+        records = RecordList.from_json(' [ {"id": "1"} ,\n{"id": "2"}\n] \n')
+        self.assertEqual(records.to_dicts(), [{'id': '1'}, {'id': '2'}])
+
+    def test_from_json_invalid(self):
+        invalid = [b'{"id": "1"}', b'[1, 2]', b'[{"id": "1"}, 2]', b'[[{"id": "1"}]]', b'[{"id": "1"} {"id": "2"}]', b'[, {"id": "1"}]',
+                    b'[{"id": "1"},]', b'[{"id": ', b'[{"id": "1}]', b'[{"id": "1"}] []', b'']
+        for content in invalid:
+            with self.subTest(content=content):
+                with self.assertRaises(ValueError):
+                    RecordList.from_json(content)
+
+    def test_values_decoded_when_read(self):
+        records = RecordList.from_json(b'[{"id": "1"}, {"id": oops}]')
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[0]['id'], '1')
+        with self.assertRaises(ValueError):
+            records[1]['id']
+
+    def test_record_behaves_like_dict(self):
+        record = records_of(PROCESSES)[0]
+        self.assertIsInstance(record, Record)
+        self.assertEqual(record['id'], '1')
+        self.assertEqual(record.get('status'), 'Completed')
+        self.assertEqual(record.get('tags', 'none'), 'none')
+        self.assertEqual(record['context'], {'a': [1, 2], 'note': 'x"]}{['})
+        self.assertEqual(list(record.keys()), ['id', 'status', 'intentType', 'context'])
+        self.assertEqual(len(record), 4)
+        self.assertEqual(record, PROCESSES[0])
+        self.assertEqual(dict(record), PROCESSES[0])
+        self.assertIn('id', record)
+        self.assertNotIn('tags', record)
+        with self.assertRaises(KeyError):
+            record['tags']
+
+    def test_missing_value_differs_from_null(self):
+        records = records_of(PROCESSES)
+        self.assertIn('endTime', records[1])
+        self.assertIsNone(records[1]['endTime'])
+        self.assertNotIn('endTime', records[0])
+
+    def test_to_dict_decoded_again(self):
+        record = records_of(PROCESSES)[0]
+        values = record.to_dict()
+        values['context']['a'].append(3)
+        self.assertEqual(record.to_dict()['context'], {'a': [1, 2], 'note': 'x"]}{['})
+
+    def test_only_latest_record_kept_decoded(self):
+        records = records_of(PROCESSES)
+        first = records[0]['context']
+        self.assertIs(records[0]['context'], first)
+        records[1]['id']
+        self.assertIsNot(records[0]['context'], first)
+
+    def test_indexing(self):
+        records = records_of(PROCESSES)
+        self.assertEqual(records[-1]['id'], '3')
+        self.assertEqual([r['id'] for r in records[1:]], ['2', '3'])
+        with self.assertRaises(IndexError):
+            records[3]
+        with self.assertRaises(IndexError):
+            records[-4]
+
+    def test_empty(self):
+        for records in [RecordList.from_json(b'[]'), RecordList.from_json(b'[ ]'), RecordList()]:
+            self.assertEqual(len(records), 0)
+            self.assertEqual(records.to_dicts(), [])
@@ -0,0 +1,191 @@
+import unittest
+import os
+import json
+import tempfile
+import shutil
+import requests
+from unittest.mock import patch, MagicMock
+import stat
+from lmctl.client import TNCOClient, TNCOClientRequest, ResponseCache, MemoryCacheBackend, DiskCacheBackend, ClientCredentialsAuth, UserPassAuth, JwtTokenAuth
+from lmctl.client.response_cache import CacheEntry
+
+def build_response(body, status_code=200, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {'Content-Type': 'application/json'})
+    response._content = json.dumps(body).encode('utf-8') if body is not None else b''
+    return response
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TNCOClient('https://test.example.com', response_cache=ResponseCache())
+        self.client.make_request = MagicMock()
+
+    def test_ttl_for_uses_longest_prefix(self):
+        cache = ResponseCache(ttls={'api/a': 10, 'api/a/b': 20}, default_ttl=5)
+        self.assertEqual(cache.ttl_for('api/a'), 10)
+        self.assertEqual(cache.ttl_for('api/a/123'), 10)
+        self.assertEqual(cache.ttl_for('api/a/b/123'), 20)
+        self.assertEqual(cache.ttl_for('api/ab'), 5)
+        self.assertEqual(cache.ttl_for('api/other'), 5)
+
+    def test_is_cacheable(self):
+        cache = ResponseCache(ttls={'api/a': 10})
+        self.assertTrue(cache.is_cacheable(TNCOClientRequest(method='GET', endpoint='api/a/1')))
+        self.assertFalse(cache.is_cacheable(TNCOClientRequest(method='POST', endpoint='api/a/1')))
+        self.assertFalse(cache.is_cacheable(TNCOClientRequest(method='GET', endpoint='api/b')))
+
+    def test_secret_endpoints_never_cached(self):
+        cache = ResponseCache(ttls={'api/resource-manager': 10})
+        self.assertTrue(cache.is_cacheable(TNCOClientRequest(method='GET', endpoint='api/resource-manager/vim-drivers')))
+        self.assertFalse(cache.is_cacheable(TNCOClientRequest(method='GET', endpoint='api/resource-manager/infrastructure-keys/shared')))
+        self.assertFalse(ResponseCache().is_cacheable(TNCOClientRequest(method='GET', endpoint='api/resource-manager/infrastructure-keys/shared/key')))
+
+    def test_identity_is_part_of_cache_key(self):
+        backend = MemoryCacheBackend()
+        clients = [
+            TNCOClient('https://test.example.com', auth_type=ClientCredentialsAuth('client-a', 'secret'), response_cache=ResponseCache(backend=backend)),
+            TNCOClient('https://test.example.com', auth_type=ClientCredentialsAuth('client-b', 'secret'), response_cache=ResponseCache(backend=backend)),
+            TNCOClient('https://test.example.com', auth_type=UserPassAuth('user-a', 'pass', 'client-a', 'secret'), response_cache=ResponseCache(backend=backend)),
+            TNCOClient('https://test.example.com', auth_type=JwtTokenAuth('token-a'), response_cache=ResponseCache(backend=backend)),
+            TNCOClient('https://test.example.com', auth_type=JwtTokenAuth('token-b'), response_cache=ResponseCache(backend=backend))
+        ]
+        for client in clients:
+            client.make_request = MagicMock(return_value=build_response([{'id': '1'}]))
+            client.deployment_locations.all()
+            client.deployment_locations.all()
+            client.make_request.assert_called_once()
+        self.assertEqual(len(backend._entries), 5)
+        for key in backend._entries.keys():
+            self.assertNotIn('token-', key)
+
+    def test_get_is_cached(self):
+        self.client.make_request.return_value = build_response([{'id': '1'}])
+        self.assertEqual(self.client.deployment_locations.all(), [{'id': '1'}])
+        self.assertEqual(self.client.deployment_locations.all(), [{'id': '1'}])
+        self.client.make_request.assert_called_once()
+
+    def test_uncached_endpoints_are_requested(self):
+        self.client.make_request.return_value = build_response([{'id': '1'}])
+        self.client.processes.query()
+        self.client.processes.query()
+        self.assertEqual(self.client.make_request.call_count, 2)
+
+    def test_query_params_are_part_of_cache_key(self):
+        self.client.make_request.return_value = build_response([{'id': '1'}])
+        self.client.deployment_locations.all_with_name('A')
+        self.client.deployment_locations.all_with_name('B')
+        self.assertEqual(self.client.make_request.call_count, 2)
+
+    def test_update_invalidates_cache(self):
+        self.client.make_request.return_value = build_response({'id': '1'})
+        self.client.deployment_locations.get('1')
+        self.client.deployment_locations.all()
+        self.client.deployment_locations.update({'id': '1'})
+        self.client.deployment_locations.get('1')
+        self.client.deployment_locations.all()
+        self.assertEqual(self.client.make_request.call_count, 5)
+
+    def test_descriptor_delete_invalidates_cache(self):
+        self.client.make_request.return_value = build_response({'name': 'assembly::A::1.0'})
+        self.client.descriptors.get('assembly::A::1.0')
+        self.client.descriptors.delete('assembly::A::1.0')
+        self.client.descriptors.get('assembly::A::1.0')
+        self.assertEqual(self.client.make_request.call_count, 3)
+
+    def test_resource_package_push_invalidates_descriptors(self):
+        self.client.make_request.return_value = build_response({'name': 'resource::A::1.0'}, headers={'Content-Type': 'application/json', 'Location': 'resource-packages/A'})
+        pkg_path = os.path.join(tempfile.mkdtemp(), 'pkg.zip')
+        self.addCleanup(shutil.rmtree, os.path.dirname(pkg_path))
+        with open(pkg_path, 'wb') as f:
+            f.write(b'pkg')
+        for push in [lambda: self.client.resource_packages.create(pkg_path), lambda: self.client.resource_packages.update('resource::A::1.0', pkg_path), 
+                        lambda: self.client.resource_packages.delete('resource::A::1.0')]:
+            self.client.descriptors.get('resource::A::1.0')
+            self.client.make_request.reset_mock()
+            push()
+            self.client.descriptors.get('resource::A::1.0')
+            self.assertEqual(self.client.make_request.call_count, 2)
+
+    def test_resource_manager_onboarding_invalidates_descriptors(self):
+        self.client.make_request.return_value = build_response({'name': 'brent'})
+        self.client.descriptors.get('resource::A::1.0')
+        self.client.resource_managers.update({'name': 'brent'})
+        self.client.descriptors.get('resource::A::1.0')
+        self.assertEqual(self.client.make_request.call_count, 3)
+
+    def test_deployment_location_update_keeps_descriptors(self):
+        self.client.make_request.return_value = build_response({'id': '1', 'name': 'assembly::A::1.0'})
+        self.client.descriptors.get('assembly::A::1.0')
+        self.client.deployment_locations.update({'id': '1'})
+        self.client.descriptors.get('assembly::A::1.0')
+        self.assertEqual(self.client.make_request.call_count, 2)
+
+    @patch('lmctl.client.response_cache.time.time')
+    def test_expired_entry_revalidated_with_etag(self, mock_time):
+        mock_time.return_value = 1000
+        self.client.make_request.return_value = build_response({'id': '1'}, headers={'Content-Type': 'application/json', 'ETag': '"v1"'})
+        self.client.deployment_locations.get('1')
+        mock_time.return_value = 2000
+        self.client.make_request.return_value = build_response(None, status_code=304)
+        self.assertEqual(self.client.deployment_locations.get('1'), {'id': '1'})
+        revalidate_request = self.client.make_request.call_args[0][0]
+        self.assertEqual(revalidate_request.headers['If-None-Match'], '"v1"')
+        # Entry refreshed by the 304
+        self.client.deployment_locations.get('1')
+        self.assertEqual(self.client.make_request.call_count, 2)
+
+class TestMemoryCacheBackend(unittest.TestCase):
+
+    def test_evicts_least_recently_used(self):
+        backend = MemoryCacheBackend(max_entries=2)
+        backend.put('a', CacheEntry('a', 200, {}, b'a', 0))
+        backend.put('b', CacheEntry('b', 200, {}, b'b', 0))
+        backend.get('a')
+        backend.put('c', CacheEntry('c', 200, {}, b'c', 0))
+        self.assertIsNotNone(backend.get('a'))
+        self.assertIsNone(backend.get('b'))
+        self.assertIsNotNone(backend.get('c'))
+
+class TestDiskCacheBackend(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        if os.path.exists(self.tmp_dir):
+            shutil.rmtree(self.tmp_dir)
+
+    def test_put_and_get(self):
+        backend = DiskCacheBackend(self.tmp_dir)
+        backend.put('a', CacheEntry('api/a', 200, {'ETag': '"1"'}, b'{"id": "1"}', 100))
+        entry = DiskCacheBackend(self.tmp_dir).get('a')
+        self.assertEqual(entry.content, b'{"id": "1"}')
+        self.assertEqual(entry.etag, '"1"')
+        self.assertEqual(entry.to_response().json(), {'id': '1'})
+
+    def test_files_only_accessible_to_user(self):
+        directory = os.path.join(self.tmp_dir, 'cache')
+        backend = DiskCacheBackend(directory)
+        backend.put('a', CacheEntry('api/a', 200, {}, b'{}', 100))
+        backend.put('a', CacheEntry('api/a', 200, {}, b'{"id": "1"}', 100))
+        self.assertEqual(stat.S_IMODE(os.stat(directory).st_mode), 0o700)
+        files = os.listdir(directory)
+        self.assertEqual(len(files), 1)
+        self.assertEqual(stat.S_IMODE(os.stat(os.path.join(directory, files[0])).st_mode), 0o600)
+        self.assertEqual(backend.get('a').content, b'{"id": "1"}')
+
+    def test_remove_matching(self):
+        backend = DiskCacheBackend(self.tmp_dir)
+        backend.put('a', CacheEntry('api/a', 200, {}, b'', 100))
+        backend.put('b', CacheEntry('api/b', 200, {}, b'', 100))
+        backend.remove_matching(lambda entry: entry.endpoint == 'api/a')
+        self.assertIsNone(backend.get('a'))
+        self.assertIsNotNone(backend.get('b'))
+
+    def test_evicts_when_full(self):
+        backend = DiskCacheBackend(self.tmp_dir, max_entries=2)
+        for key in ['a', 'b', 'c']:
+            backend.put(key, CacheEntry(key, 200, {}, b'', 100))
+        self.assertEqual(len(os.listdir(self.tmp_dir)), 2)
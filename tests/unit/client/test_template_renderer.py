@@ -0,0 +1,81 @@
+import unittest
+from lmctl.client import LocalTemplateRenderer, TemplateRenderError
+from lmctl.client.api import BatchRenderItem
+
+TEMPLATE = {
+    'name': 'assembly-template::Test::1.0',
+    'properties': {
+        'descriptorName': {'type': 'string'},
+        'vendor': {'type': 'string', 'default': 'acme'}
+    },
+    'template': 'name: assembly::{{ descriptorName }}::1.0\ndescription: by {{ vendor }}\n'
+}
+
+class TestLocalTemplateRenderer(unittest.TestCase):
+
+    def test_render(self):
+        renderer = LocalTemplateRenderer()
+        result = renderer.render(TEMPLATE, {'properties': {'descriptorName': 'Test', 'vendor': 'ibm'}})
+        self.assertEqual(result, {'name': 'assembly::Test::1.0', 'description': 'by ibm'})
+
+    def test_render_uses_property_defaults(self):
+        renderer = LocalTemplateRenderer()
+        result = renderer.render(TEMPLATE, {'properties': {'descriptorName': 'Test'}})
+        self.assertEqual(result, {'name': 'assembly::Test::1.0', 'description': 'by acme'})
+
+    def test_render_raw(self):
+        renderer = LocalTemplateRenderer()
+        result = renderer.render_raw(TEMPLATE, {'properties': {'descriptorName': 'Test'}})
+        self.assertEqual(result, 'name: assembly::Test::1.0\ndescription: by acme\n')
+
+    def test_render_ignores_undeclared_properties(self):
+        renderer = LocalTemplateRenderer()
+        template = {'name': 'Test', 'properties': {}, 'template': 'name: {{ descriptorName }}'}
+        self.assertEqual(renderer.render_raw(template, {'properties': {'descriptorName': 'Test'}}), 'name: ')
+
+    def test_render_fails_on_missing_required_property(self):
+        renderer = LocalTemplateRenderer()
+        template = {'name': 'Test', 'properties': {'descriptorName': {'type': 'string', 'required': True}}, 'template': 'name: {{ descriptorName }}'}
+        with self.assertRaises(TemplateRenderError) as context:
+            renderer.render(template, {})
+        self.assertEqual(str(context.exception), 'No value provided for required property: descriptorName')
+
+    def test_render_fails_on_invalid_template(self):
+        renderer = LocalTemplateRenderer()
+        with self.assertRaises(TemplateRenderError) as context:
+            renderer.render({'name': 'Test', 'template': 'name: {{ descriptorName '}, {})
+        self.assertTrue(str(context.exception).startswith('Template is not valid Jinja2 (line 1)'))
+
+    def test_render_fails_on_invalid_yaml_output(self):
+        renderer = LocalTemplateRenderer()
+        with self.assertRaises(TemplateRenderError) as context:
+            renderer.render({'name': 'Test', 'template': 'name: [a'}, {})
+        self.assertTrue(str(context.exception).startswith('Rendered Descriptor Template Test is not valid YAML'))
+
+    def test_compile_caches_by_content(self):
+        renderer = LocalTemplateRenderer()
+        compiled = renderer.compile('name: {{ descriptorName }}')
+        self.assertIs(renderer.compile('name: {{ descriptorName }}'), compiled)
+        self.assertIsNot(renderer.compile('name: {{ vendor }}'), compiled)
+
+    def test_compile_evicts_least_recently_used(self):
+        renderer = LocalTemplateRenderer(max_compiled_templates=2)
+        first = renderer.compile('first')
+        second = renderer.compile('second')
+        renderer.compile('first')
+        renderer.compile('third')
+        self.assertIs(renderer.compile('first'), first)
+        self.assertIsNot(renderer.compile('second'), second)
+
+    def test_render_batch(self):
+        renderer = LocalTemplateRenderer()
+        items = [
+            BatchRenderItem(TEMPLATE['name'], {'properties': {'descriptorName': 'A'}}, request_id='1'),
+            BatchRenderItem('Unknown', {}, request_id='2'),
+            BatchRenderItem(TEMPLATE['name'], {'properties': {'descriptorName': 'B'}}, request_id='3')
+        ]
+        results = list(renderer.render_batch({TEMPLATE['name']: TEMPLATE}, items))
+        self.assertEqual(results[0].result, {'name': 'assembly::A::1.0', 'description': 'by acme'})
+        self.assertTrue(results[1].failed)
+        self.assertEqual(str(results[1].error), 'No local Descriptor Template named: Unknown')
+        self.assertEqual(results[2].result, {'name': 'assembly::B::1.0', 'description': 'by acme'})
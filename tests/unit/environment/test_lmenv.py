@@ -1,8 +1,11 @@
+import os
 import unittest
 import unittest.mock as mock
+import tempfile
+import shutil
 from pydantic import ValidationError
-from lmctl.environment import TNCOEnvironment, LmSessionConfig, LmSession
-from lmctl.client import TNCOClient, LegacyUserPassAuth, UserPassAuth, ClientCredentialsAuth, JwtTokenAuth
+from lmctl.environment import TNCOEnvironment, TNCORateLimit, TNCOResponseCache, TNCONameCache, LmSessionConfig, LmSession
+from lmctl.client import TNCOClient, LegacyUserPassAuth, UserPassAuth, ClientCredentialsAuth, JwtTokenAuth, AdmissionController, ResponseCache, NameCache, MemoryCacheBackend, DiskCacheBackend, DEFAULT_CATALOG_TTLS
 
 class TestTNCOEnvironment(unittest.TestCase):
     maxDiff = None
@@ -150,6 +153,79 @@ class TestTNCOEnvironment(unittest.TestCase):
         self.assertIsInstance(client, TNCOClient)
         self.assertEqual(client.address, 'http://test:80/gateway')
         self.assertEqual(client.kami_address, 'http://test:31289')
+        self.assertIsNone(client.admission_controller)
+
+    def test_build_client_with_rate_limit(self):
+        config = TNCOEnvironment(address='https://testing', rate_limit={'requests_per_second': 5, 'burst': 10, 'max_concurrency': 4, 'max_retries': 1})
+        self.assertIsInstance(config.rate_limit, TNCORateLimit)
+        client = config.build_client()
+        self.assertIsInstance(client.admission_controller, AdmissionController)
+        self.assertEqual(client.admission_controller.bucket.rate, 5)
+        self.assertEqual(client.admission_controller.bucket.burst, 10)
+        self.assertEqual(client.admission_controller.max_concurrency, 4)
+        self.assertEqual(client.admission_controller.min_concurrency, 1)
+        self.assertEqual(client.admission_controller.max_retries, 1)
+
+    def test_init_fails_when_rate_limit_invalid(self):
+        with self.assertRaises(ValidationError):
+            TNCOEnvironment(address='https://testing', rate_limit={'max_concurrency': 2, 'min_concurrency': 3})
+        with self.assertRaises(ValidationError):
+            TNCOEnvironment(address='https://testing', rate_limit={'requests_per_second': 0})
+
+    def test_build_client_without_response_cache(self):
+        config = TNCOEnvironment(address='https://testing')
+        client = config.build_client()
+        self.assertIsNone(client.response_cache)
+
+    def test_build_client_with_memory_response_cache(self):
+        config = TNCOEnvironment(address='https://testing', response_cache={'max_entries': 10, 'default_ttl': 5, 'ttls': {'/api/topology/assemblies': 30, 'api/catalog/descriptors': 0}})
+        self.assertIsInstance(config.response_cache, TNCOResponseCache)
+        client = config.build_client()
+        self.assertIsInstance(client.response_cache, ResponseCache)
+        self.assertIsInstance(client.response_cache.backend, MemoryCacheBackend)
+        self.assertEqual(client.response_cache.backend.max_entries, 10)
+        self.assertEqual(client.response_cache.default_ttl, 5)
+        self.assertEqual(client.response_cache.ttl_for('api/topology/assemblies/123'), 30)
+        self.assertEqual(client.response_cache.ttl_for('api/catalog/descriptors'), 0)
+        self.assertEqual(client.response_cache.ttl_for('api/deploymentLocations'), DEFAULT_CATALOG_TTLS['api/deploymentLocations'])
+        self.assertEqual(client.response_cache.ttl_for('api/behaviour/projects'), 5)
+
+    def test_build_client_with_disk_response_cache(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            cache_dir = os.path.join(tmp_dir, 'responses')
+            config = TNCOEnvironment(address='https://testing', response_cache={'backend': 'Disk', 'directory': cache_dir, 'max_entries': 20})
+            self.assertEqual(config.response_cache.backend, 'disk')
+            client = config.build_client()
+            self.assertIsInstance(client.response_cache.backend, DiskCacheBackend)
+            self.assertEqual(client.response_cache.backend.directory, cache_dir)
+            self.assertEqual(client.response_cache.backend.max_entries, 20)
+            self.assertTrue(os.path.isdir(cache_dir))
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_init_fails_when_response_cache_invalid(self):
+        with self.assertRaises(ValidationError):
+            TNCOEnvironment(address='https://testing', response_cache={'backend': 'redis'})
+        with self.assertRaises(ValidationError):
+            TNCOEnvironment(address='https://testing', response_cache={'max_entries': 0})
+        with self.assertRaises(ValidationError):
+            TNCOEnvironment(address='https://testing', response_cache={'ttls': {'api/catalog/descriptors': -1}})
+
+    def test_build_client_with_assembly_name_cache(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            cache_path = os.path.join(tmp_dir, 'names.json')
+            config = TNCOEnvironment(address='https://testing', assembly_name_cache={'ttl': 300, 'path': cache_path})
+            self.assertIsInstance(config.assembly_name_cache, TNCONameCache)
+            client = config.build_client()
+            self.assertIsInstance(client.assembly_name_cache, NameCache)
+            self.assertEqual(client.assembly_name_cache.ttl, 300)
+            self.assertEqual(client.assembly_name_cache.path, cache_path)
+            client.assembly_name_cache.put('A', '1')
+            self.assertEqual(config.build_client().assembly_name_cache.get('A'), '1')
+        finally:
+            shutil.rmtree(tmp_dir)
 
     def test_build_client_legacy_auth(self):
         config = TNCOEnvironment(
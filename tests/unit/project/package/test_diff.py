@@ -0,0 +1,194 @@
+import io
+import os
+import json
+import shutil
+import tarfile
+import zipfile
+import tempfile
+import unittest
+from unittest.mock import patch
+import lmctl.project.package.diff as pkg_diff
+from lmctl.project.package.core import InvalidPackageError
+from lmctl.project.package.diff import (PkgDiffer, ContentChange, diff_pkgs, diff_content, member_kind, ADDED, REMOVED, CHANGED,
+                                        DESCRIPTOR_KIND, BEHAVIOUR_KIND, META_KIND)
+
+SCENARIO = {
+    'name': 'test',
+    'stages': [
+        {'name': 'Stage One', 'steps': [{'stepDefinitionName': 'Utilities::SleepForTime', 'properties': {'sleepTime': '20'}}]}
+    ]
+}
+
+def write_tgz(path, members):
+    with tarfile.open(path, mode='w:gz') as pkg_tar:
+        for name, data in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            pkg_tar.addfile(info, io.BytesIO(data))
+
+def write_csar(path, members):
+    with zipfile.ZipFile(path, mode='w') as pkg_csar:
+        for name, data in members.items():
+            pkg_csar.writestr(name, data)
+
+class TestMemberKind(unittest.TestCase):
+
+    def test_member_kind(self):
+        self.assertEqual(member_kind('lmpkg.yml'), META_KIND)
+        self.assertEqual(member_kind('content/Descriptor/assembly.yml'), DESCRIPTOR_KIND)
+        self.assertEqual(member_kind('content/Contains/sub/Definitions/lm/resource.yaml'), DESCRIPTOR_KIND)
+        self.assertEqual(member_kind('resource.yaml'), DESCRIPTOR_KIND)
+        self.assertEqual(member_kind('Behaviour/Tests/test.json'), BEHAVIOUR_KIND)
+        self.assertIsNone(member_kind('content/lmpkg.yml'))
+        self.assertIsNone(member_kind('Behaviour/Tests/readme.md'))
+        self.assertIsNone(member_kind('content/basic.zip'))
+
+class TestDiffContent(unittest.TestCase):
+
+    def test_dicts(self):
+        old = {'description': 'A', 'properties': {'a': {'type': 'string'}, 'b': {'type': 'string'}}}
+        new = {'description': 'B', 'properties': {'a': {'type': 'integer'}, 'c': {'type': 'string'}}}
+        self.assertEqual(diff_content(old, new), [
+            ContentChange('description', CHANGED, old='A', new='B'),
+            ContentChange('properties.a.type', CHANGED, old='string', new='integer'),
+            ContentChange('properties.b', REMOVED, old={'type': 'string'}),
+            ContentChange('properties.c', ADDED, new={'type': 'string'})
+        ])
+
+    def test_lists_matched_by_name(self):
+        old = {'stages': [{'name': 'One', 'steps': [1]}, {'name': 'Two'}]}
+        new = {'stages': [{'name': 'Zero'}, {'name': 'One', 'steps': [2]}]}
+        self.assertEqual(diff_content(old, new), [
+            ContentChange('stages[One].steps[0]', CHANGED, old=1, new=2),
+            ContentChange('stages[Two]', REMOVED, old={'name': 'Two'}),
+            ContentChange('stages[Zero]', ADDED, new={'name': 'Zero'})
+        ])
+
+    def test_lists_matched_by_index(self):
+        self.assertEqual(diff_content(['a', 'b'], ['a', 'c', 'd']), [
+            ContentChange('[1]', CHANGED, old='b', new='c'),
+            ContentChange('[2]', ADDED, new='d')
+        ])
+
+    def test_type_changed(self):
+        self.assertEqual(diff_content({'a': [1]}, {'a': 'x'}), [ContentChange('a', CHANGED, old=[1], new='x')])
+        self.assertEqual(diff_content({'a': 1}, {'a': 1}), [])
+
+class TestPkgDiff(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.old_members = {
+            'lmpkg.yml': b'name: my-svc\nversion: "1.2"\ntype: Assembly\n',
+            'content/Descriptor/assembly.yml': b'name: assembly::my-svc::1.2\ndescription: A service\n',
+            'content/Behaviour/Tests/test.json': json.dumps(SCENARIO).encode('utf-8'),
+            'content/Behaviour/Tests/removed.json': b'{}',
+            'content/blob.bin': os.urandom(4096)
+        }
+        self.old_path = os.path.join(self.tmp_dir, 'my-svc-1.2.tgz')
+        write_tgz(self.old_path, self.old_members)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _new_members(self):
+        scenario = json.loads(json.dumps(SCENARIO))
+        scenario['stages'][0]['steps'][0]['properties']['sleepTime'] = '30'
+        new_members = dict(self.old_members)
+        new_members['lmpkg.yml'] = b'name: my-svc\nversion: "1.3"\ntype: Assembly\n'
+        new_members['content/Behaviour/Tests/test.json'] = json.dumps(scenario, indent=2).encode('utf-8')
+        new_members['content/Descriptor/assembly.yml'] = b'name: assembly::my-svc::1.2\ndescription: A service\n# Only a comment added\n'
+        new_members['content/Behaviour/Tests/added.json'] = b'not json'
+        del new_members['content/Behaviour/Tests/removed.json']
+        return new_members
+
+    def _assert_diff(self, result):
+        changes = {c.path: c for c in result.changes}
+        self.assertEqual([(c.path, c.change) for c in result.changes], [
+            ('content/Behaviour/Tests/added.json', ADDED),
+            ('content/Behaviour/Tests/removed.json', REMOVED),
+            ('content/Behaviour/Tests/test.json', CHANGED),
+            ('content/Descriptor/assembly.yml', CHANGED),
+            ('lmpkg.yml', CHANGED)
+        ])
+        self.assertEqual(result.unchanged, 1)
+        self.assertEqual(changes['content/Behaviour/Tests/test.json'].kind, BEHAVIOUR_KIND)
+        self.assertEqual(changes['content/Behaviour/Tests/test.json'].content_changes,
+                            [ContentChange('stages[Stage One].steps[0].properties.sleepTime', CHANGED, old='20', new='30')])
+        # Changed bytes but the same content
+        self.assertEqual(changes['content/Descriptor/assembly.yml'].content_changes, [])
+        self.assertEqual(changes['lmpkg.yml'].content_changes, [ContentChange('version', CHANGED, old='1.2', new='1.3')])
+        self.assertIsNone(changes['content/Behaviour/Tests/added.json'].content_changes)
+        self.assertEqual(changes['content/Behaviour/Tests/removed.json'].old_size, 2)
+
+    def test_diff_tgz(self):
+        new_path = os.path.join(self.tmp_dir, 'my-svc-1.3.tgz')
+        write_tgz(new_path, self._new_members())
+        result = diff_pkgs(self.old_path, new_path, max_workers=2)
+        self._assert_diff(result)
+        self.assertTrue(result.has_changes)
+        self.assertEqual(result.to_dict()['changed'], 3)
+
+    def test_diff_csar(self):
+        new_path = os.path.join(self.tmp_dir, 'my-svc-1.3.csar')
+        write_csar(new_path, self._new_members())
+        self._assert_diff(PkgDiffer(max_workers=1).diff(self.old_path, new_path))
+
+    def test_diff_only_reads_content_of_changed_members(self):
+        new_path = os.path.join(self.tmp_dir, 'my-svc-1.3.tgz')
+        write_tgz(new_path, self._new_members())
+        read_members = pkg_diff._read_members
+        content_reads = []
+        def recording_read_members(path, include=None):
+            for member_path, data in read_members(path, include=include):
+                if include is not None:
+                    content_reads.append((os.path.basename(path), member_path))
+                yield member_path, data
+        with patch('lmctl.project.package.diff._read_members', side_effect=recording_read_members):
+            self._assert_diff(diff_pkgs(self.old_path, new_path))
+        changed = ['content/Behaviour/Tests/test.json', 'content/Descriptor/assembly.yml', 'lmpkg.yml']
+        self.assertEqual(sorted(content_reads), sorted([('my-svc-1.2.tgz', path) for path in changed] + [('my-svc-1.3.tgz', path) for path in changed]))
+
+    def test_diff_holds_old_content_in_batches_no_larger_than_largest_member(self):
+        new_path = os.path.join(self.tmp_dir, 'my-svc-1.3.tgz')
+        write_tgz(new_path, self._new_members())
+        read_members = pkg_diff._read_members
+        passes = []
+        def recording_read_members(path, include=None):
+            if include is not None and os.path.basename(path) == 'my-svc-1.2.tgz':
+                passes.append([])
+            for member_path, data in read_members(path, include=include):
+                if include is not None and os.path.basename(path) == 'my-svc-1.2.tgz':
+                    passes[-1].append(len(data))
+                yield member_path, data
+        with patch('lmctl.project.package.diff.MIN_CONTENT_DIFF_BATCH_SIZE', 1), patch('lmctl.project.package.diff._read_members', side_effect=recording_read_members):
+            self._assert_diff(diff_pkgs(self.old_path, new_path))
+        largest = max(size for sizes in passes for size in sizes)
+        self.assertGreater(len(passes), 1)
+        self.assertTrue(all(sum(sizes) <= largest for sizes in passes))
+        self.assertEqual(sum(len(sizes) for sizes in passes), 3)
+
+    def test_diff_large_members_only_by_digest(self):
+        new_path = os.path.join(self.tmp_dir, 'my-svc-1.3.tgz')
+        write_tgz(new_path, self._new_members())
+        with patch('lmctl.project.package.diff.MAX_CONTENT_DIFF_SIZE', 60):
+            result = diff_pkgs(self.old_path, new_path)
+        changes = {c.path: c for c in result.changes}
+        self.assertIsNone(changes['content/Behaviour/Tests/test.json'].content_changes)
+        self.assertIsNone(changes['content/Descriptor/assembly.yml'].content_changes)
+        self.assertEqual(changes['lmpkg.yml'].content_changes, [ContentChange('version', CHANGED, old='1.2', new='1.3')])
+
+    def test_diff_same_pkg(self):
+        # Leading "./" of member names is ignored
+        other_path = os.path.join(self.tmp_dir, 'other.tgz')
+        write_tgz(other_path, {'./{0}'.format(name): data for name, data in self.old_members.items()})
+        result = diff_pkgs(self.old_path, other_path)
+        self.assertFalse(result.has_changes)
+        self.assertEqual(result.unchanged, 5)
+
+    def test_diff_invalid_pkg(self):
+        invalid_path = os.path.join(self.tmp_dir, 'invalid.tgz')
+        with open(invalid_path, 'w') as f:
+            f.write('Not a package')
+        with self.assertRaises(InvalidPackageError):
+            diff_pkgs(self.old_path, invalid_path)
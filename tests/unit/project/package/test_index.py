@@ -0,0 +1,154 @@
+import os
+import shutil
+import hashlib
+import tempfile
+import zipfile
+from unittest.mock import patch
+from tests.common.project_testing import ProjectSimTestCase
+from lmctl.project.package.core import InvalidPackageError
+from lmctl.project.package.index import PkgIndex, PkgIndexError, read_pkg_meta
+
+def sha256(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+class TestReadPkgMeta(ProjectSimTestCase):
+
+    def test_read_tgz(self):
+        pkg_sim = self.simlab.simulate_pkg_assembly_contains_brent_basic()
+        raw_meta, meta, digest = read_pkg_meta(pkg_sim.path)
+        self.assertEqual(raw_meta['name'], 'contains_basic')
+        self.assertEqual(meta.full_name, 'contains_basic')
+        self.assertEqual([s.full_name for s in meta.subpkgs], ['sub_basic-contains_basic'])
+        self.assertEqual(digest, sha256(pkg_sim.path))
+
+    def test_read_csar(self):
+        pkg_sim = self.simlab.simulate_pkg_brent_tosca()
+        raw_meta, meta, digest = read_pkg_meta(pkg_sim.path)
+        self.assertEqual(meta.descriptor_name, 'resource::with_tosca::1.0')
+        self.assertEqual(digest, sha256(pkg_sim.path))
+
+    def test_read_deprecated_pkg_opens_pkg(self):
+        pkg_sim = self.simlab.simulate_pkg_assembly_old_style()
+        raw_meta, meta, digest = read_pkg_meta(pkg_sim.path)
+        self.assertIsNone(raw_meta)
+        self.assertEqual([s.full_name for s in meta.subpkgs], ['vnfcA', 'vnfcB'])
+        self.assertEqual(digest, sha256(pkg_sim.path))
+
+    def test_read_without_meta_file(self):
+        pkg_sim = self.simlab.simulate_pkg_general_invalid_zip()
+        with self.assertRaises(InvalidPackageError) as context:
+            read_pkg_meta(pkg_sim.path)
+        self.assertIn('Could not find meta file lmpkg.yml', str(context.exception))
+
+class TestPkgIndex(ProjectSimTestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.pkg_dir = os.path.join(self.tmp_dir, 'packages')
+        os.makedirs(os.path.join(self.pkg_dir, 'nested'))
+        self.index_path = os.path.join(self.tmp_dir, 'index.db')
+        self.contains_brent = self.__copy_pkg(self.simlab.simulate_pkg_assembly_contains_brent_basic(), 'contains_basic-1.0.tgz')
+        self.tosca = self.__copy_pkg(self.simlab.simulate_pkg_brent_tosca(), os.path.join('nested', 'with_tosca-1.0.csar'))
+        self.__copy_pkg(self.simlab.simulate_pkg_type_basic(), os.path.join('nested', 'basic-1.0.tgz'))
+
+    def tearDown(self):
+        super().tearDown()
+        shutil.rmtree(self.tmp_dir)
+
+    def __copy_pkg(self, pkg_sim, name):
+        path = os.path.join(self.pkg_dir, name)
+        shutil.copyfile(pkg_sim.path, path)
+        return path
+
+    def test_update_and_search(self):
+        with PkgIndex(self.index_path) as pkg_index:
+            result = pkg_index.update(self.pkg_dir, max_workers=2)
+            self.assertEqual(sorted(result.added), sorted([self.contains_brent, self.tosca, os.path.join(self.pkg_dir, 'nested', 'basic-1.0.tgz')]))
+            self.assertFalse(result.failed)
+            results = pkg_index.search()
+            self.assertEqual([(r['package'], r['name'], r['descriptor']) for r in results], [
+                ('basic', 'basic', 'type::basic::1.0'),
+                ('contains_basic', 'contains_basic', 'assembly::contains_basic::1.0'),
+                ('contains_basic', 'sub_basic-contains_basic', 'resource::sub_basic-contains_basic::1.0'),
+                ('with_tosca', 'with_tosca', 'resource::with_tosca::1.0')
+            ])
+            subpkg = results[2]
+            self.assertEqual(subpkg['parent'], 'contains_basic')
+            self.assertEqual(subpkg['depth'], 1)
+            self.assertEqual(subpkg['resource-manager'], 'brent')
+            self.assertEqual(subpkg['path'], self.contains_brent)
+            self.assertEqual(subpkg['digest'], sha256(self.contains_brent))
+
+    def test_search_criteria(self):
+        with PkgIndex(self.index_path) as pkg_index:
+            pkg_index.update(self.pkg_dir)
+            def names(**kwargs):
+                return [r['name'] for r in pkg_index.search(**kwargs)]
+            self.assertEqual(names(term='SUB_'), ['sub_basic-contains_basic'])
+            self.assertEqual(names(term='contains'), ['contains_basic', 'sub_basic-contains_basic'])
+            self.assertEqual(names(descriptor='resource::*::1.0'), ['sub_basic-contains_basic', 'with_tosca'])
+            self.assertEqual(names(content_type='resource', resource_manager='BRENT'), ['sub_basic-contains_basic'])
+            self.assertEqual(names(digest=sha256(self.tosca)[:10].upper()), ['with_tosca'])
+            self.assertEqual(names(version='2.0'), [])
+            # "_" and "%" are not wildcards
+            self.assertEqual(names(term='%'), [])
+
+    def test_update_only_reads_changed_packages(self):
+        with PkgIndex(self.index_path) as pkg_index:
+            pkg_index.update(self.pkg_dir)
+        os.remove(self.tosca)
+        stat = os.stat(self.contains_brent)
+        os.utime(self.contains_brent, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+        with patch('lmctl.project.package.index.read_pkg_meta', wraps=read_pkg_meta) as read_mock:
+            with PkgIndex(self.index_path) as pkg_index:
+                result = pkg_index.update(self.pkg_dir)
+                self.assertEqual(result.added, [])
+                self.assertEqual(result.updated, [self.contains_brent])
+                self.assertEqual(result.removed, [self.tosca])
+                self.assertEqual(result.unchanged, 1)
+                read_mock.assert_called_once_with(self.contains_brent)
+                self.assertEqual(pkg_index.search(term='with_tosca'), [])
+                self.assertEqual(len(pkg_index.search(term='contains_basic')), 2)
+                read_mock.reset_mock()
+                self.assertEqual(len(pkg_index.update(self.pkg_dir, rebuild=True).updated), 2)
+                self.assertEqual(read_mock.call_count, 2)
+
+    def test_invalid_packages_recorded(self):
+        with zipfile.ZipFile(os.path.join(self.pkg_dir, 'invalid-1.0.csar'), 'w') as invalid_zip:
+            invalid_zip.writestr('lmpkg.yml', 'name: invalid\ntype: Unknown\nversion: "1.0"')
+        with open(os.path.join(self.pkg_dir, 'not-a-pkg.tgz'), 'w') as f:
+            f.write('Not a package')
+        with PkgIndex(self.index_path) as pkg_index:
+            result = pkg_index.update(self.pkg_dir)
+            self.assertTrue(result.failed)
+            self.assertEqual(sorted(os.path.basename(path) for path, _ in result.errors), ['invalid-1.0.csar', 'not-a-pkg.tgz'])
+            self.assertEqual(len(result.added), 5)
+            self.assertEqual(pkg_index.search(term='invalid'), [])
+            # Read again, so they are still reported, while the valid packages are not
+            with patch('lmctl.project.package.index.read_pkg_meta', wraps=read_pkg_meta) as read_mock:
+                result = pkg_index.update(self.pkg_dir)
+            self.assertEqual(result.unchanged, 3)
+            self.assertEqual(sorted(os.path.basename(path) for path in result.updated), ['invalid-1.0.csar', 'not-a-pkg.tgz'])
+            self.assertEqual(sorted(os.path.basename(path) for path, _ in result.errors), ['invalid-1.0.csar', 'not-a-pkg.tgz'])
+            self.assertEqual(read_mock.call_count, 2)
+
+    def test_other_directories_kept(self):
+        other_dir = os.path.join(self.tmp_dir, 'other')
+        os.makedirs(other_dir)
+        shutil.move(self.tosca, os.path.join(other_dir, 'with_tosca-1.0.csar'))
+        with PkgIndex(self.index_path) as pkg_index:
+            pkg_index.update(self.pkg_dir)
+            pkg_index.update(other_dir)
+            self.assertEqual(len(pkg_index.search()), 4)
+
+    def test_directory_not_found(self):
+        with PkgIndex(self.index_path) as pkg_index:
+            with self.assertRaises(PkgIndexError):
+                pkg_index.update(os.path.join(self.tmp_dir, 'missing'))
+
+    def test_invalid_index_file(self):
+        with open(self.index_path, 'w') as f:
+            f.write('Not a database' * 100)
+        with self.assertRaises(PkgIndexError):
+            PkgIndex(self.index_path).open()
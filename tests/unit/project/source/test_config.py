@@ -3,7 +3,7 @@ import tempfile
 import os
 import yaml
 import shutil
-from lmctl.project.source.config import ProjectConfigRewriter
+from lmctl.project.source.config import ProjectConfigRewriter, ProjectConfigParser, ProjectConfigError
 
 OLD_STYLE_CONFIG = """\
 name: testproject
@@ -118,4 +118,29 @@ class TestProjectConfigRewriter(unittest.TestCase):
             new_config = f.read()
         self.assertEqual(new_config, NEW_STYLE_NO_VNFCS)
 
-    
\ No newline at end of file
+    
+
+class TestProjectConfigCompression(unittest.TestCase):
+
+    def test_parse_defaults_to_deflate(self):
+        config = ProjectConfigParser.from_dict({'schema': '2.0', 'name': 'test', 'version': '1.0'})
+        self.assertIsNone(config.compression)
+        self.assertEqual(config.compression_policy.method, 'deflate')
+        self.assertEqual(config.compression_policy.level, 6)
+        self.assertNotIn('compression', config.to_dict())
+
+    def test_parse_compression(self):
+        config = ProjectConfigParser.from_dict({
+            'schema': '2.0', 'name': 'test', 'version': '1.0',
+            'compression': {'method': 'deflate', 'level': 9, 'storedExtensions': ['.bin']},
+            'contains': [{'name': 'sub', 'type': 'Assembly'}]
+        })
+        self.assertEqual(config.compression_policy.level, 9)
+        self.assertEqual(config.compression_policy.stored_extensions, ['.bin'])
+        self.assertEqual(config.to_dict()['compression'], {'method': 'deflate', 'level': 9, 'storedExtensions': ['.bin']})
+        self.assertIs(config.subprojects[0].compression_policy, config.compression_policy)
+
+    def test_parse_invalid_compression_fails(self):
+        with self.assertRaises(ProjectConfigError) as context:
+            ProjectConfigParser.from_dict({'schema': '2.0', 'name': 'test', 'version': '1.0', 'compression': {'method': 'bzip2'}})
+        self.assertIn('Compression method must be one of', str(context.exception))
@@ -0,0 +1,53 @@
+import unittest
+import tempfile
+import shutil
+import json
+import os
+from lmctl.project.journal import ProjectJournal, JsonLinesJournalConsumer
+
+class TestJsonLinesJournalConsumer(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        if os.path.exists(self.tmp_dir):
+            shutil.rmtree(self.tmp_dir)
+
+    def _read_records(self, path):
+        with open(path, 'r') as f:
+            return [json.loads(line) for line in f.readlines()]
+
+    def test_writes_event_per_line(self):
+        path = os.path.join(self.tmp_dir, 'logs', 'journal.jsonl')
+        consumer = JsonLinesJournalConsumer(path)
+        journal = ProjectJournal(consumer)
+        journal.section('Validate Sources')
+        journal.stage('Validating descriptor')
+        journal.event('Descriptor found')
+        journal.subproject('sub')
+        journal.event('Sub descriptor found')
+        journal.subproject_end('sub')
+        journal.error_event('Failed')
+        consumer.close()
+        records = self._read_records(path)
+        self.assertEqual([r['type'] for r in records], ['section', 'stage', 'event', 'subproject', 'event', 'subproject_end', 'event'])
+        self.assertEqual(records[2]['section'], 'Validate Sources')
+        self.assertEqual(records[2]['stage'], 'Validating descriptor')
+        self.assertEqual(records[2]['message'], 'Descriptor found')
+        self.assertIsNone(records[2]['subproject'])
+        self.assertEqual(records[4]['subproject'], 'sub')
+        self.assertEqual(records[5]['subproject'], 'sub')
+        self.assertIsNone(records[6]['subproject'])
+        self.assertEqual(records[6]['level'], 'Error')
+        self.assertIn('timestamp', records[0])
+        self.assertLessEqual(records[0]['elapsed'], records[6]['elapsed'])
+
+    def test_ignores_entries_after_close(self):
+        path = os.path.join(self.tmp_dir, 'journal.jsonl')
+        consumer = JsonLinesJournalConsumer(path)
+        journal = ProjectJournal(consumer)
+        journal.event('Before')
+        consumer.close()
+        journal.event('After')
+        self.assertEqual(len(self._read_records(path)), 1)
@@ -0,0 +1,78 @@
+import unittest
+import tempfile
+import shutil
+import os
+import lmctl.project.profiling as profiling
+from tests.common.project_testing import ProjectSimTestCase
+from lmctl.project.source.core import Project, BuildOptions
+
+class TestPhaseProfiler(unittest.TestCase):
+
+    def test_nested_phases(self):
+        profiler = profiling.PhaseProfiler('Build')
+        profiler.start()
+        with profiler.phase('Stage'):
+            profiler.record_bytes_copied(10)
+            with profiler.phase('sub'):
+                profiler.record_bytes_copied(5)
+        with profiler.phase('Push'):
+            profiler.record_bytes_uploaded(20)
+        with profiler.phase('Push'):
+            pass
+        profiler.stop()
+        root = profiler.root
+        self.assertEqual(list(root.children.keys()), ['Stage', 'Push'])
+        stage = root.children['Stage']
+        self.assertEqual(stage.bytes_copied, 10)
+        self.assertEqual(stage.total_bytes_copied, 15)
+        self.assertEqual(stage.children['sub'].total_bytes_copied, 5)
+        self.assertEqual(root.children['Push'].calls, 2)
+        self.assertEqual(root.total_bytes_uploaded, 20)
+        self.assertGreaterEqual(root.elapsed, stage.elapsed)
+        summary = profiler.summary()
+        self.assertTrue(summary[0].startswith('Build: '))
+        self.assertIn('copied 15B', summary[1])
+        self.assertTrue(summary[2].startswith('    sub: '))
+        self.assertIn('2 calls', summary[3])
+        self.assertIn('uploaded 20B', summary[3])
+
+    def test_module_functions_without_active_profiler(self):
+        profiling.deactivate()
+        with profiling.phase('Stage') as record:
+            self.assertIsNone(record)
+        profiling.record_bytes_copied(10)
+        profiling.record_bytes_uploaded(10)
+
+    def test_record_copy_of_tree(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            os.makedirs(os.path.join(tmp_dir, 'nested'))
+            with open(os.path.join(tmp_dir, 'a.txt'), 'w') as f:
+                f.write('12345')
+            with open(os.path.join(tmp_dir, 'nested', 'b.txt'), 'w') as f:
+                f.write('123')
+            profiler = profiling.PhaseProfiler()
+            profiling.activate(profiler)
+            try:
+                profiling.record_copy(tmp_dir)
+                profiling.record_copy(os.path.join(tmp_dir, 'a.txt'))
+            finally:
+                profiling.deactivate()
+            self.assertEqual(profiler.root.bytes_copied, 13)
+        finally:
+            shutil.rmtree(tmp_dir)
+
+class TestProfileProjectBuild(ProjectSimTestCase):
+
+    def test_build_records_phases(self):
+        project_sim = self.simlab.simulate_assembly_contains_assembly_basic()
+        profiler = profiling.PhaseProfiler('Build')
+        profiling.activate(profiler)
+        try:
+            Project(project_sim.path).build(BuildOptions())
+        finally:
+            profiling.deactivate()
+        phases = profiler.root.children
+        self.assertEqual(list(phases.keys()), ['Validate', 'Stage', 'Compile', 'Package'])
+        self.assertIn('sub_basic', phases['Stage'].children)
+        self.assertGreater(phases['Stage'].total_bytes_copied, 0)
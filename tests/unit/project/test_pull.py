@@ -0,0 +1,44 @@
+import unittest
+from unittest.mock import MagicMock
+from lmctl.project.processes.pull import PullPrefetch, PrefetchedEnvironmentSessions
+from lmctl.project.sessions import EnvironmentSessions
+from lmctl.drivers.lm.base import NotFoundException
+
+class TestPullPrefetch(unittest.TestCase):
+
+    def setUp(self):
+        self.lm_session = MagicMock()
+        self.descriptor_driver = self.lm_session.descriptor_driver
+        self.behaviour_driver = self.lm_session.behaviour_driver
+        self.descriptor_driver.get_descriptor.side_effect = lambda name: 'name: {0}'.format(name)
+        self.behaviour_driver.get_project.side_effect = NotFoundException('Not found')
+        self.behaviour_driver.get_assembly_configurations.return_value = []
+        self.behaviour_driver.get_scenarios.return_value = []
+        self.prefetch = PullPrefetch()
+        self.prefetch.fetch(self.lm_session, ['assembly::A::1.0', 'assembly::B::1.0'], max_workers=4)
+        self.env_sessions = PrefetchedEnvironmentSessions(EnvironmentSessions(self.lm_session), self.prefetch)
+
+    def test_fetch_calls_each_method_once_per_name(self):
+        self.assertEqual(self.descriptor_driver.get_descriptor.call_count, 2)
+        self.assertEqual(self.behaviour_driver.get_project.call_count, 2)
+        self.assertEqual(self.behaviour_driver.get_assembly_configurations.call_count, 2)
+        self.assertEqual(self.behaviour_driver.get_scenarios.call_count, 2)
+
+    def test_prefetched_result_returned_once(self):
+        self.assertEqual(self.env_sessions.lm.descriptor_driver.get_descriptor('assembly::A::1.0'), 'name: assembly::A::1.0')
+        self.assertEqual(self.descriptor_driver.get_descriptor.call_count, 2)
+        self.assertEqual(self.env_sessions.lm.descriptor_driver.get_descriptor('assembly::A::1.0'), 'name: assembly::A::1.0')
+        self.assertEqual(self.descriptor_driver.get_descriptor.call_count, 3)
+
+    def test_prefetched_error_raised(self):
+        with self.assertRaises(NotFoundException):
+            self.env_sessions.lm.behaviour_driver.get_project('assembly::B::1.0')
+        self.assertEqual(self.behaviour_driver.get_project.call_count, 2)
+
+    def test_other_calls_go_to_driver(self):
+        self.env_sessions.lm.descriptor_driver.get_descriptor('assembly::C::1.0')
+        self.descriptor_driver.get_descriptor.assert_called_with('assembly::C::1.0')
+        self.env_sessions.lm.behaviour_driver.get_scenario('123')
+        self.behaviour_driver.get_scenario.assert_called_once_with('123')
+        self.assertEqual(self.env_sessions.lm.env, self.lm_session.env)
+        self.assertFalse(self.env_sessions.is_lm_updated())
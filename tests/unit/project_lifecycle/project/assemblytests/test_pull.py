@@ -408,4 +408,30 @@ class TestPullAssemblyProjects(ProjectSimTestCase):
         project_assertions = self.assert_project(project_sim.as_project())
         project_assertions.assert_has_no_backup(os.path.join(ASSEMBLY_BEHAVIOUR_DIR, ASSEMBLY_TESTS_DIR, 'test.json'))
         project_assertions.assert_has_file(os.path.join(ASSEMBLY_BEHAVIOUR_DIR, ASSEMBLY_TESTS_DIR, 'test.json'), current_test_content)
-     
\ No newline at end of file
+     
+    def test_pull_subprojects_prefetches_descriptors(self):
+        project_sim = self.simlab.simulate_assembly_contains_assembly_basic()
+        lm_sim = self.simlab.simulate_lm()
+        lm_sim.add_descriptor('name: assembly::contains_basic::1.0\ndescription: parent pulled from the environment\n')
+        lm_sim.add_descriptor('name: assembly::sub_basic-contains_basic::1.0\ndescription: child pulled from the environment\n')
+        lm_session = lm_sim.as_mocked_session()
+        self.__exec_pull(project_sim, lm_session)
+        self.assertEqual(lm_session.descriptor_driver.get_descriptor.call_count, 2)
+        lm_session.descriptor_driver.get_descriptor.assert_any_call('assembly::contains_basic::1.0')
+        lm_session.descriptor_driver.get_descriptor.assert_any_call('assembly::sub_basic-contains_basic::1.0')
+        lm_session.behaviour_driver.get_project.assert_any_call('assembly::sub_basic-contains_basic::1.0')
+        project_assertions = self.assert_project(project_sim.as_project())
+        project_assertions.assert_has_file(os.path.join(ASSEMBLY_DESCRIPTOR_DIR, ASSEMBLY_DESCRIPTOR_YML_FILE), 'description: parent pulled from the environment\n')
+        project_assertions.assert_has_file(os.path.join('Contains', 'sub_basic', ASSEMBLY_DESCRIPTOR_DIR, ASSEMBLY_DESCRIPTOR_YML_FILE), 'description: child pulled from the environment\n')
+
+    def test_pull_without_concurrency(self):
+        project_sim = self.simlab.simulate_assembly_contains_assembly_basic()
+        lm_sim = self.simlab.simulate_lm()
+        lm_sim.add_descriptor('name: assembly::sub_basic-contains_basic::1.0\ndescription: child pulled from the environment\n')
+        lm_session = lm_sim.as_mocked_session()
+        pull_options = PullOptions()
+        pull_options.max_workers = 1
+        project_sim.as_project().pull(EnvironmentSessions(lm_session), pull_options)
+        self.assertEqual(lm_session.descriptor_driver.get_descriptor.call_count, 2)
+        project_assertions = self.assert_project(project_sim.as_project())
+        project_assertions.assert_has_file(os.path.join('Contains', 'sub_basic', ASSEMBLY_DESCRIPTOR_DIR, ASSEMBLY_DESCRIPTOR_YML_FILE), 'description: child pulled from the environment\n')
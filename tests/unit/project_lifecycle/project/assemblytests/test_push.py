@@ -1,10 +1,11 @@
 import unittest
-from unittest.mock import call
+from unittest.mock import call, patch, MagicMock
 import os
 import tests.common.simulations.project_lab as project_lab
 from tests.common.project_testing import (ProjectSimTestCase, PROJECT_CONTAINS_DIR)
 from lmctl.project.sessions import EnvironmentSessions
-from lmctl.project.package.core import Pkg, PkgContent, PushOptions
+from lmctl.project.package.core import Pkg, PkgContent, PushOptions, MultiPushOptions
+from lmctl.drivers.lm.base import LmDriverException
 from lmctl.project.handlers.assembly.assembly_src import TEMPLATE_CONTENT
 
 WITH_TEMPLATE_ASSEMBLY_TEMPLATE_DESCRIPTOR_YAML = "name: assembly-template::with_template::1.0"
@@ -542,3 +543,49 @@ class TestPushOldStyle(ProjectSimTestCase):
         csar_a_path = os.path.join(result.tree.root_path, PROJECT_CONTAINS_DIR, 'vnfcA', 'vnfcA.csar')
         csar_b_path = os.path.join(result.tree.root_path, PROJECT_CONTAINS_DIR, 'vnfcB', 'vnfcB.csar')
         arm_session.arm_driver.onboard_type.assert_has_calls([call('vnfcA', '1.0', csar_a_path), call('vnfcB', '2.0', csar_b_path)])
+
+
+class TestPushAssemblyPkgsToEnvironments(ProjectSimTestCase):
+
+    def test_push_to_environments(self):
+        pkg_sim = self.simlab.simulate_pkg_assembly_basic()
+        pkg = Pkg(pkg_sim.path)
+        lm_session_a = self.simlab.simulate_lm().as_mocked_session()
+        lm_session_b = self.simlab.simulate_lm().as_mocked_session()
+        results = pkg.push_to_environments({'envA': EnvironmentSessions(lm_session_a), 'envB': EnvironmentSessions(lm_session_b)}, MultiPushOptions())
+        self.assertEqual([r.environment_name for r in results], ['envA', 'envB'])
+        self.assertFalse(any(r.failed for r in results))
+        for lm_session in [lm_session_a, lm_session_b]:
+            lm_session.descriptor_driver.create_descriptor.assert_called_once_with('name: assembly::basic::1.0\ndescription: basic_assembly\n')
+
+    def test_push_to_environments_with_open_content(self):
+        pkg_sim = self.simlab.simulate_pkg_assembly_contains_assembly_basic()
+        pkg = Pkg(pkg_sim.path)
+        pkg_content = pkg.open()
+        lm_session_a = self.simlab.simulate_lm().as_mocked_session()
+        lm_session_b = self.simlab.simulate_lm().as_mocked_session()
+        with patch.object(Pkg, 'open') as mock_open:
+            results = pkg.push_to_environments({'envA': EnvironmentSessions(lm_session_a), 'envB': EnvironmentSessions(lm_session_b)}, MultiPushOptions(), pkg_content=pkg_content)
+        mock_open.assert_not_called()
+        self.assertFalse(any(r.failed for r in results))
+        for lm_session in [lm_session_a, lm_session_b]:
+            lm_session.descriptor_driver.create_descriptor.assert_has_calls([
+                call('name: assembly::sub_basic-contains_basic::1.0\ndescription: descriptor\n'),
+                call('name: assembly::contains_basic::1.0\ndescription: basic_assembly\n')])
+
+    def test_push_to_environments_reports_each_failure(self):
+        pkg_sim = self.simlab.simulate_pkg_assembly_basic()
+        pkg = Pkg(pkg_sim.path)
+        lm_session_a = self.simlab.simulate_lm().as_mocked_session()
+        lm_session_b = self.simlab.simulate_lm().as_mocked_session()
+        lm_session_a.descriptor_driver.create_descriptor.side_effect = LmDriverException('Mock error')
+        journal_consumer = MagicMock()
+        journal_consumer.is_interested.return_value = True
+        push_options = MultiPushOptions()
+        push_options.environment_journal_consumers = {'envB': journal_consumer}
+        results = pkg.push_to_environments({'envA': EnvironmentSessions(lm_session_a), 'envB': EnvironmentSessions(lm_session_b)}, push_options)
+        self.assertTrue(results[0].failed)
+        self.assertEqual(str(results[0].error), 'Mock error')
+        self.assertFalse(results[1].failed)
+        lm_session_b.descriptor_driver.create_descriptor.assert_called_once_with('name: assembly::basic::1.0\ndescription: basic_assembly\n')
+        self.assertTrue(journal_consumer.consume.called)
@@ -0,0 +1,163 @@
+import unittest
+import tempfile
+import shutil
+import zipfile
+import os
+from unittest.mock import patch
+import lmctl.archive as archive
+
+class TestCompressionPolicy(unittest.TestCase):
+
+    def test_defaults(self):
+        policy = archive.CompressionPolicy()
+        self.assertEqual(policy.method, archive.DEFLATE)
+        self.assertEqual(policy.level, archive.DEFAULT_COMPRESSION_LEVEL)
+        self.assertEqual(policy.compress_type_for('Lifecycle/ansible/install.yaml'), archive.ZIP_DEFLATED)
+        self.assertEqual(policy.compress_type_for('Files/image.QCOW2'), archive.ZIP_STORED)
+        self.assertEqual(policy.compress_type_for('Files/bundle.tgz'), archive.ZIP_STORED)
+
+    def test_stored_method(self):
+        policy = archive.CompressionPolicy(method=archive.STORED)
+        self.assertEqual(policy.compress_type_for('Lifecycle/ansible/install.yaml'), archive.ZIP_STORED)
+
+    def test_from_dict(self):
+        policy = archive.CompressionPolicy.from_dict({'level': 1, 'storedExtensions': ['.bin']})
+        self.assertEqual(policy.method, archive.DEFLATE)
+        self.assertEqual(policy.level, 1)
+        self.assertEqual(policy.compress_type_for('data.bin'), archive.ZIP_STORED)
+        self.assertEqual(policy.compress_type_for('data.zip'), archive.ZIP_DEFLATED)
+
+    def test_invalid_method(self):
+        with self.assertRaises(archive.ArchiveError) as context:
+            archive.CompressionPolicy(method='lzma')
+        self.assertEqual(str(context.exception), 'Compression method must be one of [\'stored\', \'deflate\'] but was: lzma')
+
+    def test_invalid_level(self):
+        with self.assertRaises(archive.ArchiveError):
+            archive.CompressionPolicy(level=10)
+        with self.assertRaises(archive.ArchiveError):
+            archive.CompressionPolicy.from_dict({'level': 'high'})
+
+class TestZipWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.src = os.path.join(self.tmp_dir, 'src')
+        os.makedirs(os.path.join(self.src, 'Lifecycle', 'ansible'))
+        os.makedirs(os.path.join(self.src, 'Lifecycle', 'empty'))
+        self.__write('Lifecycle/ansible/install.yaml', b'- hosts: all\n' * 5000)
+        self.__write('Lifecycle/image.tgz', b'already compressed' * 100)
+        self.__write('Lifecycle/random.bin', os.urandom(20000))
+        self.__write('Lifecycle/empty.txt', b'')
+        self.zip_path = os.path.join(self.tmp_dir, 'out.zip')
+
+    def tearDown(self):
+        if os.path.exists(self.tmp_dir):
+            shutil.rmtree(self.tmp_dir)
+
+    def __write(self, relative_path, content):
+        with open(os.path.join(self.src, relative_path), 'wb') as f:
+            f.write(content)
+
+    def __build(self, policy=None):
+        with archive.ZipWriter(self.zip_path, policy) as writer:
+            path = os.path.join(self.src, 'Lifecycle')
+            writer.write(path, arcname='Lifecycle')
+            for root, dirs, filenames in os.walk(path):
+                for name in sorted(dirs) + sorted(filenames):
+                    full_path = os.path.join(root, name)
+                    writer.write(full_path, arcname=os.path.relpath(full_path, self.src))
+
+    def __assert_round_trip(self):
+        extract_path = os.path.join(self.tmp_dir, 'extracted')
+        with zipfile.ZipFile(self.zip_path, 'r') as zip_file:
+            self.assertIsNone(zip_file.testzip())
+            zip_file.extractall(extract_path)
+        for root, _, filenames in os.walk(self.src):
+            for name in filenames:
+                full_path = os.path.join(root, name)
+                with open(full_path, 'rb') as original, open(os.path.join(extract_path, os.path.relpath(full_path, self.src)), 'rb') as extracted:
+                    self.assertEqual(original.read(), extracted.read())
+        self.assertTrue(os.path.isdir(os.path.join(extract_path, 'Lifecycle', 'empty')))
+
+    def __infos(self):
+        with zipfile.ZipFile(self.zip_path, 'r') as zip_file:
+            return {info.filename: info for info in zip_file.infolist()}
+
+    def test_write_deflates_by_policy(self):
+        self.__build()
+        self.__assert_round_trip()
+        infos = self.__infos()
+        self.assertEqual(list(infos.keys())[:4], ['Lifecycle/', 'Lifecycle/ansible/', 'Lifecycle/empty/', 'Lifecycle/empty.txt'])
+        self.assertTrue(infos['Lifecycle/'].is_dir())
+        self.assertEqual(infos['Lifecycle/ansible/install.yaml'].compress_type, zipfile.ZIP_DEFLATED)
+        self.assertLess(infos['Lifecycle/ansible/install.yaml'].compress_size, infos['Lifecycle/ansible/install.yaml'].file_size)
+        self.assertEqual(infos['Lifecycle/image.tgz'].compress_type, zipfile.ZIP_STORED)
+
+    def test_write_deflates_on_worker_threads(self):
+        with patch('lmctl.archive.run_concurrently', wraps=archive.run_concurrently) as run_mock:
+            self.__build(archive.CompressionPolicy(max_workers=4))
+        self.__assert_round_trip()
+        deflated = [zinfo.filename for call in run_mock.call_args_list for _, zinfo in call[0][1]]
+        self.assertEqual(sorted(deflated), ['Lifecycle/ansible/install.yaml', 'Lifecycle/empty.txt', 'Lifecycle/random.bin'])
+        self.assertEqual(run_mock.call_args[1], {'max_workers': 4})
+        # Still written in the order they were added
+        self.assertEqual(list(self.__infos().keys()), ['Lifecycle/', 'Lifecycle/ansible/', 'Lifecycle/empty/', 'Lifecycle/empty.txt', 'Lifecycle/image.tgz',
+                                                        'Lifecycle/random.bin', 'Lifecycle/ansible/install.yaml'])
+
+    def test_write_single_worker(self):
+        with patch('lmctl.archive.run_concurrently') as run_mock:
+            self.__build(archive.CompressionPolicy(max_workers=1))
+        run_mock.assert_not_called()
+        self.__assert_round_trip()
+        self.assertEqual(self.__infos()['Lifecycle/ansible/install.yaml'].compress_type, zipfile.ZIP_DEFLATED)
+
+    def test_write_pending_when_size_reached(self):
+        with patch('lmctl.archive.MAX_PENDING_SIZE', 1), patch('lmctl.archive.run_concurrently', wraps=archive.run_concurrently) as run_mock:
+            self.__build()
+        self.__assert_round_trip()
+        self.assertTrue(all(len(call[0][1]) == 1 for call in run_mock.call_args_list))
+
+    def test_write_large_members_on_calling_thread(self):
+        with patch('lmctl.archive.MAX_PARALLEL_MEMBER_SIZE', 30000), patch('lmctl.archive.run_concurrently', wraps=archive.run_concurrently) as run_mock:
+            self.__build()
+        self.__assert_round_trip()
+        deflated = [zinfo.filename for call in run_mock.call_args_list for _, zinfo in call[0][1]]
+        self.assertNotIn('Lifecycle/ansible/install.yaml', deflated)
+        self.assertEqual(self.__infos()['Lifecycle/ansible/install.yaml'].compress_type, zipfile.ZIP_DEFLATED)
+
+    def test_write_stored_policy(self):
+        self.__build(archive.CompressionPolicy(method=archive.STORED))
+        self.__assert_round_trip()
+        for info in self.__infos().values():
+            self.assertEqual(info.compress_type, zipfile.ZIP_STORED)
+
+    def test_write_zip64(self):
+        with patch('zipfile.ZIP64_LIMIT', 100), patch('zipfile.ZIP_FILECOUNT_LIMIT', 2):
+            self.__build()
+        self.__assert_round_trip()
+        with open(self.zip_path, 'rb') as f:
+            self.assertIn(b'PK\006\006', f.read())
+
+    def test_write_zip64_streamed(self):
+        with patch('zipfile.ZIP64_LIMIT', 100), patch('zipfile.ZIP_FILECOUNT_LIMIT', 2):
+            self.__build(archive.CompressionPolicy(max_workers=1))
+        self.__assert_round_trip()
+
+    def test_write_uses_policy_level(self):
+        self.__write('Lifecycle/ansible/install.yaml', ''.join('- hosts: group{0}\n'.format(i) for i in range(20000)).encode())
+        sizes = {}
+        for level in [1, 9]:
+            for max_workers in [1, 4]:
+                self.__build(archive.CompressionPolicy(level=level, max_workers=max_workers))
+                self.__assert_round_trip()
+                sizes[(level, max_workers)] = self.__infos()['Lifecycle/ansible/install.yaml'].compress_size
+        self.assertEqual(sizes[(1, 1)], sizes[(1, 4)])
+        self.assertEqual(sizes[(9, 1)], sizes[(9, 4)])
+        self.assertLess(sizes[(9, 1)], sizes[(1, 1)])
+
+    def test_infer_from_archive(self):
+        self.__build(archive.CompressionPolicy(method=archive.STORED))
+        self.assertEqual(archive.CompressionPolicy.infer_from_archive(self.zip_path).method, archive.STORED)
+        self.__build()
+        self.assertEqual(archive.CompressionPolicy.infer_from_archive(self.zip_path).method, archive.DEFLATE)
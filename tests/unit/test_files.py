@@ -0,0 +1,142 @@
+import unittest
+import tempfile
+import shutil
+import os
+import errno
+from unittest.mock import patch
+import lmctl.files as files
+
+class TestCopyTree(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        if os.path.exists(self.tmp_dir):
+            shutil.rmtree(self.tmp_dir)
+
+    def test_copy_tree_recreates_removed_directories(self):
+        src = os.path.join(self.tmp_dir, 'src')
+        os.makedirs(os.path.join(src, 'nested'))
+        with open(os.path.join(src, 'nested', 'file.txt'), 'w') as f:
+            f.write('content')
+        dest = os.path.join(self.tmp_dir, 'dest')
+        files.copy_tree(src, dest)
+        files.remove_directory(dest)
+        files.copy_tree(src, dest)
+        with open(os.path.join(dest, 'nested', 'file.txt'), 'r') as f:
+            self.assertEqual(f.read(), 'content')
+
+class TestCopyEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.src = os.path.join(self.tmp_dir, 'src')
+        os.makedirs(os.path.join(self.src, 'empty'))
+        for i in range(files.PARALLEL_COPY_THRESHOLD + 4):
+            sub_dir = os.path.join(self.src, 'dir{0}'.format(i % 3))
+            os.makedirs(sub_dir, exist_ok=True)
+            with open(os.path.join(sub_dir, 'file{0}.txt'.format(i)), 'w') as f:
+                f.write('content {0}'.format(i) * (i + 1))
+
+    def tearDown(self):
+        if os.path.exists(self.tmp_dir):
+            shutil.rmtree(self.tmp_dir)
+
+    def __assert_trees_equal(self, src, dest):
+        for root, dirs, filenames in os.walk(src):
+            target_root = os.path.join(dest, os.path.relpath(root, src))
+            for dirname in dirs:
+                self.assertTrue(os.path.isdir(os.path.join(target_root, dirname)))
+            for filename in filenames:
+                with open(os.path.join(root, filename), 'r') as orig, open(os.path.join(target_root, filename), 'r') as copy:
+                    self.assertEqual(orig.read(), copy.read())
+
+    def test_copy_tree(self):
+        dest = os.path.join(self.tmp_dir, 'dest')
+        copied = files.copy_tree(self.src, dest)
+        self.assertEqual(len(copied), files.PARALLEL_COPY_THRESHOLD + 4)
+        self.__assert_trees_equal(self.src, dest)
+        orig_path = os.path.join(self.src, 'dir0', 'file0.txt')
+        copy_path = os.path.join(dest, 'dir0', 'file0.txt')
+        self.assertNotEqual(os.stat(orig_path).st_ino, os.stat(copy_path).st_ino)
+        self.assertEqual(int(os.stat(orig_path).st_mtime), int(os.stat(copy_path).st_mtime))
+
+    def test_copy_tree_merges_into_existing(self):
+        dest = os.path.join(self.tmp_dir, 'dest')
+        os.makedirs(os.path.join(dest, 'dir0'))
+        with open(os.path.join(dest, 'dir0', 'existing.txt'), 'w') as f:
+            f.write('existing')
+        files.copy_tree(self.src, dest)
+        self.__assert_trees_equal(self.src, dest)
+        self.assertTrue(os.path.exists(os.path.join(dest, 'dir0', 'existing.txt')))
+
+    def test_copy_tree_with_links(self):
+        dest = os.path.join(self.tmp_dir, 'dest')
+        files.copy_tree(self.src, dest, allow_links=True)
+        self.__assert_trees_equal(self.src, dest)
+        self.assertEqual(os.stat(os.path.join(self.src, 'dir0', 'file0.txt')).st_ino, os.stat(os.path.join(dest, 'dir0', 'file0.txt')).st_ino)
+
+    def test_copy_file_replaces_linked_file(self):
+        orig_path = os.path.join(self.src, 'dir0', 'file0.txt')
+        linked_path = os.path.join(self.tmp_dir, 'linked.txt')
+        files.copy_file(orig_path, linked_path, allow_links=True)
+        other_path = os.path.join(self.tmp_dir, 'other.txt')
+        with open(other_path, 'w') as f:
+            f.write('other')
+        files.copy_file(other_path, linked_path)
+        with open(linked_path, 'r') as f:
+            self.assertEqual(f.read(), 'other')
+        with open(orig_path, 'r') as f:
+            self.assertEqual(f.read(), 'content 0')
+
+    def test_copy_file_replaces_dangling_link(self):
+        dest = os.path.join(self.tmp_dir, 'dangling.txt')
+        os.symlink(os.path.join(self.tmp_dir, 'missing.txt'), dest)
+        files.copy_file(os.path.join(self.src, 'dir0', 'file0.txt'), dest)
+        self.assertFalse(os.path.islink(dest))
+        with open(dest, 'r') as f:
+            self.assertEqual(f.read(), 'content 0')
+
+    def test_copy_tree_follows_links_to_directories(self):
+        os.symlink(os.path.join(self.src, 'dir0'), os.path.join(self.src, 'dir1', 'linked'))
+        dest = os.path.join(self.tmp_dir, 'dest')
+        files.copy_tree(self.src, dest)
+        self.assertFalse(os.path.islink(os.path.join(dest, 'dir1', 'linked')))
+        with open(os.path.join(dest, 'dir1', 'linked', 'file0.txt'), 'r') as f:
+            self.assertEqual(f.read(), 'content 0')
+
+    def test_copy_tree_stops_at_link_cycles(self):
+        os.symlink(self.src, os.path.join(self.src, 'dir0', 'loop'))
+        os.symlink(os.path.join(self.src, 'dir0'), os.path.join(self.src, 'dir0', 'self'))
+        dest = os.path.join(self.tmp_dir, 'dest')
+        copied = files.copy_tree(self.src, dest)
+        self.assertEqual(len(copied), files.PARALLEL_COPY_THRESHOLD + 4)
+        self.assertFalse(os.path.exists(os.path.join(dest, 'dir0', 'loop')))
+        self.assertFalse(os.path.exists(os.path.join(dest, 'dir0', 'self')))
+
+    def test_copy_file_to_directory(self):
+        dest_dir = os.path.join(self.tmp_dir, 'dest')
+        os.makedirs(dest_dir)
+        target_path = files.copy_file(os.path.join(self.src, 'dir0', 'file0.txt'), dest_dir)
+        self.assertEqual(target_path, os.path.join(dest_dir, 'file0.txt'))
+        with open(target_path, 'r') as f:
+            self.assertEqual(f.read(), 'content 0')
+
+    def test_copy_file_falls_back_when_fast_copies_unsupported(self):
+        engine = files.CopyEngine()
+        unsupported = OSError(errno.EXDEV, 'Cross-device link')
+        with patch('fcntl.ioctl', side_effect=unsupported), patch('os.copy_file_range', side_effect=unsupported, create=True), \
+                patch('os.sendfile', side_effect=unsupported, create=True):
+            target_path = engine.copy_file(os.path.join(self.src, 'dir1', 'file1.txt'), os.path.join(self.tmp_dir, 'copy.txt'))
+            engine.copy_file(os.path.join(self.src, 'dir2', 'file2.txt'), os.path.join(self.tmp_dir, 'copy2.txt'))
+        with open(target_path, 'r') as f:
+            self.assertEqual(f.read(), 'content 1content 1')
+        with open(os.path.join(self.tmp_dir, 'copy2.txt'), 'r') as f:
+            self.assertEqual(f.read(), 'content 2' * 3)
+
+    def test_copy_file_raises_other_errors(self):
+        with patch('os.copy_file_range', side_effect=OSError(errno.ENOSPC, 'No space left on device'), create=True), patch('fcntl.ioctl', side_effect=OSError(errno.EOPNOTSUPP, 'Not supported')):
+            with self.assertRaises(OSError) as context:
+                files.CopyEngine().copy_file(os.path.join(self.src, 'dir1', 'file1.txt'), os.path.join(self.tmp_dir, 'copy.txt'))
+        self.assertEqual(context.exception.errno, errno.ENOSPC)
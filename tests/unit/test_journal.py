@@ -1,4 +1,6 @@
 import unittest
+import threading
+from unittest.mock import MagicMock
 from lmctl.journal import *
 
 class TestEntryTarget(unittest.TestCase):
@@ -188,4 +190,34 @@ class TestJournalKeeper(unittest.TestCase):
         self.assertEqual(keeper.chapters[0].entries[0].to_readable(), "Entry1")
         self.assertEqual(keeper.chapters[0].entries[1].to_readable(), "Entry2")
         self.assertEqual(len(keeper.chapters[1].entries), 1)
-        self.assertEqual(keeper.chapters[1].entries[0].to_readable(), "Entry3")
\ No newline at end of file
+        self.assertEqual(keeper.chapters[1].entries[0].to_readable(), "Entry3")
+
+class TestConsumerGroup(unittest.TestCase):
+
+    def test_consume_forwards_to_interested(self):
+        keeper = JournalKeeper()
+        uninterested = MagicMock()
+        uninterested.is_interested.return_value = False
+        group = ConsumerGroup([keeper, uninterested])
+        self.assertTrue(group.is_interested(TextEntry("Test")))
+        group.consume(OpenChapterEntry("Chapter1"))
+        group.consume(TextEntry("Entry1"))
+        self.assertEqual(keeper.chapters[0].entries[0].to_readable(), "Entry1")
+        uninterested.consume.assert_not_called()
+
+class TestJournalConcurrency(unittest.TestCase):
+
+    def test_add_entry_from_threads(self):
+        journal = Journal()
+        keeper = JournalKeeper()
+        journal.register_consumer(keeper)
+        journal.open_chapter("Chapter1")
+        def add_entries(thread_no):
+            for i in range(100):
+                journal.add_text("{0}-{1}".format(thread_no, i))
+        threads = [threading.Thread(target=add_entries, args=(t,)) for t in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(keeper.chapters[0].entries), 500)
@@ -0,0 +1,38 @@
+import unittest
+import threading
+from lmctl.utils.concurrency import run_concurrently
+from lmctl.utils.trace_ctx import trace_ctx
+
+class TestRunConcurrently(unittest.TestCase):
+
+    def test_results_in_order(self):
+        results = run_concurrently(lambda x: x * 2, [1, 2, 3, 4], max_workers=3)
+        self.assertEqual([r.value for r in results], [2, 4, 6, 8])
+        self.assertEqual([r.item for r in results], [1, 2, 3, 4])
+
+    def test_captures_errors(self):
+        def task(x):
+            if x == 2:
+                raise ValueError('Mock error')
+            return x
+        results = run_concurrently(task, [1, 2, 3])
+        self.assertFalse(results[0].failed)
+        self.assertTrue(results[1].failed)
+        self.assertEqual(str(results[1].error), 'Mock error')
+        self.assertEqual(results[2].value, 3)
+
+    def test_raises_errors_not_catchable(self):
+        def task(x):
+            raise ValueError('Mock error')
+        with self.assertRaises(ValueError):
+            run_concurrently(task, [1, 2], catchable_exceptions=(KeyError,))
+
+    def test_uses_multiple_threads(self):
+        barrier = threading.Barrier(3, timeout=5)
+        results = run_concurrently(lambda x: barrier.wait(), [1, 2, 3], max_workers=3)
+        self.assertFalse(any(r.failed for r in results))
+
+    def test_carries_trace_ctx_to_workers(self):
+        with trace_ctx.scope(transaction_id='123'):
+            results = run_concurrently(lambda x: trace_ctx.get_transaction_id(), [1, 2], max_workers=2)
+        self.assertEqual([r.value for r in results], ['123', '123'])
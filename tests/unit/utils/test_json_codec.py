@@ -0,0 +1,43 @@
+import json
+import unittest
+import requests
+from unittest.mock import patch, MagicMock
+from lmctl.utils import json_codec
+
+class TestJsonCodec(unittest.TestCase):
+
+    def _test_with_and_without_orjson(self, test):
+        test()
+        with patch('lmctl.utils.json_codec.orjson', None):
+            test()
+
+    def test_loads(self):
+        def test():
+            self.assertEqual(json_codec.loads(b'{"a": [1, "\xc3\xa9"]}'), {'a': [1, 'é']})
+            self.assertEqual(json_codec.loads('{"a": 1}'), {'a': 1})
+            with self.assertRaises(ValueError):
+                json_codec.loads(b'{"a": ')
+        self._test_with_and_without_orjson(test)
+
+    def test_dumps(self):
+        def test():
+            self.assertEqual(json.loads(json_codec.dumps({'a': [1, 'b']})), {'a': [1, 'b']})
+            self.assertEqual(json_codec.dumps({'a': {'b': 1}}, indent=True), '{\n  "a": {\n    "b": 1\n  }\n}')
+            self.assertEqual(json.loads(json_codec.dumps_bytes({'a': 1})), {'a': 1})
+        self._test_with_and_without_orjson(test)
+
+    def test_dumps_falls_back_for_unsupported_values(self):
+        self.assertEqual(json.loads(json_codec.dumps({'a': 2 ** 70})), {'a': 2 ** 70})
+        self.assertEqual(json.loads(json_codec.dumps({1: 'a'})), {'1': 'a'})
+
+    def test_read_response(self):
+        def test():
+            response = requests.Response()
+            response._content = b'[{"id": "1"}]'
+            self.assertEqual(json_codec.read_response(response), [{'id': '1'}])
+        self._test_with_and_without_orjson(test)
+
+    def test_read_response_without_bytes_content(self):
+        response = MagicMock(content=None)
+        response.json.return_value = {'id': '1'}
+        self.assertEqual(json_codec.read_response(response), {'id': '1'})